@@ -0,0 +1,30 @@
+"""add composite workflow indexes on documents
+
+Revision ID: 9c4e1b7d2a31
+Revises: e039944678ca
+Create Date: 2026-10-19 09:12:44.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1b7d2a31'
+down_revision: Union[str, Sequence[str], None] = 'e039944678ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_documents_responsible_status', 'documents', ['responsible', 'status'], unique=False)
+    op.create_index('ix_documents_reviewer_status', 'documents', ['reviewer', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_reviewer_status', table_name='documents')
+    op.drop_index('ix_documents_responsible_status', table_name='documents')
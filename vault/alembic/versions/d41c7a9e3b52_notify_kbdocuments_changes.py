@@ -0,0 +1,52 @@
+"""notify listeners of kbdocuments changes
+
+Revision ID: d41c7a9e3b52
+Revises: 9c4e1b7d2a31
+Create Date: 2026-10-19 14:03:27.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c7a9e3b52'
+down_revision: Union[str, Sequence[str], None] = '9c4e1b7d2a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Payload is the companyid; identical notifications are merged per transaction,
+    # so a bulk insert sends one per tenant. Channel matches local_index.KB_CHANGE_CHANNEL.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION kbdocuments_notify_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('kbdocuments_changed', coalesce(OLD.companyid::text, ''));
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('kbdocuments_changed', coalesce(NEW.companyid::text, ''));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER kbdocuments_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON kbdocuments
+        FOR EACH ROW EXECUTE FUNCTION kbdocuments_notify_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS kbdocuments_notify_change ON kbdocuments")
+    op.execute("DROP FUNCTION IF EXISTS kbdocuments_notify_change()")
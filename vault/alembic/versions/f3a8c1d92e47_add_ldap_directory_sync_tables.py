@@ -0,0 +1,84 @@
+"""add ldap directory sync tables
+
+Revision ID: f3a8c1d92e47
+Revises: d41c7a9e3b52
+Create Date: 2026-10-19 16:21:08.734115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d92e47'
+down_revision: Union[str, Sequence[str], None] = 'd41c7a9e3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # IF NOT EXISTS throughout: k8s-migration-job.yaml creates the same tables,
+    # as it does ldap_connectors. Keep the two in step.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ldap_directory_entries (
+            id BIGSERIAL PRIMARY KEY,
+            connector_id UUID NOT NULL,
+            company_id INTEGER NOT NULL,
+            directory_key TEXT NOT NULL,
+            entry_type VARCHAR(20) NOT NULL DEFAULT 'user',
+            dn TEXT NOT NULL,
+            username TEXT,
+            email TEXT,
+            display_name TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            telephone TEXT,
+            department TEXT,
+            description TEXT,
+            search_text TEXT,
+            usn_changed BIGINT,
+            modify_timestamp VARCHAR(32),
+            is_deleted BOOLEAN NOT NULL DEFAULT false,
+            last_seen_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+            CONSTRAINT uq_ldap_directory_entries_connector_key UNIQUE (connector_id, directory_key)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ldap_directory_entries_connector_id "
+        "ON ldap_directory_entries (connector_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ldap_directory_entries_company_id "
+        "ON ldap_directory_entries (company_id)"
+    )
+    # Substring type-ahead (LIKE '%term%') for the directory picker
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ldap_directory_entries_search_text_trgm "
+        "ON ldap_directory_entries USING gin (search_text gin_trgm_ops)"
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ldap_sync_state (
+            connector_id UUID PRIMARY KEY,
+            server VARCHAR(255),
+            highest_usn BIGINT,
+            highest_modify_timestamp VARCHAR(32),
+            last_full_sync TIMESTAMP WITHOUT TIME ZONE,
+            last_delta_sync TIMESTAMP WITHOUT TIME ZONE,
+            entry_count INTEGER DEFAULT 0
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS ldap_sync_state")
+    op.execute("DROP TABLE IF EXISTS ldap_directory_entries")
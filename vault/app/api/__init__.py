@@ -7,8 +7,10 @@ from app.api.auth import router as auth_router
 from app.api.collector import router as collector_router
 from app.api.companies import router as companies_router
 from app.api.expert import router as expert_router
+from app.api.health import router as health_router
 from app.api.helper import router as helper_router
 from app.api.knowledge_base import router as kb_router
+from app.api.metrics import router as metrics_router
 from app.api.passwords import router as passwords_router
 from app.api.user import router as users_router
 from app.api.utils import router as utils_router
@@ -28,4 +30,6 @@ __all__ = [
     "helper_router",
     "expert_router",
     "validator_router",
+    "metrics_router",
+    "health_router",
 ]
@@ -16,6 +16,7 @@ from app.email_service import send_welcome_email
 from app.middleware.auth import verify_token_with_tenant
 from app.models import Profile, Role, Session, User, UserRole
 from app.schemas.user import DeleteUserResponse, OrganisationDetails, UpdateUserDetailsRequest
+from app.services.auth_context import AuthContextCache
 from app.services.auth_service import AuthService
 from app.services.tenant_service import TenantService
 
@@ -346,6 +347,8 @@ async def update_user_details(
                     f"Assigned new roles to user ID: {db_user_id} in tenant {company_reg_no} - Roles: {requested_roles}"
                 )
 
+            AuthContextCache.invalidate_user(db_user_id)
+
         response_data = {
             "firstName": first_name,
             "lastName": last_name,
@@ -396,6 +399,8 @@ async def admin_users_delete(user_id: str, db: AsyncSession = Depends(get_async_
                 await db.commit()
                 logger.info(f"Deleted profile {user_id}")
 
+            AuthContextCache.invalidate_user(user_id)
+
             return DeleteUserResponse(message=f"User {user_id} permanently deleted.")
 
         # Soft delete
@@ -421,6 +426,7 @@ async def admin_users_delete(user_id: str, db: AsyncSession = Depends(get_async_
         profile.updated_at = datetime.utcnow()
 
         await db.commit()
+        AuthContextCache.invalidate_user(user_id)
         logger.info(f"Deactivated user {user_id}")
 
         return DeleteUserResponse(message=f"User {user_id} successfully deactivated.")
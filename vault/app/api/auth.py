@@ -16,7 +16,6 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any
 
-import bcrypt
 import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -38,6 +37,10 @@ from app.schemas.auth import (
     UserLogin,
     UserResponse,
 )
+from app.services import password_hasher
+from app.services.auth_context import AuthContextCache
+from app.services.password_hasher import PasswordHasherBusyError
+from app.services.profile_directory import ProfileDirectory
 
 # Shared DB dependency (matches usage elsewhere in your repo)
 try:
@@ -55,23 +58,18 @@ router = APIRouter(tags=["Authentication"])
 
 class AuthService:
     # -------------------------------------------------------------------------
-    # Password utilities (using bcrypt directly to avoid passlib compatibility issues)
+    # Password utilities (blocking; async handlers go through password_hasher)
     # -------------------------------------------------------------------------
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using bcrypt, truncating to 72 bytes as required."""
-        password_bytes = password.encode("utf-8")[:72]
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode("utf-8")
+        return password_hasher.hash_password_sync(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash, truncating to 72 bytes as required."""
         try:
-            password_bytes = plain_password.encode("utf-8")[:72]
-            hashed_bytes = hashed_password.encode("utf-8")
-            return bcrypt.checkpw(password_bytes, hashed_bytes)
+            return password_hasher.verify_password_sync(plain_password, hashed_password)
         except Exception as e:
             logger.warning(f"Password verification error: {e}")
             return False
@@ -144,7 +142,7 @@ class AuthService:
         new_user = User(
             id=user_id,
             email=user_data.email,
-            encryptedpassword=AuthService.hash_password(user_data.password),
+            encryptedpassword=await password_hasher.hash_password(user_data.password),
             emailconfirmedat=now if email_confirmed else None,
             confirmedat=now if email_confirmed else None,
             createdat=now,
@@ -197,6 +195,7 @@ class AuthService:
 
         await db.commit()
         await db.refresh(new_profile)
+        ProfileDirectory.invalidate(new_profile.company_reg_no)
         return new_profile
 
     # -------------------------------------------------------------------------
@@ -228,7 +227,8 @@ class AuthService:
                 logger.warning(f"Authentication failed: No password set - {email}")
                 return None
 
-            if not AuthService.verify_password(password, hashed):
+            matches, upgraded_hash = await password_hasher.verify_and_upgrade(password, hashed)
+            if not matches:
                 logger.warning(f"Authentication failed: Invalid password - {email}")
                 return None
 
@@ -249,9 +249,16 @@ class AuthService:
                 logger.warning(f"Authentication failed: Profile inactive - {email}")
                 return None
 
+            if upgraded_hash:
+                user.encryptedpassword = upgraded_hash
+                await db.commit()
+                logger.info(f"Rehashed password at cost {settings.BCRYPT_ROUNDS}: {email}")
+
             logger.info(f"User authenticated successfully: {email}")
             return user, profile
 
+        except PasswordHasherBusyError:
+            raise
         except Exception:
             logger.exception("Error authenticating user")
             return None
@@ -305,6 +312,7 @@ class AuthService:
 
             db.add(UserRole(user_id=profile_id, role_id=role.id, company_reg_no=company_reg_no))
             await db.commit()
+            AuthContextCache.invalidate_user(profile_id)
             return True
         except Exception:
             await db.rollback()
@@ -370,7 +378,7 @@ class AuthService:
             if not user:
                 return False
 
-            user.encryptedpassword = AuthService.hash_password(new_password)
+            user.encryptedpassword = await password_hasher.hash_password(new_password)
             user.recoverytoken = None
             user.recoverysentat = None
             user.updatedat = datetime.utcnow()
@@ -389,7 +397,7 @@ class AuthService:
             if not user:
                 return False
 
-            user.encryptedpassword = AuthService.hash_password(new_password)
+            user.encryptedpassword = await password_hasher.hash_password(new_password)
             user.updatedat = datetime.utcnow()
             await db.commit()
             return True
@@ -527,6 +535,14 @@ def require_access_level(min_level: int):
     return access_checker
 
 
+def _hasher_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
@@ -546,6 +562,8 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_d
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except PasswordHasherBusyError as e:
+        raise _hasher_busy_exception() from e
     except Exception as e:
         logger.exception("Error registering user")
         raise HTTPException(
@@ -570,17 +588,19 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)
         user.lastsigninat = datetime.utcnow()
         await db.commit()
 
-        access_token = AuthService.create_access_token(
-            data={
-                "sub": str(user.id),
-                "email": user.email,
-                "company_reg_no": getattr(profile, "company_reg_no", None),
-            }
-        )
-        refresh_token = AuthService.create_refresh_token(str(user.id))
-
         current_user = await AuthService.get_user_with_roles(db, str(user.id))
 
+        claims = {
+            "sub": str(user.id),
+            "email": user.email,
+            "company_reg_no": getattr(profile, "company_reg_no", None),
+        }
+        if settings.AUTH_EMBED_ROLE_CLAIMS and current_user:
+            claims["roles"] = current_user.get("roles", [])
+
+        access_token = AuthService.create_access_token(data=claims)
+        refresh_token = AuthService.create_refresh_token(str(user.id))
+
         return LoginResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -591,6 +611,8 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)
 
     except HTTPException:
         raise
+    except PasswordHasherBusyError as e:
+        raise _hasher_busy_exception() from e
     except Exception as e:
         logger.exception("Error during login")
         raise HTTPException(
@@ -618,13 +640,15 @@ async def refresh_token_endpoint(refresh_token: str, db: AsyncSession = Depends(
         if not user_data:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-        new_access = AuthService.create_access_token(
-            data={
-                "sub": user_id,
-                "email": user_data["user"]["email"],
-                "company_reg_no": user_data.get("company_reg_no"),
-            }
-        )
+        claims = {
+            "sub": user_id,
+            "email": user_data["user"]["email"],
+            "company_reg_no": user_data.get("company_reg_no"),
+        }
+        if settings.AUTH_EMBED_ROLE_CLAIMS:
+            claims["roles"] = user_data.get("roles", [])
+
+        new_access = AuthService.create_access_token(data=claims)
         new_refresh = AuthService.create_refresh_token(user_id)
 
         return TokenResponse(
@@ -696,7 +720,10 @@ async def change_password(
     )
 
     # Verify old password
-    result = await AuthService.authenticate_user(db, email, old_password)
+    try:
+        result = await AuthService.authenticate_user(db, email, old_password)
+    except PasswordHasherBusyError as e:
+        raise _hasher_busy_exception() from e
     if not result:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect current password"
@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Any
 import uuid
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status, Form
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -29,6 +29,7 @@ from app.middleware.auth import verify_token_with_tenant
 from app.models import ChatMessageCollector, Document, Profile, Question, Session
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from app.services.auth_context import AuthContextCache
 from app.services.collector_llm import (
     _extract_simple_topic,
     generate_follow_up_question,
@@ -36,7 +37,9 @@ from app.services.collector_llm import (
     generate_summary,
     generate_tags,
 )
+from app.services.document_listing import MAX_PAGE_SIZE, list_documents, validate_cursor
 from app.services.file_extract import extract_text
+from app.services.profile_directory import ProfileDirectory
 
 router = APIRouter(prefix="/api/v1/collector", tags=["collector"])
 logger = logging.getLogger(__name__)
@@ -206,6 +209,8 @@ async def update_profile(
 
         await db.commit()
         await db.refresh(profile)
+        ProfileDirectory.invalidate(profile.company_reg_no)
+        AuthContextCache.invalidate_user(profile.id)
 
         return {"message": "Profile updated successfully", "data": {"id": str(profile.id)}}
 
@@ -733,45 +738,41 @@ async def continue_session(
 
 @router.get("/fetch_documents_status")
 async def fetch_documents_status(
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
-    """Fetch documents for the collector (non-draft documents)."""
+    """Fetch documents for the collector (non-draft documents), newest first."""
     user_id = get_user_id(current_user)
     company_reg_no = get_company_reg_no(current_user)
+    validate_cursor(cursor)
 
     try:
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        user_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        stmt = (
-            select(Document)
-            .where(
-                Document.author_id == user_id,
-                Document.status != "Draft",
-            )
-            .order_by(Document.created_at.desc())
+        documents, next_cursor = await list_documents(
+            db,
+            Document.author_id == user_id,
+            Document.status != "Draft",
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.responsible,
+            company_reg_no=company_reg_no,
         )
 
-        result = await db.execute(stmt)
-        documents = result.scalars().all()
-
         if not documents:
-            return {"documents": []}
+            return {"documents": [], "next_cursor": None}
 
         rows = [
             {
                 "id": str(d.doc_id),
                 "title": d.title or "Untitled",
-                "responsible": user_map.get(str(d.responsible), "N/A") if d.responsible else "N/A",
+                "responsible": d.person_name or "N/A",
                 "status": d.status or "Pending",
             }
             for d in documents
         ]
 
-        return {"documents": rows}
+        return {"documents": rows, "next_cursor": next_cursor}
 
     except HTTPException:
         raise
@@ -916,11 +917,9 @@ async def get_validators(
     company_reg_no = get_company_reg_no(current_user)
 
     try:
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
+        user_map = await ProfileDirectory.get_name_map(db, company_reg_no)
 
-        validators = [{"id": str(p.id), "fullName": p.full_name or "N/A"} for p in profiles]
+        validators = [{"id": uid, "fullName": name or "N/A"} for uid, name in user_map.items()]
 
         return {"validators": validators}
 
@@ -1159,7 +1158,7 @@ async def upload_voice_collector(
 ) -> dict[str, Any]:
     """Upload voice for collector chat."""
     try:
-        from app.services.file_processor import extract_from_audio
+        from app.services.transcription import transcribe_async
         
         audio_dir = Path("./uploads/audio")
         audio_dir.mkdir(parents=True, exist_ok=True)
@@ -1170,7 +1169,8 @@ async def upload_voice_collector(
             shutil.copyfileobj(audio.file, buffer)
         
         try:
-            transcription = extract_from_audio(audio_path)
+            # Transcribe on the shared Whisper pool, off the event loop
+            transcription = await transcribe_async(audio_path)
             
             if not transcription.strip():
                 raise ValueError("No speech detected")
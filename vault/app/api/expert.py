@@ -8,7 +8,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,7 +17,8 @@ from app.dto.expert import AcceptDocumentRequest
 from app.dto.expert import Document as DocumentDTO
 from app.dto.expert import DocumentRow, RejectRequest
 from app.middleware.auth import verify_token_with_tenant
-from app.models import Document, Profile
+from app.models import Document
+from app.services.document_listing import MAX_PAGE_SIZE, list_documents, validate_cursor
 
 router = APIRouter(prefix="/api/v1/expert", tags=["expert"])
 logger = logging.getLogger(__name__)
@@ -25,35 +26,39 @@ logger = logging.getLogger(__name__)
 
 @router.get("/get-documents", response_model=list[DocumentDTO])
 async def expert_get_documents(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> list[DocumentDTO]:
     """
     Get documents assigned to expert for review (status = 'On Review').
+    Pass ``limit`` to paginate; the next page cursor is in the ``X-Next-Cursor`` header.
     """
     user_id = current_user["user_id"]
     company_reg_no = current_user.get("company_reg_no")
+    validate_cursor(cursor)
 
     try:
-        # Get user map for authors
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        user_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        # Get documents assigned to this expert
-        stmt = select(Document).where(
-            Document.status == "On Review",
+        # Get documents assigned to this expert, with author names joined
+        docs, next_cursor = await list_documents(
+            db,
             Document.reviewer == user_id,
+            Document.status == "On Review",
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.author_id,
+            company_reg_no=company_reg_no,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             DocumentDTO(
                 id=str(d.doc_id),
                 title=d.title or "Untitled",
-                author=user_map.get(str(d.author_id), "N/A"),
+                author=d.person_name or "N/A",
                 status=d.status or "On Review",
             )
             for d in docs
@@ -236,37 +241,41 @@ async def expert_reject_document(
 @router.get("/completed-documents/{reviewer_id}")
 async def expert_completed_documents(
     reviewer_id: str,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> list[dict[str, Any]]:
     """
     Get completed documents for an expert reviewer.
     Returns documents with status: Rejected, Validated - Stored, Validated - Awaiting Approval.
+    Pass ``limit`` to paginate; the next page cursor is in the ``X-Next-Cursor`` header.
     """
     company_reg_no = current_user.get("company_reg_no")
+    validate_cursor(cursor)
 
     try:
-        # Get user map
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        profile_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        # Get completed documents
-        stmt = select(Document).where(
+        # Get completed documents, with author names joined
+        docs, next_cursor = await list_documents(
+            db,
+            Document.reviewer == reviewer_id,
             Document.status.in_(
                 ["Rejected", "Validated - Stored", "Validated - Awaiting Approval"]
             ),
-            Document.reviewer == reviewer_id,
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.author_id,
+            company_reg_no=company_reg_no,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             {
                 "id": str(d.doc_id),
                 "title": d.title or "Untitled",
-                "author": profile_map.get(str(d.author_id), "N/A"),
+                "author": d.person_name or "N/A",
                 "status": d.status or "N/A",
             }
             for d in docs
@@ -282,35 +291,39 @@ async def expert_completed_documents(
 
 @router.get("/review-documents", response_model=list[DocumentRow])
 async def validator_expert_review_documents(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> list[DocumentRow]:
     """
     For validators: show documents currently 'On Review' where validator is responsible.
+    Pass ``limit`` to paginate; the next page cursor is in the ``X-Next-Cursor`` header.
     """
     user_id = current_user["user_id"]
     company_reg_no = current_user.get("company_reg_no")
+    validate_cursor(cursor)
 
     try:
-        # Get profile map
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        profile_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        # Get documents
-        stmt = select(Document).where(
-            Document.status == "On Review",
+        # Get documents, with reviewer names joined
+        docs, next_cursor = await list_documents(
+            db,
             Document.responsible == user_id,
+            Document.status == "On Review",
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.reviewer,
+            company_reg_no=company_reg_no,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             DocumentRow(
                 id=str(d.doc_id),
                 title=d.title or "Untitled",
-                reviewer=profile_map.get(str(d.reviewer), "N/A"),
+                reviewer=d.person_name or "N/A",
                 status=d.status or "On Review",
             )
             for d in docs
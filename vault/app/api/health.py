@@ -0,0 +1,72 @@
+"""
+Liveness and readiness endpoints.
+
+``/health`` reports whether the process is up and which optional system
+dependencies (tesseract, whisper, ffmpeg) are installed; the dependency
+checks run in a worker thread and are cached for HEALTH_CACHE_TTL_SECONDS.
+``/ready`` answers 503 until the startup warm-up has finished.
+"""
+
+import asyncio
+import importlib.util
+import subprocess
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.warmup import warmup
+
+router = APIRouter()
+
+_dependency_cache = TTLCache(maxsize=1, ttl=settings.HEALTH_CACHE_TTL_SECONDS, name="health")
+
+
+def _check_dependencies() -> dict:
+    dependencies = {}
+
+    try:
+        import pytesseract
+
+        dependencies["tesseract"] = {
+            "installed": True,
+            "version": str(pytesseract.get_tesseract_version()),
+        }
+    except Exception as e:
+        dependencies["tesseract"] = {"installed": False, "error": str(e)}
+
+    # find_spec instead of importing: whisper would pull in torch on every cold check
+    package = next(
+        (name for name in ("faster_whisper", "whisper") if importlib.util.find_spec(name)), None
+    )
+    dependencies["whisper"] = (
+        {"installed": True, "package": package}
+        if package
+        else {"installed": False, "error": "neither faster-whisper nor whisper is installed"}
+    )
+
+    try:
+        result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, timeout=5)
+        dependencies["ffmpeg"] = {"installed": result.returncode == 0}
+    except Exception as e:
+        dependencies["ffmpeg"] = {"installed": False, "error": str(e)}
+
+    return dependencies
+
+
+@router.get("/health")
+async def health_check():
+    """Health check with dependency verification."""
+    dependencies = _dependency_cache.get("dependencies")
+    if dependencies is None:
+        dependencies = await asyncio.to_thread(_check_dependencies)
+        _dependency_cache.set("dependencies", dependencies)
+    return {"status": "healthy", "dependencies": dependencies}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """200 once the startup warm-up has finished and the database is reachable."""
+    ready, report = await warmup.readiness()
+    return JSONResponse(report, status_code=200 if ready else 503)
@@ -1,6 +1,7 @@
 """
 Helper endpoints - AI-powered knowledge base assistant
 """
+import asyncio
 import logging
 import shutil
 import uuid
@@ -14,7 +15,10 @@ from app.database import get_async_db
 from app.middleware.auth import verify_token_with_tenant
 from app.models import ChatMessage, Profile
 from app.connectors.store_data_in_kb import search_kb
+from app.core.tracing import current_span, span
 from app.integrations.ollama_client import chat
+from app.services.profile_directory import ProfileDirectory
+from app.services.reranker import candidate_count, rerank
 
 router = APIRouter(prefix="/api/v1/helper", tags=["helper"])
 logger = logging.getLogger(__name__)
@@ -98,8 +102,9 @@ async def send_message(
         stmt = select(Profile.user_access, Profile.company_id, Profile.company_reg_no).where(
             Profile.id == user_id
         )
-        result = await db.execute(stmt)
-        profile_data = result.first()
+        with span("helper.profile_lookup"):
+            result = await db.execute(stmt)
+            profile_data = result.first()
 
         user_access_level = profile_data.user_access if profile_data else 1
         company_id = profile_data.company_id if profile_data else None
@@ -107,25 +112,37 @@ async def send_message(
 
         # Get existing chat
         stmt = select(ChatMessage).where(ChatMessage.id == chat_id)
-        result = await db.execute(stmt)
-        chat = result.scalar_one_or_none()
+        with span("helper.chat_lookup"):
+            result = await db.execute(stmt)
+            chat_session = result.scalar_one_or_none()
 
-        if not chat:
+        if not chat_session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Chat not found",
             )
 
-        # Search knowledge base for relevant documents
+        # Over-fetch candidates from the vector index, then keep the best few after re-ranking
         logger.info(f"Searching KB for: {message_text}")
-        retrieved_docs = search_kb(
+        # Resolving the reranker may load its model, so keep it off the event loop
+        limit = await asyncio.to_thread(candidate_count)
+        candidates = await asyncio.to_thread(
+            search_kb,
             query=message_text,
-            limit=3,
+            limit=limit,
             access_level=user_access_level,
             company_id=company_id,
             company_reg_no=company_reg_no,
             similarity_threshold=0.3,
         )
+        retrieved_docs = await asyncio.to_thread(rerank, message_text, candidates)
+        current_span().set_attributes(
+            {
+                "kb.candidates": len(candidates),
+                "kb.chunks": len(retrieved_docs),
+                "kb.access_level": user_access_level,
+            }
+        )
 
         # Generate AI response using RAG
         if not retrieved_docs:
@@ -192,6 +209,7 @@ async def send_message(
                 {
                     "title": doc["title"],
                     "score": doc["score"],
+                    "rerank_score": doc.get("rerank_score"),
                     "id": doc["id"],
                 }
                 for doc in retrieved_docs
@@ -200,9 +218,9 @@ async def send_message(
         # Update message history (parse existing or start new)
         import json
         current_messages = []
-        if chat.message:
+        if chat_session.message:
             try:
-                current_messages = json.loads(chat.message) if isinstance(chat.message, str) else []
+                current_messages = json.loads(chat_session.message) if isinstance(chat_session.message, str) else []
             except:
                 current_messages = []
 
@@ -218,8 +236,9 @@ async def send_message(
             ]
         )
 
-        chat.message = json.dumps(current_messages)
-        await db.commit()
+        chat_session.message = json.dumps(current_messages)
+        with span("helper.commit"):
+            await db.commit()
 
         logger.info(f"Generated response for chat {chat_id} with {len(sources)} sources")
 
@@ -337,24 +356,22 @@ async def get_user_maps(
         if not company_reg_no:
             # If no company, return current user only
             user_id = get_user_id(current_user)
-            stmt = select(Profile.id, Profile.fullname).where(Profile.id == user_id)
+            stmt = select(Profile.id, Profile.full_name).where(Profile.id == user_id)
             result = await db.execute(stmt)
             profiles = result.all()
+            user_maps = [
+                {
+                    "id": str(p.id),
+                    "fullname": p.full_name or "Unknown User",
+                }
+                for p in profiles
+            ]
         else:
-            # Get all users in the company
-            stmt = select(Profile.id, Profile.fullname).where(
-                Profile.company_reg_no == company_reg_no
-            )
-            result = await db.execute(stmt)
-            profiles = result.all()
-        
-        user_maps = [
-            {
-                "id": str(p.id),
-                "fullname": p.fullname or "Unknown User",
-            }
-            for p in profiles
-        ]
+            # Get all users in the company (cached per tenant)
+            user_map = await ProfileDirectory.get_name_map(db, company_reg_no)
+            user_maps = [
+                {"id": uid, "fullname": name or "Unknown User"} for uid, name in user_map.items()
+            ]
         
         return {"usermaps": user_maps}
         
@@ -382,55 +399,10 @@ async def upload_voice(
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
-    """Upload voice message and transcribe it."""
+    """Upload voice message and transcribe it (see /ws/transcribe for live input)."""
     try:
-        from app.services.file_processor import extract_from_audio
-        
-        user_id = get_user_id(current_user)
-        
-        # Save audio temporarily
-        audio_path = Path(f"./uploads/audio/{uuid.uuid4()}{Path(audio.filename).suffix}")
-        audio_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(audio_path, "wb") as buffer:
-            shutil.copyfileobj(audio.file, buffer)
-        
-        try:
-            # Transcribe audio
-            transcription = extract_from_audio(audio_path)
-            
-            if not transcription.strip():
-                raise ValueError("No speech detected in audio")
-            
-            return {
-                "status": "success",
-                "transcription": transcription,
-                "chat_id": chat_id,
-            }
-            
-        finally:
-            if audio_path.exists():
-                audio_path.unlink()
-                
-    except Exception as e:
-        logger.error(f"Error processing voice: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing voice: {str(e)}",
-        )
-
+        from app.services.transcription import transcribe_async
 
-@router.post("/upload_voice")
-async def upload_voice(
-    audio: UploadFile = File(...),
-    chat_id: str = Form(...),
-    current_user: dict = Depends(verify_token_with_tenant),
-    db: AsyncSession = Depends(get_async_db),
-) -> dict[str, Any]:
-    """Upload voice message and transcribe it."""
-    try:
-        from app.services.file_processor import extract_from_audio
-        
         # Save audio temporarily
         audio_dir = Path("./uploads/audio")
         audio_dir.mkdir(parents=True, exist_ok=True)
@@ -441,8 +413,8 @@ async def upload_voice(
             shutil.copyfileobj(audio.file, buffer)
         
         try:
-            # Transcribe audio
-            transcription = extract_from_audio(audio_path)
+            # Transcribe on the shared Whisper pool, off the event loop
+            transcription = await transcribe_async(audio_path)
             
             if not transcription.strip():
                 raise ValueError("No speech detected in audio")
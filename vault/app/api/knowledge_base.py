@@ -1,10 +1,13 @@
 """
 Knowledge Base API - File upload and management
 """
+import asyncio
+import functools
 import logging
 import os
 import shutil
 import uuid
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -21,6 +24,7 @@ from app.connectors.store_data_in_kb import (
     store_in_kb,
     store_bulk_in_kb,
     delete_from_kb,
+    delete_sources_from_kb,
     list_documents,
     get_document_count,
     search_kb,
@@ -69,7 +73,7 @@ async def upload_document(
         user_id = get_user_id(current_user)
         
         # Get user's company info
-        stmt = select(Profile.company_id, Profile.company_reg_no, Profile.fullname).where(
+        stmt = select(Profile.company_id, Profile.company_reg_no, Profile.full_name).where(
             Profile.id == user_id
         )
         result = await db.execute(stmt)
@@ -77,7 +81,7 @@ async def upload_document(
         
         company_id = profile_data.company_id if profile_data else None
         company_reg_no = profile_data.company_reg_no if profile_data else None
-        author = profile_data.fullname if profile_data else "Unknown"
+        author = profile_data.full_name if profile_data else "Unknown"
         
         # Validate file
         if not file.filename:
@@ -96,9 +100,9 @@ async def upload_document(
         
         logger.info(f"Processing file: {file.filename} ({file_ext})")
         
-        # Extract text from file
+        # Extract text from file (OCR and transcription can take minutes; keep the loop free)
         try:
-            extracted_text = process_file(temp_path, file_ext)
+            extracted_text = await asyncio.to_thread(process_file, temp_path, file_ext)
             
             if not extracted_text or not extracted_text.strip():
                 raise ValueError("No text could be extracted from the file")
@@ -320,16 +324,25 @@ async def scrape_website_endpoint(
     access_level: int = Form(1),
     department: str | None = Form(None),
     tags: str | None = Form(None),
+    max_pages: int = Form(1),
+    max_depth: int = Form(0),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
-    """Scrape a website and add to knowledge base."""
+    """
+    Scrape a website and add to knowledge base.
+
+    Only ``url`` itself is fetched by default; raise ``max_pages`` and
+    ``max_depth`` to crawl the site behind it (e.g. an internal wiki).
+    Re-scraping only re-embeds pages that changed.
+    """
     try:
-        from app.services.file_processor import scrape_website
+        from app.connectors.kb_writer import KBBatchWriter
+        from app.connectors.web_crawler import WebCrawler
         
         user_id = get_user_id(current_user)
         
-        stmt = select(Profile.company_id, Profile.company_reg_no, Profile.fullname).where(
+        stmt = select(Profile.company_id, Profile.company_reg_no, Profile.full_name).where(
             Profile.id == user_id
         )
         result = await db.execute(stmt)
@@ -337,41 +350,54 @@ async def scrape_website_endpoint(
         
         company_id = profile_data.company_id if profile_data else None
         company_reg_no = profile_data.company_reg_no if profile_data else None
-        author = profile_data.fullname if profile_data else "Unknown"
+        author = profile_data.full_name if profile_data else "Unknown"
         
-        logger.info(f"Scraping website: {url}")
+        logger.info(f"Scraping website: {url} (max_pages={max_pages}, max_depth={max_depth})")
         
-        scraped_text = scrape_website(url)
+        doc_ids = []
         
-        if not scraped_text.strip():
-            raise ValueError("No text extracted from website")
+        def store_batch(docs: list[dict]) -> dict:
+            batch_result = store_bulk_in_kb(docs)
+            doc_ids.extend(batch_result.get("doc_ids", []))
+            return batch_result
         
-        chunks = chunk_text(scraped_text, chunk_size=1000, overlap=100)
-        
-        docs_to_store = [
-            {
-                "content": chunk,
-                "file_name": url,
-                "file_title": f"{title or url} (Part {i+1}/{len(chunks)})",
-                "level": access_level,
-                "company_id": company_id,
-                "company_reg_no": company_reg_no,
-                "department": department,
-                "tags": tags,
-                "author": author,
-                "doc_type": "website",
-            }
-            for i, chunk in enumerate(chunks)
-        ]
+        # Another tenant may have scraped the same pages; only replace our own chunks
+        writer = KBBatchWriter(
+            store_batch=store_batch,
+            delete_sources=functools.partial(delete_sources_from_kb, company_id=company_id),
+        )
+        state_path = (
+            Path(settings.WEB_CRAWL_STATE_DIR) / f"company-{company_id}.json"
+            if company_id is not None
+            else None
+        )
+        async with WebCrawler(state_path=state_path, writer=writer) as crawler:
+            stats = await crawler.crawl(
+                [url],
+                max_pages=max_pages,
+                max_depth=max_depth,
+                metadata={
+                    "level": access_level,
+                    "company_id": company_id,
+                    "company_reg_no": company_reg_no,
+                    "department": department,
+                    "tags": tags,
+                    "author": author,
+                },
+                titles={url: title} if title else None,
+            )
         
-        result = store_bulk_in_kb(docs_to_store)
+        if not stats.ingested and not stats.unchanged:
+            raise ValueError("No text extracted from website")
         
         return {
             "status": "success",
             "message": "Website scraped and indexed",
             "url": url,
-            "chunks": len(chunks),
-            "doc_ids": result.get("doc_ids", []),
+            "pages": stats.ingested,
+            "chunks": writer.chunks,
+            "doc_ids": doc_ids,
+            "stats": asdict(stats),
         }
         
     except Exception as e:
@@ -18,6 +18,7 @@ from app.schemas.auth import (
     PasswordResetRequest,
     PasswordResetResponse,
 )
+from app.services import password_hasher
 from app.services.auth_service import AuthService
 
 router = APIRouter()
@@ -72,11 +73,13 @@ async def change_password(request: PasswordChange, db: AsyncSession = Depends(ge
             raise HTTPException(status_code=404, detail="User not found")
 
         # Verify current password
-        if not AuthService.verify_password(request.current_password, user.encrypted_password):
+        if not await password_hasher.verify_password(
+            request.current_password, user.encrypted_password
+        ):
             raise HTTPException(status_code=401, detail="Current password is incorrect")
 
         # Update password
-        user.encrypted_password = AuthService.hash_password(request.new_password)
+        user.encrypted_password = await password_hasher.hash_password(request.new_password)
 
         # Update session
         stmt = select(Session).where(Session.user_id == request.user_id)
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import knowledge_base
+from app.database import get_async_db
+from app.middleware.auth import verify_token_with_tenant
+
+PROFILE = SimpleNamespace(company_id=3, company_reg_no="R-3", full_name="Ada Lovelace")
+
+
+class _ProfileSession:
+    """Async session stand-in answering the endpoint's profile lookup."""
+
+    async def execute(self, stmt):
+        return SimpleNamespace(first=lambda: PROFILE)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(knowledge_base, "UPLOAD_DIR", tmp_path)
+    app = FastAPI()
+    app.include_router(knowledge_base.router)
+    app.dependency_overrides[verify_token_with_tenant] = lambda: {"user_id": "u-1"}
+    app.dependency_overrides[get_async_db] = _ProfileSession
+    return TestClient(app)
+
+
+def test_upload_extracts_and_stores_with_profile_metadata(client, monkeypatch, tmp_path):
+    stored = []
+
+    def store_in_kb(doc):
+        stored.append(doc)
+        return {"doc_id": "doc-1"}
+
+    monkeypatch.setattr(knowledge_base, "store_in_kb", store_in_kb)
+
+    response = client.post(
+        "/api/v1/kb/upload",
+        files={"file": ("notes.txt", b"Expense claims are due by the 5th.", "text/plain")},
+        data={"title": "Notes", "access_level": "2"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["doc_ids"] == ["doc-1"]
+    [doc] = stored
+    assert doc["content"] == "Expense claims are due by the 5th."
+    assert (doc["company_id"], doc["company_reg_no"], doc["author"]) == (3, "R-3", "Ada Lovelace")
+    assert (doc["level"], doc["doc_type"]) == (2, "txt")
+    # The temporary copy is removed
+    assert not list(tmp_path.iterdir())
+
+
+def test_scrape_crawls_into_tenant_scoped_writer(client, monkeypatch, tmp_path):
+    from app.connectors import web_crawler
+
+    stored, deleted, crawls = [], [], []
+
+    class FakeCrawler:
+        def __init__(self, state_path=None, writer=None):
+            self.state_path = state_path
+            self.writer = writer
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            await self.writer.flush()
+
+        async def crawl(self, urls, **kwargs):
+            crawls.append((self.state_path, urls, kwargs))
+            page = {"content": "Wiki page", "file_name": urls[0], **kwargs["metadata"]}
+            await self.writer.add([page], replaces=urls[0])
+            return web_crawler.WebCrawlStats(fetched=1, ingested=1)
+
+    def store_bulk_in_kb(docs):
+        stored.extend(docs)
+        return {"status": "success", "doc_ids": [f"doc-{i}" for i in range(len(docs))]}
+
+    def delete_sources_from_kb(sources, company_id=None):
+        deleted.append((sources, company_id))
+        return {"status": "success"}
+
+    monkeypatch.setattr(web_crawler, "WebCrawler", FakeCrawler)
+    monkeypatch.setattr(knowledge_base, "store_bulk_in_kb", store_bulk_in_kb)
+    monkeypatch.setattr(knowledge_base, "delete_sources_from_kb", delete_sources_from_kb)
+    monkeypatch.setattr(knowledge_base.settings, "WEB_CRAWL_STATE_DIR", str(tmp_path))
+
+    response = client.post(
+        "/api/v1/kb/scrape",
+        data={"url": "https://wiki.example.com/", "max_pages": "20", "max_depth": "2"},
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["pages"], body["chunks"], body["doc_ids"]) == (1, 1, ["doc-0"])
+    [(state_path, urls, kwargs)] = crawls
+    assert state_path == tmp_path / "company-3.json"
+    assert (urls, kwargs["max_pages"], kwargs["max_depth"]) == (
+        ["https://wiki.example.com/"],
+        20,
+        2,
+    )
+    assert (stored[0]["company_id"], stored[0]["author"]) == (3, "Ada Lovelace")
+    # Re-scraped pages replace only this tenant's chunks
+    assert deleted == [(["https://wiki.example.com/"], 3)]
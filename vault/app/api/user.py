@@ -26,6 +26,7 @@ from app.schemas.user import (
     UserProfileRequest,
     UserProfileResponse,
 )
+from app.services.auth_context import AuthContextCache
 from app.services.tenant_service import TenantService
 
 router = APIRouter()
@@ -311,6 +312,7 @@ async def delete_user(
             profile_obj.status = "inactive"
             profile_obj.updated_at = datetime.utcnow()
             await db.commit()
+            AuthContextCache.invalidate_user(user_id)
 
         logger.info(f"Deleted user {user_id} for company {company_reg_no}")
 
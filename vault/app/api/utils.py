@@ -2,13 +2,19 @@
 Utility endpoints.
 """
 
+import asyncio
 import logging
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
 
 import app.email_service as email_service
+from app.config import settings
+from app.core import diagnostics
+from app.middleware.auth import require_roles
 from app.schemas.auth import EmailTestRequest
+from app.services import password_hasher
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -20,6 +26,73 @@ def download_logs():
     return FileResponse("backend_logs.log", media_type="text/plain", filename="backend_logs.log")
 
 
+_admin_only = [Depends(require_roles(["Administrator"]))]
+
+
+@router.get("/slow-requests", dependencies=_admin_only)
+def list_slow_requests():
+    """Recent requests over SLOW_REQUEST_THRESHOLD_MS, newest first (summaries)."""
+    return {
+        "threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+        "requests": [
+            {
+                key: entry[key]
+                for key in ("id", "method", "path", "route", "status", "duration_ms", "started_at")
+            }
+            | {
+                "sql_count": len(entry["sql"]),
+                "sql_total_ms": entry["sql_total_ms"],
+                "http_count": len(entry["http"]),
+                "http_total_ms": entry["http_total_ms"],
+                "stack_samples": entry["stack_samples"],
+            }
+            for entry in diagnostics.slow_requests.entries()
+        ],
+    }
+
+
+@router.get("/slow-requests/{entry_id}", dependencies=_admin_only)
+def get_slow_request(entry_id: int):
+    """One captured slow request with its SQL, outbound HTTP calls and stack samples."""
+    entry = diagnostics.slow_requests.get(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slow request not found")
+    return entry
+
+
+@router.delete("/slow-requests", dependencies=_admin_only)
+def clear_slow_requests():
+    """Empty the slow-request buffer."""
+    diagnostics.slow_requests.clear()
+    return {"status": "success", "message": "Slow-request buffer cleared"}
+
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=_admin_only)
+async def profile(
+    seconds: float = Query(30, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILE_SAMPLE_INTERVAL_MS, ge=1, le=1000),
+):
+    """
+    Sample all threads for ``seconds`` and download the collapsed stacks
+    (input for flamegraph.pl, speedscope or inferno).
+    """
+    try:
+        collapsed, samples = await asyncio.to_thread(diagnostics.profile, seconds, interval_ms)
+    except diagnostics.ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    logger.info(f"Profiled {seconds}s ({samples} samples)")
+    filename = f"profile-{datetime.now(UTC):%Y%m%dT%H%M%SZ}.collapsed"
+    return PlainTextResponse(
+        collapsed, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/password-hasher-stats", dependencies=_admin_only)
+def password_hasher_stats():
+    """Queue depth and timings of the bcrypt worker pool."""
+    return password_hasher.get_stats()
+
+
 @router.post("/test-email")
 async def test_email(request: EmailTestRequest):
     """Test email sending functionality."""
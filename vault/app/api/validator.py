@@ -6,11 +6,11 @@ Handles document validation workflow.
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
@@ -22,33 +22,28 @@ from app.dto.validator import (
 )
 from app.middleware.auth import verify_token_with_tenant
 from app.models import Document, Profile
+from app.services.document_listing import MAX_PAGE_SIZE, list_documents, validate_cursor
+from app.services.profile_directory import ProfileDirectory
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/validator", tags=["validator"])
 
 
-def parse_dt(s: str | None) -> datetime | None:
-    """Parse ISO datetime string."""
-    if not s:
-        return None
-    try:
-        s2 = s.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(s2)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=UTC)
-        return dt
-    except Exception:
-        return None
+ASSIGNED_STATUSES = ["Pending", "On Review", "Validated - Awaiting Approval"]
+COMPLETED_STATUSES = ["Rejected", "Validated - Stored"]
 
 
 @router.get("/get-documents")
 async def get_documents(
     userid: str = Query(...),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
     """
     Get documents awaiting validator action (status: Pending, Validated - Awaiting Approval).
+    Pass ``limit`` to paginate; follow ``next_cursor`` for the next page.
     """
     token_uid = current_user["user_id"]
     company_reg_no = current_user.get("company_reg_no")
@@ -58,33 +53,31 @@ async def get_documents(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="userid does not match token user",
         )
+    validate_cursor(cursor)
 
     try:
-        # Get user map
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        user_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        # Get documents
-        stmt = select(Document).where(
+        # Get documents, with author names joined for just this page
+        docs, next_cursor = await list_documents(
+            db,
             Document.responsible == token_uid,
             Document.status.in_(["Pending", "Validated - Awaiting Approval"]),
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.author_id,
+            company_reg_no=company_reg_no,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
 
         rows = [
             {
                 "id": str(d.doc_id),
                 "title": d.title or "Untitled",
-                "author": user_map.get(str(d.author_id), "N/A"),
+                "author": d.person_name or "N/A",
                 "status": d.status or "N/A",
             }
             for d in docs
         ]
 
-        return {"documents": rows}
+        return {"documents": rows, "next_cursor": next_cursor}
 
     except Exception as e:
         logger.error(f"Error fetching validator documents: {e}")
@@ -96,35 +89,39 @@ async def get_documents(
 
 @router.get("/completed-documents")
 async def completed_documents(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     current_user: dict = Depends(verify_token_with_tenant),
     db: AsyncSession = Depends(get_async_db),
 ) -> list[dict[str, Any]]:
     """
     Get completed documents for validator (status: Rejected, Validated - Stored).
+    Pass ``limit`` to paginate; the next page cursor is in the ``X-Next-Cursor`` header.
     """
     token_uid = current_user["user_id"]
     company_reg_no = current_user.get("company_reg_no")
+    validate_cursor(cursor)
 
     try:
-        # Get user map
-        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
-        result = await db.execute(stmt)
-        profiles = result.all()
-        user_map = {str(p.id): p.full_name or "N/A" for p in profiles}
-
-        # Get documents
-        stmt = select(Document).where(
+        # Get documents, with author names joined for just this page
+        docs, next_cursor = await list_documents(
+            db,
             Document.responsible == token_uid,
-            Document.status.in_(["Rejected", "Validated - Stored"]),
+            Document.status.in_(COMPLETED_STATUSES),
+            limit=limit,
+            cursor=cursor,
+            person_column=Document.author_id,
+            company_reg_no=company_reg_no,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             {
                 "id": str(d.doc_id),
                 "title": d.title or "Untitled",
-                "author": user_map.get(str(d.author_id), "N/A"),
+                "author": d.person_name or "N/A",
                 "status": d.status or "N/A",
             }
             for d in docs
@@ -381,42 +378,116 @@ async def get_stats(
 ) -> dict[str, Any]:
     """
     Get validator statistics: total assigned, completed, average review time.
+    Aggregated in a single SQL query; no document rows are loaded.
     """
     token_uid = current_user["user_id"]
 
     try:
-        # Get all documents for this validator
-        stmt = select(Document).where(Document.responsible == token_uid)
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
+        review_seconds = func.extract("epoch", Document.updated_at - Document.created_at)
+        stmt = select(
+            func.count().filter(Document.status.in_(ASSIGNED_STATUSES)).label("total_assigned"),
+            func.count().filter(Document.status.in_(COMPLETED_STATUSES)).label("total_completed"),
+            func.avg(review_seconds)
+            .filter(Document.updated_at > Document.created_at)
+            .label("avg_review_seconds"),
+        ).where(Document.responsible == token_uid)
+        row = (await db.execute(stmt)).one()
+
+        avg_hours = float(row.avg_review_seconds or 0.0) / 3600.0
 
-        total_assigned = 0
-        total_completed = 0
-        durations_hours = []
+        return {
+            "total_assigned": row.total_assigned,
+            "total_completed": row.total_completed,
+            "average_review_time": round(avg_hours, 2),
+        }
 
-        for d in docs:
-            st = d.status or ""
-            if st in ["Pending", "On Review", "Validated - Awaiting Approval"]:
-                total_assigned += 1
-            if st in ["Rejected", "Validated - Stored"]:
-                total_completed += 1
+    except Exception as e:
+        logger.error(f"Error fetching stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
 
-            c = parse_dt(d.created_at.isoformat() if d.created_at else None)
-            u = parse_dt(d.updated_at.isoformat() if d.updated_at else None)
 
-            if c and u and u > c:
-                durations_hours.append((u - c).total_seconds() / 3600.0)
+@router.get("/get_tenant_stats")
+async def get_tenant_stats(
+    window_days: int = Query(30, ge=1, le=365),
+    current_user: dict = Depends(verify_token_with_tenant),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict[str, Any]:
+    """
+    Tenant-wide validation dashboard:
+    - throughput per validator over the last ``window_days``
+    - age percentiles (hours) of the open backlog
+    """
+    company_reg_no = current_user.get("company_reg_no")
 
-        avg = sum(durations_hours) / len(durations_hours) if durations_hours else 0.0
+    try:
+        since = datetime.now(UTC) - timedelta(days=window_days)
+        completed_in_window = and_(
+            Document.status.in_(COMPLETED_STATUSES), Document.updated_at >= since
+        )
+        review_seconds = func.extract("epoch", Document.updated_at - Document.created_at)
+
+        # Validators are scoped to the tenant through their profile
+        tenant_validator = and_(
+            Profile.id == Document.responsible, Profile.company_reg_no == company_reg_no
+        )
+
+        stmt = (
+            select(
+                Document.responsible,
+                Profile.full_name,
+                func.count().filter(completed_in_window).label("completed"),
+                func.count().filter(Document.status.in_(ASSIGNED_STATUSES)).label("open"),
+                func.avg(review_seconds).filter(completed_in_window).label("avg_review_seconds"),
+            )
+            .select_from(Document)
+            .join(Profile, tenant_validator)
+            .group_by(Document.responsible, Profile.full_name)
+            .order_by(func.count().filter(completed_in_window).desc())
+        )
+        validators = [
+            {
+                "id": str(r.responsible),
+                "fullName": r.full_name or "N/A",
+                "completed": r.completed,
+                "per_day": round(r.completed / window_days, 2),
+                "open": r.open,
+                "average_review_time": round(float(r.avg_review_seconds or 0.0) / 3600.0, 2),
+            }
+            for r in (await db.execute(stmt)).all()
+        ]
+
+        age_hours = func.extract("epoch", func.now() - Document.created_at) / 3600.0
+        stmt = (
+            select(
+                func.count().label("open"),
+                func.percentile_cont(0.5).within_group(age_hours).label("p50"),
+                func.percentile_cont(0.9).within_group(age_hours).label("p90"),
+                func.percentile_cont(0.99).within_group(age_hours).label("p99"),
+                func.max(age_hours).label("max"),
+            )
+            .select_from(Document)
+            .join(Profile, tenant_validator)
+            .where(Document.status.in_(ASSIGNED_STATUSES))
+        )
+        backlog = (await db.execute(stmt)).one()
 
         return {
-            "total_assigned": total_assigned,
-            "total_completed": total_completed,
-            "average_review_time": round(avg, 2),
+            "window_days": window_days,
+            "validators": validators,
+            "backlog": {
+                "open": backlog.open,
+                "age_hours": {
+                    key: round(float(getattr(backlog, key) or 0.0), 2)
+                    for key in ("p50", "p90", "p99", "max")
+                },
+            },
         }
 
     except Exception as e:
-        logger.error(f"Error fetching stats: {e}")
+        logger.error(f"Error fetching tenant stats: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -461,16 +532,12 @@ async def fetch_delegators(
             ]
         except Exception:
             # Fallback: all profiles except self
-            stmt = select(Profile.id, Profile.full_name).where(
-                Profile.company_reg_no == company_reg_no
-            )
-            result = await db.execute(stmt)
-            rows = result.all()
+            user_map = await ProfileDirectory.get_name_map(db, company_reg_no)
 
             delegators = [
-                {"id": str(r.id), "fullName": r.full_name or "N/A"}
-                for r in rows
-                if r.id and str(r.id) != token_uid
+                {"id": uid, "fullName": name or "N/A"}
+                for uid, name in user_map.items()
+                if uid != token_uid
             ]
 
         return {"delegators": delegators}
@@ -491,24 +558,34 @@ async def fetch_assigned_documents(
 ) -> dict[str, Any]:
     """
     Fetch documents assigned to validator (summary view).
+    Optional body keys ``limit`` and ``cursor`` paginate the result.
     """
     token_uid = current_user["user_id"]
     validator_id = data.get("validator_id")
+    limit = data.get("limit")
+    cursor = data.get("cursor")
 
     if not validator_id or validator_id != token_uid:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="validator_id does not match token user",
         )
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be a positive integer",
+        )
+    validate_cursor(cursor)
 
     try:
         # Get assigned documents
-        stmt = select(Document).where(
+        docs, next_cursor = await list_documents(
+            db,
             Document.responsible == token_uid,
-            Document.status.in_(["Pending", "On Review", "Validated - Awaiting Approval"]),
+            Document.status.in_(ASSIGNED_STATUSES),
+            limit=limit,
+            cursor=cursor,
         )
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
 
         return {
             "documents": [
@@ -518,7 +595,8 @@ async def fetch_assigned_documents(
                     "status": d.status or "N/A",
                 }
                 for d in docs
-            ]
+            ],
+            "next_cursor": next_cursor,
         }
 
     except Exception as e:
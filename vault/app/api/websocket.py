@@ -2,11 +2,17 @@
 WebSocket endpoints for real-time communication.
 """
 
+import asyncio
+import json
 import logging
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.security import HTTPAuthorizationCredentials
 
+from app.config import settings
 from app.connection_manager import connection_manager
+from app.database import async_session_maker
+from app.middleware.auth import verify_token_with_tenant
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -15,6 +21,111 @@ logger = logging.getLogger(__name__)
 manager = connection_manager()
 
 
+async def _authenticate(token: str) -> dict:
+    """Browsers cannot set headers on WebSockets, so the access token comes as a query param."""
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    async with async_session_maker() as db:
+        return await verify_token_with_tenant(credentials, db)
+
+
+# Registered before /ws/{client_id}, which would otherwise match it
+@router.websocket("/ws/transcribe")
+async def transcribe_stream(websocket: WebSocket, token: str = "", language: str | None = None):
+    """
+    Live voice input. The client sends 16 kHz mono 16-bit little-endian PCM
+    as binary frames and {"type": "end"} when done. Each utterance is
+    transcribed as soon as the speaker pauses and sent back as
+    {"type": "partial", "index", "text", "start", "end"}, followed by
+    {"type": "final", "text"} for the whole recording.
+    """
+    try:
+        await _authenticate(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    # numpy and the VAD load on first use, not at startup
+    from app.services.transcription import (
+        SAMPLE_RATE,
+        UtteranceChunker,
+        pcm16_to_float32,
+        transcribe_async,
+    )
+
+    chunker = UtteranceChunker()
+    utterances: asyncio.Queue = asyncio.Queue()
+    texts: list[str] = []
+
+    async def transcriber() -> None:
+        # Utterances are transcribed in order while more audio keeps arriving
+        while (utterance := await utterances.get()) is not None:
+            start, end, samples = utterance
+            text = await transcribe_async(samples, language)
+            if not text:
+                continue
+            texts.append(text)
+            await websocket.send_json(
+                {
+                    "type": "partial",
+                    "index": len(texts) - 1,
+                    "text": text,
+                    "start": round(start, 2),
+                    "end": round(end, 2),
+                }
+            )
+
+    task = asyncio.create_task(transcriber())
+    max_bytes = 2 * SAMPLE_RATE * settings.TRANSCRIBE_STREAM_MAX_SECONDS
+    received = 0
+    # A frame may end mid-sample; the odd byte is prepended to the next one
+    carry = b""
+    try:
+        while not task.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                received += len(message["bytes"])
+                if received > max_bytes:
+                    await websocket.send_json(
+                        {
+                            "type": "error",
+                            "detail": f"Stream exceeds {settings.TRANSCRIBE_STREAM_MAX_SECONDS}s",
+                        }
+                    )
+                    break
+                data = carry + message["bytes"]
+                usable = len(data) - len(data) % 2
+                carry = data[usable:]
+                samples = pcm16_to_float32(data[:usable])
+                for utterance in await asyncio.to_thread(chunker.feed, samples):
+                    utterances.put_nowait(utterance)
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if isinstance(control, dict) and control.get("type") == "end":
+                    break
+
+        if not task.done():
+            for utterance in await asyncio.to_thread(chunker.flush):
+                utterances.put_nowait(utterance)
+            utterances.put_nowait(None)
+        await task
+        await websocket.send_json({"type": "final", "text": " ".join(texts)})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug("Transcription stream closed by the client")
+    except Exception as e:
+        logger.error(f"Error in transcription stream: {e}")
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    finally:
+        task.cancel()
+
+
 @router.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     """WebSocket endpoint for real-time communication."""
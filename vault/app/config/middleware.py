@@ -5,6 +5,10 @@ Middleware configuration for the application.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import settings
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.slow_requests import SlowRequestMiddleware
+
 
 def setup_middleware(app: FastAPI):
     """Configure CORS and other middleware."""
@@ -23,6 +27,14 @@ def setup_middleware(app: FastAPI):
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"],
-        expose_headers=["Content-Type", "Authorization"],
+        expose_headers=["Content-Type", "Authorization", "Server-Timing"],
         max_age=3600,
     )
+
+    # Inside ServerTimingMiddleware, whose stage timings it stores with slow requests
+    if settings.SLOW_REQUEST_CAPTURE_ENABLED:
+        app.add_middleware(SlowRequestMiddleware)
+
+    # Added last so it is outermost and times the whole request
+    if settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
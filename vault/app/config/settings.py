@@ -17,6 +17,73 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Embed roles in access tokens so an auth cache miss can skip the roles lookup.
+    # Role changes then only take effect once the token is refreshed.
+    AUTH_EMBED_ROLE_CLAIMS: bool = False
+
+    # Password hashing (bcrypt runs on a dedicated thread pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # LDAP connection pools (per connector, bound as the service account)
+    LDAP_POOL_MAX_CONNECTIONS: int = 8
+    LDAP_POOL_WORKERS: int = 16
+    LDAP_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+    # Idle connections older than this are pinged (whoami) before reuse
+    LDAP_POOL_HEALTH_CHECK_SECONDS: int = 60
+    # Recycle connections before AD's idle timeout (MaxConnIdleTime, 900s by default)
+    LDAP_POOL_MAX_LIFETIME_SECONDS: int = 600
+
+    # LDAP connector configs and decrypted vault secrets (invalidated on update)
+    LDAP_CONNECTOR_CACHE_TTL_SECONDS: int = 300
+    LDAP_SECRET_CACHE_TTL_SECONDS: int = 300
+    LDAP_CONFIG_CACHE_MAX_ENTRIES: int = 1024
+
+    # LDAP directory sync
+    LDAP_SYNC_PAGE_SIZE: int = 1000
+    # Pages buffered between the LDAP reader and the database writer
+    LDAP_SYNC_QUEUE_PAGES: int = 2
+    # Delta syncs cannot see deletions, so force a full sync at least this often
+    LDAP_SYNC_FULL_RESYNC_HOURS: int = 24
+
+    # LDAP directory picker (answered from the synced index when available)
+    LDAP_DIRECTORY_SEARCH_LIMIT: int = 100
+    LDAP_SEARCH_CACHE_TTL_SECONDS: int = 60
+    LDAP_SEARCH_CACHE_MAX_ENTRIES: int = 5000
+
+    # Connector ingestion (chunks embedded and stored per store_bulk_in_kb call)
+    KB_INGEST_BATCH_SIZE: int = 64
+    KB_INGEST_CHUNK_SIZE: int = 1000
+    KB_INGEST_CHUNK_OVERLAP: int = 100
+
+    # SharePoint crawler (Microsoft Graph)
+    SHAREPOINT_CRAWL_CONCURRENCY: int = 8
+    SHAREPOINT_MAX_RETRIES: int = 5
+    SHAREPOINT_HTTP_TIMEOUT_SECONDS: float = 60.0
+    SHAREPOINT_MAX_FILE_MB: int = 100
+
+    # Confluence crawler (REST API, CQL search)
+    CONFLUENCE_SPACE_CONCURRENCY: int = 4
+    CONFLUENCE_REQUEST_CONCURRENCY: int = 8
+    # Listing pages only carry metadata, so they can be much larger than body batches
+    CONFLUENCE_LIST_PAGE_SIZE: int = 200
+    CONFLUENCE_BODY_BATCH_SIZE: int = 25
+    CONFLUENCE_MAX_RETRIES: int = 5
+    CONFLUENCE_HTTP_TIMEOUT_SECONDS: float = 60.0
+
+    # Website crawler (/api/v1/kb/scrape)
+    WEB_CRAWL_CONCURRENCY: int = 8
+    WEB_CRAWL_PER_HOST_CONCURRENCY: int = 2
+    # Upper bounds for what a single crawl request may ask for
+    WEB_CRAWL_MAX_PAGES: int = 1000
+    WEB_CRAWL_MAX_DEPTH: int = 10
+    WEB_CRAWL_MAX_PAGE_MB: int = 10
+    WEB_CRAWL_MAX_RETRIES: int = 3
+    WEB_CRAWL_HTTP_TIMEOUT_SECONDS: float = 30.0
+    WEB_CRAWL_USER_AGENT: str = "VaultCrawler/1.0"
+    # Validators (ETag/Last-Modified) per crawled page, one file per company
+    WEB_CRAWL_STATE_DIR: str = "./uploads/web"
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -25,11 +92,78 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    # Observability: Prometheus /metrics and per-request Server-Timing headers
+    METRICS_ENABLED: bool = True
+    # When set, /metrics requires "Authorization: Bearer <token>"
+    METRICS_TOKEN: str | None = None
+    SERVER_TIMING_ENABLED: bool = True
+    # OpenTelemetry tracing (needs opentelemetry-sdk): exporter otlp | file
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    # One JSON span per line, for offline analysis without a collector
+    TRACING_FILE_PATH: str = "./traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_SERVICE_NAME: str = "vault-api"
+    # Requests slower than the threshold are kept (SQL, outbound HTTP, stack
+    # samples) in a ring buffer under /api/utils/slow-requests
+    SLOW_REQUEST_CAPTURE_ENABLED: bool = True
+    SLOW_REQUEST_THRESHOLD_MS: int = 2000
+    SLOW_REQUEST_BUFFER_SIZE: int = 50
+    SLOW_REQUEST_SAMPLE_INTERVAL_MS: int = 20
+    # On-demand sampling profiler at /api/utils/profile
+    PROFILE_MAX_SECONDS: int = 300
+    PROFILE_SAMPLE_INTERVAL_MS: int = 10
+
+    # Startup: heavy dependencies load on first use; when enabled, these are
+    # imported in the background right after startup instead (comma-separated)
+    PREWARM_ENABLED: bool = False
+    PREWARM_MODULES: str = "ollama,numpy,PyPDF2,docx,docx2python,pptx,openpyxl,bs4"
+    # Warm-up run by the lifespan hook; /ready answers 503 until it finishes
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 120.0
+    # Connections opened per engine up front (capped at the pool size)
+    WARMUP_DB_CONNECTIONS: int = 5
+    # /ready's database re-check after a failed warm-up; slower counts as not ready
+    WARMUP_DB_CHECK_TIMEOUT_SECONDS: float = 2.0
+    # Local chat models to load into Ollama (comma-separated); empty = OLLAMA_CHAT_MODEL
+    WARMUP_CHAT_MODELS: str = ""
+    # Tenants (companies) whose vector index gets a warm query; 0 disables
+    WARMUP_VECTOR_TENANTS: int = 50
+    # Load the Whisper model during warm-up (skipped if faster-whisper is missing)
+    WARMUP_WHISPER: bool = True
+    # /health dependency checks (tesseract, whisper, ffmpeg) are cached this long
+    HEALTH_CACHE_TTL_SECONDS: int = 300
+
     # Ollama Configuration
     OLLAMA_HOST: str = "http://localhost:11434"
     OLLAMA_EMBED_MODEL: str = "nomic-embed-text"
     OLLAMA_CHAT_MODEL: str = "llama3.2:1b"
     OLLAMA_MODEL: str = "llama3.2:1b"
+    # How long Ollama keeps models loaded after a request ("30m", "-1" = forever)
+    OLLAMA_KEEP_ALIVE: str | None = None
+
+    # Speech-to-text (faster-whisper), one shared model per process
+    WHISPER_MODEL: str = "base"
+    WHISPER_DEVICE: str = "cpu"
+    WHISPER_COMPUTE_TYPE: str = "int8"
+    # Parallel transcriptions (model workers and threads)
+    TRANSCRIBE_WORKERS: int = 2
+    # Live transcription (/ws/transcribe): a pause this long ends an utterance
+    TRANSCRIBE_MIN_SILENCE_MS: int = 500
+    TRANSCRIBE_MAX_UTTERANCE_SECONDS: float = 20.0
+    TRANSCRIBE_STREAM_MAX_SECONDS: int = 600
+
+    # OCR of scanned PDF pages (no text layer) and images, one process per page
+    OCR_WORKERS: int = 4
+    OCR_LANGUAGES: str = "eng"
+    # Rasterisation resolution (when poppler's pdftoppm is installed)
+    OCR_DPI: int = 300
+    OCR_TIMEOUT_SECONDS: int = 120
+    # Pages whose text layer has fewer non-space characters than this are OCRed
+    OCR_MIN_TEXT_CHARS: int = 20
+    # Recognised text by page hash, so re-ingesting a document skips OCR
+    OCR_CACHE_DIR: str = "./data/ocr_cache"
 
     # Qdrant Configuration
     QDRANT_HOST: str = "localhost"
@@ -39,12 +173,37 @@ class Settings(BaseSettings):
     # RAG/Vector Settings
     CHUNK_SIZE: int = 3000
     VECTOR_DIMENSIONS: int = 768
+    # Knowledge-base vector backend: pgvector | qdrant | memory
+    VECTOR_BACKEND: str = "pgvector"
+    VECTOR_UPSERT_BATCH_SIZE: int = 500
+    # In-process exact-search snapshots for small tenants (also served when the DB is down)
+    VECTOR_LOCAL_INDEX_ENABLED: bool = False
+    VECTOR_LOCAL_INDEX_DIR: str = "./data/vector_index"
+    VECTOR_LOCAL_INDEX_MAX_CHUNKS: int = 50000
+    # float32 ranks exactly like pgvector; float16 halves memory at ~1e-3 score error
+    VECTOR_LOCAL_INDEX_DTYPE: str = "float32"
     RETRIEVAL_SIMILARITY_THRESHOLD: float = 0.5
     MAX_RETRIEVAL_DOCS: int = 5
     KB_CHUNK_SIZE: int = 1000
     KB_CHUNK_OVERLAP: int = 100
     KB_TOP_K: int = 5
 
+    # Re-ranking of over-fetched chunks before generation: cross-encoder | llm | none
+    # (cross-encoder needs the "rerank" extra, i.e. sentence-transformers; without it
+    # retrieval fetches only RERANK_TOP_N chunks and keeps the vector order)
+    RERANK_BACKEND: str = "cross-encoder"
+    RERANK_CANDIDATES: int = 50
+    RERANK_TOP_N: int = 3
+    RERANK_MIN_SCORE: float = 0.0
+    RERANK_CROSS_ENCODER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_LLM_MODEL: str | None = None
+    RERANK_LLM_CONCURRENCY: int = 4
+    # Passages per LLM scoring prompt
+    RERANK_LLM_BATCH_SIZE: int = 10
+    RERANK_MAX_CHARS: int = 1000
+    RERANK_CACHE_TTL_SECONDS: int = 3600
+    RERANK_CACHE_MAX_ENTRIES: int = 100000
+
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str = ""
     CLOUDINARY_API_KEY: str = ""
@@ -57,6 +216,12 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     SMTP_FROM: str = ""
 
+    # In-process caches
+    PROFILE_DIRECTORY_CACHE_TTL_SECONDS: int = 300
+    PROFILE_DIRECTORY_CACHE_MAX_TENANTS: int = 256
+    AUTH_CONTEXT_CACHE_TTL_SECONDS: int = 30
+    AUTH_CONTEXT_CACHE_MAX_ENTRIES: int = 10000
+
     # Application
     APP_NAME: str = "Vault API"
     DEBUG: bool = False
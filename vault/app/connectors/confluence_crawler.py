@@ -0,0 +1,361 @@
+"""
+Confluence Crawler
+Async Confluence REST crawler that feeds spaces into the knowledge base.
+
+Pages are listed per space with one CQL search (``expand=ancestors,version``),
+so hierarchy and version come back in the listing instead of one
+``get_page_by_id`` call per page. Only pages whose ``version.number`` changed
+since the last crawl have their bodies fetched, in ``id in (...)`` batches.
+Spaces are crawled concurrently and all chunks go through one KBBatchWriter.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.connectors.http_retry import RETRY_STATUSES, retry_delay
+from app.connectors.kb_writer import KBBatchWriter, build_chunk_documents
+from app.services.file_processor import html_to_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path("./uploads/confluence/state.json")
+
+
+class ConfluenceCrawlError(RuntimeError):
+    """Raised when Confluence keeps failing after retries or rejects a request."""
+
+
+@dataclass
+class ConfluenceCrawlStats:
+    space: str
+    listed: int = 0
+    ingested: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    deleted: int = 0
+
+
+def augment_content_with_hierarchy(content: str, hierarchy: str, date: str) -> str:
+    """
+    Augments content with hierarchy and date information.
+    """
+    hierarchy_info = f"This is the page hierarchy of the content: {hierarchy}"
+    date_info = f"Published on: {date}"
+    return f"{hierarchy_info}\n{date_info}\n\n{content}"
+
+
+def format_ancestors(page: dict) -> str:
+    """Page hierarchy from the ``ancestors`` expansion (returned root first)."""
+    titles = [ancestor["title"] for ancestor in page.get("ancestors") or []]
+    return " > ".join(titles) if titles else "No hierarchy available"
+
+
+def confluence_root(url: str) -> str:
+    """
+    REST root for a site URL: ``/rest/api`` and trailing slashes are dropped, and
+    Atlassian Cloud sites get their ``/wiki`` context path if it is missing.
+    """
+    url = url.rstrip("/").removesuffix("/rest/api").rstrip("/")
+    if (urlsplit(url).hostname or "").endswith(".atlassian.net") and not url.endswith("/wiki"):
+        url = f"{url}/wiki"
+    return url
+
+
+class ConfluenceCrawler:
+    """
+    Crawl Confluence spaces into the knowledge base.
+
+    Usage::
+
+        async with ConfluenceCrawler(url, user, api_token, state_path=path) as confluence:
+            await confluence.crawl_spaces(["HR", "ENG"], metadata={"company_id": 1})
+
+    ``base_url`` is the site URL; Cloud sites may be given with or without
+    ``/wiki`` (see ``confluence_root``). ``state_path`` stores each page's last
+    ingested version; without it every crawl re-embeds every page.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        api_token: str,
+        *,
+        state_path: str | Path | None = None,
+        writer: KBBatchWriter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = confluence_root(base_url)
+        self.state_path = Path(state_path) if state_path else None
+        self.writer = writer or KBBatchWriter()
+        self._auth = (username, api_token)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._requests = asyncio.Semaphore(settings.CONFLUENCE_REQUEST_CONCURRENCY)
+        self._state: dict = {}
+        self._state_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> ConfluenceCrawler:
+        self._client = httpx.AsyncClient(
+            auth=self._auth,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=settings.CONFLUENCE_REQUEST_CONCURRENCY,
+                max_keepalive_connections=settings.CONFLUENCE_REQUEST_CONCURRENCY,
+            ),
+            timeout=httpx.Timeout(settings.CONFLUENCE_HTTP_TIMEOUT_SECONDS),
+            transport=self._transport,
+        )
+        self._state = await asyncio.to_thread(self._load_state)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def _get_json(self, url: str, params: dict | None = None) -> dict:
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with self._requests:
+                    response = await self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                if attempt >= settings.CONFLUENCE_MAX_RETRIES:
+                    raise ConfluenceCrawlError(f"GET {url} failed: {e}") from e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.is_error:
+                        raise ConfluenceCrawlError(
+                            f"GET {url} returned {response.status_code}: {response.text[:200]}"
+                        )
+                    return response.json()
+                if attempt >= settings.CONFLUENCE_MAX_RETRIES:
+                    raise ConfluenceCrawlError(
+                        f"GET {url} still failing with {response.status_code} "
+                        f"after {attempt} retries"
+                    )
+
+            delay = retry_delay(response, attempt)
+            logger.info(f"Confluence throttled/failed on {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _search(self, cql: str, expand: str, limit: int) -> AsyncIterator[list[dict]]:
+        """Yield result pages of a CQL content search, following ``_links.next``."""
+        url = f"{self.base_url}/rest/api/content/search"
+        params = {"cql": cql, "expand": expand, "limit": limit}
+        while url:
+            data = await self._get_json(url, params=params)
+            yield data.get("results", [])
+            next_link = (data.get("_links") or {}).get("next")
+            # The next link already carries the query (and the cursor on Cloud)
+            url = f"{self.base_url}{next_link}" if next_link else None
+            params = None
+
+    async def list_spaces(self) -> list[str]:
+        """Keys of every global space visible to the account."""
+        keys = []
+        url = f"{self.base_url}/rest/api/space"
+        params = {"type": "global", "limit": settings.CONFLUENCE_LIST_PAGE_SIZE}
+        while url:
+            data = await self._get_json(url, params=params)
+            keys.extend(space["key"] for space in data.get("results", []))
+            next_link = (data.get("_links") or {}).get("next")
+            url = f"{self.base_url}{next_link}" if next_link else None
+            params = None
+        return keys
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _load_state(self) -> dict:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict) -> None:
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    async def _commit_space(self, space_key: str, known: dict) -> None:
+        async with self._state_lock:
+            self._state[space_key] = known
+            await asyncio.to_thread(self._save_state, dict(self._state))
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def _page_documents(
+        self, listed: dict, page: dict, space_key: str, metadata: dict | None
+    ) -> tuple[str, list[dict]]:
+        version = page.get("version") or {}
+        source = f"{self.base_url}{page['_links']['webui']}"
+        content = augment_content_with_hierarchy(
+            html_to_text(page["body"]["storage"]["value"]),
+            format_ancestors(listed),
+            version.get("when", ""),
+        )
+        doc_metadata = {
+            "level": 1,
+            "tags": f"confluence,{space_key}",
+            **(metadata or {}),
+            "file_name": source,
+            "author": (version.get("by") or {}).get("displayName"),
+            "doc_type": "confluence",
+        }
+        return source, build_chunk_documents(content, doc_metadata, page["title"])
+
+    async def _ingest_batch(
+        self,
+        listed_pages: list[dict],
+        space_key: str,
+        metadata: dict | None,
+        known: dict,
+        stats: ConfluenceCrawlStats,
+    ) -> None:
+        ids = ",".join(page["id"] for page in listed_pages)
+        bodies = {}
+        async for results in self._search(
+            f"id in ({ids})", "body.storage,version", len(listed_pages)
+        ):
+            bodies.update((page["id"], page) for page in results)
+
+        for listed in listed_pages:
+            page = bodies.get(listed["id"])
+            if page is None:
+                # Deleted (or restricted) between listing and fetch
+                continue
+            try:
+                source, docs = await asyncio.to_thread(
+                    self._page_documents, listed, page, space_key, metadata
+                )
+            except Exception as e:
+                logger.warning(f"Failed to convert Confluence page {listed['id']}: {e}")
+                stats.failed += 1
+                continue
+
+            previous = known.get(page["id"])
+            if previous:
+                self.writer.purge(previous["source"])
+            await self.writer.add(docs)
+            known[page["id"]] = {"version": page["version"]["number"], "source": source}
+            stats.ingested += 1
+
+    async def crawl_space(
+        self, space_key: str, metadata: dict | None = None, full: bool = False
+    ) -> ConfluenceCrawlStats:
+        """
+        Crawl one space: list every page, fetch and embed only changed ones, and
+        drop pages that no longer exist.
+
+        Args:
+            space_key: Confluence space key
+            metadata: Extra document fields (company_id, level, department, ...)
+            full: Re-embed every page regardless of version
+        """
+        stats = ConfluenceCrawlStats(space=space_key)
+        known: dict = dict(self._state.get(space_key, {}))
+        seen: set[str] = set()
+
+        async with asyncio.TaskGroup() as tasks:
+            async for results in self._search(
+                f'space="{space_key}" and type=page',
+                "ancestors,version",
+                settings.CONFLUENCE_LIST_PAGE_SIZE,
+            ):
+                changed = []
+                for page in results:
+                    stats.listed += 1
+                    seen.add(page["id"])
+                    previous = known.get(page["id"])
+                    if not full and previous and previous["version"] == page["version"]["number"]:
+                        stats.unchanged += 1
+                        continue
+                    changed.append(page)
+
+                batch_size = settings.CONFLUENCE_BODY_BATCH_SIZE
+                for i in range(0, len(changed), batch_size):
+                    tasks.create_task(
+                        self._ingest_batch(
+                            changed[i : i + batch_size], space_key, metadata, known, stats
+                        )
+                    )
+
+        for page_id in [page_id for page_id in known if page_id not in seen]:
+            self.writer.purge(known.pop(page_id)["source"])
+            stats.deleted += 1
+
+        # Versions are only recorded once their chunks are stored
+        await self.writer.flush()
+        await self._commit_space(space_key, known)
+        logger.info(f"Confluence space {space_key} crawled: {asdict(stats)}")
+        return stats
+
+    async def crawl_spaces(
+        self, space_keys: list[str], metadata: dict | None = None, full: bool = False
+    ) -> dict[str, ConfluenceCrawlStats]:
+        """
+        Crawl several spaces concurrently (``CONFLUENCE_SPACE_CONCURRENCY`` at a time).
+
+        A failing space does not stop the others; the first error is raised once
+        every space has finished.
+        """
+        limit = asyncio.Semaphore(settings.CONFLUENCE_SPACE_CONCURRENCY)
+
+        async def crawl(space_key: str) -> ConfluenceCrawlStats:
+            async with limit:
+                return await self.crawl_space(space_key, metadata=metadata, full=full)
+
+        results = await asyncio.gather(*(crawl(key) for key in space_keys), return_exceptions=True)
+        errors = []
+        stats = {}
+        for space_key, result in zip(space_keys, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Confluence space {space_key} failed: {result}")
+                errors.append(result)
+            else:
+                stats[space_key] = result
+        if errors:
+            raise errors[0]
+        return stats
+
+
+def store_confluence_in_kb(
+    confluence_url: str,
+    username: str,
+    api_token: str,
+    space_keys: str | list[str],
+    metadata: dict | None = None,
+    state_path: str | Path | None = DEFAULT_STATE_PATH,
+) -> dict[str, ConfluenceCrawlStats]:
+    """Synchronous entry point for scripts: crawl one or more spaces into the KB."""
+    if isinstance(space_keys, str):
+        space_keys = [space_keys]
+
+    async def crawl():
+        async with ConfluenceCrawler(
+            confluence_url, username, api_token, state_path=state_path
+        ) as confluence:
+            return await confluence.crawl_spaces(space_keys, metadata=metadata)
+
+    return asyncio.run(crawl())
@@ -0,0 +1,25 @@
+"""
+HTTP retry helpers shared by the connector crawlers.
+"""
+
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Throttling and transient server errors worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_delay(response: httpx.Response | None, attempt: int) -> float:
+    """Seconds to wait before retrying: ``Retry-After`` if given, else exponential backoff."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return min(2.0**attempt, 60.0)
@@ -0,0 +1,129 @@
+"""
+Batched Knowledge Base Writer
+Shared ingestion tail for the connectors: extracted text is chunked, buffered,
+and embedded/stored in batches through store_bulk_in_kb instead of one
+document (and one embedding request) at a time.
+
+Sources that changed upstream are purged before their new chunks land, so a
+re-crawl replaces a document rather than duplicating it.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from app.config import settings
+from app.connectors.store_data_in_kb import delete_sources_from_kb, store_bulk_in_kb
+from app.services.file_processor import chunk_text
+
+logger = logging.getLogger(__name__)
+
+
+class KBIngestError(RuntimeError):
+    """Raised when a batch could not be stored; the crawl must not be checkpointed."""
+
+
+def build_chunk_documents(text: str, metadata: dict[str, Any], title: str) -> list[dict]:
+    """
+    Split extracted text into store_bulk_in_kb documents.
+
+    Titles follow the upload endpoint: ``"<title> (Part i/n)"`` when there is
+    more than one chunk.
+    """
+    if not text or not text.strip():
+        return []
+    chunks = chunk_text(
+        text,
+        chunk_size=settings.KB_INGEST_CHUNK_SIZE,
+        overlap=settings.KB_INGEST_CHUNK_OVERLAP,
+    )
+    total = len(chunks)
+    return [
+        {
+            **metadata,
+            "content": chunk,
+            "file_title": f"{title} (Part {i + 1}/{total})" if total > 1 else title,
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+class KBBatchWriter:
+    """
+    Buffers chunk documents and stores them in batches of ``batch_size``.
+
+    Storing runs in a worker thread (embedding and the insert are blocking) and
+    one batch at a time, so producers that ``await add(...)`` are throttled to
+    the speed of the embedding model.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        store_batch: Callable[[list[dict]], dict] = store_bulk_in_kb,
+        delete_sources: Callable[[list[str]], dict] = delete_sources_from_kb,
+    ):
+        self.batch_size = batch_size or settings.KB_INGEST_BATCH_SIZE
+        self._store_batch = store_batch
+        self._delete_sources = delete_sources
+        self._buffer: list[dict] = []
+        self._pending_purges: set[str] = set()
+        self._purged: set[str] = set()
+        self._lock = asyncio.Lock()
+
+        self.chunks = 0
+        self.batches = 0
+        self.purged = 0
+
+    def purge(self, source: str) -> None:
+        """Delete ``source``'s existing chunks before the next batch is stored."""
+        if source not in self._purged:
+            self._pending_purges.add(source)
+
+    async def add(self, docs: list[dict], replaces: str | None = None) -> None:
+        """
+        Queue chunk documents, storing a batch whenever enough are buffered.
+
+        Args:
+            docs: Documents in the store_bulk_in_kb format
+            replaces: Source whose previously stored chunks these supersede
+        """
+        if replaces is not None:
+            self.purge(replaces)
+        self._buffer.extend(docs)
+        while len(self._buffer) >= self.batch_size:
+            await self._flush(full_batches_only=True)
+
+    async def flush(self) -> None:
+        """Store everything buffered and apply pending purges."""
+        await self._flush(full_batches_only=False)
+
+    async def _flush(self, full_batches_only: bool) -> None:
+        async with self._lock:
+            if full_batches_only and len(self._buffer) < self.batch_size:
+                return
+            batch = self._buffer[: self.batch_size]
+            self._buffer = self._buffer[self.batch_size :]
+            purges = sorted(self._pending_purges)
+            self._pending_purges.clear()
+
+            if purges:
+                result = await asyncio.to_thread(self._delete_sources, purges)
+                if result.get("status") != "success":
+                    raise KBIngestError(result.get("message", "Failed to delete sources"))
+                self._purged.update(purges)
+                self.purged += len(purges)
+
+            if batch:
+                result = await asyncio.to_thread(self._store_batch, batch)
+                if result.get("status") != "success":
+                    raise KBIngestError(result.get("message", "Failed to store batch"))
+                self.chunks += len(batch)
+                self.batches += 1
+
+        if not full_batches_only and (self._buffer or self._pending_purges):
+            await self._flush(full_batches_only=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"chunks": self.chunks, "batches": self.batches, "purged_sources": self.purged}
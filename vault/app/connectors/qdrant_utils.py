@@ -4,15 +4,23 @@ This module is used by ingestion/migration scripts to create collections sized t
 match the embedding dimension returned by the local Ollama instance and to upsert
 points into Qdrant.
 
+Large loads go through ``PipelinedUpserter``: embedding and upserting run on
+separate worker threads, so the embedding of batch N+1 overlaps the (``wait=False``)
+upsert of batch N, and a bulk-load mode defers HNSW indexing until the load is done.
+
 Note: Keep this logic lightweight to avoid adding extra external dependencies.
 """
 
 import logging
 import os
+import threading
+import time
 import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import requests
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +28,25 @@ OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2:1b")
 QDRANT_HOST = os.environ.get("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.environ.get("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.environ.get("QDRANT_GRPC_PORT", "6334"))
+# gRPC is markedly faster for large upserts; the client falls back to REST if unavailable
+QDRANT_PREFER_GRPC = os.environ.get("QDRANT_PREFER_GRPC", "true").lower() == "true"
+# Concurrent embedding requests (Ollama serialises per model, so 1 is usually right)
+QDRANT_EMBED_WORKERS = int(os.environ.get("QDRANT_EMBED_WORKERS", "1"))
+QDRANT_UPSERT_PARALLELISM = int(os.environ.get("QDRANT_UPSERT_PARALLELISM", "2"))
+# How long close() waits for the index rebuild after a bulk load (seconds)
+QDRANT_INDEX_WAIT_TIMEOUT = float(os.environ.get("QDRANT_INDEX_WAIT_TIMEOUT", "600"))
+
+_client: QdrantClient | None = None
+_client_lock = threading.Lock()
+_session = requests.Session()
 
 
 def _ollama_embed(texts):
     """Embed list of texts via Ollama HTTP embed endpoint."""
     url = f"{OLLAMA_HOST.rstrip('/')}/api/embed"
     payload = {"model": OLLAMA_MODEL, "input": texts}
-    resp = requests.post(url, json=payload, timeout=60)
+    resp = _session.post(url, json=payload, timeout=60)
     resp.raise_for_status()
     data = resp.json()
     if isinstance(data, dict) and "embeddings" in data:
@@ -44,8 +64,19 @@ def get_embedding_dim():
     return len(emb[0])
 
 
-def get_qdrant_client():
-    return QdrantClient(url=f"http://{QDRANT_HOST}:{QDRANT_PORT}")
+def get_qdrant_client() -> QdrantClient:
+    """Process-wide Qdrant client (thread-safe; reuses its connections)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = QdrantClient(
+                    host=QDRANT_HOST,
+                    port=QDRANT_PORT,
+                    grpc_port=QDRANT_GRPC_PORT,
+                    prefer_grpc=QDRANT_PREFER_GRPC,
+                )
+    return _client
 
 
 def recreate_collection(collection_name: str):
@@ -63,25 +94,209 @@ def recreate_collection(collection_name: str):
         raise
 
 
-def upsert_documents(collection_name: str, documents: list):
+def _build_points(documents: list, embeddings: list) -> list[models.PointStruct]:
+    points = []
+    for d, emb in zip(documents, embeddings, strict=True):
+        payload = dict(d.get("metadata", {}))
+        # include a copy of content in payload so retrieval returns it
+        payload.setdefault("content", d.get("content", ""))
+        points.append(
+            models.PointStruct(id=d.get("id") or str(uuid.uuid4()), vector=emb, payload=payload)
+        )
+    return points
+
+
+def upsert_documents(collection_name: str, documents: list, client: QdrantClient | None = None):
     """Upsert a list of documents into Qdrant.
 
     Each document should be a dict with at least: id (str), content (str), and optional metadata.
+    For many batches use ``PipelinedUpserter`` (or ``upsert_documents_pipelined``).
     """
-    client = get_qdrant_client()
-    # Prepare points for upsert
+    client = client or get_qdrant_client()
     texts = [d.get("content", "") for d in documents]
-    embeddings = _ollama_embed(texts)
-    points = []
-    for d, emb in zip(documents, embeddings, strict=False):
-        point = {
-            "id": d.get("id") or str(uuid.uuid4()),
-            "vector": emb,
-            "payload": d.get("metadata", {}),
-        }
-        # include a copy of content in payload so retrieval returns it
-        point["payload"].setdefault("content", d.get("content", ""))
-        points.append(point)
-    # Upsert into Qdrant
+    points = _build_points(documents, _ollama_embed(texts))
     client.upsert(collection_name=collection_name, points=points)
     logger.info(f"Upserted {len(points)} documents into '{collection_name}'")
+
+
+class PipelinedUpserter:
+    """Embed and upsert batches on a two-stage thread pipeline.
+
+    ``add(batch)`` returns as soon as the batch is queued; at most
+    ``embed_workers + upsert_parallelism`` batches are in flight, so producers
+    block instead of buffering a whole corpus. ``close()`` waits for everything
+    and raises the first failure.
+
+    With ``bulk_load=True`` HNSW indexing is switched off for the collection while
+    loading (``indexing_threshold=0``) and restored on close, so Qdrant builds the
+    index once instead of continuously re-indexing growing segments. ``close()``
+    then waits (at most ``index_wait_timeout`` seconds) for the collection to go
+    green again.
+
+    Usage::
+
+        with PipelinedUpserter("vault", bulk_load=True) as upserter:
+            for batch in batches:
+                upserter.add(batch)
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        client: QdrantClient | None = None,
+        embed: Callable[[list[str]], list] = _ollama_embed,
+        embed_workers: int | None = None,
+        upsert_parallelism: int | None = None,
+        bulk_load: bool = False,
+        wait_for_index: bool = True,
+        index_wait_timeout: float | None = None,
+    ):
+        self.collection_name = collection_name
+        self.client = client or get_qdrant_client()
+        self._embed = embed
+        embed_workers = embed_workers or QDRANT_EMBED_WORKERS
+        upsert_parallelism = upsert_parallelism or QDRANT_UPSERT_PARALLELISM
+        self._embed_pool = ThreadPoolExecutor(embed_workers, thread_name_prefix="qdrant-embed")
+        self._upsert_pool = ThreadPoolExecutor(
+            upsert_parallelism, thread_name_prefix="qdrant-upsert"
+        )
+        self._slots = threading.BoundedSemaphore(embed_workers + upsert_parallelism)
+        self._futures: set[Future] = set()
+        self._lock = threading.Lock()
+        self._errors: list[BaseException] = []
+        self._bulk_load = bulk_load
+        self._wait_for_index = wait_for_index
+        self._index_wait_timeout = (
+            QDRANT_INDEX_WAIT_TIMEOUT if index_wait_timeout is None else index_wait_timeout
+        )
+        self._saved_indexing_threshold: int | None = None
+        self.upserted = 0
+        self.batches = 0
+
+        if bulk_load:
+            self._disable_indexing()
+
+    def __enter__(self) -> PipelinedUpserter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(raise_errors=exc_type is None)
+
+    # Bulk-load indexing control
+    def _disable_indexing(self) -> None:
+        info = self.client.get_collection(self.collection_name)
+        self._saved_indexing_threshold = info.config.optimizer_config.indexing_threshold
+        self.client.update_collection(
+            self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+        logger.info(f"Indexing disabled on '{self.collection_name}' for bulk load")
+
+    def _restore_indexing(self) -> None:
+        self.client.update_collection(
+            self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(
+                indexing_threshold=self._saved_indexing_threshold or 20000
+            ),
+        )
+        logger.info(f"Indexing re-enabled on '{self.collection_name}', rebuilding index")
+        if not self._wait_for_index:
+            return
+        deadline = time.monotonic() + self._index_wait_timeout
+        while (
+            status := self.client.get_collection(self.collection_name).status
+        ) != models.CollectionStatus.GREEN:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # The points are stored; Qdrant keeps optimizing in the background
+                logger.warning(
+                    f"'{self.collection_name}' still {status} after "
+                    f"{self._index_wait_timeout:.0f}s; not waiting for the index rebuild"
+                )
+                return
+            time.sleep(min(1.0, remaining))
+
+    # Pipeline
+    def _track(self, future: Future) -> None:
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+
+    def _embed_stage(self, documents: list) -> None:
+        try:
+            embeddings = self._embed([d.get("content", "") for d in documents])
+            points = _build_points(documents, embeddings)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Hand off and return, so this worker can start embedding the next batch
+        self._track(self._upsert_pool.submit(self._upsert_stage, points))
+
+    def _upsert_stage(self, points: list) -> None:
+        try:
+            self.client.upsert(collection_name=self.collection_name, points=points, wait=False)
+            with self._lock:
+                self.upserted += len(points)
+                self.batches += 1
+        finally:
+            self._slots.release()
+
+    def add(self, documents: list) -> None:
+        """Queue a batch of documents (same format as ``upsert_documents``)."""
+        if self._errors:
+            raise self._errors[0]
+        if not documents:
+            return
+        self._slots.acquire()
+        self._track(self._embed_pool.submit(self._embed_stage, documents))
+
+    def flush(self) -> None:
+        """Wait until every queued batch has been sent; raise the first failure."""
+        while True:
+            with self._lock:
+                pending = list(self._futures)
+            if not pending:
+                break
+            for future in pending:
+                future.exception()
+        if self._errors:
+            raise self._errors[0]
+
+    def close(self, raise_errors: bool = True) -> None:
+        try:
+            self.flush()
+        except BaseException:
+            if raise_errors:
+                raise
+        finally:
+            self._embed_pool.shutdown(wait=True)
+            self._upsert_pool.shutdown(wait=True)
+            if self._bulk_load:
+                self._restore_indexing()
+        logger.info(
+            f"Upserted {self.upserted} documents in {self.batches} batches "
+            f"into '{self.collection_name}'"
+        )
+
+
+def upsert_documents_pipelined(
+    collection_name: str,
+    documents: list,
+    batch_size: int = 200,
+    bulk_load: bool = False,
+    client: QdrantClient | None = None,
+    embed: Callable[[list[str]], list] = _ollama_embed,
+) -> int:
+    """Upsert documents in pipelined batches; returns the number upserted."""
+    with PipelinedUpserter(
+        collection_name, client=client, embed=embed, bulk_load=bulk_load
+    ) as upserter:
+        for i in range(0, len(documents), batch_size):
+            upserter.add(documents[i : i + batch_size])
+    return upserter.upserted
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import os
 from pathlib import Path
@@ -7,7 +8,7 @@ import requests
 # Remove Azure Search & AzureOpenAI dependencies; route to Qdrant
 from dotenv import load_dotenv
 
-from app.connectors.store_data_in_kb import store_in_qdrant
+from app.connectors.store_data_in_kb import store_in_kb
 
 # Load .env from current directory
 env_path = Path(__file__).parent.parent / ".env"
@@ -27,9 +28,9 @@ def generate_chunk_ids(doc_id, num_chunks):
 
 
 def store_in_kb_sharepoint(doc):
-    """Store a processed SharePoint document into Qdrant using existing wrapper."""
+    """Store a processed SharePoint document in the knowledge base."""
     # doc expected to include metadata and content
-    store_in_qdrant(doc, collection_name=QDRANT_COLLECTION)
+    return store_in_kb(doc)
 
 
 class SharePointClient:
@@ -244,6 +245,31 @@ class SharePointClient:
                         #      store in KB
                         # store_in_azure_kb(doc)  # TODO: Function not implemented
 
+    async def process_folder_contents_async(
+        self,
+        site_id,
+        drive_id,
+        folder_id,
+        local_folder_path="",
+        metadata=None,
+    ):
+        """
+        Crawl a SharePoint folder tree into the knowledge base.
+
+        Delegates to SharePointCrawler, which lists sub-folders and downloads
+        files concurrently and stores chunks in batches. Use
+        ``SharePointCrawler.crawl_drive`` for whole libraries (delta sync).
+        """
+        from app.connectors.sharepoint_crawler import SharePointCrawler
+
+        async with SharePointCrawler(
+            self.tenant_id,
+            self.client_id,
+            self.client_secret,
+            work_dir=local_folder_path or None,
+        ) as crawler:
+            return await crawler.crawl_folder(drive_id, folder_id, metadata=metadata)
+
     def process_folder_contents(
         self,
         site_id,
@@ -252,68 +278,14 @@ class SharePointClient:
         current_path="",
         local_folder_path="",
         level=0,
+        metadata=None,
     ):
         """
-        Recursively process folder contents from SharePoint and store files in Qdrant.
+        Synchronous entry point for scripts; request handlers await
+        ``process_folder_contents_async`` instead.
         """
-        folder_contents_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{folder_id}/children"
-        contents_headers = {"Authorization": f"Bearer {self.access_token}"}
-        contents_response = requests.get(folder_contents_url, headers=contents_headers)
-        folder_contents = contents_response.json()
-
-        if "value" in folder_contents:
-            for item in folder_contents["value"]:
-                item_name = item["name"]
-                file_path = f"{current_path}/{item_name}" if current_path else item_name
-
-                # Common metadata extraction
-                base_item = {
-                    "name": item_name,
-                    "id": item["id"],
-                    "full_path": file_path,
-                    "web_url": item.get("webUrl"),
-                    "createdBy": item.get("createdBy", {}).get("user", {}).get("displayName"),
-                    "lastModifiedBy": item.get("lastModifiedBy", {})
-                    .get("user", {})
-                    .get("displayName"),
-                    "createdDateTime": item.get("createdDateTime"),
-                    "lastModifiedDateTime": item.get("lastModifiedDateTime"),
-                }
-
-                if "folder" in item:
-                    # It's a folder
-                    if local_folder_path:
-                        new_local_path = os.path.join(local_folder_path, item_name)
-                        if not os.path.exists(new_local_path):
-                            os.makedirs(new_local_path)
-                    else:
-                        new_local_path = local_folder_path
-
-                    # Recurse into subfolder
-                    self.process_folder_contents(
-                        site_id,
-                        drive_id,
-                        item["id"],
-                        current_path=file_path,
-                        local_folder_path=new_local_path,
-                        level=level + 1,
-                    )
-
-                elif "file" in item:
-                    # It's a file
-                    if ".mp4" not in item_name:
-                        file_id = item["id"]
-                        file_name = item_name
-                        file_download_url = f"{self.resource_url}v1.0/sites/{site_id}/drives/{drive_id}/items/{file_id}/content"
-
-                        content = self.extract_file_content(
-                            file_download_url, local_folder_path, file_name
-                        )
-
-                        if content.strip():
-                            doc = self.create_document(base_item, content)
-                            # to do
-                            #      store in KB
-                            store_in_kb_sharepoint(doc)
-
-        # No explicit return needed
+        return asyncio.run(
+            self.process_folder_contents_async(
+                site_id, drive_id, folder_id, local_folder_path=local_folder_path, metadata=metadata
+            )
+        )
@@ -0,0 +1,505 @@
+"""
+SharePoint Crawler
+Async Microsoft Graph crawler that feeds SharePoint document libraries into the
+knowledge base.
+
+Whole libraries are enumerated with the drive ``/delta`` endpoint, so after the
+first crawl only changed and deleted items are fetched. Sub-folders (which
+SharePoint libraries cannot delta-query) are walked with concurrent listings.
+Downloads stream to disk over a bounded connection pool, throttling responses
+are retried after their ``Retry-After``, and extracted chunks go to the
+knowledge base in batches through KBBatchWriter.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import aiofiles
+import httpx
+
+from app.config import settings
+from app.connectors.http_retry import RETRY_STATUSES, retry_delay
+from app.connectors.kb_writer import KBBatchWriter, build_chunk_documents
+from app.services.file_processor import process_file
+
+logger = logging.getLogger(__name__)
+
+GRAPH_URL = "https://graph.microsoft.com/v1.0"
+LOGIN_URL = "https://login.microsoftonline.com"
+
+# Formats process_file handles without OCR/transcription
+SUPPORTED_EXTENSIONS = frozenset(
+    {".pdf", ".docx", ".pptx", ".txt", ".md", ".csv", ".xlsx", ".xls", ".html", ".htm"}
+)
+
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# Drive item fields kept for files to retry on the next delta crawl
+_RETRY_FIELDS = ("id", "name", "file", "size", "cTag", "eTag", "webUrl", "lastModifiedBy")
+_DEFAULT_WORK_DIR = Path("./uploads/sharepoint")
+
+
+class SharePointCrawlError(RuntimeError):
+    """Raised when Graph keeps failing after retries or returns an unexpected error."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class CrawlStats:
+    mode: str = "full"
+    listed: int = 0
+    ingested: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # Files that failed on an earlier delta crawl and were tried again
+    retried: int = 0
+    deleted: int = 0
+    chunks: int = 0
+    batches: int = 0
+
+
+class _WorkerPool:
+    """
+    ``size`` workers draining a queue of ``handle(*entry)`` calls.
+
+    The first failure stops further work: remaining entries are drained
+    unprocessed, ``put`` raises it to the producer, and leaving the context
+    re-raises it.
+    """
+
+    def __init__(self, handle, size: int, maxsize: int = 0):
+        self._handle = handle
+        self._size = size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._tasks: list[asyncio.Task] = []
+        self.errors: list[BaseException] = []
+
+    async def _worker(self) -> None:
+        while True:
+            entry = await self._queue.get()
+            try:
+                if not self.errors:
+                    await self._handle(*entry)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    async def put(self, *entry) -> None:
+        if self.errors:
+            raise self.errors[0]
+        await self._queue.put(entry)
+
+    def put_nowait(self, *entry) -> None:
+        self._queue.put_nowait(entry)
+
+    async def __aenter__(self) -> _WorkerPool:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._size)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self._queue.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if exc_type is None and self.errors:
+            raise self.errors[0]
+
+
+class SharePointCrawler:
+    """
+    Crawl SharePoint drives into the knowledge base.
+
+    Usage::
+
+        async with SharePointCrawler(tenant_id, client_id, secret, state_path=path) as crawler:
+            site_id = await crawler.get_site_id("contoso.sharepoint.com:/sites/hr")
+            for drive_id, _ in await crawler.list_drives(site_id):
+                await crawler.crawl_drive(drive_id, metadata={"company_id": 1})
+
+    ``state_path`` is a JSON file holding each drive's delta link, the
+    ``cTag`` of every ingested file and the files that failed to ingest;
+    without it every crawl is a full crawl.
+    """
+
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        *,
+        state_path: str | Path | None = None,
+        work_dir: str | Path | None = None,
+        concurrency: int | None = None,
+        writer: KBBatchWriter | None = None,
+        graph_url: str = GRAPH_URL,
+        token_url: str | None = None,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.graph_url = graph_url.rstrip("/")
+        self.token_url = token_url or f"{LOGIN_URL}/{tenant_id}/oauth2/v2.0/token"
+        self.state_path = Path(state_path) if state_path else None
+        self.work_dir = Path(work_dir) if work_dir else None
+        self.concurrency = concurrency or settings.SHAREPOINT_CRAWL_CONCURRENCY
+        self.writer = writer or KBBatchWriter()
+
+        self._client: httpx.AsyncClient | None = None
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> SharePointCrawler:
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            timeout=httpx.Timeout(settings.SHAREPOINT_HTTP_TIMEOUT_SECONDS),
+            # Content downloads redirect to a pre-authenticated URL; httpx drops the
+            # Authorization header when the redirect leaves the Graph host
+            follow_redirects=True,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def _get_token(self, refresh: bool = False) -> str:
+        async with self._token_lock:
+            if refresh or self._token is None or time.monotonic() >= self._token_expires:
+                response = await self._client.post(
+                    self.token_url,
+                    data={
+                        "grant_type": "client_credentials",
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                        "scope": "https://graph.microsoft.com/.default",
+                    },
+                )
+                response.raise_for_status()
+                data = response.json()
+                self._token = data["access_token"]
+                # Renew a minute early so long crawls never send an expired token
+                self._token_expires = time.monotonic() + int(data.get("expires_in", 3600)) - 60
+            return self._token
+
+    async def _send(
+        self, method: str, url: str, *, stream: bool = False, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a Graph request, retrying throttling/5xx/transport errors and a
+        single expired-token 401. The caller closes streamed responses.
+        """
+        refreshed = False
+        attempt = 0
+        while True:
+            token = await self._get_token()
+            request = self._client.build_request(
+                method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs
+            )
+            response = None
+            try:
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= settings.SHAREPOINT_MAX_RETRIES:
+                    raise SharePointCrawlError(f"{method} {url} failed: {e}") from e
+                logger.debug(f"Graph transport error on {url}: {e}")
+            else:
+                if response.status_code == 401 and not refreshed:
+                    await response.aclose()
+                    await self._get_token(refresh=True)
+                    refreshed = True
+                    continue
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                await response.aclose()
+                if attempt >= settings.SHAREPOINT_MAX_RETRIES:
+                    raise SharePointCrawlError(
+                        f"{method} {url} still failing with {response.status_code} "
+                        f"after {attempt} retries"
+                    )
+
+            delay = retry_delay(response, attempt)
+            logger.info(f"Graph throttled/failed on {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get_json(self, url: str, **kwargs) -> dict:
+        response = await self._send("GET", url, **kwargs)
+        if response.is_error:
+            raise SharePointCrawlError(
+                f"GET {url} returned {response.status_code}", response.status_code
+            )
+        return response.json()
+
+    async def _iter_pages(self, url: str, params: dict | None = None) -> AsyncIterator[dict]:
+        """Yield every page of a Graph collection, following ``@odata.nextLink``."""
+        while url:
+            page = await self._get_json(url, params=params)
+            yield page
+            url = page.get("@odata.nextLink")
+            # nextLink already carries the query string
+            params = None
+
+    @asynccontextmanager
+    async def _download(self, drive_id: str, item: dict) -> AsyncIterator[Path]:
+        """Stream a file's content to a temporary file, removed on exit."""
+        work_dir = self.work_dir or _DEFAULT_WORK_DIR
+        work_dir.mkdir(parents=True, exist_ok=True)
+        path = work_dir / f"{uuid.uuid4()}{Path(item['name']).suffix.lower()}"
+        response = await self._send(
+            "GET", f"{self.graph_url}/drives/{drive_id}/items/{item['id']}/content", stream=True
+        )
+        try:
+            if response.is_error:
+                raise SharePointCrawlError(
+                    f"Download of {item['name']} returned {response.status_code}",
+                    response.status_code,
+                )
+            async with aiofiles.open(path, "wb") as f:
+                async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_BYTES):
+                    await f.write(chunk)
+        finally:
+            await response.aclose()
+        try:
+            yield path
+        finally:
+            path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _load_state(self) -> dict:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict) -> None:
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    # ------------------------------------------------------------------
+    # Sites and drives
+    # ------------------------------------------------------------------
+    async def get_site_id(self, site: str) -> str:
+        """Resolve ``hostname:/sites/path`` (or a site id) to a site id."""
+        return (await self._get_json(f"{self.graph_url}/sites/{site}"))["id"]
+
+    async def list_drives(self, site_id: str) -> list[tuple[str, str]]:
+        """Document libraries of a site as ``(drive_id, name)`` pairs."""
+        drives = []
+        async for page in self._iter_pages(f"{self.graph_url}/sites/{site_id}/drives"):
+            drives.extend((drive["id"], drive["name"]) for drive in page.get("value", []))
+        return drives
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def _source(self, item: dict, path: str | None) -> str:
+        return item.get("webUrl") or path or item["name"]
+
+    def _metadata(self, item: dict, source: str, metadata: dict | None) -> dict:
+        modified_by = (item.get("lastModifiedBy") or {}).get("user", {}).get("displayName")
+        return {
+            "level": 1,
+            "tags": "sharepoint",
+            **(metadata or {}),
+            "file_name": source,
+            "author": modified_by,
+            "doc_type": Path(item["name"]).suffix.lower().lstrip("."),
+        }
+
+    async def _ingest(
+        self,
+        drive_id: str,
+        item: dict,
+        known: dict,
+        metadata: dict | None,
+        stats: CrawlStats,
+        path: str | None = None,
+    ) -> bool:
+        """Ingest one file; False if it could not be downloaded or processed."""
+        stats.listed += 1
+        ext = Path(item["name"]).suffix.lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            stats.skipped += 1
+            return True
+        if item.get("size", 0) > settings.SHAREPOINT_MAX_FILE_MB * 1024 * 1024:
+            logger.info(f"Skipping {item['name']}: larger than {settings.SHAREPOINT_MAX_FILE_MB}MB")
+            stats.skipped += 1
+            return True
+
+        source = self._source(item, path)
+        previous = known.get(item["id"])
+        tag = item.get("cTag") or item.get("eTag")
+        if previous and previous["tag"] == tag and previous["source"] == source:
+            stats.unchanged += 1
+            return True
+
+        try:
+            async with self._download(drive_id, item) as file_path:
+                docs = await asyncio.to_thread(
+                    lambda: build_chunk_documents(
+                        process_file(file_path, ext),
+                        self._metadata(item, source, metadata),
+                        item["name"],
+                    )
+                )
+        except Exception as e:
+            # A bad file (or whatever its format library raised) must not stop the crawl
+            logger.warning(f"Failed to ingest {item['name']}: {e}")
+            stats.failed += 1
+            return False
+
+        if previous:
+            self.writer.purge(previous["source"])
+        await self.writer.add(docs)
+        known[item["id"]] = {"tag": tag, "source": source}
+        stats.ingested += 1
+        return True
+
+    def _remove(self, item_id: str, known: dict, stats: CrawlStats) -> None:
+        previous = known.pop(item_id, None)
+        if previous:
+            self.writer.purge(previous["source"])
+            stats.deleted += 1
+
+    async def crawl_drive(
+        self, drive_id: str, metadata: dict | None = None, full: bool = False
+    ) -> CrawlStats:
+        """
+        Crawl a whole document library via ``/delta``.
+
+        The first crawl (or ``full=True``) enumerates everything; later crawls
+        resume from the stored delta link and only see changes and deletions.
+        State is saved only after every batch has been stored, so a failed
+        crawl is simply repeated from the previous checkpoint. Files that fail
+        to download or ingest are kept in the state and tried again by the
+        next delta crawl, since the new delta link will not list them again
+        until they change.
+
+        Args:
+            drive_id: Drive (document library) id
+            metadata: Extra document fields (company_id, level, department, ...)
+            full: Ignore the stored delta link
+        """
+        state = await asyncio.to_thread(self._load_state)
+        drive_state = state.get(drive_id, {})
+        known: dict = dict(drive_state.get("items", {}))
+        delta_link = None if full else drive_state.get("delta_link")
+        stats = CrawlStats(mode="delta" if delta_link else "full")
+        chunks_before, batches_before = self.writer.chunks, self.writer.batches
+        seen: set[str] = set()
+        retry: dict = dict(drive_state.get("failed", {}))
+        failed: dict = {}
+
+        async def handle(item: dict) -> None:
+            if not await self._ingest(drive_id, item, known, metadata, stats):
+                failed[item["id"]] = {key: item[key] for key in _RETRY_FIELDS if key in item}
+
+        url = delta_link or f"{self.graph_url}/drives/{drive_id}/root/delta"
+        async with _WorkerPool(handle, self.concurrency, maxsize=self.concurrency * 2) as pool:
+            while True:
+                try:
+                    async for page in self._iter_pages(url):
+                        for item in page.get("value", []):
+                            if "deleted" in item:
+                                retry.pop(item["id"], None)
+                                self._remove(item["id"], known, stats)
+                            elif "file" in item:
+                                seen.add(item["id"])
+                                await pool.put(item)
+                        delta_link = page.get("@odata.deltaLink", delta_link)
+                    break
+                except SharePointCrawlError as e:
+                    if e.status_code != 410 or stats.mode != "delta":
+                        raise
+                    # Delta tokens expire; Graph answers 410 Gone and wants a full resync
+                    logger.info(f"Delta link for drive {drive_id} expired, running full crawl")
+                    stats.mode = "full"
+                    url = f"{self.graph_url}/drives/{drive_id}/root/delta"
+
+            if stats.mode == "delta":
+                # A full enumeration lists them anyway; a delta only if they changed
+                for item_id, item in retry.items():
+                    if item_id not in seen:
+                        stats.retried += 1
+                        await pool.put(item)
+
+        if stats.mode == "full":
+            # Anything ingested before but absent from a full enumeration is gone
+            for item_id in [item_id for item_id in known if item_id not in seen]:
+                self._remove(item_id, known, stats)
+
+        await self.writer.flush()
+        stats.chunks = self.writer.chunks - chunks_before
+        stats.batches = self.writer.batches - batches_before
+
+        state[drive_id] = {"delta_link": delta_link, "items": known, "failed": failed}
+        await asyncio.to_thread(self._save_state, state)
+        logger.info(f"SharePoint drive {drive_id} crawled: {asdict(stats)}")
+        return stats
+
+    async def crawl_folder(
+        self, drive_id: str, folder_id: str = "root", metadata: dict | None = None
+    ) -> CrawlStats:
+        """
+        Crawl one folder tree, listing sub-folders concurrently.
+
+        Folder listings and file downloads share the same workers, so at most
+        ``concurrency`` Graph requests are in flight. Files whose ``cTag`` is
+        unchanged since the last crawl are not downloaded again.
+        """
+        state = await asyncio.to_thread(self._load_state)
+        drive_state = state.get(drive_id, {})
+        known: dict = dict(drive_state.get("items", {}))
+        stats = CrawlStats(mode="folder")
+        chunks_before, batches_before = self.writer.chunks, self.writer.batches
+
+        async def handle(item: dict, path: str) -> None:
+            if "folder" not in item:
+                await self._ingest(drive_id, item, known, metadata, stats, path)
+                return
+            url = f"{self.graph_url}/drives/{drive_id}/items/{item['id']}/children"
+            async for page in self._iter_pages(url):
+                for child in page.get("value", []):
+                    if "folder" in child or "file" in child:
+                        pool.put_nowait(child, f"{path}/{child['name']}" if path else child["name"])
+
+        async with _WorkerPool(handle, self.concurrency) as pool:
+            pool.put_nowait({"id": folder_id, "folder": {}}, "")
+
+        await self.writer.flush()
+        stats.chunks = self.writer.chunks - chunks_before
+        stats.batches = self.writer.batches - batches_before
+
+        state[drive_id] = {**drive_state, "items": known}
+        await asyncio.to_thread(self._save_state, state)
+        logger.info(f"SharePoint folder {folder_id} crawled: {asdict(stats)}")
+        return stats
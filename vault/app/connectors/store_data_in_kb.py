@@ -12,14 +12,18 @@ from datetime import datetime
 import requests
 from sqlalchemy import text
 
+from app.core.metrics import EMBED_SECONDS, VECTOR_QUERY_SECONDS, timed
+from app.core.tracing import span
 from app.database import SessionLocal  # ← Use main session
 from app.models.kb import KBDocument  # ← Import from models
+from app.services.vector_store import SearchFilter, SearchHit, VectorRecord, get_vector_store
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_EMBED_MODEL = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE") or None
 
 
 # ============================================================================
@@ -55,7 +59,13 @@ def _get_embedding(text_content: str) -> list[float]:
     try:
         url = f"{OLLAMA_HOST.rstrip('/')}/api/embed"
         payload = {"model": OLLAMA_EMBED_MODEL, "input": [text_content]}
-        resp = requests.post(url, json=payload, timeout=60)
+        if OLLAMA_KEEP_ALIVE:
+            payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+        with (
+            span("kb.embed", {"llm.model": OLLAMA_EMBED_MODEL, "embed.inputs": 1}),
+            timed(EMBED_SECONDS, "embed", model=OLLAMA_EMBED_MODEL, call="single"),
+        ):
+            resp = requests.post(url, json=payload, timeout=60)
         resp.raise_for_status()
         data = resp.json()
 
@@ -85,7 +95,13 @@ def _get_embeddings_batch(texts: list[str]) -> list[list[float]]:
     try:
         url = f"{OLLAMA_HOST.rstrip('/')}/api/embed"
         payload = {"model": OLLAMA_EMBED_MODEL, "input": texts}
-        resp = requests.post(url, json=payload, timeout=120)
+        if OLLAMA_KEEP_ALIVE:
+            payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+        with (
+            span("kb.embed", {"llm.model": OLLAMA_EMBED_MODEL, "embed.inputs": len(texts)}),
+            timed(EMBED_SECONDS, "embed", model=OLLAMA_EMBED_MODEL, call="batch"),
+        ):
+            resp = requests.post(url, json=payload, timeout=120)
         resp.raise_for_status()
         data = resp.json()
 
@@ -105,9 +121,45 @@ def _get_embeddings_batch(texts: list[str]) -> list[list[float]]:
 # ============================================================================
 
 
+def _backend() -> str:
+    """Name of the store ingest writes to (without a local-index wrapper suffix)."""
+    return get_vector_store().name.split("+", 1)[0]
+
+
+def _require_pgvector(operation: str) -> None:
+    """
+    Refuse Postgres-only operations when the knowledge base lives elsewhere,
+    rather than silently reading or writing a table ingest never touches.
+    """
+    backend = _backend()
+    if backend != "pgvector":
+        raise RuntimeError(f"{operation} needs the pgvector backend, not {backend}")
+
+
+def _to_record(doc: dict, embedding: list[float]) -> VectorRecord:
+    """Map an ingestion doc dict onto a vector store record with a fresh ID."""
+    now = datetime.now().isoformat()
+    return VectorRecord(
+        id=str(uuid.uuid4()),
+        content=doc["content"],
+        embedding=embedding,
+        sourcefile=doc.get("file_name", "unknown"),
+        title=doc.get("file_title", "Untitled"),
+        access_level=doc.get("level", 1),
+        company_id=doc.get("company_id"),
+        company_reg_no=doc.get("company_reg_no"),
+        department=doc.get("department"),
+        tags=doc.get("tags"),
+        author=doc.get("author"),
+        doc_type=doc.get("doc_type"),
+        created_at=now,
+        last_modified_date=now,
+    )
+
+
 def store_in_kb(doc: dict) -> dict:
     """
-    Store a document in the pgvector knowledge base.
+    Store a document in the knowledge base (configured vector backend).
 
     Args:
         doc: Dictionary containing document data with keys:
@@ -120,64 +172,29 @@ def store_in_kb(doc: dict) -> dict:
     Returns:
         Dictionary with status and document ID
     """
-    db = None
     try:
         logger.info(f"Storing document: {doc.get('file_title', 'Untitled')}")
 
-        # Extract document data
-        content = doc.get("content", "")
-        if not content:
+        if not doc.get("content"):
             raise ValueError("Document content is empty")
 
-        file_name = doc.get("file_name", "unknown")
-        file_title = doc.get("file_title", "Untitled")
-        access_level = doc.get("level", 1)
-
         # Generate embedding
         logger.info("Generating embedding for document...")
-        embedding = _get_embedding(content)
-
-        # Create unique ID
-        doc_id = uuid.uuid4()
-
-        # Create document record using KBDocument model
-        kb_doc = KBDocument(
-            id=doc_id,
-            content=content,
-            embedding=embedding,
-            sourcefile=file_name,
-            title=file_title,
-            access_level=access_level,
-            company_id=doc.get("company_id"),
-            company_reg_no=doc.get("company_reg_no"),
-            department=doc.get("department"),
-            tags=doc.get("tags"),
-            author=doc.get("author"),
-            doc_type=doc.get("doc_type"),
-            last_modified_date=datetime.now(),
-        )
+        record = _to_record(doc, _get_embedding(doc["content"]))
 
-        # Store in database
-        db = get_db_session()
-        db.add(kb_doc)
-        db.commit()
+        get_vector_store().upsert([record])
 
-        logger.info(f"Document stored successfully with ID: {doc_id}")
+        logger.info(f"Document stored successfully with ID: {record.id}")
 
         return {
             "status": "success",
             "message": "Document stored in knowledge base",
-            "doc_id": str(doc_id),
+            "doc_id": record.id,
         }
 
     except Exception as e:
         logger.error(f"Error storing document in knowledge base: {e}")
-        if db:
-            db.rollback()
         return {"status": "error", "message": f"Failed to store document: {str(e)}"}
-    finally:
-        if db:
-            db.close()
 
 
 def store_bulk_in_kb(docs: list[dict]) -> dict:
@@ -190,7 +207,6 @@ def store_bulk_in_kb(docs: list[dict]) -> dict:
     Returns:
         Dictionary with status and count of stored documents
     """
-    db = None
     try:
         logger.info(f"Bulk storing {len(docs)} documents")
 
@@ -204,52 +220,23 @@ def store_bulk_in_kb(docs: list[dict]) -> dict:
         logger.info(f"Generating embeddings for {len(contents)} documents...")
         embeddings = _get_embeddings_batch(contents)
 
-        # Create document records
-        kb_docs = []
-        doc_ids = []
-
-        for i, doc in enumerate(valid_docs):
-            doc_id = uuid.uuid4()
-            doc_ids.append(str(doc_id))
-
-            kb_doc = KBDocument(
-                id=doc_id,
-                content=doc.get("content", ""),
-                embedding=embeddings[i],
-                sourcefile=doc.get("file_name", "unknown"),
-                title=doc.get("file_title", "Untitled"),
-                access_level=doc.get("level", 1),
-                company_id=doc.get("company_id"),
-                company_reg_no=doc.get("company_reg_no"),
-                department=doc.get("department"),
-                tags=doc.get("tags"),
-                author=doc.get("author"),
-                doc_type=doc.get("doc_type"),
-                last_modified_date=datetime.now(),
-            )
-            kb_docs.append(kb_doc)
-
-        # Bulk insert
-        db = get_db_session()
-        db.add_all(kb_docs)
-        db.commit()
+        records = [
+            _to_record(doc, embedding)
+            for doc, embedding in zip(valid_docs, embeddings, strict=True)
+        ]
+        get_vector_store().upsert(records)
 
-        logger.info(f"Bulk storage complete: {len(kb_docs)} documents stored")
+        logger.info(f"Bulk storage complete: {len(records)} documents stored")
 
         return {
             "status": "success",
-            "message": f"Stored {len(kb_docs)} documents in knowledge base",
-            "doc_ids": doc_ids,
+            "message": f"Stored {len(records)} documents in knowledge base",
+            "doc_ids": [record.id for record in records],
         }
 
     except Exception as e:
         logger.error(f"Error in bulk storage: {e}")
-        if db:
-            db.rollback()
         return {"status": "error", "message": f"Bulk storage failed: {str(e)}"}
-    finally:
-        if db:
-            db.close()
 
 
 def delete_from_kb(doc_id: str) -> dict:
@@ -262,31 +249,19 @@ def delete_from_kb(doc_id: str) -> dict:
     Returns:
         Dictionary with status
     """
-    db = None
     try:
         logger.info(f"Deleting document: {doc_id}")
 
-        db = get_db_session()
-        doc = db.query(KBDocument).filter(KBDocument.id == doc_id).first()
-
-        if not doc:
+        if not get_vector_store().delete([doc_id]):
             return {"status": "error", "message": "Document not found"}
 
-        db.delete(doc)
-        db.commit()
-
         logger.info(f"Document {doc_id} deleted successfully")
 
         return {"status": "success", "message": "Document deleted from knowledge base"}
 
     except Exception as e:
         logger.error(f"Error deleting document: {e}")
-        if db:
-            db.rollback()
         return {"status": "error", "message": f"Failed to delete document: {str(e)}"}
-    finally:
-        if db:
-            db.close()
 
 
 def delete_bulk_from_kb(doc_ids: list[str]) -> dict:
@@ -299,17 +274,10 @@ def delete_bulk_from_kb(doc_ids: list[str]) -> dict:
     Returns:
         Dictionary with status and count of deleted documents
     """
-    db = None
     try:
         logger.info(f"Bulk deleting {len(doc_ids)} documents")
 
-        db = get_db_session()
-        deleted_count = (
-            db.query(KBDocument)
-            .filter(KBDocument.id.in_(doc_ids))
-            .delete(synchronize_session=False)
-        )
-        db.commit()
+        deleted_count = get_vector_store().delete(doc_ids)
 
         logger.info(f"Deleted {deleted_count} documents")
 
@@ -321,12 +289,35 @@ def delete_bulk_from_kb(doc_ids: list[str]) -> dict:
 
     except Exception as e:
         logger.error(f"Error in bulk delete: {e}")
-        if db:
-            db.rollback()
         return {"status": "error", "message": f"Bulk delete failed: {str(e)}"}
-    finally:
-        if db:
-            db.close()
+
+
+def delete_sources_from_kb(sourcefiles: list[str], company_id: int | None = None) -> dict:
+    """
+    Delete every chunk stored for the given source files (e.g. before re-ingesting
+    a document that changed upstream).
+
+    Args:
+        sourcefiles: Source file identifiers as stored in ``file_name``
+        company_id: Only delete this tenant's chunks (for sources shared across tenants)
+
+    Returns:
+        Dictionary with status and count of deleted documents
+    """
+    try:
+        deleted_count = get_vector_store().delete_by_source(sourcefiles, company_id)
+
+        logger.info(f"Deleted {deleted_count} documents from {len(sourcefiles)} sources")
+
+        return {
+            "status": "success",
+            "message": f"Deleted {deleted_count} documents from knowledge base",
+            "deleted_count": deleted_count,
+        }
+
+    except Exception as e:
+        logger.error(f"Error deleting sources: {e}")
+        return {"status": "error", "message": f"Source delete failed: {str(e)}"}
 
 
 def search_kb(
@@ -339,7 +330,7 @@ def search_kb(
     similarity_threshold: float = 0.5,
 ) -> list[dict]:
     """
-    Search the knowledge base for similar documents using pgvector.
+    Search the knowledge base for similar documents.
 
     Args:
         query: Search query text
@@ -353,100 +344,80 @@ def search_kb(
     Returns:
         List of matching documents with scores
     """
-    db = None
     try:
         logger.info(f"Searching knowledge base for: {query}")
 
         # Generate query embedding
         query_embedding = _get_embedding(query)
 
-        db = get_db_session()
-
-        # Build the similarity search query using pgvector's cosine distance
-        # Note: pgvector uses distance, so we convert to similarity (1 - distance)
-        query_sql = text(
-            """
-            SELECT
-                id,
-                content,
-                sourcefile,
-                title,
-                access_level,
-                company_id,
-                company_reg_no,
-                department,
-                tags,
-                author,
-                doc_type,
-                created_at,
-                last_modified_date,
-                1 - (embedding <=> :query_embedding::vector) as similarity
-            FROM kb_documents
-            WHERE access_level <= :access_level
-            AND (1 - (embedding <=> :query_embedding::vector)) >= :similarity_threshold
-            AND (:company_id IS NULL OR company_id = :company_id)
-            AND (:company_reg_no IS NULL OR company_reg_no = :company_reg_no)
-            AND (:department IS NULL OR department = :department)
-            ORDER BY embedding <=> :query_embedding::vector
-            LIMIT :limit
-        """
-        )
-
-        results = db.execute(
-            query_sql,
-            {
-                "query_embedding": str(query_embedding),
-                "access_level": access_level,
-                "similarity_threshold": similarity_threshold,
-                "company_id": company_id,
-                "company_reg_no": company_reg_no,
-                "department": department,
-                "limit": limit,
-            },
-        ).fetchall()
-
-        # Format results
-        formatted_results = []
-        for row in results:
-            formatted_results.append(
+        store = get_vector_store()
+        with (
+            span(
+                "kb.vector_search",
                 {
-                    "id": str(row.id),
-                    "score": float(row.similarity),
-                    "content": row.content,
-                    "title": row.title,
-                    "source": row.sourcefile,
-                    "sourcefile": row.sourcefile,
-                    "access_level": row.access_level,
-                    "company_id": row.company_id,
-                    "company_reg_no": row.company_reg_no,
-                    "department": row.department,
-                    "tags": row.tags,
-                    "author": row.author,
-                    "doc_type": row.doc_type,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                    "last_modified_date": (
-                        row.last_modified_date.isoformat() if row.last_modified_date else None
-                    ),
-                    "metadata": {
-                        "title": row.title,
-                        "sourcefile": row.sourcefile,
-                        "access_level": row.access_level,
-                        "company_id": row.company_id,
-                        "department": row.department,
-                        "tags": row.tags,
-                    },
+                    "vector.backend": store.name,
+                    "vector.limit": limit,
+                    "vector.min_score": similarity_threshold,
+                    "vector.company_id": company_id,
+                },
+            ) as search_span,
+            timed(VECTOR_QUERY_SECONDS, "vector", backend=store.name, operation="search"),
+        ):
+            hits = store.search(
+                query_embedding,
+                limit=limit,
+                filters=SearchFilter(
+                    max_access_level=access_level,
+                    company_id=company_id,
+                    company_reg_no=company_reg_no,
+                    department=department,
+                ),
+                min_score=similarity_threshold,
+            )
+            search_span.set_attributes(
+                {
+                    "vector.hits": len(hits),
+                    "vector.scores": [round(hit.score, 4) for hit in hits],
                 }
             )
 
+        formatted_results = [_format_hit(hit) for hit in hits]
+
         logger.info(f"Found {len(formatted_results)} matching documents")
         return formatted_results
 
     except Exception as e:
         logger.error(f"Error searching knowledge base: {e}")
         return []
-    finally:
-        if db:
-            db.close()
+
+
+def _format_hit(hit: SearchHit) -> dict:
+    record = hit.record
+    return {
+        "id": record.id,
+        "score": float(hit.score),
+        "content": record.content,
+        "title": record.title,
+        "source": record.sourcefile,
+        "sourcefile": record.sourcefile,
+        "access_level": record.access_level,
+        "company_id": record.company_id,
+        "company_reg_no": record.company_reg_no,
+        "department": record.department,
+        "tags": record.tags,
+        "author": record.author,
+        "doc_type": record.doc_type,
+        "created_at": record.created_at,
+        "last_modified_date": record.last_modified_date,
+        "metadata": {
+            "title": record.title,
+            "sourcefile": record.sourcefile,
+            "access_level": record.access_level,
+            "company_id": record.company_id,
+            "department": record.department,
+            "tags": record.tags,
+        },
+    }
 
 
 def search_kb_hybrid(
@@ -470,9 +441,30 @@ def search_kb_hybrid(
 
     Returns:
         List of matching documents with combined scores
+
+    Keyword ranking uses PostgreSQL full-text search; on other backends this
+    logs a warning and returns plain semantic results.
     """
     db = None
     try:
+        backend = _backend()
+        if backend != "pgvector":
+            logger.warning(
+                f"Hybrid search needs the pgvector backend, not {backend}; "
+                "returning semantic results only"
+            )
+            results = search_kb(
+                query,
+                limit=limit,
+                access_level=access_level,
+                company_id=company_id,
+                similarity_threshold=0.0,
+            )
+            return [
+                {**result, "semantic_score": result["score"], "keyword_score": 0.0}
+                for result in results
+            ]
+
         logger.info(f"Hybrid searching knowledge base for: {query}")
 
         # Generate query embedding
@@ -486,10 +478,10 @@ def search_kb_hybrid(
             WITH semantic_search AS (
                 SELECT
                     id,
-                    1 - (embedding <=> :query_embedding::vector) as semantic_score
-                FROM kb_documents
-                WHERE access_level <= :access_level
-                AND (:company_id IS NULL OR company_id = :company_id)
+                    1 - (embedding <=> CAST(:query_embedding AS vector)) as semantic_score
+                FROM kbdocuments
+                WHERE accesslevel <= :access_level
+                AND (:company_id IS NULL OR companyid = :company_id)
             ),
             keyword_search AS (
                 SELECT
@@ -498,50 +490,63 @@ def search_kb_hybrid(
                         to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, '')),
                         plainto_tsquery('english', :query)
                     ) as keyword_score
-                FROM kb_documents
-                WHERE access_level <= :access_level
-                AND (:company_id IS NULL OR company_id = :company_id)
+                FROM kbdocuments
+                WHERE accesslevel <= :access_level
+                AND (:company_id IS NULL OR companyid = :company_id)
             )
             SELECT
                 d.id,
                 d.content,
                 d.sourcefile,
                 d.title,
-                d.access_level,
-                d.company_id,
-                d.company_reg_no,
+                d.accesslevel,
+                d.companyid,
+                d.companyregno,
                 d.department,
                 d.tags,
                 d.author,
-                d.doc_type,
-                d.created_at,
-                d.last_modified_date,
+                d.doctype,
+                d.createdat,
+                d.lastmodifieddate,
                 COALESCE(s.semantic_score, 0) as semantic_score,
                 COALESCE(k.keyword_score, 0) as keyword_score,
                 (COALESCE(s.semantic_score, 0) * :semantic_weight +
                  COALESCE(k.keyword_score, 0) * :keyword_weight) as combined_score
-            FROM kb_documents d
+            FROM kbdocuments d
             LEFT JOIN semantic_search s ON d.id = s.id
             LEFT JOIN keyword_search k ON d.id = k.id
-            WHERE d.access_level <= :access_level
-            AND (:company_id IS NULL OR d.company_id = :company_id)
+            WHERE d.accesslevel <= :access_level
+            AND (:company_id IS NULL OR d.companyid = :company_id)
             ORDER BY combined_score DESC
             LIMIT :limit
         """
         )
 
-        results = db.execute(
-            query_sql,
-            {
-                "query_embedding": str(query_embedding),
-                "query": query,
-                "access_level": access_level,
-                "company_id": company_id,
-                "semantic_weight": semantic_weight,
-                "keyword_weight": keyword_weight,
-                "limit": limit,
-            },
-        ).fetchall()
+        with (
+            span(
+                "kb.hybrid_search",
+                {"vector.backend": "pgvector", "vector.limit": limit},
+            ) as search_span,
+            timed(VECTOR_QUERY_SECONDS, "vector", backend="pgvector", operation="hybrid"),
+        ):
+            results = db.execute(
+                query_sql,
+                {
+                    "query_embedding": str(query_embedding),
+                    "query": query,
+                    "access_level": access_level,
+                    "company_id": company_id,
+                    "semantic_weight": semantic_weight,
+                    "keyword_weight": keyword_weight,
+                    "limit": limit,
+                },
+            ).fetchall()
+            search_span.set_attributes(
+                {
+                    "vector.hits": len(results),
+                    "vector.scores": [round(float(row.combined_score), 4) for row in results],
+                }
+            )
 
         # Format results
         formatted_results = []
@@ -556,17 +561,17 @@ def search_kb_hybrid(
                     "title": row.title,
                     "source": row.sourcefile,
                     "sourcefile": row.sourcefile,
-                    "access_level": row.access_level,
-                    "company_id": row.company_id,
-                    "company_reg_no": row.company_reg_no,
+                    "access_level": row.accesslevel,
+                    "company_id": row.companyid,
+                    "company_reg_no": row.companyregno,
                     "department": row.department,
                     "tags": row.tags,
                     "author": row.author,
-                    "doc_type": row.doc_type,
+                    "doc_type": row.doctype,
                     "metadata": {
                         "title": row.title,
                         "sourcefile": row.sourcefile,
-                        "access_level": row.access_level,
+                        "access_level": row.accesslevel,
                     },
                 }
             )
@@ -594,6 +599,7 @@ def get_document_by_id(doc_id: str) -> dict | None:
     """
     db = None
     try:
+        _require_pgvector("get_document_by_id")
         db = get_db_session()
         doc = db.query(KBDocument).filter(KBDocument.id == doc_id).first()
 
@@ -605,16 +611,16 @@ def get_document_by_id(doc_id: str) -> dict | None:
             "content": doc.content,
             "title": doc.title,
             "sourcefile": doc.sourcefile,
-            "access_level": doc.access_level,
-            "company_id": doc.company_id,
-            "company_reg_no": doc.company_reg_no,
+            "access_level": doc.accesslevel,
+            "company_id": doc.companyid,
+            "company_reg_no": doc.companyregno,
             "department": doc.department,
             "tags": doc.tags,
             "author": doc.author,
-            "doc_type": doc.doc_type,
-            "created_at": doc.created_at.isoformat() if doc.created_at else None,
+            "doc_type": doc.doctype,
+            "created_at": doc.createdat.isoformat() if doc.createdat else None,
             "last_modified_date": (
-                doc.last_modified_date.isoformat() if doc.last_modified_date else None
+                doc.lastmodifieddate.isoformat() if doc.lastmodifieddate else None
             ),
         }
 
@@ -641,6 +647,7 @@ def update_document(doc_id: str, updates: dict) -> dict:
     try:
         logger.info(f"Updating document: {doc_id}")
 
+        _require_pgvector("update_document")
         db = get_db_session()
         doc = db.query(KBDocument).filter(KBDocument.id == doc_id).first()
 
@@ -649,7 +656,7 @@ def update_document(doc_id: str, updates: dict) -> dict:
 
         # Update fields
         for key, value in updates.items():
-            if hasattr(doc, key) and key not in ["id", "embedding", "created_at"]:
+            if hasattr(doc, key) and key not in ["id", "embedding", "createdat"]:
                 setattr(doc, key, value)
 
         # If content is updated, regenerate embedding
@@ -657,7 +664,7 @@ def update_document(doc_id: str, updates: dict) -> dict:
             logger.info("Regenerating embedding for updated content...")
             doc.embedding = _get_embedding(updates["content"])
 
-        doc.updated_at = datetime.now()
+        doc.updatedat = datetime.now()
         db.commit()
 
         logger.info(f"Document {doc_id} updated successfully")
@@ -692,42 +699,34 @@ def list_documents(
         department: Optional department filter
 
     Returns:
-        List of document metadata (without content for efficiency)
+        List of document metadata (without content for efficiency), newest first
     """
-    db = None
     try:
-        db = get_db_session()
-        query = db.query(KBDocument)
-
-        if access_level is not None:
-            query = query.filter(KBDocument.access_level <= access_level)
-        if company_id is not None:
-            query = query.filter(KBDocument.company_id == company_id)
-        if department is not None:
-            query = query.filter(KBDocument.department == department)
-
-        docs = query.order_by(KBDocument.created_at.desc()).offset(offset).limit(limit).all()
+        records = get_vector_store().list_records(
+            SearchFilter(
+                max_access_level=access_level, company_id=company_id, department=department
+            ),
+            limit=limit,
+            offset=offset,
+        )
 
         return [
             {
-                "id": str(doc.id),
-                "title": doc.title,
-                "sourcefile": doc.sourcefile,
-                "access_level": doc.access_level,
-                "company_id": doc.company_id,
-                "department": doc.department,
-                "doc_type": doc.doc_type,
-                "created_at": doc.created_at.isoformat() if doc.created_at else None,
+                "id": record.id,
+                "title": record.title,
+                "sourcefile": record.sourcefile,
+                "access_level": record.access_level,
+                "company_id": record.company_id,
+                "department": record.department,
+                "doc_type": record.doc_type,
+                "created_at": record.created_at,
             }
-            for doc in docs
+            for record in records
         ]
 
     except Exception as e:
         logger.error(f"Error listing documents: {e}")
         return []
-    finally:
-        if db:
-            db.close()
 
 
 def get_document_count(
@@ -744,24 +743,14 @@ def get_document_count(
     Returns:
         Count of documents
     """
-    db = None
     try:
-        db = get_db_session()
-        query = db.query(KBDocument)
-
-        if access_level is not None:
-            query = query.filter(KBDocument.access_level <= access_level)
-        if company_id is not None:
-            query = query.filter(KBDocument.company_id == company_id)
-
-        return query.count()
+        return get_vector_store().count(
+            SearchFilter(max_access_level=access_level, company_id=company_id)
+        )
 
     except Exception as e:
         logger.error(f"Error counting documents: {e}")
         return 0
-    finally:
-        if db:
-            db.close()
 
 
 def reindex_document(doc_id: str) -> dict:
@@ -778,6 +767,7 @@ def reindex_document(doc_id: str) -> dict:
     try:
         logger.info(f"Reindexing document: {doc_id}")
 
+        _require_pgvector("reindex_document")
         db = get_db_session()
         doc = db.query(KBDocument).filter(KBDocument.id == doc_id).first()
 
@@ -786,7 +776,7 @@ def reindex_document(doc_id: str) -> dict:
 
         # Regenerate embedding
         doc.embedding = _get_embedding(doc.content)
-        doc.updated_at = datetime.now()
+        doc.updatedat = datetime.now()
         db.commit()
 
         logger.info(f"Document {doc_id} reindexed successfully")
@@ -814,6 +804,7 @@ def reindex_all_documents() -> dict:
     try:
         logger.info("Reindexing all documents...")
 
+        _require_pgvector("reindex_all_documents")
         db = get_db_session()
         docs = db.query(KBDocument).all()
 
@@ -821,7 +812,7 @@ def reindex_all_documents() -> dict:
         for doc in docs:
             try:
                 doc.embedding = _get_embedding(doc.content)
-                doc.updated_at = datetime.now()
+                doc.updatedat = datetime.now()
                 count += 1
                 if count % 10 == 0:
                     logger.info(f"Reindexed {count} documents...")
@@ -1,6 +1,6 @@
 import argparse
 
-from store_data_in_kb import store_confluence_in_qdrant
+from app.connectors.confluence_crawler import store_confluence_in_kb
 
 
 def main(args):
@@ -11,9 +11,7 @@ def main(args):
     # store_sharepoint_in_azure_kb(hostname, sitepath, index)
 
     # store_confluence_in_azure_kb(confluence_url, username, api_key, space_key, index)
-    store_confluence_in_qdrant(
-        confluence_url, username, api_key, space_key, collection_name="confluence-kb"
-    )
+    store_confluence_in_kb(confluence_url, username, api_key, space_key)
 
 
 if __name__ == "__main__":
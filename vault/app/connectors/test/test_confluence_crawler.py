@@ -0,0 +1,136 @@
+import httpx
+import pytest
+
+from app.connectors import confluence_crawler
+from app.connectors.confluence_crawler import ConfluenceCrawler, confluence_root
+from app.connectors.kb_writer import KBBatchWriter
+
+
+class ConfluenceStandIn:
+    """Just enough of the Confluence Cloud REST API: paged CQL search and page bodies."""
+
+    def __init__(self, versions: dict[str, int]):
+        self.versions = versions
+        self.requests: list[httpx.Request] = []
+        self.body_batches: list[list[str]] = []
+
+    def _page(self, page_id: str) -> dict:
+        return {
+            "id": page_id,
+            "title": f"Page {page_id}",
+            "ancestors": [{"title": "HR"}],
+            "version": {
+                "number": self.versions[page_id],
+                "when": "2026-01-01",
+                "by": {"displayName": "Ada"},
+            },
+            "_links": {"webui": f"/spaces/HR/pages/{page_id}"},
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        assert request.url.path == "/wiki/rest/api/content/search"
+        cql = request.url.params["cql"]
+        if cql.startswith("id in"):
+            ids = cql.removeprefix("id in (").removesuffix(")").split(",")
+            self.body_batches.append(ids)
+            results = [
+                {**self._page(page_id), "body": {"storage": {"value": f"<p>Body {page_id}</p>"}}}
+                for page_id in ids
+                if page_id in self.versions
+            ]
+            return httpx.Response(200, json={"results": results})
+
+        # Two pages per listing page; Cloud's next link is relative to /wiki
+        page_ids = sorted(self.versions)
+        start = int(request.url.params.get("cursor", 0))
+        body = {"results": [self._page(page_id) for page_id in page_ids[start : start + 2]]}
+        if start + 2 < len(page_ids):
+            body["_links"] = {
+                "next": f"/rest/api/content/search?cql={cql}&limit=2&cursor={start + 2}"
+            }
+        return httpx.Response(200, json=body)
+
+
+@pytest.fixture(autouse=True)
+def _small_batches(monkeypatch):
+    monkeypatch.setattr(confluence_crawler.settings, "CONFLUENCE_LIST_PAGE_SIZE", 2)
+    monkeypatch.setattr(confluence_crawler.settings, "CONFLUENCE_BODY_BATCH_SIZE", 2)
+
+
+def _crawler(site, tmp_path, stored, deleted):
+    def store_batch(docs):
+        stored.extend(docs)
+        return {"status": "success"}
+
+    def delete_sources(sources):
+        deleted.extend(sources)
+        return {"status": "success"}
+
+    return ConfluenceCrawler(
+        "https://acme.atlassian.net",
+        "user",
+        "token",
+        state_path=tmp_path / "state.json",
+        writer=KBBatchWriter(batch_size=10, store_batch=store_batch, delete_sources=delete_sources),
+        transport=httpx.MockTransport(site),
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://acme.atlassian.net",
+        "https://acme.atlassian.net/wiki/",
+        "https://acme.atlassian.net/wiki/rest/api",
+    ],
+)
+def test_cloud_urls_get_one_wiki_suffix(url):
+    assert confluence_root(url) == "https://acme.atlassian.net/wiki"
+
+
+def test_server_urls_are_used_as_given():
+    assert confluence_root("https://confluence.acme.de/") == "https://confluence.acme.de"
+
+
+async def test_crawl_pages_listing_and_fetches_bodies_in_batches(tmp_path):
+    site = ConfluenceStandIn({"1": 1, "2": 1, "3": 1, "4": 1, "5": 1})
+    stored = []
+
+    async with _crawler(site, tmp_path, stored, []) as confluence:
+        stats = await confluence.crawl_space("HR", metadata={"company_id": 7})
+
+    assert (stats.listed, stats.ingested, stats.unchanged) == (5, 5, 0)
+    listings = [r for r in site.requests if r.url.params["cql"].startswith("space=")]
+    assert [r.url.params.get("cursor") for r in listings] == [None, "2", "4"]
+    # Each listing page's changed pages are fetched together, at most two per request
+    assert sorted(site.body_batches) == [["1", "2"], ["3", "4"], ["5"]]
+    bodies = [r for r in site.requests if r.url.params["cql"].startswith("id in")]
+    assert {r.url.params["expand"] for r in bodies} == {"body.storage,version"}
+    assert {doc["file_name"] for doc in stored} == {
+        f"https://acme.atlassian.net/wiki/spaces/HR/pages/{i}" for i in "12345"
+    }
+    assert all(doc["company_id"] == 7 and doc["author"] == "Ada" for doc in stored)
+
+
+async def test_recrawl_fetches_only_changed_versions(tmp_path):
+    site = ConfluenceStandIn({"1": 1, "2": 1, "3": 1})
+    async with _crawler(site, tmp_path, [], []) as confluence:
+        await confluence.crawl_space("HR")
+
+    site.versions = {"1": 1, "2": 2}
+    site.body_batches.clear()
+    stored, deleted = [], []
+    async with _crawler(site, tmp_path, stored, deleted) as confluence:
+        stats = await confluence.crawl_space("HR")
+
+    assert (stats.listed, stats.ingested, stats.unchanged, stats.deleted) == (2, 1, 1, 1)
+    assert site.body_batches == [["2"]]
+    assert {doc["file_name"] for doc in stored} == {
+        "https://acme.atlassian.net/wiki/spaces/HR/pages/2"
+    }
+    # The old chunks of the edited page and of the removed page are purged
+    assert sorted(deleted) == [
+        "https://acme.atlassian.net/wiki/spaces/HR/pages/2",
+        "https://acme.atlassian.net/wiki/spaces/HR/pages/3",
+    ]
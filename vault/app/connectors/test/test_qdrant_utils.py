@@ -0,0 +1,98 @@
+import hashlib
+import threading
+import time
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from app.connectors.qdrant_utils import PipelinedUpserter, upsert_documents_pipelined
+
+DIM = 8
+
+
+def fake_embed(texts):
+    """Deterministic embeddings, slow enough for the stages to overlap."""
+    time.sleep(0.01)
+    return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:DIM]] for text in texts]
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "kb", vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE)
+    )
+    return client
+
+
+def _docs(n):
+    return [
+        {"id": i + 1, "content": f"chunk {i}", "metadata": {"sourcefile": f"doc{i % 7}.txt"}}
+        for i in range(n)
+    ]
+
+
+def test_pipelined_upsert_stores_every_batch(client):
+    upserted = upsert_documents_pipelined(
+        "kb", _docs(1050), batch_size=100, client=client, embed=fake_embed
+    )
+
+    assert upserted == 1050
+    assert client.count("kb").count == 1050
+    point = client.retrieve("kb", [42])[0]
+    assert point.payload == {"sourcefile": "doc6.txt", "content": "chunk 41"}
+
+
+def test_embedding_overlaps_upsert(client):
+    upserting = threading.Event()
+    overlapped = []
+
+    def slow_upsert(**kwargs):
+        upserting.set()
+        time.sleep(0.05)
+        upserting.clear()
+        return QdrantClient.upsert(client, **kwargs)
+
+    def embed(texts):
+        overlapped.append(upserting.is_set())
+        return fake_embed(texts)
+
+    client.upsert = slow_upsert
+    with PipelinedUpserter("kb", client=client, embed=embed, upsert_parallelism=1) as upserter:
+        for i in range(0, 500, 100):
+            upserter.add(_docs(500)[i : i + 100])
+
+    assert client.count("kb").count == 500
+    assert any(overlapped[1:])
+
+
+def test_failed_batch_is_raised(client):
+    def broken_embed(texts):
+        raise RuntimeError("ollama down")
+
+    with pytest.raises(RuntimeError, match="ollama down"):
+        with PipelinedUpserter("kb", client=client, embed=broken_embed) as upserter:
+            upserter.add(_docs(10))
+
+
+def test_bulk_load_restores_indexing(client):
+    with PipelinedUpserter("kb", client=client, embed=fake_embed, bulk_load=True) as upserter:
+        upserter.add(_docs(10))
+
+    assert client.get_collection("kb").config.optimizer_config.indexing_threshold == 20000
+
+
+def test_index_wait_is_bounded(client, caplog):
+    info = client.get_collection("kb")
+    stuck = info.model_copy(update={"status": models.CollectionStatus.YELLOW})
+    client.get_collection = lambda name: stuck
+
+    started = time.monotonic()
+    with PipelinedUpserter(
+        "kb", client=client, embed=fake_embed, bulk_load=True, index_wait_timeout=0.2
+    ) as upserter:
+        upserter.add(_docs(10))
+
+    assert time.monotonic() - started < 5
+    assert client.count("kb").count == 10
+    assert "not waiting for the index rebuild" in caplog.text
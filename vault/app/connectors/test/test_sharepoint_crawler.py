@@ -0,0 +1,255 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.connectors.kb_writer import KBBatchWriter
+from app.connectors.sharepoint_crawler import SharePointCrawler
+
+FILES = {
+    "f1": b"Quarterly report. " * 10,
+    "f2": b"# Handbook\nBe nice.",
+    "f4": b"Updated policy text.",
+}
+
+
+def _file(item_id, name, ctag):
+    return {
+        "id": item_id,
+        "name": name,
+        "file": {},
+        "size": 100,
+        "cTag": ctag,
+        "webUrl": f"https://contoso.sharepoint.com/docs/{name}",
+    }
+
+
+class GraphStandIn(BaseHTTPRequestHandler):
+    """Just enough of Microsoft Graph for the crawler: token, delta pages, content."""
+
+    throttled: set = set()
+    missing: set = set()
+    downloads: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body, status=200):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._json({"access_token": "token", "expires_in": 3600})
+
+    def do_GET(self):
+        base = f"http://{self.headers['Host']}"
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        assert self.headers["Authorization"] == "Bearer token"
+
+        if url.path == "/drives/d1/root/delta":
+            if query.get("token") == ["2"]:
+                # Nothing changed since the last delta
+                self._json(
+                    {"value": [], "@odata.deltaLink": f"{base}/drives/d1/root/delta?token=2"}
+                )
+            elif "token" in query:
+                self._json(
+                    {
+                        "value": [
+                            {"id": "f2", "deleted": {}},
+                            _file("f4", "policy.txt", "v1"),
+                        ],
+                        "@odata.deltaLink": f"{base}/drives/d1/root/delta?token=2",
+                    }
+                )
+            elif "page" in query:
+                self._json(
+                    {
+                        "value": [_file("f2", "handbook.md", "v1"), _file("f3", "demo.mp4", "v1")],
+                        "@odata.deltaLink": f"{base}/drives/d1/root/delta?token=1",
+                    }
+                )
+            else:
+                self._json(
+                    {
+                        "value": [
+                            {"id": "d", "name": "Shared", "folder": {}},
+                            _file("f1", "report.txt", "v1"),
+                        ],
+                        "@odata.nextLink": f"{base}/drives/d1/root/delta?page=2",
+                    }
+                )
+            return
+
+        item_id = url.path.split("/")[-2]
+        if item_id not in self.throttled:
+            # Throttle the first download of every file
+            self.throttled.add(item_id)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if item_id in self.missing:
+            # Fail one download
+            self.missing.discard(item_id)
+            self._json({"error": {"code": "itemNotFound"}}, status=404)
+            return
+        self.downloads.append(item_id)
+        body = FILES[item_id]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def graph_server():
+    GraphStandIn.throttled = set()
+    GraphStandIn.missing = set()
+    GraphStandIn.downloads = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GraphStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _crawler(graph_server, tmp_path, stored, deleted):
+    def store_batch(docs):
+        stored.append(docs)
+        return {"status": "success"}
+
+    def delete_sources(sources):
+        deleted.extend(sources)
+        return {"status": "success"}
+
+    return SharePointCrawler(
+        "tenant",
+        "client",
+        "secret",
+        state_path=tmp_path / "state.json",
+        work_dir=tmp_path / "work",
+        concurrency=4,
+        writer=KBBatchWriter(batch_size=2, store_batch=store_batch, delete_sources=delete_sources),
+        graph_url=graph_server,
+        token_url=f"{graph_server}/token",
+    )
+
+
+async def test_delta_crawl_ingests_then_applies_changes(graph_server, tmp_path):
+    stored, deleted = [], []
+
+    def crawler():
+        return _crawler(graph_server, tmp_path, stored, deleted)
+
+    async with crawler() as sharepoint:
+        stats = await sharepoint.crawl_drive("d1", metadata={"company_id": 7})
+
+    assert stats.mode == "full"
+    assert (stats.listed, stats.ingested, stats.skipped) == (3, 2, 1)
+    assert sorted(GraphStandIn.downloads) == ["f1", "f2"]
+    docs = [doc for batch in stored for doc in batch]
+    assert {doc["file_name"].rsplit("/", 1)[-1] for doc in docs} == {"report.txt", "handbook.md"}
+    assert all(doc["company_id"] == 7 for doc in docs)
+    assert not list((tmp_path / "work").iterdir())
+
+    stored.clear()
+    async with crawler() as sharepoint:
+        stats = await sharepoint.crawl_drive("d1")
+
+    assert stats.mode == "delta"
+    assert (stats.ingested, stats.deleted) == (1, 1)
+    assert deleted == ["https://contoso.sharepoint.com/docs/handbook.md"]
+    assert [doc["file_name"] for batch in stored for doc in batch] == [
+        "https://contoso.sharepoint.com/docs/policy.txt"
+    ]
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state["d1"]["delta_link"].endswith("token=2")
+    assert set(state["d1"]["items"]) == {"f1", "f4"}
+
+
+async def test_delta_crawl_retries_failed_files(graph_server, tmp_path):
+    stored = []
+
+    def crawler():
+        return _crawler(graph_server, tmp_path, stored, [])
+
+    async with crawler() as sharepoint:
+        await sharepoint.crawl_drive("d1")
+
+    GraphStandIn.missing = {"f4"}
+    async with crawler() as sharepoint:
+        stats = await sharepoint.crawl_drive("d1")
+
+    assert (stats.ingested, stats.failed) == (0, 1)
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state["d1"]["delta_link"].endswith("token=2")
+    assert set(state["d1"]["failed"]) == {"f4"}
+
+    # The new delta link has no changes, but the failed file is tried again
+    stored.clear()
+    async with crawler() as sharepoint:
+        stats = await sharepoint.crawl_drive("d1")
+
+    assert (stats.retried, stats.ingested, stats.failed) == (1, 1, 0)
+    assert [doc["file_name"] for batch in stored for doc in batch] == [
+        "https://contoso.sharepoint.com/docs/policy.txt"
+    ]
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state["d1"]["failed"] == {}
+    assert set(state["d1"]["items"]) == {"f1", "f4"}
+
+
+class _FolderCrawler:
+    """SharePointCrawler stand-in recording crawl_folder calls."""
+
+    calls: list = []
+
+    def __init__(self, tenant_id, client_id, client_secret, *, work_dir=None):
+        self.work_dir = work_dir
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def crawl_folder(self, drive_id, folder_id="root", metadata=None):
+        self.calls.append((self.work_dir, drive_id, folder_id, metadata))
+        return "stats"
+
+
+@pytest.fixture
+def folder_client(monkeypatch):
+    from app.connectors import sharepoint_crawler
+    from app.connectors.sharepoint_client import SharePointClient
+
+    _FolderCrawler.calls = []
+    monkeypatch.setattr(sharepoint_crawler, "SharePointCrawler", _FolderCrawler)
+    # Skip the token request in __init__
+    client = SharePointClient.__new__(SharePointClient)
+    client.tenant_id, client.client_id, client.client_secret = "tenant", "client", "secret"
+    return client
+
+
+async def test_process_folder_contents_can_be_awaited(folder_client):
+    stats = await folder_client.process_folder_contents_async(
+        "site", "d1", "folder", metadata={"company_id": 7}
+    )
+
+    assert stats == "stats"
+    assert _FolderCrawler.calls == [(None, "d1", "folder", {"company_id": 7})]
+
+
+def test_process_folder_contents_runs_its_own_loop_for_scripts(folder_client, tmp_path):
+    assert folder_client.process_folder_contents("site", "d1", "f", local_folder_path=tmp_path)
+    assert _FolderCrawler.calls == [(tmp_path, "d1", "f", None)]
@@ -0,0 +1,54 @@
+import pytest
+
+from app.connectors import store_data_in_kb as kb
+from app.services.vector_store import VectorRecord, create_vector_store, set_vector_store
+
+DIMENSIONS = 4
+
+
+def _record(i: int, company_id: int) -> VectorRecord:
+    return VectorRecord(
+        id=f"00000000-0000-0000-0000-{i:012d}",
+        content=f"chunk {i}",
+        embedding=[1.0, float(i), 0.0, 0.5],
+        sourcefile=f"doc-{i}.pdf",
+        title=f"Doc {i}",
+        access_level=1 + i % 2,
+        company_id=company_id,
+        created_at=f"2026-01-{i + 1:02d}T00:00:00",
+    )
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = create_vector_store("memory")
+    store.upsert([_record(i, company_id=1 + i % 2) for i in range(6)])
+    set_vector_store(store)
+    monkeypatch.setattr(kb, "_get_embedding", lambda text: [1.0, 0.0, 0.0, 0.5])
+    yield store
+    set_vector_store(None)
+
+
+def test_list_count_and_delete_go_through_the_vector_store(store):
+    listed = kb.list_documents(company_id=1, limit=2)
+    assert [doc["title"] for doc in listed] == ["Doc 4", "Doc 2"]
+    assert listed[0]["created_at"] == "2026-01-05T00:00:00"
+    assert kb.get_document_count(company_id=2) == 3
+    assert kb.get_document_count(access_level=1) == 3
+
+    assert kb.delete_from_kb(listed[0]["id"])["status"] == "success"
+    assert kb.delete_from_kb(listed[0]["id"])["message"] == "Document not found"
+    result = kb.delete_bulk_from_kb([listed[1]["id"], "not-a-uuid"])
+    assert result["deleted_count"] == 1
+    assert store.count() == 4
+
+
+def test_postgres_only_operations_refuse_other_backends(store):
+    # Hybrid search degrades to semantic ranking
+    hits = kb.search_kb_hybrid("chunk", limit=2, access_level=2, company_id=1)
+    assert len(hits) == 2
+    assert all(hit["keyword_score"] == 0.0 for hit in hits)
+
+    assert kb.get_document_by_id(_record(0, 1).id) is None
+    assert kb.update_document(_record(0, 1).id, {"title": "x"})["status"] == "error"
+    assert "pgvector" in kb.reindex_all_documents()["message"]
@@ -0,0 +1,179 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.connectors.kb_writer import KBBatchWriter
+from app.connectors.web_crawler import WebCrawler, parse_page
+
+
+def _html(title, body, head=""):
+    return f"<html><head><title>{title}</title>{head}</head><body>{body}</body></html>"
+
+
+SITE = {
+    "robots.txt": "User-agent: *\nDisallow: /wiki/private/\nSitemap: {base}/sitemap.xml\n",
+    "sitemap.xml": (
+        '<?xml version="1.0"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>{base}/wiki/orphan.html</loc></url></urlset>"
+    ),
+    "index.html": _html("Outside", "Not part of the wiki"),
+    "wiki/index.html": _html(
+        "Wiki home",
+        '<nav><a href="/wiki/a.html">A</a></nav><p>Welcome to the wiki.</p>'
+        '<a href="b.html">B</a> <a href="private/secret.html">secret</a> '
+        '<a href="/index.html">up</a> <a href="logo.png">logo</a> '
+        '<a href="https://external.example/">elsewhere</a> <a href="#top">top</a>',
+    ),
+    "wiki/a.html": _html("Page A", '<p>Alpha content.</p><a href="c.html">C</a>'),
+    "wiki/b.html": _html("Page B", "<p>Draft.</p>", head='<meta name="robots" content="noindex">'),
+    "wiki/c.html": _html("Page C", '<p>Gamma content.</p><a href="d.html">D</a>'),
+    "wiki/d.html": _html("Page D", "<p>Too deep.</p>"),
+    "wiki/orphan.html": _html("Orphan", "<p>Only in the sitemap.</p>"),
+    "wiki/private/secret.html": _html("Secret", "<p>Keep out.</p>"),
+    "wiki/logo.png": "not really a png",
+}
+
+
+class StaticSite(SimpleHTTPRequestHandler):
+    """The stdlib static file server (Last-Modified / If-Modified-Since), instrumented."""
+
+    requests: list = []
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def log_request(self, code="-", size="-"):
+        self.requests.append((self.path, int(code)))
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            time.sleep(0.02)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "site"
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(StaticSite, directory=str(root))
+    )
+    base = f"http://127.0.0.1:{server.server_port}"
+    for name, content in SITE.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content.replace("{base}", base))
+        # Well in the past, so an edit in the test gets a newer Last-Modified
+        os.utime(path, (time.time() - 3600, time.time() - 3600))
+    StaticSite.requests = []
+    StaticSite.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base, root
+    server.shutdown()
+
+
+def test_parse_page_extracts_links_and_directives():
+    page = parse_page(
+        _html(
+            "T",
+            '<header>Menu</header><p>Body</p><a href="x.html#s">x</a>'
+            '<a href="mailto:a@b.c">m</a><a rel="nofollow" href="y.html">y</a>',
+            head='<meta name="ROBOTS" content="noindex, follow"><base href="/docs/">',
+        ),
+        "http://host:80/start.html",
+    )
+    assert page.links == ["http://host/docs/x.html"]
+    assert page.text == "Body\nx\nm\ny"
+    assert (page.index, page.follow) == (False, True)
+
+
+async def test_crawl_then_conditional_recrawl(site, tmp_path):
+    base, root = site
+    stored, deleted = [], []
+
+    def store_batch(docs):
+        stored.extend(docs)
+        return {"status": "success"}
+
+    def delete_sources(sources):
+        deleted.extend(sources)
+        return {"status": "success"}
+
+    def crawler():
+        return WebCrawler(
+            state_path=tmp_path / "state.json",
+            writer=KBBatchWriter(
+                batch_size=2, store_batch=store_batch, delete_sources=delete_sources
+            ),
+            concurrency=8,
+            per_host_concurrency=2,
+        )
+
+    async with crawler() as web:
+        stats = await web.crawl(
+            [f"{base}/wiki/index.html"], max_depth=2, metadata={"company_id": 7}
+        )
+
+    titles = {doc["file_title"] for doc in stored}
+    assert titles == {"Wiki home", "Page A", "Page C", "Orphan"}
+    assert all(doc["company_id"] == 7 and doc["doc_type"] == "website" for doc in stored)
+    # Skipped: private/ (robots.txt), the noindex page B and logo.png
+    assert (stats.ingested, stats.skipped) == (4, 3)
+    paths = {path for path, _ in StaticSite.requests}
+    # Out of scope, disallowed by robots.txt, or deeper than max_depth
+    assert not paths & {"/index.html", "/wiki/private/secret.html", "/wiki/d.html"}
+    assert StaticSite.peak <= 2
+
+    # Unchanged pages answer 304 and their links come from the state; A was
+    # edited and C deleted
+    stored.clear()
+    StaticSite.requests = []
+    (root / "wiki/c.html").unlink()
+    (root / "wiki/a.html").write_text(
+        _html("Page A", '<p>Alpha, revised.</p><a href="c.html">C</a>')
+    )
+    async with crawler() as web:
+        stats = await web.crawl(
+            [f"{base}/wiki/index.html"], max_depth=2, metadata={"company_id": 7}
+        )
+
+    assert ("/wiki/index.html", 304) in StaticSite.requests
+    assert (stats.ingested, stats.unchanged, stats.deleted) == (1, 3, 1)
+    assert [doc["file_title"] for doc in stored] == ["Page A"]
+    assert "Alpha, revised." in stored[0]["content"]
+    assert sorted(deleted) == [f"{base}/wiki/a.html", f"{base}/wiki/c.html"]
+
+
+async def test_single_page_by_default(site, tmp_path):
+    base, _ = site
+    stored = []
+
+    def store_batch(docs):
+        stored.extend(docs)
+        return {"status": "success"}
+
+    async with WebCrawler(writer=KBBatchWriter(store_batch=store_batch)) as web:
+        stats = await web.crawl(
+            [f"{base}/wiki/a.html"], max_depth=0, titles={f"{base}/wiki/a.html": "Mine"}
+        )
+
+    assert stats.ingested == 1
+    assert [doc["file_title"] for doc in stored] == ["Mine"]
+    assert stored[0]["content"].startswith(f"# Mine\nSource: {base}/wiki/a.html\n\nAlpha content.")
+    # No sitemap lookups for a single page
+    assert {path for path, _ in StaticSite.requests} == {"/robots.txt", "/wiki/a.html"}
@@ -0,0 +1,565 @@
+"""
+Website Crawler
+Async crawler that feeds a website (an internal wiki, a docs site, ...) into
+the knowledge base.
+
+Starting from one or more URLs, and the sitemaps the site lists in
+robots.txt, links are followed within the start URL's host and directory up
+to ``max_depth`` hops and ``max_pages`` pages. robots.txt rules, Crawl-delay
+and ``<meta name="robots">`` are honoured, and each host gets at most
+``WEB_CRAWL_PER_HOST_CONCURRENCY`` requests at a time.
+
+Re-crawls send the ``ETag``/``Last-Modified`` validators from the previous
+crawl. A 304 (or an unchanged body) skips re-embedding, and the links stored
+for the page keep the crawl going. Pages are chunked and handed to a
+KBBatchWriter as they arrive, so embedding overlaps with fetching.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from app.config import settings
+from app.connectors.http_retry import RETRY_STATUSES, retry_delay
+from app.connectors.kb_writer import KBBatchWriter, KBIngestError, build_chunk_documents
+
+logger = logging.getLogger(__name__)
+
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Sitemap indexes can nest; bound how many sitemap files one crawl reads
+_MAX_SITEMAPS = 50
+
+# Crawls of different sites can share a state file
+_state_file_lock = threading.Lock()
+
+
+class WebCrawlError(RuntimeError):
+    """Raised when a URL keeps failing after retries."""
+
+
+@dataclass
+class WebCrawlStats:
+    fetched: int = 0
+    ingested: int = 0
+    unchanged: int = 0
+    # Disallowed by robots.txt, noindex, not HTML or too large
+    skipped: int = 0
+    failed: int = 0
+    deleted: int = 0
+
+
+@dataclass
+class ParsedPage:
+    title: str
+    text: str
+    links: list[str]
+    index: bool = True
+    follow: bool = True
+
+
+@dataclass
+class _Response:
+    status: int
+    url: str
+    headers: httpx.Headers
+    # None when the body was not read (not HTML, or over the size limit)
+    body: bytes | None
+    encoding: str = "utf-8"
+
+    @property
+    def text(self) -> str | None:
+        return None if self.body is None else self.body.decode(self.encoding, errors="replace")
+
+
+def normalize_url(url: str, base: str | None = None) -> str | None:
+    """
+    Absolute http(s) URL without fragment or default port, or None for
+    anything else (mailto:, javascript:, malformed).
+    """
+    if base is not None:
+        url = urljoin(base, url.strip())
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port != _DEFAULT_PORTS[parts.scheme]:
+        host = f"{host}:{port}"
+    return urlunsplit((parts.scheme, host, parts.path or "/", parts.query, ""))
+
+
+def _scope(url: str) -> str:
+    """Crawl scope of a start URL: its origin and directory."""
+    parts = urlsplit(url)
+    directory = parts.path[: parts.path.rfind("/") + 1]
+    return f"{parts.scheme}://{parts.netloc}{directory}"
+
+
+def parse_page(html: str, url: str) -> ParsedPage:
+    """Title, visible text, outgoing links and robots directives of an HTML page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    directives = set()
+    for meta in soup.find_all("meta", attrs={"name": True, "content": True}):
+        if meta["name"].lower() == "robots":
+            directives.update(d.strip().lower() for d in meta["content"].split(","))
+
+    base_tag = soup.find("base", href=True)
+    base = urljoin(url, base_tag["href"]) if base_tag else url
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        if "nofollow" in (anchor.get("rel") or []):
+            continue
+        link = normalize_url(anchor["href"], base)
+        if link is not None and link != url:
+            links.append(link)
+
+    title_tag = soup.find("title")
+    title = title_tag.get_text(strip=True) if title_tag else ""
+
+    # Keep the content, not scripts or the site's navigation chrome
+    for element in soup(
+        ["head", "script", "style", "noscript", "nav", "footer", "header", "aside"]
+    ):
+        element.decompose()
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = "\n".join(chunk for chunk in chunks if chunk)
+
+    return ParsedPage(
+        title=title or url,
+        text=text,
+        links=list(dict.fromkeys(links)),
+        index=not directives & {"noindex", "none"},
+        follow=not directives & {"nofollow", "none"},
+    )
+
+
+def parse_sitemap(data: bytes) -> tuple[list[str], list[str]]:
+    """``(page URLs, child sitemap URLs)`` from a sitemap or sitemap index."""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return [], []
+    locs = [
+        loc.text.strip()
+        for loc in root.iter()
+        if loc.tag.rsplit("}", 1)[-1] == "loc" and loc.text and loc.text.strip()
+    ]
+    if root.tag.rsplit("}", 1)[-1] == "sitemapindex":
+        return [], locs
+    return locs, []
+
+
+class _Host:
+    """Per-host request slots, robots.txt rules and Crawl-delay."""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.robots: RobotFileParser | None = None
+        self.robots_lock = asyncio.Lock()
+        self.delay = 0.0
+        self._next_request = 0.0
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        async with self.semaphore:
+            if self.delay:
+                # Reserve the next start time before sleeping so waiters stay spaced out
+                loop = asyncio.get_running_loop()
+                start = max(loop.time(), self._next_request)
+                self._next_request = start + self.delay
+                await asyncio.sleep(start - loop.time())
+            yield
+
+
+@dataclass
+class _Crawl:
+    """Per-call crawl bookkeeping shared by the workers."""
+
+    scopes: list[str]
+    metadata: dict
+    full: bool
+    stats: WebCrawlStats = field(default_factory=WebCrawlStats)
+    updated: dict[str, dict] = field(default_factory=dict)
+    removed: set[str] = field(default_factory=set)
+
+    def in_scope(self, url: str) -> bool:
+        return any(url.startswith(scope) for scope in self.scopes)
+
+
+class WebCrawler:
+    """
+    Crawl websites into the knowledge base.
+
+    Usage::
+
+        async with WebCrawler(state_path=path) as crawler:
+            stats = await crawler.crawl(
+                ["https://wiki.example.com/"], max_pages=500, max_depth=5,
+                metadata={"company_id": 1},
+            )
+
+    ``state_path`` is a JSON file holding each page's validators, content
+    hash and links; without it every crawl re-fetches and re-embeds every
+    page. Pages that disappear (404/410) are removed from the knowledge base;
+    pages merely not reached (limits, robots.txt) are left alone.
+    """
+
+    def __init__(
+        self,
+        *,
+        state_path: str | Path | None = None,
+        writer: KBBatchWriter | None = None,
+        concurrency: int | None = None,
+        per_host_concurrency: int | None = None,
+        user_agent: str | None = None,
+        respect_robots: bool = True,
+    ):
+        self.state_path = Path(state_path) if state_path else None
+        self.writer = writer or KBBatchWriter()
+        self.concurrency = concurrency or settings.WEB_CRAWL_CONCURRENCY
+        self.per_host_concurrency = per_host_concurrency or settings.WEB_CRAWL_PER_HOST_CONCURRENCY
+        self.user_agent = user_agent or settings.WEB_CRAWL_USER_AGENT
+        self.respect_robots = respect_robots
+        self._client: httpx.AsyncClient | None = None
+        self._hosts: dict[str, _Host] = {}
+        self._state: dict = {}
+
+    async def __aenter__(self) -> WebCrawler:
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": self.user_agent},
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+            ),
+            timeout=httpx.Timeout(settings.WEB_CRAWL_HTTP_TIMEOUT_SECONDS),
+        )
+        self._state = await asyncio.to_thread(self._load_state)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _host(self, url: str) -> _Host:
+        netloc = urlsplit(url).netloc
+        if netloc not in self._hosts:
+            self._hosts[netloc] = _Host(self.per_host_concurrency)
+        return self._hosts[netloc]
+
+    async def _read(self, response: httpx.Response, html_only: bool) -> _Response:
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        result = _Response(response.status_code, str(response.url), response.headers, None)
+        if html_only and response.status_code == 200 and content_type not in _HTML_TYPES:
+            # Images, PDFs, archives: never downloaded
+            return result
+        limit = settings.WEB_CRAWL_MAX_PAGE_MB * 1024 * 1024
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > limit:
+                logger.info(
+                    f"Skipping {response.url}: larger than {settings.WEB_CRAWL_MAX_PAGE_MB} MB"
+                )
+                return result
+        result.body = bytes(body)
+        result.encoding = response.encoding or "utf-8"
+        return result
+
+    async def _get(
+        self, url: str, headers: dict | None = None, html_only: bool = False
+    ) -> _Response:
+        host = self._host(url)
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with host.slot():
+                    async with self._client.stream("GET", url, headers=headers) as response:
+                        if response.status_code not in RETRY_STATUSES:
+                            return await self._read(response, html_only)
+            except httpx.TransportError as e:
+                if attempt >= settings.WEB_CRAWL_MAX_RETRIES:
+                    raise WebCrawlError(f"GET {url} failed: {e}") from e
+            else:
+                if attempt >= settings.WEB_CRAWL_MAX_RETRIES:
+                    raise WebCrawlError(
+                        f"GET {url} still failing with {response.status_code} "
+                        f"after {attempt} retries"
+                    )
+
+            delay = retry_delay(response, attempt)
+            logger.info(f"Crawl request to {url} throttled/failed, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _robots(self, url: str) -> RobotFileParser:
+        """The host's robots.txt rules, fetched once per crawler."""
+        host = self._host(url)
+        async with host.robots_lock:
+            if host.robots is None:
+                parts = urlsplit(url)
+                parser = RobotFileParser(f"{parts.scheme}://{parts.netloc}/robots.txt")
+                try:
+                    response = await self._get(parser.url)
+                except WebCrawlError as e:
+                    logger.warning(f"Could not fetch {parser.url}, crawling without it: {e}")
+                    response = None
+                # Same interpretation as urllib: auth errors forbid, other errors allow
+                if response is not None and response.status in (401, 403):
+                    parser.disallow_all = True
+                elif response is None or response.status >= 400 or response.text is None:
+                    parser.allow_all = True
+                else:
+                    parser.parse(response.text.splitlines())
+                    host.delay = float(parser.crawl_delay(self.user_agent) or 0)
+                host.robots = parser
+        return host.robots
+
+    async def _sitemap_urls(self, start_url: str, limit: int) -> list[str]:
+        """Page URLs from the sitemaps in robots.txt (or ``/sitemap.xml``)."""
+        robots = await self._robots(start_url)
+        parts = urlsplit(start_url)
+        pending = list(robots.site_maps() or []) or [f"{parts.scheme}://{parts.netloc}/sitemap.xml"]
+        seen: set[str] = set()
+        urls: list[str] = []
+        while pending and len(urls) < limit and len(seen) < _MAX_SITEMAPS:
+            sitemap = pending.pop(0)
+            if sitemap in seen:
+                continue
+            seen.add(sitemap)
+            try:
+                response = await self._get(sitemap)
+            except WebCrawlError as e:
+                logger.info(f"Skipping sitemap {sitemap}: {e}")
+                continue
+            if response.status != 200 or not response.body:
+                continue
+            pages, children = await asyncio.to_thread(parse_sitemap, response.body)
+            pending.extend(children)
+            urls.extend(pages)
+        return urls
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _load_state(self) -> dict:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, updated: dict, removed: set[str]) -> None:
+        if self.state_path is None:
+            return
+        with _state_file_lock:
+            # Merge into the file as it is now: another crawl may have saved meanwhile
+            state = self._load_state()
+            state.update(updated)
+            for url in removed:
+                state.pop(url, None)
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+
+    # ------------------------------------------------------------------
+    # Crawling
+    # ------------------------------------------------------------------
+    async def _crawl_page(self, url: str, crawl: _Crawl, title: str | None) -> list[str]:
+        """Fetch and ingest one page; returns the links to follow from it."""
+        stats = crawl.stats
+        if self.respect_robots and not (await self._robots(url)).can_fetch(self.user_agent, url):
+            stats.skipped += 1
+            return []
+
+        previous = self._state.get(url)
+        headers = {}
+        if previous and not crawl.full:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        response = await self._get(url, headers, html_only=True)
+        stats.fetched += 1
+        if response.status == 304 and previous:
+            stats.unchanged += 1
+            return previous.get("links", [])
+        if response.status in (404, 410):
+            if previous:
+                self.writer.purge(url)
+                crawl.removed.add(url)
+                stats.deleted += 1
+            else:
+                stats.failed += 1
+            return []
+        if response.status >= 400:
+            logger.warning(f"Crawling {url} returned {response.status}")
+            stats.failed += 1
+            return []
+        if response.body is None or not crawl.in_scope(response.url):
+            # Not HTML, too large, or redirected off the site (e.g. to a login page)
+            stats.skipped += 1
+            return []
+
+        page = await asyncio.to_thread(parse_page, response.text, response.url)
+        links = page.links if page.follow else []
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "links": links,
+            "hash": None,
+        }
+        if not page.index or not page.text:
+            if previous and previous.get("hash"):
+                self.writer.purge(url)
+            crawl.updated[url] = entry
+            stats.skipped += 1
+            return links
+
+        title = title or page.title
+        content = f"# {title}\nSource: {url}\n\n{page.text}"
+        entry["hash"] = hashlib.sha256(content.encode()).hexdigest()
+        crawl.updated[url] = entry
+        if previous and previous.get("hash") == entry["hash"] and not crawl.full:
+            stats.unchanged += 1
+            return links
+
+        doc_metadata = {
+            "level": 1,
+            "doc_type": "website",
+            **crawl.metadata,
+            "file_name": url,
+        }
+        docs = await asyncio.to_thread(build_chunk_documents, content, doc_metadata, title)
+        await self.writer.add(docs, replaces=url if previous else None)
+        stats.ingested += 1
+        return links
+
+    async def crawl(
+        self,
+        start_urls: list[str],
+        *,
+        max_pages: int | None = None,
+        max_depth: int | None = None,
+        metadata: dict | None = None,
+        titles: dict[str, str] | None = None,
+        full: bool = False,
+    ) -> WebCrawlStats:
+        """
+        Crawl from ``start_urls`` breadth-first and store the pages in the KB.
+
+        Args:
+            start_urls: Where to start; each also limits the crawl to its directory
+            max_pages: Pages to fetch at most (capped at WEB_CRAWL_MAX_PAGES)
+            max_depth: Link hops from a start URL; 0 fetches only the start URLs
+            metadata: Extra document fields (company_id, level, department, ...)
+            titles: Titles to use instead of ``<title>``, by start URL
+            full: Ignore validators and content hashes and re-embed every page
+        """
+        max_pages = min(max_pages or settings.WEB_CRAWL_MAX_PAGES, settings.WEB_CRAWL_MAX_PAGES)
+        max_depth = min(
+            settings.WEB_CRAWL_MAX_DEPTH if max_depth is None else max_depth,
+            settings.WEB_CRAWL_MAX_DEPTH,
+        )
+        starts = [normalize_url(url) for url in start_urls]
+        if None in starts:
+            raise ValueError(f"Not an http(s) URL: {start_urls[starts.index(None)]}")
+        titles = {normalize_url(url): title for url, title in (titles or {}).items()}
+
+        crawl = _Crawl(scopes=[_scope(url) for url in starts], metadata=metadata or {}, full=full)
+        queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        scheduled: set[str] = set()
+
+        def schedule(url: str, depth: int) -> None:
+            if url in scheduled or len(scheduled) >= max_pages or not crawl.in_scope(url):
+                return
+            scheduled.add(url)
+            queue.put_nowait((url, depth))
+
+        for url in starts:
+            schedule(url, 0)
+        if max_depth > 0:
+            # Sitemap pages count as linked from the start page
+            for url in starts:
+                for page_url in await self._sitemap_urls(url, max_pages):
+                    if (page_url := normalize_url(page_url)) is not None:
+                        schedule(page_url, 1)
+
+        async def worker() -> None:
+            while True:
+                url, depth = await queue.get()
+                try:
+                    links = await self._crawl_page(url, crawl, titles.get(url))
+                    if depth < max_depth:
+                        for link in links:
+                            schedule(link, depth + 1)
+                except KBIngestError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Failed to crawl {url}: {e}")
+                    crawl.stats.failed += 1
+                finally:
+                    queue.task_done()
+
+        async with asyncio.TaskGroup() as tasks:
+            workers = [tasks.create_task(worker()) for _ in range(self.concurrency)]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+
+        # Validators are only recorded once their chunks are stored
+        await self.writer.flush()
+        await asyncio.to_thread(self._save_state, crawl.updated, crawl.removed)
+        self._state.update(crawl.updated)
+        for url in crawl.removed:
+            self._state.pop(url, None)
+        logger.info(f"Crawled {', '.join(starts)}: {asdict(crawl.stats)}")
+        return crawl.stats
+
+
+def store_website_in_kb(
+    url: str,
+    max_pages: int | None = None,
+    max_depth: int | None = None,
+    metadata: dict | None = None,
+    state_path: str | Path | None = None,
+) -> WebCrawlStats:
+    """Synchronous entry point for scripts: crawl a site into the KB."""
+
+    async def crawl():
+        async with WebCrawler(state_path=state_path) as crawler:
+            return await crawler.crawl(
+                [url], max_pages=max_pages, max_depth=max_depth, metadata=metadata
+            )
+
+    return asyncio.run(crawl())
@@ -0,0 +1,133 @@
+"""
+In-process caching primitives
+Thread-safe LRU cache with per-entry TTL, shared by the service-level caches
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Safe to use from the event loop and from worker threads. A ``name`` makes
+    its hit/miss counts show up in ``/metrics``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_evict: Callable[[Hashable, Any], None] | None = None,
+        name: str | None = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.name = name
+        if name is not None:
+            _named_caches[name] = self
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        evicted = None
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                evicted = value
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+        self._evicted(key, evicted)
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        evicted: list[tuple[Hashable, Any]] = []
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.pop(key, _MISSING)
+            if old is not _MISSING and old[1] is not value:
+                evicted.append((key, old[1]))
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                old_key, (_, old_value) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value))
+
+        for old_key, old_value in evicted:
+            self._evicted(old_key, old_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value (even if expired)."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        self._evicted(key, entry[1])
+        return entry[1]
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches ``predicate``; returns the count removed."""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            removed = [(k, self._data.pop(k)[1]) for k in keys]
+
+        for key, value in removed:
+            self._evicted(key, value)
+        return len(removed)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            removed = list(self._data.items())
+            self._data.clear()
+
+        for key, (_, value) in removed:
+            self._evicted(key, value)
+
+    def _evicted(self, key: Hashable, value: Any) -> None:
+        if self._on_evict is not None and value is not None:
+            self._on_evict(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] >= time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# Named caches, exported by /metrics
+_named_caches: weakref.WeakValueDictionary[str, TTLCache] = weakref.WeakValueDictionary()
+
+
+def cache_stats() -> list[tuple[str, dict[str, int]]]:
+    """Hits, misses and entries of every named cache, sorted by name."""
+    return [
+        (name, {"hits": cache.hits, "misses": cache.misses, "entries": len(cache)})
+        for name, cache in sorted(_named_caches.items())
+    ]
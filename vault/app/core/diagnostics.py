@@ -0,0 +1,400 @@
+"""
+Request diagnostics
+Slow-request capture (SQL statements, outbound HTTP calls and stack samples of
+requests that exceed SLOW_REQUEST_THRESHOLD_MS, kept in a ring buffer) and an
+on-demand sampling profiler producing collapsed stacks for flamegraph.pl or
+speedscope.
+
+Everything is recorded against the request's context variable, so work done
+in ``asyncio.to_thread`` workers and SQLAlchemy's async greenlets is attributed
+to the request that caused it.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from types import FrameType
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-request limits so a runaway request cannot hold unbounded data
+MAX_SQL_STATEMENTS = 200
+MAX_HTTP_CALLS = 200
+MAX_STACK_SAMPLES = 500
+MAX_STATEMENT_CHARS = 2000
+MAX_STACK_DEPTH = 64
+
+# Frames of threads that are parked rather than working
+_IDLE_FILES = tuple(
+    os.path.join(*parts)
+    for parts in (
+        ("threading.py",),
+        ("selectors.py",),
+        ("queue.py",),
+        ("concurrent", "futures", "thread.py"),
+    )
+)
+
+
+@dataclass
+class RequestCapture:
+    """What one request did: SQL, outbound HTTP, and stack samples once over budget."""
+
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    task: asyncio.Task | None = None
+    sql: list[dict[str, Any]] = field(default_factory=list)
+    http: list[dict[str, Any]] = field(default_factory=list)
+    stacks: Counter = field(default_factory=Counter)
+    samples: int = 0
+    awaiting: list[str] = field(default_factory=list)
+    dropped: int = 0
+
+    def offset_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def add_sql(self, statement: str, duration: float, executemany: bool) -> None:
+        if len(self.sql) >= MAX_SQL_STATEMENTS:
+            self.dropped += 1
+            return
+        self.sql.append(
+            {
+                "statement": statement[:MAX_STATEMENT_CHARS],
+                "duration_ms": round(duration * 1000, 2),
+                "offset_ms": round(self.offset_ms() - duration * 1000, 1),
+                "executemany": executemany,
+            }
+        )
+
+    def add_http(self, method: str, url: str, status: int | None, duration: float) -> None:
+        if len(self.http) >= MAX_HTTP_CALLS:
+            self.dropped += 1
+            return
+        self.http.append(
+            {
+                "method": method,
+                # Query strings can carry tokens
+                "url": url.split("?", 1)[0],
+                "status": status,
+                "duration_ms": round(duration * 1000, 2),
+                "offset_ms": round(self.offset_ms() - duration * 1000, 1),
+            }
+        )
+
+
+_current_capture: ContextVar[RequestCapture | None] = ContextVar("request_capture", default=None)
+
+
+def current_capture() -> RequestCapture | None:
+    return _current_capture.get()
+
+
+# ============================================================================
+# Stack sampling
+# ============================================================================
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """``outer;...;inner`` frame labels, the collapsed-stack line format."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _is_idle(frame: FrameType) -> bool:
+    return frame.f_code.co_filename.endswith(_IDLE_FILES)
+
+
+def sample_threads(skip: set[int] = frozenset()) -> list[str]:
+    """One collapsed stack per busy thread, prefixed with the thread name."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = []
+    for ident, frame in sys._current_frames().items():
+        if ident in skip or _is_idle(frame):
+            continue
+        stack = collapse_stack(frame)
+        stacks.append(f"{names.get(ident, ident)};{stack}" if stack else str(names.get(ident)))
+    return stacks
+
+
+def _task_stack(task: asyncio.Task) -> list[str]:
+    """The await chain a suspended request coroutine is parked on (innermost last)."""
+    # Task.get_stack() only returns the outermost frame of a suspended coroutine
+    chain = []
+    awaitable = task.get_coro()
+    while awaitable is not None and len(chain) < MAX_STACK_DEPTH:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        chain.append(f"{_frame_label(frame)}:{frame.f_lineno}")
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return chain
+
+
+# ============================================================================
+# Slow-request ring buffer and watchdog
+# ============================================================================
+
+
+class SlowRequestLog:
+    """
+    Tracks in-flight requests; a watchdog thread samples stacks for those past
+    the latency budget, and finished slow requests are kept in a ring buffer.
+    """
+
+    def __init__(self, threshold_ms: float, size: int, interval_ms: float):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._entries: deque[dict[str, Any]] = deque(maxlen=size)
+        self._active: dict[int, RequestCapture] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def begin(self, capture: RequestCapture) -> int:
+        self._ensure_watchdog()
+        key = next(self._ids)
+        with self._lock:
+            self._active[key] = capture
+        return key
+
+    def end(self, key: int, capture: RequestCapture, status: int, route: str | None, stages):
+        with self._lock:
+            self._active.pop(key, None)
+        duration = time.perf_counter() - capture.started
+        if duration < self.threshold:
+            return
+        entry = {
+            "id": key,
+            "method": capture.method,
+            "path": capture.path,
+            "route": route,
+            "status": status,
+            "duration_ms": round(duration * 1000, 1),
+            "started_at": capture.started_at.isoformat(),
+            "stages_ms": {name: round(s * 1000, 1) for name, s in (stages or {}).items()},
+            "sql": capture.sql,
+            "sql_total_ms": round(sum(q["duration_ms"] for q in capture.sql), 1),
+            "http": capture.http,
+            "http_total_ms": round(sum(c["duration_ms"] for c in capture.http), 1),
+            "dropped_events": capture.dropped,
+            "stack_samples": capture.samples,
+            "stacks": [
+                {"stack": stack, "count": count} for stack, count in capture.stacks.most_common()
+            ],
+            "awaiting": capture.awaiting,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            f"Slow request {capture.method} {capture.path}: {entry['duration_ms']} ms "
+            f"({len(capture.sql)} SQL, {len(capture.http)} HTTP, {capture.samples} samples)"
+        )
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def get(self, entry_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            return next((e for e in self._entries if e["id"] == entry_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _ensure_watchdog(self) -> None:
+        if self._watchdog is not None:
+            return
+        with self._lock:
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._watch, name="slow-request-watchdog", daemon=True
+                )
+                self._watchdog.start()
+
+    def _watch(self) -> None:
+        me = {threading.get_ident()}
+        while not self._stopped.wait(self.interval):
+            now = time.perf_counter()
+            with self._lock:
+                slow = [c for c in self._active.values() if now - c.started >= self.threshold]
+            slow = [c for c in slow if c.samples < MAX_STACK_SAMPLES]
+            if not slow:
+                continue
+            # One sample of every busy thread, shared by all over-budget requests
+            stacks = sample_threads(skip=me)
+            for capture in slow:
+                capture.samples += 1
+                capture.stacks.update(stacks)
+                if capture.task is not None:
+                    capture.awaiting = _task_stack(capture.task)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+slow_requests = SlowRequestLog(
+    threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    size=settings.SLOW_REQUEST_BUFFER_SIZE,
+    interval_ms=settings.SLOW_REQUEST_SAMPLE_INTERVAL_MS,
+)
+
+
+def start_capture(method: str, path: str) -> tuple[int, RequestCapture]:
+    """Begin capturing the current request (called by the middleware)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    capture = RequestCapture(method=method, path=path, task=task)
+    _current_capture.set(capture)
+    return slow_requests.begin(capture), capture
+
+
+def finish_capture(
+    key: int, capture: RequestCapture, status: int, route: str | None, stages
+) -> None:
+    """Stop capturing; keep the capture if the request was over budget."""
+    slow_requests.end(key, capture, status, route, stages)
+
+
+# ============================================================================
+# SQL and outbound HTTP hooks
+# ============================================================================
+
+_http_patched = False
+_hooks_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start time lives on the per-execution context, so a statement that
+    # raises (and never reaches after_cursor_execute) leaves nothing behind
+    if _current_capture.get() is not None:
+        context._diag_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    capture = _current_capture.get()
+    started = getattr(context, "_diag_started", None)
+    if capture is not None and started is not None:
+        capture.add_sql(statement, time.perf_counter() - started, executemany)
+
+
+def _wrap_send(send):
+    def timed_send(self, request, *args, **kwargs):
+        capture = _current_capture.get()
+        if capture is None:
+            return send(self, request, *args, **kwargs)
+        started = time.perf_counter()
+        status = None
+        try:
+            response = send(self, request, *args, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            capture.add_http(
+                request.method, str(request.url), status, time.perf_counter() - started
+            )
+
+    return timed_send
+
+
+def _wrap_async_send(send):
+    async def timed_send(self, request, *args, **kwargs):
+        capture = _current_capture.get()
+        if capture is None:
+            return await send(self, request, *args, **kwargs)
+        started = time.perf_counter()
+        status = None
+        try:
+            response = await send(self, request, *args, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            capture.add_http(
+                request.method, str(request.url), status, time.perf_counter() - started
+            )
+
+    return timed_send
+
+
+def install_hooks(engines) -> None:
+    """Time SQL on ``engines`` and outbound requests/httpx calls; idempotent."""
+    global _http_patched
+    from sqlalchemy import event
+
+    with _hooks_lock:
+        for engine in engines:
+            if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        if _http_patched:
+            return
+        _http_patched = True
+
+    # Patch the transport entry points once; the wrappers do nothing outside a request
+    import httpx
+    import requests
+
+    requests.Session.send = _wrap_send(requests.Session.send)
+    httpx.Client.send = _wrap_send(httpx.Client.send)
+    httpx.AsyncClient.send = _wrap_async_send(httpx.AsyncClient.send)
+
+
+# ============================================================================
+# On-demand profiler
+# ============================================================================
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+def profile(seconds: float, interval_ms: float) -> tuple[str, int]:
+    """
+    Sample every busy thread for ``seconds``; returns collapsed stacks
+    (``thread;frame;...;frame count`` per line) and the number of samples.
+
+    Blocking: run it in a worker thread.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        me = {threading.get_ident()}
+        stacks: Counter = Counter()
+        samples = 0
+        interval = interval_ms / 1000
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            stacks.update(sample_threads(skip=me))
+            samples += 1
+            time.sleep(interval)
+    finally:
+        _profile_lock.release()
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()), samples
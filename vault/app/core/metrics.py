@@ -0,0 +1,291 @@
+"""
+Application metrics
+Prometheus counters and histograms (text exposition format, no client library)
+and per-request stage timings that the Server-Timing middleware reports
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.core.cache import cache_stats
+
+# Latency buckets (seconds) from a cache hit up to a slow local generation
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if math.isinf(value) else repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Exposition lines for every labelled series, header included."""
+
+
+class Counter(_Metric):
+    """Monotonic counter; ``inc(**labels)``."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; ``observe(seconds, **labels)``."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        # First bucket whose upper bound is >= value; len(buckets) means +Inf
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(
+                (key, list(counts), total[0]) for key, (counts, total) in self._values.items()
+            )
+        lines = self.header()
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """The set of metrics rendered by ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.extend(_render_caches())
+        return "\n".join(lines) + "\n"
+
+
+def _render_caches() -> list[str]:
+    """Hit/miss/size of every named TTLCache, read from the caches at scrape time."""
+    stats = cache_stats()
+    series = [
+        ("vault_cache_hits_total", "counter", "Cache lookups answered from the cache", "hits"),
+        ("vault_cache_misses_total", "counter", "Cache lookups that missed or expired", "misses"),
+        ("vault_cache_entries", "gauge", "Entries currently held by the cache", "entries"),
+    ]
+    lines = []
+    for name, kind, documentation, field in series:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{cache="{_escape(cache)}"}} {row[field]}' for cache, row in stats]
+    return lines
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, documentation, labelnames)
+    REGISTRY.register(metric)
+    return metric
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    metric = Histogram(name, documentation, labelnames, buckets)
+    REGISTRY.register(metric)
+    return metric
+
+
+HTTP_REQUEST_SECONDS = histogram(
+    "vault_http_request_seconds",
+    "HTTP request duration by route template",
+    ("method", "route", "status"),
+)
+EMBED_SECONDS = histogram(
+    "vault_embed_seconds",
+    "Embedding request latency (a batch call embeds many texts)",
+    ("model", "call"),
+)
+VECTOR_QUERY_SECONDS = histogram(
+    "vault_vector_query_seconds",
+    "Vector store query latency, excluding the query embedding",
+    ("backend", "operation"),
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = histogram(
+    "vault_llm_time_to_first_token_seconds",
+    "Model load plus prompt evaluation time as reported by Ollama",
+    ("model", "task"),
+)
+LLM_SECONDS = histogram(
+    "vault_llm_seconds", "Total LLM call duration", ("model", "task", "outcome")
+)
+EXTRACTION_SECONDS = histogram(
+    "vault_extraction_seconds", "Text extraction time per file", ("file_type",)
+)
+TRANSCRIPTION_SECONDS = histogram(
+    "vault_transcription_seconds", "Speech-to-text time per file or live utterance", ("mode",)
+)
+DB_POOL_WAIT_SECONDS = histogram(
+    "vault_db_pool_wait_seconds", "Time to obtain a pooled database connection", ("engine",)
+)
+OCR_PAGES = counter(
+    "vault_ocr_pages_total",
+    "Scanned pages and image frames OCRed or served from cache",
+    ("source",),
+)
+OLLAMA_FALLBACKS = counter(
+    "vault_ollama_fallbacks_total",
+    "Models skipped by chat_with_fallback before one answered",
+    ("task", "model", "reason"),
+)
+
+# ============================================================================
+# Per-request stage timings (Server-Timing)
+# ============================================================================
+
+# Set per request by the Server-Timing middleware; a mutable dict so stages
+# recorded in asyncio.to_thread workers (which copy the context) are seen too.
+_request_stages: ContextVar[dict[str, float] | None] = ContextVar("request_stages", default=None)
+
+
+def start_request_stages() -> dict[str, float]:
+    """Begin collecting stage timings for the current request."""
+    stages: dict[str, float] = {}
+    _request_stages.set(stages)
+    return stages
+
+
+def current_request_stages() -> dict[str, float] | None:
+    """Stage timings collected so far for the current request."""
+    return _request_stages.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add ``seconds`` to ``stage`` of the current request, if one is being timed."""
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(histogram: Histogram, stage: str | None = None, **labels: object) -> Iterator[None]:
+    """Observe the block's duration in ``histogram`` and, optionally, as a request stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        if stage is not None:
+            record_stage(stage, elapsed)
@@ -0,0 +1,77 @@
+"""
+Secure memory helpers
+Holds long-lived secrets in a mutable buffer that is locked into RAM (best
+effort) and overwritten with zeros when the secret is dropped.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_libc = None
+_libc_lock = threading.Lock()
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        with _libc_lock:
+            if _libc is None:
+                try:
+                    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                except OSError:
+                    _libc = False
+    return _libc or None
+
+
+class LockedSecret:
+    """
+    A secret stored in a ``bytearray`` that is ``mlock``-ed so it is never written
+    to swap, and zeroed by ``wipe()``.
+
+    ``reveal()`` has to return a ``str`` for the libraries that consume it; that
+    copy is short-lived and cannot be zeroed, but the cached copy can.
+    """
+
+    __slots__ = ("_buffer", "_view", "_locked")
+
+    def __init__(self, value: str):
+        self._buffer = bytearray(value.encode("utf-8"))
+        # Exporting the buffer also stops it from ever being reallocated (and copied)
+        self._view = (ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)
+        self._locked = self._mlock()
+
+    def _mlock(self) -> bool:
+        libc = _get_libc()
+        if libc is None or not self._buffer:
+            return False
+        if libc.mlock(ctypes.addressof(self._view), ctypes.c_size_t(len(self._buffer))) != 0:
+            logger.debug(f"mlock failed (errno {ctypes.get_errno()}); secret may be swapped")
+            return False
+        return True
+
+    def reveal(self) -> str:
+        """Return the secret value."""
+        if self._view is None:
+            raise ValueError("Secret has been wiped")
+        return self._buffer.decode("utf-8")
+
+    def wipe(self) -> None:
+        """Overwrite the secret with zeros and release the memory lock."""
+        if self._view is None:
+            return
+        ctypes.memset(ctypes.addressof(self._view), 0, len(self._buffer))
+        if self._locked:
+            libc = _get_libc()
+            libc.munlock(ctypes.addressof(self._view), ctypes.c_size_t(len(self._buffer)))
+            self._locked = False
+        self._view = None
+
+    def __del__(self):
+        self.wipe()
+
+    def __repr__(self) -> str:
+        return "LockedSecret(****)"
@@ -0,0 +1,127 @@
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core import diagnostics
+from app.core.diagnostics import SlowRequestLog, collapse_stack, install_hooks, profile
+from app.core.metrics import record_stage
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.slow_requests import SlowRequestMiddleware
+
+
+def test_collapse_stack_lists_frames_outermost_first():
+    def inner():
+        return collapse_stack(sys._getframe())
+
+    def outer():
+        return inner()
+
+    stack = outer()
+
+    assert stack.endswith(f"{__name__}:outer;{__name__}:inner")
+
+
+def test_ring_buffer_keeps_only_recent_slow_requests():
+    log = SlowRequestLog(threshold_ms=0, size=2, interval_ms=1000)
+    for path in ("/a", "/b", "/c"):
+        key, capture = 0, diagnostics.RequestCapture(method="GET", path=path)
+        log.end(key, capture, 200, None, {})
+
+    assert [entry["path"] for entry in log.entries()] == ["/c", "/b"]
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    log = SlowRequestLog(threshold_ms=50, size=10, interval_ms=5)
+    monkeypatch.setattr(diagnostics, "slow_requests", log)
+    yield log
+    log.stop()
+
+
+def test_slow_request_captures_sql_http_and_stacks(slow_log):
+    engine = create_engine("sqlite://")
+    install_hooks([engine])
+    outbound = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+
+    app = FastAPI()
+    app.add_middleware(SlowRequestMiddleware)
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/slow/{item_id}")
+    def slow(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        outbound.get("http://ollama.test/api/tags?token=secret")
+        record_stage("llm", 0.1)
+        deadline = time.perf_counter() + 0.15
+        while time.perf_counter() < deadline:
+            pass
+        return {"id": item_id}
+
+    @app.get("/fast")
+    def fast():
+        return {}
+
+    client = TestClient(app)
+    client.get("/fast")
+    client.get("/slow/3")
+
+    [entry] = slow_log.entries()
+    assert entry["route"] == "/slow/{item_id}"
+    assert entry["status"] == 200
+    assert entry["duration_ms"] >= 150
+    assert entry["stages_ms"] == {"llm": 100.0}
+    assert [q["statement"] for q in entry["sql"]] == ["SELECT 1"]
+    assert entry["http"][0]["url"] == "http://ollama.test/api/tags"
+    assert entry["http"][0]["status"] == 204
+    assert entry["stack_samples"] > 0
+    assert any(":slow" in s["stack"] for s in entry["stacks"])
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection():
+    engine = create_engine("sqlite://")
+    install_hooks([engine])
+    capture = diagnostics.RequestCapture(method="GET", path="/errors")
+    token = diagnostics._current_capture.set(capture)
+    try:
+        with engine.connect() as conn:
+            info = dict(conn.info)
+            for _ in range(3):
+                with pytest.raises(Exception, match="no such table"):
+                    conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+            assert dict(conn.info) == info
+    finally:
+        diagnostics._current_capture.reset(token)
+
+    assert [q["statement"] for q in capture.sql] == ["SELECT 1"]
+
+
+def test_profile_outputs_collapsed_stacks():
+    # A plain flag: waiting in threading.Event would look like an idle thread
+    running = [True]
+
+    def spin():
+        while running[0]:
+            pass
+
+    worker = threading.Thread(target=spin, name="spinner")
+    worker.start()
+    try:
+        collapsed, samples = profile(seconds=0.05, interval_ms=5)
+    finally:
+        running[0] = False
+        worker.join()
+
+    assert samples > 0
+    assert "spinner;threading:_bootstrap" in collapsed
+    assert f"{__name__}:spin " in collapsed
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
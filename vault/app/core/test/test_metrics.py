@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.cache import TTLCache
+from app.core.metrics import HTTP_REQUEST_SECONDS, Counter, Histogram, _Metric, record_stage
+from app.middleware.server_timing import ServerTimingMiddleware
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test latency", ("model",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, model="a")
+    histogram.observe(0.5, model="a")
+    histogram.observe(5.0, model="a")
+
+    lines = histogram.render()
+
+    assert 'test_seconds_bucket{model="a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{model="a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{model="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{model="a"} 3' in lines
+    assert 'test_seconds_sum{model="a"} 5.55' in lines
+
+
+def test_counter_requires_declared_labels():
+    counter = Counter("test_total", "Test counter", ("reason",))
+    counter.inc(reason='quote"d')
+
+    assert 'test_total{reason="quote\\"d"} 1.0' in counter.render()
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+
+
+def test_metric_types_must_implement_render():
+    class Gauge(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError, match="render"):
+        Gauge("test_gauge", "Test gauge")
+
+
+def test_named_caches_are_exported():
+    from app.core.metrics import REGISTRY
+
+    cache = TTLCache(maxsize=4, ttl=60, name="test_cache")
+    cache.set("k", 1)
+    cache.get("k")
+    cache.get("missing")
+
+    output = REGISTRY.render()
+
+    assert 'vault_cache_hits_total{cache="test_cache"} 1' in output
+    assert 'vault_cache_misses_total{cache="test_cache"} 1' in output
+
+
+def test_server_timing_header_includes_stages_from_worker_threads():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        # Sync endpoints run in a worker thread
+        record_stage("embed", 0.012)
+        record_stage("embed", 0.008)
+        return {"id": item_id}
+
+    response = TestClient(app).get("/items/7")
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("embed;dur=20.0, total;dur=")
+    assert HTTP_REQUEST_SECONDS.count(method="GET", route="/items/{item_id}", status=200) == 1
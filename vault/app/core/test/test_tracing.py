@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from app.config import settings
+from app.core import tracing
+
+
+def test_disabled_tracing_is_a_shared_noop():
+    assert tracing.setup_tracing() is False
+
+    with tracing.span("anything", {"key": 1}) as first, tracing.span("other") as second:
+        first.set_attribute("x", 1)
+        assert first is second
+    assert tracing.current_span() is first
+
+
+def test_file_exporter_writes_nested_spans(tmp_path, monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "file")
+    monkeypatch.setattr(settings, "TRACING_FILE_PATH", str(path))
+    # Automatic library instrumentation is global; keep this test to manual spans
+    monkeypatch.setattr(tracing, "_instrument_libraries", lambda app: None)
+
+    assert tracing.setup_tracing() is True
+    try:
+        with tracing.span("parent", {"llm.model": "m", "skipped": None}):
+            with tracing.span("child") as child:
+                child.set_attributes({"vector.scores": [0.9, 0.5]})
+    finally:
+        tracing.shutdown_tracing()
+
+    spans = {s["name"]: s for s in map(json.loads, path.read_text().splitlines())}
+    assert spans["parent"]["attributes"] == {"llm.model": "m"}
+    assert spans["child"]["attributes"] == {"vector.scores": [0.9, 0.5]}
+    assert spans["child"]["parent_id"] == spans["parent"]["context"]["span_id"]
+    assert tracing.span("after") is tracing._NOOP_SPAN
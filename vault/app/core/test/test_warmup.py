@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+from app.core import warmup as warmup_module
+from app.core.warmup import Warmup, prewarm_imports
+
+
+def test_prewarm_imports_reports_missing_modules():
+    timings = prewarm_imports(["json", "vault_module_that_does_not_exist"])
+
+    assert timings["json"] >= 0
+    assert timings["vault_module_that_does_not_exist"] is None
+
+
+def _stub_steps(monkeypatch, database_ok=True):
+    calls = {}
+
+    async def database():
+        if not database_ok:
+            raise ConnectionError("database down")
+        return "2 connections"
+
+    async def chat_models():
+        raise RuntimeError("model load failed")
+
+    async def embed_model():
+        return [0.5, 0.5]
+
+    async def whisper():
+        return "base"
+
+    async def vector_indexes(query):
+        calls["vector_query"] = query
+        return "3 tenants"
+
+    async def check_database():
+        return "reachable"
+
+    monkeypatch.setattr(warmup_module, "_warm_database", database)
+    monkeypatch.setattr(warmup_module, "_warm_chat_models", chat_models)
+    monkeypatch.setattr(warmup_module, "_warm_embed_model", embed_model)
+    monkeypatch.setattr(warmup_module, "_warm_whisper", whisper)
+    monkeypatch.setattr(warmup_module, "_warm_vector_indexes", vector_indexes)
+    monkeypatch.setattr(warmup_module, "_check_database", check_database)
+    return calls
+
+
+def test_failed_optional_step_does_not_block_readiness(monkeypatch):
+    calls = _stub_steps(monkeypatch)
+    warmup = Warmup()
+
+    async def scenario():
+        before = await warmup.readiness()
+        await warmup.run()
+        return before, await warmup.readiness()
+
+    (ready_before, _), (ready, report) = asyncio.run(scenario())
+
+    assert ready_before is False
+    assert ready is True
+    assert report["steps"]["chat_models"]["status"] == "failed"
+    assert report["steps"]["imports"]["status"] == "skipped"
+    assert report["steps"]["vector_index"]["detail"] == "3 tenants"
+    # The vector warm query reuses the embedding from the model warm-up
+    assert calls["vector_query"] == [0.5, 0.5]
+
+
+def test_readiness_rechecks_a_failed_database(monkeypatch):
+    _stub_steps(monkeypatch, database_ok=False)
+    warmup = Warmup()
+
+    async def scenario():
+        await warmup.run()
+        return warmup.steps["database"].status, await warmup.readiness()
+
+    status_after_warmup, (ready, report) = asyncio.run(scenario())
+
+    assert status_after_warmup == "failed"
+    assert ready is True
+    assert report["steps"]["database"]["detail"] == "reachable"
+
+
+def test_readiness_times_out_a_hanging_database_check(monkeypatch):
+    import app.database
+
+    class HangingEngine:
+        def connect(self):
+            return self
+
+        async def __aenter__(self):
+            await asyncio.sleep(10)
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+    check_database = warmup_module._check_database
+    _stub_steps(monkeypatch, database_ok=False)
+    monkeypatch.setattr(warmup_module, "_check_database", check_database)
+    monkeypatch.setattr(app.database, "async_engine", HangingEngine())
+    monkeypatch.setattr(warmup_module.settings, "WARMUP_DB_CHECK_TIMEOUT_SECONDS", 0.05)
+    warmup = Warmup()
+
+    async def scenario():
+        await warmup.run()
+        started = time.perf_counter()
+        return await warmup.readiness(), time.perf_counter() - started
+
+    (ready, report), elapsed = asyncio.run(scenario())
+
+    assert ready is False
+    assert report["steps"]["database"]["status"] == "timeout"
+    assert elapsed < 1
@@ -0,0 +1,170 @@
+"""
+Optional OpenTelemetry tracing
+Spans for the stages of a request (DB lookups, embedding, vector search,
+re-ranking, LLM calls), exported to an OTLP collector or a JSON-lines file.
+
+With TRACING_ENABLED off nothing from opentelemetry is imported and ``span()``
+returns a shared no-op, so instrumented code pays one global lookup per span.
+Needs opentelemetry-sdk (plus opentelemetry-exporter-otlp-proto-http for OTLP
+and the opentelemetry-instrumentation-* packages for automatic FastAPI,
+SQLAlchemy, httpx and requests spans; each is skipped if missing).
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopSpan:
+    """Stands in for a span (and its context manager) when tracing is off."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+_tracer = None
+_provider = None
+_export_file = None
+
+
+def _clean(attributes: Mapping[str, Any] | None) -> dict[str, Any] | None:
+    # OpenTelemetry rejects None attribute values
+    if not attributes:
+        return None
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def span(name: str, attributes: Mapping[str, Any] | None = None):
+    """Context manager for a child span of the current one; yields the span."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=_clean(attributes))
+
+
+def current_span():
+    """The active span, for adding attributes learned after it started."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    from opentelemetry import trace
+
+    return trace.get_current_span()
+
+
+def _create_exporter():
+    exporter = settings.TRACING_EXPORTER.lower()
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if exporter == "file":
+        global _export_file
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        _export_file = open(settings.TRACING_FILE_PATH, "a", encoding="utf-8")
+        return ConsoleSpanExporter(
+            out=_export_file, formatter=lambda s: s.to_json(indent=None) + "\n"
+        )
+    raise ValueError(f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r} (otlp, file)")
+
+
+def _instrument_libraries(app) -> None:
+    """Automatic spans for inbound requests, SQL, and outbound HTTP (incl. Ollama)."""
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+        if app is not None:
+            FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics,health,ready")
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-fastapi not installed; no request spans")
+
+    try:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+        from app.database import async_engine, sync_engine
+
+        SQLAlchemyInstrumentor().instrument(engines=[sync_engine, async_engine.sync_engine])
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-sqlalchemy not installed; no SQL spans")
+
+    try:
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+        HTTPXClientInstrumentor().instrument()
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-httpx not installed; no httpx spans")
+
+    try:
+        from opentelemetry.instrumentation.requests import RequestsInstrumentor
+
+        RequestsInstrumentor().instrument()
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-requests not installed; no requests spans")
+
+
+def setup_tracing(app=None) -> bool:
+    """
+    Install the tracer provider when TRACING_ENABLED; returns whether tracing is on.
+
+    Call before the app serves requests (FastAPI instrumentation wraps the app).
+    """
+    global _tracer, _provider
+    if _provider is not None:
+        return True
+    if not settings.TRACING_ENABLED:
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        exporter = _create_exporter()
+    except ImportError as e:
+        logger.warning(f"TRACING_ENABLED is set but OpenTelemetry is not installed: {e}")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _tracer = provider.get_tracer("vault")
+
+    _instrument_libraries(app)
+    logger.info(
+        f"Tracing enabled: exporter={settings.TRACING_EXPORTER}, "
+        f"sample ratio={settings.TRACING_SAMPLE_RATIO}"
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans and close the exporter."""
+    global _tracer, _provider, _export_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _export_file is not None:
+        _export_file.close()
+    _tracer = _provider = _export_file = None
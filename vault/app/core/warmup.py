@@ -0,0 +1,282 @@
+"""
+Startup warm-up and readiness
+After a deploy the first users would otherwise pay for opening database
+connections, loading the chat and embedding models into Ollama, loading the
+Whisper model and paging in each tenant's vector index. The lifespan hook
+starts ``warmup``, which does that work concurrently in the background while
+the app already serves ``/health``; ``/ready`` answers 503 until it has
+finished.
+
+Heavy Python dependencies are imported on first use so workers start
+quickly; with PREWARM_ENABLED the warm-up imports PREWARM_MODULES as well.
+"""
+
+import asyncio
+import importlib
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import select, text
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm_imports(modules: list[str]) -> dict[str, float | None]:
+    """Import ``modules``; seconds per module, None for those not installed."""
+    timings: dict[str, float | None] = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# ============================================================================
+# Steps
+# ============================================================================
+
+
+class _StepSkippedError(Exception):
+    """Raised by a step that is disabled or has nothing to do."""
+
+
+async def _warm_imports() -> str:
+    if not settings.PREWARM_ENABLED:
+        raise _StepSkippedError("PREWARM_ENABLED is off")
+    timings = await asyncio.to_thread(prewarm_imports, _split(settings.PREWARM_MODULES))
+    missing = [name for name, seconds in timings.items() if seconds is None]
+    loaded = len(timings) - len(missing)
+    return f"{loaded} modules" + (f" (not installed: {', '.join(missing)})" if missing else "")
+
+
+async def _warm_database() -> str:
+    """Open pool connections up front on both engines and run a trivial query."""
+    from app.database import async_engine, sync_engine
+
+    async_count = min(settings.WARMUP_DB_CONNECTIONS, async_engine.pool.size())
+    sync_count = min(settings.WARMUP_DB_CONNECTIONS, sync_engine.pool.size())
+
+    async def open_async():
+        conn = await async_engine.connect().start()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    def open_sync() -> None:
+        # Held until all are open so each checkout creates a new connection
+        conns = []
+        try:
+            for _ in range(sync_count):
+                conn = sync_engine.connect()
+                conns.append(conn)
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in conns:
+                conn.close()
+
+    async_results, _ = await asyncio.gather(
+        asyncio.gather(*(open_async() for _ in range(async_count)), return_exceptions=True),
+        asyncio.to_thread(open_sync),
+    )
+    errors = [r for r in async_results if isinstance(r, BaseException)]
+    for conn in async_results:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    if errors:
+        raise errors[0]
+    return f"{async_count} async + {sync_count} sync connections"
+
+
+async def _warm_chat_models() -> str:
+    from app.integrations import ollama_client
+
+    models = _split(settings.WARMUP_CHAT_MODELS) or [settings.OLLAMA_CHAT_MODEL]
+    # Cloud models run remotely; there is nothing to load
+    local = [model for model in models if not ollama_client.is_cloud_model(model)]
+    if not local:
+        raise _StepSkippedError("only cloud models configured")
+    for model in local:
+        await asyncio.to_thread(ollama_client.preload_model, model)
+    return ", ".join(local)
+
+
+async def _warm_embed_model() -> list[float]:
+    from app.integrations import ollama_client
+
+    return await asyncio.to_thread(ollama_client.preload_embed_model)
+
+
+async def _warm_whisper() -> str:
+    if not settings.WARMUP_WHISPER:
+        raise _StepSkippedError("WARMUP_WHISPER is off")
+    from app.services import transcription
+
+    if not await asyncio.to_thread(transcription.preload):
+        raise _StepSkippedError("faster-whisper not installed")
+    return settings.WHISPER_MODEL
+
+
+async def _warm_vector_indexes(query: list[float] | None) -> str:
+    """One filtered search per tenant, so index pages and local snapshots are loaded."""
+    if settings.WARMUP_VECTOR_TENANTS <= 0:
+        raise _StepSkippedError("WARMUP_VECTOR_TENANTS is 0")
+    from app.database import async_session_maker
+    from app.models import Company
+    from app.services.vector_store import SearchFilter, get_vector_store
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Company.id).order_by(Company.id).limit(settings.WARMUP_VECTOR_TENANTS)
+        )
+        company_ids = list(result.scalars())
+
+    if query is None:
+        # The embedding model is unavailable; any unit vector still pages the index in
+        query = [1.0 / math.sqrt(settings.VECTOR_DIMENSIONS)] * settings.VECTOR_DIMENSIONS
+
+    def search_all() -> None:
+        store = get_vector_store()
+        for company_id in company_ids:
+            store.search(query, limit=1, filters=SearchFilter(company_id=company_id))
+
+    await asyncio.to_thread(search_all)
+    return f"{len(company_ids)} tenants"
+
+
+# ============================================================================
+# Orchestration
+# ============================================================================
+
+
+@dataclass
+class StepResult:
+    status: str = "pending"  # pending | running | ok | skipped | failed | timeout
+    seconds: float | None = None
+    detail: str | None = None
+
+
+class Warmup:
+    """
+    Runs the warm-up steps concurrently once per process and tracks readiness.
+    Only the database step is required: a failed model load or vector warm
+    query is logged and reported, but the instance still becomes ready.
+    """
+
+    required = ("database",)
+
+    def __init__(self):
+        self.steps: dict[str, StepResult] = {}
+        self.finished = False
+        self._task: asyncio.Task | None = None
+
+    async def _step(self, name: str, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        step = self.steps.setdefault(name, StepResult())
+        step.status = "running"
+        started = time.perf_counter()
+        try:
+            result = await func(*args)
+        except _StepSkippedError as e:
+            step.status, step.detail = "skipped", str(e)
+            return None
+        except TimeoutError as e:
+            step.status, step.detail = "timeout", str(e) or None
+            logger.warning(f"Warm-up step {name} timed out")
+            return None
+        except asyncio.CancelledError:
+            step.status = "timeout"
+            raise
+        except Exception as e:
+            step.status, step.detail = "failed", str(e)
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            return None
+        finally:
+            step.seconds = round(time.perf_counter() - started, 3)
+        step.status = "ok"
+        if isinstance(result, str):
+            step.detail = result
+        return result
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        names = ("database", "imports", "chat_models", "embed_model", "whisper", "vector_index")
+        for name in names:
+            self.steps[name] = StepResult()
+        try:
+            async with asyncio.timeout(settings.WARMUP_TIMEOUT_SECONDS):
+                _, _, _, query, _ = await asyncio.gather(
+                    self._step("database", _warm_database),
+                    self._step("imports", _warm_imports),
+                    self._step("chat_models", _warm_chat_models),
+                    self._step("embed_model", _warm_embed_model),
+                    self._step("whisper", _warm_whisper),
+                )
+                await self._step("vector_index", _warm_vector_indexes, query)
+        except TimeoutError:
+            logger.warning(f"Warm-up exceeded {settings.WARMUP_TIMEOUT_SECONDS}s")
+            for step in self.steps.values():
+                if step.status in ("pending", "running"):
+                    step.status = "timeout"
+        finally:
+            self.finished = True
+        logger.info(
+            f"Warm-up finished in {time.perf_counter() - started:.2f}s: "
+            + ", ".join(f"{name}={step.status}" for name, step in self.steps.items())
+        )
+
+    def start(self) -> None:
+        """Begin warming up in the background (call from the lifespan hook)."""
+        if not settings.WARMUP_ENABLED:
+            self.finished = True
+            return
+        self._task = asyncio.create_task(self.run(), name="warmup")
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def readiness(self) -> tuple[bool, dict[str, Any]]:
+        """Whether to accept traffic, with the per-step report for ``/ready``."""
+        for name in self.required:
+            step = self.steps.get(name)
+            if self.finished and step is not None and step.status in ("failed", "timeout"):
+                # Recover once the database is reachable again
+                await self._step(name, _check_database)
+        ready = self.finished and all(
+            self.steps.get(name, StepResult("ok")).status in ("ok", "skipped")
+            for name in self.required
+        )
+        return ready, {
+            "ready": ready,
+            "warmup": "finished" if self.finished else "running",
+            "steps": {name: asdict(step) for name, step in self.steps.items()},
+        }
+
+
+async def _check_database() -> str:
+    from app.database import async_engine
+
+    # A hung connect must not hold up /ready; the caller treats a timeout as not ready
+    async with asyncio.timeout(settings.WARMUP_DB_CHECK_TIMEOUT_SECONDS):
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    return "reachable"
+
+
+warmup = Warmup()
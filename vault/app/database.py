@@ -4,17 +4,37 @@ PostgreSQL with asyncpg for async operations + sync for blocking operations (emb
 """
 
 import logging
+import time
 from collections.abc import AsyncGenerator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.config import settings
+from app.core.metrics import DB_POOL_WAIT_SECONDS, record_stage
 
 logger = logging.getLogger(__name__)
 
 
+def _timed_pool(base: type[Pool], engine: str) -> type[Pool]:
+    """``base`` recording how long each checkout waited for (or opened) a connection."""
+
+    class TimedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                elapsed = time.perf_counter() - started
+                DB_POOL_WAIT_SECONDS.observe(elapsed, engine=engine)
+                record_stage("db-wait", elapsed)
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
 # ============================================================================
 # ASYNC ENGINE (for FastAPI endpoints)
 # ============================================================================
@@ -26,6 +46,7 @@ async_engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    poolclass=_timed_pool(AsyncAdaptedQueuePool, "async"),
 )
 
 async_session_maker = async_sessionmaker(
@@ -56,6 +77,7 @@ sync_engine = create_engine(
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
+    poolclass=_timed_pool(QueuePool, "sync"),
 )
 
 SessionLocal = sessionmaker(
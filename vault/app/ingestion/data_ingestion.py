@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 from langchain.text_splitter import CharacterTextSplitter
 
 # Qdrant / Ollama utilities
-from app.connectors.qdrant_utils import recreate_collection, upsert_documents
+from app.connectors.qdrant_utils import PipelinedUpserter, recreate_collection
 
 # Load .env from current directory
 env_path = Path(__file__).parent / ".env"
@@ -94,11 +94,11 @@ def main(args):
         logging.info(f"Recreating Qdrant collection '{collection_name}' as requested...")
         recreate_collection(collection_name)
 
-    # Upsert in batches to avoid large payloads
-    batch_size = 200
-    for i in range(0, len(docs_to_upsert), batch_size):
-        batch = docs_to_upsert[i : i + batch_size]
-        upsert_documents(collection_name, batch)
+    # Upsert in batches to avoid large payloads; embedding overlaps the previous upsert
+    batch_size = args.batch_size
+    with PipelinedUpserter(collection_name, bulk_load=args.bulk_load) as upserter:
+        for i in range(0, len(docs_to_upsert), batch_size):
+            upserter.add(docs_to_upsert[i : i + batch_size])
 
     logging.info("Data Ingestion Process Completed.")
     print("Data Ingestion Process Completed.")
@@ -117,5 +117,16 @@ if __name__ == "__main__":
         action="store_true",
         help="If set, recreate the Qdrant collection before upserting (DANGEROUS: will drop existing data).",
     )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=200,
+        help="Chunks embedded and upserted per batch.",
+    )
+    parser.add_argument(
+        "--bulk_load",
+        action="store_true",
+        help="Disable HNSW indexing while loading and rebuild it once at the end.",
+    )
     args = parser.parse_args()
     main(args)
@@ -8,9 +8,22 @@ from __future__ import annotations
 import logging
 import os
 import time
+from typing import TYPE_CHECKING
 
 import httpx
-import ollama
+
+from app.core.metrics import (
+    EMBED_SECONDS,
+    LLM_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS,
+    OLLAMA_FALLBACKS,
+    record_stage,
+    timed,
+)
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    import ollama
 
 logger = logging.getLogger(__name__)
 
@@ -46,11 +59,16 @@ OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "10"))
 CLOUD_READ_TIMEOUT = float(os.getenv("OLLAMA_CLOUD_TIMEOUT", "30"))  # Cloud is fast
 LOCAL_READ_TIMEOUT = float(os.getenv("OLLAMA_LOCAL_TIMEOUT", "120"))  # Local is slow
 
+# How long Ollama keeps a model loaded after a request ("30m", "-1" = forever);
+# unset uses the server default (5 minutes)
+KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE") or None
+
 # Task-specific timeouts
 TASK_TIMEOUTS_CLOUD = {
     "topic": 10.0,
     "tags": 15.0,
     "chat": 20.0,
+    "rerank": 15.0,
     "summary": 30.0,
     "questions": 45.0,
 }
@@ -59,6 +77,7 @@ TASK_TIMEOUTS_LOCAL = {
     "topic": 20.0,
     "tags": 30.0,
     "chat": 60.0,
+    "rerank": 60.0,
     "summary": 90.0,
     "questions": 120.0,
 }
@@ -108,6 +127,9 @@ def _create_timeout(read_timeout: float) -> httpx.Timeout:
 
 def get_client(timeout: float = LOCAL_READ_TIMEOUT) -> ollama.Client:
     """Get Ollama client with specified timeout."""
+    # Imported on first use: the ollama package adds ~150 ms to a cold start
+    import ollama
+
     return ollama.Client(host=OLLAMA_HOST, timeout=_create_timeout(timeout))
 
 
@@ -240,7 +262,11 @@ def embed(text: str, model: str = EMBED_MODEL) -> list[float]:
     """Generate embeddings."""
     try:
         client = get_client()
-        resp = client.embeddings(model=model, prompt=text)
+        with (
+            span("ollama.embed", {"llm.model": model, "embed.inputs": 1}),
+            timed(EMBED_SECONDS, "embed", model=model, call="single"),
+        ):
+            resp = client.embeddings(model=model, prompt=text, keep_alive=KEEP_ALIVE)
 
         if hasattr(resp, "embedding"):
             return resp.embedding
@@ -253,11 +279,25 @@ def embed(text: str, model: str = EMBED_MODEL) -> list[float]:
         raise OllamaError(f"Embedding failed: {e}") from e
 
 
+def preload_embed_model(model: str = EMBED_MODEL) -> list[float]:
+    """Load the embedding model into Ollama (startup warm-up); returns a sample embedding."""
+    return embed("warm-up", model=model)
+
+
 # =============================================================================
 # Chat Functions
 # =============================================================================
 
 
+def preload_model(model: str) -> None:
+    """Load a chat model into Ollama's memory without generating (startup warm-up)."""
+    try:
+        # An empty prompt only loads the model; keep_alive decides how long it stays
+        get_client().generate(model=model, prompt="", keep_alive=KEEP_ALIVE)
+    except Exception as e:
+        raise OllamaError(f"Preloading {model} failed: {e}") from e
+
+
 def chat(
     messages: list[dict[str, str]],
     model: str | None = None,
@@ -280,6 +320,8 @@ def chat(
     Returns:
         Response text
     """
+    import ollama
+
     # Auto-select model if not specified
     if model is None:
         model, is_cloud = get_best_model(prefer_cloud=True)
@@ -292,17 +334,34 @@ def chat(
 
     logger.debug(f"Chat: model={model}, cloud={is_cloud}, timeout={timeout}s")
 
+    started = time.perf_counter()
+    outcome = "error"
     try:
         client = get_client(timeout=timeout)
 
-        resp = client.chat(
-            model=model,
-            messages=messages,
-            options={
-                "temperature": temperature,
-                "num_predict": max_tokens,
+        with span(
+            "ollama.chat",
+            {
+                "llm.model": model,
+                "llm.task": task,
+                "llm.cloud": is_cloud,
+                "llm.temperature": temperature,
+                "llm.max_tokens": max_tokens,
+                "llm.messages": len(messages),
             },
-        )
+        ) as chat_span:
+            resp = client.chat(
+                model=model,
+                messages=messages,
+                options={
+                    "temperature": temperature,
+                    "num_predict": max_tokens,
+                },
+                keep_alive=KEEP_ALIVE,
+            )
+            chat_span.set_attributes(_token_counts(resp))
+        outcome = "ok"
+        _observe_time_to_first_token(resp, model, task)
 
         # Extract response
         if hasattr(resp, "message"):
@@ -326,6 +385,38 @@ def chat(
         raise OllamaError(f"Ollama error: {e}") from e
     except Exception as e:
         raise OllamaError(f"Error: {e}") from e
+    finally:
+        elapsed = time.perf_counter() - started
+        LLM_SECONDS.observe(elapsed, model=model, task=task, outcome=outcome)
+        record_stage("llm", elapsed)
+
+
+def _response_field(resp, field: str):
+    value = getattr(resp, field, None)
+    if value is None and isinstance(resp, dict):
+        value = resp.get(field)
+    return value
+
+
+def _token_counts(resp) -> dict[str, int]:
+    counts = {
+        "llm.prompt_tokens": _response_field(resp, "prompt_eval_count"),
+        "llm.completion_tokens": _response_field(resp, "eval_count"),
+    }
+    return {key: value for key, value in counts.items() if value is not None}
+
+
+def _observe_time_to_first_token(resp, model: str, task: str) -> None:
+    """
+    Non-streaming calls never see the first token arrive, so use Ollama's own
+    accounting: model load plus prompt evaluation (nanoseconds).
+    """
+    durations = [
+        _response_field(resp, field) for field in ("load_duration", "prompt_eval_duration")
+    ]
+    if any(durations):
+        seconds = sum(d or 0 for d in durations) / 1e9
+        LLM_TIME_TO_FIRST_TOKEN_SECONDS.observe(seconds, model=model, task=task)
 
 
 def chat_with_fallback(
@@ -385,13 +476,16 @@ def chat_with_fallback(
 
         except OllamaModelNotFoundError:
             logger.warning(f"Model {model} not found")
+            OLLAMA_FALLBACKS.inc(task=task, model=model, reason="not_found")
             continue
         except OllamaTimeoutError as e:
             logger.warning(f"Model {model} timed out: {e}")
+            OLLAMA_FALLBACKS.inc(task=task, model=model, reason="timeout")
             last_error = e
             continue
         except OllamaError as e:
             logger.warning(f"Model {model} failed: {e}")
+            OLLAMA_FALLBACKS.inc(task=task, model=model, reason="error")
             last_error = e
             continue
 
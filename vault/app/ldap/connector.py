@@ -135,11 +135,11 @@ def format_user_ldap_entry(
     return LDAPUser(
         type="user",
         name=cn,
-        directoryId=connector.id,
+        directory_id=connector.id,
         username=f"{connector.domain}\\{sam_account_name}".lower(),
         email=email or "No email provided",
-        firstName=first_name,
-        lastName=last_name,
+        first_name=first_name,
+        last_name=last_name,
     )
 
 
@@ -232,204 +232,212 @@ def format_group_ldap_entry(
     return LDAPGroup(
         type="group",
         name=group_name,
-        directoryId=connector.id,
+        directory_id=connector.id,
         username=f"{len(members)} user{'s' if len(members) != 1 else ''}",
         email="",
         members=members,
     )
 
 
-async def get_ldap_search_results(query: str, connector: LDAPConnector) -> list[LDAPSearchResult]:
+def search_directory(client: Any, query: str, connector: LDAPConnector) -> list[LDAPSearchResult]:
+    """
+    Search a bound LDAP connection for users and groups matching the query
+
+    Args:
+        client: LDAP connection bound as the service account
+        query: Search query string
+        connector: LDAP connector configuration
+
+    Returns:
+        list of search results (users and groups)
+    """
+    # Parse query
+    name_parts = query.split("\\")
+    account_name = name_parts[-1]
+
+    # User search configuration
+    user_dn = f"{connector.user_dn + ',' if connector.user_dn else ''}{connector.base_dn}"
+
+    # Build user filter
+    if account_name == "*":
+        user_filter = f"(&(objectClass={connector.user_object}))"
+    else:
+        user_filter = f"(&(objectClass={connector.user_object})({connector.attribute_username}=*{account_name}*))"
+
+    if connector.user_object_filter:
+        user_filter = connector.user_object_filter.replace("*", account_name)
+
+    # Filter attributes
+    user_attrs = [
+        connector.attribute_username,
+        connector.attribute_first_name,
+        connector.attribute_last_name,
+        connector.attribute_display_name,
+        connector.attribute_username_rdn,
+        connector.attribute_principal_name,
+        connector.attribute_email,
+        connector.attribute_user_guid,
+        "cn",
+    ]
+    user_attrs = [attr for attr in user_attrs if attr]
+
+    # Search for users
+    logger.info(f"Searching for users with filter: {user_filter}")
+    user_results = client.search_s(user_dn, ldap.SCOPE_SUBTREE, user_filter, user_attrs)
+
+    # Group search configuration
+    group_dn = f"{connector.group_dn + ',' if connector.group_dn else ''}{connector.base_dn}"
+
+    # Build group filter
+    if account_name == "*":
+        group_filter = f"(&(objectClass={connector.group_object}))"
+    else:
+        group_filter = f"(&(objectClass={connector.group_object})({connector.attribute_group_name}=*{account_name}*))"
+
+    if connector.group_object_filter:
+        group_filter = connector.group_object_filter.replace("*", account_name)
+
+    # Filter attributes
+    group_attrs = [
+        connector.attribute_group_name,
+        connector.attribute_group_description,
+        connector.attribute_group_members,
+        connector.attribute_group_guid,
+        "cn",
+    ]
+    group_attrs = [attr for attr in group_attrs if attr]
+
+    # Search for groups
+    logger.info(f"Searching for groups with filter: {group_filter}")
+    group_results = client.search_s(group_dn, ldap.SCOPE_SUBTREE, group_filter, group_attrs)
+
+    # Format results
+    users = [
+        format_user_ldap_entry(entry, connector)
+        for entry in user_results
+        if entry[0]  # Filter out None entries
+    ]
+    groups = [
+        format_group_ldap_entry(entry, connector)
+        for entry in group_results
+        if entry[0]  # Filter out None entries
+    ]
+
+    # Combine results
+    return users + groups
+
+
+async def get_ldap_search_results(
+    query: str, connector: LDAPConnector, service_bind_password: str
+) -> list[LDAPSearchResult]:
     """
     Search LDAP directory for users and groups matching the query
 
     Args:
         query: Search query string
         connector: LDAP connector configuration
+        service_bind_password: Password of the connector's service account
 
     Returns:
         list of search results (users and groups)
     """
-    try:
-        # Get LDAP client
-        client = get_ldap_client(connector)
-
-        # Parse query
-        name_parts = query.split("\\")
-        account_name = name_parts[-1]
-
-        try:
-            # Bind with service account
-            client.simple_bind_s(connector.username, connector.password)
-
-            # User search configuration
-            user_dn = f"{connector.user_dn + ',' if connector.user_dn else ''}{connector.base_dn}"
-
-            # Build user filter
-            if account_name == "*":
-                user_filter = f"(&(objectClass={connector.user_object}))"
-            else:
-                user_filter = f"(&(objectClass={connector.user_object})({connector.attribute_username}=*{account_name}*))"
-
-            if connector.user_object_filter:
-                user_filter = connector.user_object_filter.replace("*", account_name)
-
-            # Filter attributes
-            user_attrs = [
-                connector.attribute_username,
-                connector.attribute_first_name,
-                connector.attribute_last_name,
-                connector.attribute_display_name,
-                connector.attribute_username_rdn,
-                connector.attribute_principal_name,
-                connector.attribute_email,
-                connector.attribute_user_guid,
-                "cn",
-            ]
-            user_attrs = [attr for attr in user_attrs if attr]
-
-            # Search for users
-            logger.info(f"Searching for users with filter: {user_filter}")
-            user_results = client.search_s(user_dn, ldap.SCOPE_SUBTREE, user_filter, user_attrs)
-
-            # Group search configuration
-            group_dn = (
-                f"{connector.group_dn + ',' if connector.group_dn else ''}{connector.base_dn}"
-            )
-
-            # Build group filter
-            if account_name == "*":
-                group_filter = f"(&(objectClass={connector.group_object}))"
-            else:
-                group_filter = f"(&(objectClass={connector.group_object})({connector.attribute_group_name}=*{account_name}*))"
-
-            if connector.group_object_filter:
-                group_filter = connector.group_object_filter.replace("*", account_name)
-
-            # Filter attributes
-            group_attrs = [
-                connector.attribute_group_name,
-                connector.attribute_group_description,
-                connector.attribute_group_members,
-                connector.attribute_group_guid,
-                "cn",
-            ]
-            group_attrs = [attr for attr in group_attrs if attr]
-
-            # Search for groups
-            logger.info(f"Searching for groups with filter: {group_filter}")
-            group_results = client.search_s(group_dn, ldap.SCOPE_SUBTREE, group_filter, group_attrs)
-
-            # Format results
-            users = [
-                format_user_ldap_entry(entry, connector)
-                for entry in user_results
-                if entry[0]  # Filter out None entries
-            ]
-            groups = [
-                format_group_ldap_entry(entry, connector)
-                for entry in group_results
-                if entry[0]  # Filter out None entries
-            ]
-
-            # Combine results
-            combined_results = users + groups
-
-            return combined_results
-
-        except ldap.LDAPError as e:
-            error_msg = str(e)
-            logger.error(f"LDAP search error: {error_msg}")
-            return []
-
-        finally:
-            # Always unbind
-            try:
-                client.unbind_s()
-            except Exception:
-                pass
+    # Imported here: the pool builds its connections with get_ldap_client
+    from .pool import run_ldap
 
+    try:
+        return await run_ldap(
+            connector,
+            service_bind_password,
+            lambda client: search_directory(client, query, connector),
+        )
+    except ldap.LDAPError as e:
+        logger.error(f"LDAP search error: {str(e)}")
+        return []
     except Exception as e:
         logger.error(f"Error in LDAP search: {str(e)}")
         return []
 
 
-async def authenticate_ldap(connector: LDAPConnector, credentials: dict[str, str]) -> bool:
+def find_user_dn(client: Any, connector: LDAPConnector, email: str) -> str | None:
     """
-    Authenticate a user against LDAP
+    Look up a user's DN by email, falling back to the username part of the email
 
     Args:
+        client: LDAP connection bound as the service account
         connector: LDAP connector configuration
-        credentials: User credentials (email and password)
+        email: User's email (or username)
 
     Returns:
-        True if authentication successful, False otherwise
+        The user's DN or None if not found
     """
-    try:
-        # Get credentials
-        email = credentials.get("email", "")
-        password = credentials.get("password", "")
-
-        if not email or not password:
-            logger.error("Missing email or password for LDAP authentication")
-            return False
+    user_components = email.split("@")
+    username = user_components[0] if user_components else email
 
-        # Determine username from email
-        user_components = email.split("@")
-        username = user_components[0] if user_components else email
+    search_dn = f"{connector.user_dn + ',' if connector.user_dn else ''}{connector.base_dn}"
+    search_filter = f"(&(objectClass={connector.user_object})({connector.attribute_email}={email}))"
+    results = client.search_s(search_dn, ldap.SCOPE_SUBTREE, search_filter, ["dn"])
 
-        # Get LDAP client
-        client = get_ldap_client(connector)
+    if not results:
+        # Try with username instead
+        search_filter = (
+            f"(&(objectClass={connector.user_object})({connector.attribute_username}={username}))"
+        )
+        results = client.search_s(search_dn, ldap.SCOPE_SUBTREE, search_filter, ["dn"])
 
-        try:
-            # Search for user
-            search_dn = f"{connector.user_dn + ',' if connector.user_dn else ''}{connector.base_dn}"
-            search_filter = (
-                f"(&(objectClass={connector.user_object})({connector.attribute_email}={email}))"
-            )
+    if not results or not results[0][0]:
+        return None
+    return results[0][0]
 
-            # Bind with service account to search
-            client.simple_bind_s(connector.username, connector.password)
 
-            # Get user's DN
-            results = client.search_s(search_dn, ldap.SCOPE_SUBTREE, search_filter, ["dn"])
+async def authenticate_ldap(
+    connector: LDAPConnector, credentials: dict[str, str], service_bind_password: str
+) -> bool:
+    """
+    Authenticate a user against LDAP
 
-            if not results:
-                # Try with username instead
-                search_filter = f"(&(objectClass={connector.user_object})({connector.attribute_username}={username}))"
-                results = client.search_s(search_dn, ldap.SCOPE_SUBTREE, search_filter, ["dn"])
+    The user's DN is looked up and their password verified on a pooled
+    connection, which is then re-bound as the service account.
 
-            if not results or not results[0][0]:
-                logger.warning(f"User not found in LDAP: {email}")
-                return False
+    Args:
+        connector: LDAP connector configuration
+        credentials: User credentials (email and password)
+        service_bind_password: Password of the connector's service account
 
-            user_dn = results[0][0]
+    Returns:
+        True if authentication successful, False otherwise
+    """
+    from .pool import get_pool, run_in_ldap_thread
 
-            # Unbind service account
-            client.unbind_s()
+    email = credentials.get("email", "")
+    password = credentials.get("password", "")
 
-            # Create new client and try to authenticate with user credentials
-            client = get_ldap_client(connector)
-            client.simple_bind_s(user_dn, password)
+    if not email or not password:
+        logger.error("Missing email or password for LDAP authentication")
+        return False
 
-            logger.info(f"LDAP authentication successful for user: {email}")
-            return True
+    pool = get_pool(connector, service_bind_password)
 
-        except ldap.INVALID_CREDENTIALS:
-            logger.warning(f"Invalid LDAP credentials for user: {email}")
+    def authenticate(client: Any) -> bool:
+        user_dn = find_user_dn(client, connector, email)
+        if not user_dn:
+            logger.warning(f"User not found in LDAP: {email}")
             return False
+        pool.bind_as(client, user_dn, password)
+        return True
 
-        except ldap.LDAPError as e:
-            error_msg = str(e)
-            logger.error(f"LDAP authentication error: {error_msg}")
-            return False
+    try:
+        authenticated = await run_in_ldap_thread(pool.run, authenticate)
+        if authenticated:
+            logger.info(f"LDAP authentication successful for user: {email}")
+        return authenticated
+
+    except ldap.INVALID_CREDENTIALS:
+        logger.warning(f"Invalid LDAP credentials for user: {email}")
+        return False
 
-        finally:
-            # Always unbind
-            try:
-                client.unbind_s()
-            except Exception:
-                pass
+    except ldap.LDAPError as e:
+        logger.error(f"LDAP authentication error: {str(e)}")
+        return False
 
     except Exception as e:
         logger.error(f"Error in LDAP authentication: {str(e)}")
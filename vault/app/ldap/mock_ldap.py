@@ -51,6 +51,10 @@ LDAP_OPT_X_TLS_ALLOW = 3
 LDAP_OPT_X_TLS_TRY = 4
 
 
+# Number of users returned by user searches (raise it to exercise paging)
+MOCK_USER_COUNT = 3
+
+
 # Exceptions
 class LDAPError(Exception):
     """Base exception for LDAP errors."""
@@ -88,6 +92,17 @@ class FilterError(LDAPError):
     pass
 
 
+class SimplePagedResultsControl:
+    """Mock of ``ldap.controls.SimplePagedResultsControl`` (RFC 2696)."""
+
+    controlType = "1.2.840.113556.1.4.319"  # noqa: N815 (python-ldap attribute name)
+
+    def __init__(self, criticality=False, size=10, cookie=""):
+        self.criticality = criticality
+        self.size = size
+        self.cookie = cookie
+
+
 class MockConnection:
     """Mock LDAP connection object."""
 
@@ -95,6 +110,8 @@ class MockConnection:
         self.uri = uri
         self.bound = False
         self.options = {}
+        self._pending = {}
+        self._next_msgid = 1
         print(f"[MOCK LDAP] Initializing connection to {uri}")
 
     def set_option(self, option, value):
@@ -133,13 +150,16 @@ class MockConnection:
         if "user" in str(filterstr).lower() or "person" in str(filterstr).lower():
             result = []
             # Add a few mock users
-            for i in range(1, 4):
+            for i in range(1, MOCK_USER_COUNT + 1):
                 dn = f"cn=user{i},{base}"
                 attrs = {
                     "cn": [f"user{i}".encode()],
                     "sn": [f"User {i}".encode()],
                     "mail": [f"user{i}@example.com".encode()],
                     "givenName": [f"Test{i}".encode()],
+                    "sAMAccountName": [f"user{i}".encode()],
+                    "uSNChanged": [str(1000 + i).encode()],
+                    "modifyTimestamp": [b"20240101000000Z"],
                     "objectClass": [
                         b"top",
                         b"person",
@@ -176,6 +196,53 @@ class MockConnection:
             )
         ]
 
+    def search_ext(
+        self,
+        base,
+        scope,
+        filterstr="(objectClass=*)",
+        attrlist=None,
+        attrsonly=0,
+        serverctrls=None,
+        clientctrls=None,
+        timeout=-1,
+        sizelimit=0,
+    ):
+        """Asynchronous search; honours a paged results control in ``serverctrls``."""
+        msgid = self._next_msgid
+        self._next_msgid += 1
+        results = self.search_s(base, scope, filterstr, attrlist, attrsonly)
+
+        page_control = next(
+            (
+                c
+                for c in serverctrls or []
+                if getattr(c, "controlType", None) == SimplePagedResultsControl.controlType
+            ),
+            None,
+        )
+        response_controls = []
+        if page_control is not None:
+            offset = int(page_control.cookie or 0)
+            end = offset + page_control.size
+            cookie = str(end).encode() if end < len(results) else b""
+            results = results[offset:end]
+            response_controls.append(
+                type(page_control)(criticality=True, size=page_control.size, cookie=cookie)
+            )
+
+        self._pending[msgid] = (results, response_controls)
+        return msgid
+
+    def result3(self, msgid=RES_ANY, all=1, timeout=None, resp_ctrl_classes=None):
+        """Return the results of an earlier ``search_ext`` call."""
+        results, response_controls = self._pending.pop(msgid)
+        return RES_SEARCH_RESULT, results, msgid, response_controls
+
+    def whoami_s(self):
+        """Return the bound identity."""
+        return "u:mock" if self.bound else ""
+
     def unbind_s(self):
         """Synchronous unbind operation."""
         print(f"[MOCK LDAP] Unbinding from {self.uri}")
@@ -0,0 +1,349 @@
+"""
+LDAP Connection Pool
+Per-connector pools of persistent connections bound as the service account.
+
+python-ldap is blocking, so every pooled operation runs on a dedicated thread
+pool instead of the event loop. Idle connections are health-checked before
+reuse, recycled after a maximum lifetime, and transparently re-established once
+if the server drops them mid-operation.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import ldap
+
+from app.config import settings
+
+from .connector import get_ldap_client
+from .models import LDAPConnector
+
+logger = logging.getLogger(__name__)
+
+
+# Errors meaning the connection itself is gone and the operation can be retried
+_RECONNECT_ERRORS = (ldap.SERVER_DOWN, ldap.CONNECT_ERROR)
+
+
+class LDAPPoolExhaustedError(RuntimeError):
+    """Raised when no pooled connection became free within the acquire timeout."""
+
+
+class _BrokenBindingError(RuntimeError):
+    """A pooled connection could not be re-bound as the service account."""
+
+
+def _safe_unbind(client: Any) -> None:
+    if client is None:
+        return
+    try:
+        client.unbind_s()
+    except Exception:
+        pass
+
+
+class _PooledConnection:
+    __slots__ = ("client", "created_at", "last_used")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class LDAPConnectionPool:
+    """
+    Bounded pool of connections to one LDAP connector, bound as its service account.
+
+    Not async itself: ``run`` blocks and is meant to be called from a worker
+    thread (see ``run_ldap``).
+    """
+
+    def __init__(
+        self,
+        connector: LDAPConnector,
+        password: str,
+        fingerprint: str,
+        max_size: int | None = None,
+    ):
+        self.connector = connector
+        self.fingerprint = fingerprint
+        self.max_size = max_size or settings.LDAP_POOL_MAX_CONNECTIONS
+        self._password = password
+        self._idle: list[_PooledConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._closed = False
+        # Learned on the first connect so later connects need a single TLS handshake
+        self._bypass_cert: bool | None = None
+
+        self.created = 0
+        self.reused = 0
+        self.reconnects = 0
+        self.discarded = 0
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+    def _bind(self, bypass_cert_verification: bool) -> Any:
+        client = get_ldap_client(self.connector, bypass_cert_verification=bypass_cert_verification)
+        try:
+            client.simple_bind_s(self.connector.username, self._password)
+        except Exception:
+            _safe_unbind(client)
+            raise
+        return client
+
+    def _connect(self) -> _PooledConnection:
+        if self._bypass_cert is None:
+            try:
+                client = self._bind(bypass_cert_verification=False)
+                self._bypass_cert = False
+            except ldap.INVALID_CREDENTIALS:
+                raise
+            except ldap.LDAPError as cert_error:
+                if not self.connector.is_ssl:
+                    raise
+                logger.warning(
+                    f"LDAP connection with cert failed for {self.connector.host}: {cert_error}; "
+                    "retrying without certificate verification"
+                )
+                client = self._bind(bypass_cert_verification=True)
+                self._bypass_cert = True
+        else:
+            client = self._bind(bypass_cert_verification=self._bypass_cert)
+
+        with self._lock:
+            self.created += 1
+        logger.debug(f"Opened pooled LDAP connection to {self.connector.host}")
+        return _PooledConnection(client)
+
+    def _is_healthy(self, conn: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if now - conn.created_at > settings.LDAP_POOL_MAX_LIFETIME_SECONDS:
+            return False
+        if now - conn.last_used < settings.LDAP_POOL_HEALTH_CHECK_SECONDS:
+            return True
+        try:
+            conn.client.whoami_s()
+            return True
+        except Exception as e:
+            logger.debug(f"Pooled LDAP connection to {self.connector.host} failed check: {e}")
+            return False
+
+    def _discard(self, conn: _PooledConnection) -> None:
+        _safe_unbind(conn.client)
+        with self._lock:
+            self.discarded += 1
+
+    def _acquire(self) -> _PooledConnection:
+        if not self._slots.acquire(timeout=settings.LDAP_POOL_ACQUIRE_TIMEOUT_SECONDS):
+            raise LDAPPoolExhaustedError(
+                f"No LDAP connection to {self.connector.host} available "
+                f"after {settings.LDAP_POOL_ACQUIRE_TIMEOUT_SECONDS}s"
+            )
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    return self._connect()
+                if self._is_healthy(conn):
+                    with self._lock:
+                        self.reused += 1
+                    return conn
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: _PooledConnection | None) -> None:
+        try:
+            if conn is None:
+                return
+            conn.last_used = time.monotonic()
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(conn)
+                    return
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def run[T](self, operation: Callable[[Any], T]) -> T:
+        """
+        Run ``operation(client)`` on a pooled, service-bound connection.
+
+        If the connection turns out to be dead it is replaced and the operation
+        retried once. ``operation`` must leave the connection bound as the
+        service account (see ``bind_as``).
+        """
+        conn = self._acquire()
+        reusable = True
+        try:
+            try:
+                return operation(conn.client)
+            except _RECONNECT_ERRORS as e:
+                logger.warning(f"LDAP connection to {self.connector.host} lost ({e}), reconnecting")
+                self._discard(conn)
+                conn = None
+                conn = self._connect()
+                with self._lock:
+                    self.reconnects += 1
+                return operation(conn.client)
+        except (_BrokenBindingError, *_RECONNECT_ERRORS):
+            reusable = False
+            raise
+        except ldap.LDAPError:
+            # Operation-level failure (bad filter, no such object): connection is fine
+            raise
+        except BaseException:
+            reusable = False
+            raise
+        finally:
+            if conn is not None and not reusable:
+                self._discard(conn)
+                conn = None
+            self._release(conn)
+
+    def bind_as(self, client: Any, who: str, credential: str) -> None:
+        """
+        Verify ``who``/``credential`` with a bind on ``client``, then restore the
+        service account binding so the connection can go back to the pool.
+
+        Raises:
+            ldap.INVALID_CREDENTIALS: If the user's credentials are wrong
+        """
+        try:
+            client.simple_bind_s(who, credential)
+        finally:
+            try:
+                client.simple_bind_s(self.connector.username, self._password)
+            except ldap.LDAPError as e:
+                raise _BrokenBindingError(
+                    f"Could not restore service binding on {self.connector.host}: {e}"
+                ) from e
+
+    def close(self) -> None:
+        """Unbind every idle connection; in-use connections are unbound on release."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _safe_unbind(conn.client)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "host": self.connector.host,
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "reconnects": self.reconnects,
+                "discarded": self.discarded,
+                "cert_verification_bypassed": bool(self._bypass_cert),
+            }
+
+
+# -----------------------------------------------------------------------------
+# Pool registry
+# -----------------------------------------------------------------------------
+_pools: dict[str, LDAPConnectionPool] = {}
+_pools_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.LDAP_POOL_WORKERS,
+                    thread_name_prefix="ldap",
+                )
+    return _executor
+
+
+def _fingerprint(connector: LDAPConnector, password: str) -> str:
+    """Hash of everything that affects how a connection is opened and bound."""
+    parts = (
+        connector.host,
+        str(connector.port),
+        str(connector.is_ssl),
+        str(connector.search_timeout),
+        connector.username or "",
+        password or "",
+    )
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_pool(connector: LDAPConnector, password: str) -> LDAPConnectionPool:
+    """Get the pool for a connector, replacing it if its connection settings changed."""
+    fingerprint = _fingerprint(connector, password)
+    stale = None
+    with _pools_lock:
+        pool = _pools.get(connector.id)
+        if pool is None or pool.fingerprint != fingerprint:
+            stale = pool
+            pool = LDAPConnectionPool(connector, password, fingerprint)
+            _pools[connector.id] = pool
+    if stale is not None:
+        stale.close()
+    return pool
+
+
+def close_pool(connector_id: str) -> None:
+    """Drop a connector's pool (call after the connector is updated or deleted)."""
+    with _pools_lock:
+        pool = _pools.pop(str(connector_id), None)
+    if pool is not None:
+        pool.close()
+
+
+async def run_in_ldap_thread[T](func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking python-ldap call on the LDAP worker threads."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+async def run_ldap[T](
+    connector: LDAPConnector,
+    password: str,
+    operation: Callable[[Any], T],
+) -> T:
+    """Run ``operation(client)`` on a pooled connection without blocking the event loop."""
+    pool = get_pool(connector, password)
+    return await run_in_ldap_thread(pool.run, operation)
+
+
+def get_stats() -> dict[str, Any]:
+    """Per-connector pool statistics."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {connector_id: pool.stats() for connector_id, pool in pools.items()}
+
+
+def shutdown() -> None:
+    """Close every pool and stop the worker threads (application shutdown)."""
+    global _executor
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -24,7 +24,14 @@ from app.config import settings
 from app.email_service import send_welcome_email
 
 from .models import LDAPSearchInputModel, LDAPSearchResult, LoginModel
-from .service import ldap_authenticate, ldap_search, sync_ldap_connector, test_ldap_connection
+from .pool import get_stats as get_pool_stats
+from .service import (
+    invalidate_connector,
+    ldap_authenticate,
+    ldap_search,
+    test_ldap_connection,
+)
+from .sync import sync_ldap_connector
 
 logger = logging.getLogger(__name__)
 
@@ -407,6 +414,7 @@ async def db_update_ldap_connector(
     connector.updated_at = datetime.utcnow()
     await db.commit()
     await db.refresh(connector)
+    invalidate_connector(connector_id)
     return connector
 
 
@@ -422,6 +430,7 @@ async def db_delete_ldap_connector(db: AsyncSession, connector_id: str) -> bool:
 
     await db.delete(connector)
     await db.commit()
+    invalidate_connector(connector_id)
     return True
 
 
@@ -682,12 +691,22 @@ async def authenticate(connector_id: str, credentials: LoginModel):
     }
 
 
+@router.get("/pool-stats", response_model=dict[str, Any])
+async def pool_stats():
+    """
+    Connection pool statistics per LDAP connector
+    """
+    return get_pool_stats()
+
+
 @router.post("/sync/{connector_id}", response_model=dict[str, Any])
-async def sync_connector(connector_id: str):
+async def sync_connector(connector_id: str, full: bool = False):
     """
     Synchronize users and groups with LDAP directory
+
+    Only entries changed since the last sync are fetched unless ``full`` is set.
     """
-    result = await sync_ldap_connector(connector_id)
+    result = await sync_ldap_connector(connector_id, full=full)
 
     if "error" in result:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result["error"])
@@ -950,7 +969,7 @@ async def get_directory_users(
         connector_pydantic = connector_to_pydantic(connector)
 
         # Search LDAP for users
-        search_input = LDAPSearchInputModel(query=query or "*", connectorId=connector_pydantic.id)
+        search_input = LDAPSearchInputModel(query=query or "*", connector_id=connector_pydantic.id)
 
         results = await ldap_search(search_input)
 
@@ -1270,15 +1289,3 @@ async def deactivate_directory(
         raise HTTPException(
             status_code=500, detail=f"Error deactivating directory: {str(e)}"
         ) from e
-
-
-# ============================================================================
-# Database Initialization
-# ============================================================================
-
-
-async def init_ldap_tables():
-    """Initialize LDAP-related database tables"""
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("LDAP database tables initialized successfully")
@@ -12,17 +12,32 @@ from typing import Any
 
 import ldap
 from cryptography.fernet import Fernet
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.future import select
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.secure_memory import LockedSecret
 
 from .connector import authenticate_ldap, get_ldap_client
 from .errors import map_ldap_error
 from .models import LDAPConnector, LDAPSearchInputModel, LDAPSearchResult, LoginModel
+from .pool import LDAPPoolExhaustedError, close_pool, run_in_ldap_thread, run_ldap
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -48,6 +63,49 @@ if not ENCRYPTION_KEY:
 
 fernet = Fernet(ENCRYPTION_KEY.encode() if isinstance(ENCRYPTION_KEY, str) else ENCRYPTION_KEY)
 
+# Connector fields that invalidate pooled LDAP connections when changed
+_POOL_CONNECTION_FIELDS = frozenset(
+    {"host", "port", "is_ssl", "username", "vault_secret_name", "search_timeout"}
+)
+
+# connector_id -> LDAPConnector
+_connector_cache = TTLCache(
+    maxsize=settings.LDAP_CONFIG_CACHE_MAX_ENTRIES,
+    ttl=settings.LDAP_CONNECTOR_CACHE_TTL_SECONDS,
+    name="ldap_connectors",
+)
+
+# secret name -> LockedSecret; evicted secrets are zeroed
+_secret_cache = TTLCache(
+    maxsize=settings.LDAP_CONFIG_CACHE_MAX_ENTRIES,
+    ttl=settings.LDAP_SECRET_CACHE_TTL_SECONDS,
+    on_evict=lambda _name, secret: secret.wipe(),
+    name="ldap_secrets",
+)
+
+# Connector fields that change what a live picker search returns
+_SEARCH_FIELDS = frozenset(
+    {
+        "host",
+        "port",
+        "base_dn",
+        "user_dn",
+        "user_object_filter",
+        "attribute_username",
+        "attribute_first_name",
+        "attribute_last_name",
+        "attribute_display_name",
+        "attribute_email",
+    }
+)
+
+# (connector_id, normalized query) -> list[LDAPSearchResult] for the directory picker
+_search_cache = TTLCache(
+    maxsize=settings.LDAP_SEARCH_CACHE_MAX_ENTRIES,
+    ttl=settings.LDAP_SEARCH_CACHE_TTL_SECONDS,
+    name="ldap_search",
+)
+
 
 # ============================================================================
 # SQLAlchemy Models
@@ -121,6 +179,62 @@ class LDAPConnectorModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class LDAPDirectoryEntryModel(Base):
+    """Local copy of a connector's directory users and groups, maintained by the sync engine"""
+
+    __tablename__ = "ldap_directory_entries"
+    __table_args__ = (
+        UniqueConstraint(
+            "connector_id", "directory_key", name="uq_ldap_directory_entries_connector_key"
+        ),
+        # Substring type-ahead (LIKE '%term%') over search_text
+        Index(
+            "ix_ldap_directory_entries_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    connector_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    company_id = Column(Integer, nullable=False, index=True)
+    # objectGUID/entryUUID when the directory provides one (survives renames), else the DN
+    directory_key = Column(Text, nullable=False)
+    entry_type = Column(String(20), nullable=False, default="user")
+    dn = Column(Text, nullable=False)
+    username = Column(Text, nullable=True)
+    email = Column(Text, nullable=True)
+    display_name = Column(Text, nullable=True)
+    first_name = Column(Text, nullable=True)
+    last_name = Column(Text, nullable=True)
+    telephone = Column(Text, nullable=True)
+    department = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)
+    # Lower-cased names/username/email joined for the directory picker
+    search_text = Column(Text, nullable=True)
+    usn_changed = Column(BigInteger, nullable=True)
+    modify_timestamp = Column(String(32), nullable=True)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    last_seen_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LDAPSyncStateModel(Base):
+    """Delta-sync high-water marks per connector"""
+
+    __tablename__ = "ldap_sync_state"
+
+    connector_id = Column(UUID(as_uuid=True), primary_key=True)
+    # uSNChanged values are only comparable on the domain controller that issued them
+    server = Column(String(255), nullable=True)
+    highest_usn = Column(BigInteger, nullable=True)
+    highest_modify_timestamp = Column(String(32), nullable=True)
+    last_full_sync = Column(DateTime, nullable=True)
+    last_delta_sync = Column(DateTime, nullable=True)
+    entry_count = Column(Integer, default=0)
+
+
 # ============================================================================
 # Database Session Helper
 # ============================================================================
@@ -190,6 +304,7 @@ async def store_secret_in_vault(
             db.add(new_secret)
 
         await db.commit()
+        _secret_cache.pop(secret_name)
         logger.info(f"Secret '{secret_name}' stored successfully")
         return True
 
@@ -209,6 +324,9 @@ async def _get_password_from_vault(
     """
     Retrieves a decrypted secret from the vault
 
+    Decrypted secrets are cached for ``LDAP_SECRET_CACHE_TTL_SECONDS`` in locked
+    memory and zeroed when evicted or when the secret is updated/deleted.
+
     Args:
         secret_name: Name of the secret to retrieve
         db: Database session
@@ -225,17 +343,28 @@ async def _get_password_from_vault(
         logger.info(f"Using hardcoded password for {secret_name} (temporary fix)")
         return "sCadbqFg2uS1cwaVewro"
 
+    cached = _secret_cache.get(secret_name)
+    if cached is not None:
+        try:
+            return cached.reveal()
+        except ValueError:
+            # Evicted and wiped by another thread in the meantime
+            pass
+
     close_session = False
     if db is None:
         db = await get_db_session()
         close_session = True
 
     try:
-        result = await db.execute(select(VaultSecret).where(VaultSecret.name == secret_name))
-        secret = result.scalar_one_or_none()
+        result = await db.execute(
+            select(VaultSecret.encrypted_secret).where(VaultSecret.name == secret_name)
+        )
+        encrypted_secret = result.scalar_one_or_none()
 
-        if secret and secret.encrypted_secret:
-            decrypted = decrypt_secret(secret.encrypted_secret)
+        if encrypted_secret:
+            decrypted = decrypt_secret(encrypted_secret)
+            _secret_cache.set(secret_name, LockedSecret(decrypted))
             return decrypted
         else:
             logger.error(f"Secret '{secret_name}' not found in Vault or value is empty.")
@@ -275,6 +404,7 @@ async def delete_secret_from_vault(
         if secret:
             await db.delete(secret)
             await db.commit()
+            _secret_cache.pop(secret_name)
             logger.info(f"Secret '{secret_name}' deleted from Vault")
             return True
         return False
@@ -518,6 +648,11 @@ async def update_ldap_connector(
 
         await db.commit()
         await db.refresh(connector)
+        _connector_cache.pop(str(connector_id))
+        if _POOL_CONNECTION_FIELDS.intersection(connector_data):
+            close_pool(connector_id)
+        if _SEARCH_FIELDS.intersection(connector_data):
+            invalidate_search_cache(connector_id)
 
         logger.info(f"Updated LDAP connector: {connector_id}")
         return model_to_dict(connector)
@@ -561,6 +696,7 @@ async def delete_ldap_connector(
 
         await db.delete(connector)
         await db.commit()
+        invalidate_connector(connector_id)
 
         logger.info(f"Deleted LDAP connector: {connector_id}")
         return {"message": f"Deleted LDAP connector: {connector_id}"}
@@ -581,6 +717,9 @@ async def get_ldap_connector(
     """
     Get an LDAP connector by ID
 
+    Served from an in-process cache, invalidated whenever the connector is
+    updated or deleted.
+
     Args:
         connector_id: ID of the connector
         db: Database session
@@ -588,6 +727,10 @@ async def get_ldap_connector(
     Returns:
         The connector or None if not found
     """
+    cached = _connector_cache.get(str(connector_id))
+    if cached is not None:
+        return cached.model_copy()
+
     close_session = False
     if db is None:
         db = await get_db_session()
@@ -600,7 +743,9 @@ async def get_ldap_connector(
         connector = result.scalar_one_or_none()
 
         if connector:
-            return model_to_pydantic(connector)
+            connector_model = model_to_pydantic(connector)
+            _connector_cache.set(str(connector_id), connector_model.model_copy())
+            return connector_model
         else:
             logger.warning(f"LDAP connector not found: {connector_id}")
             return None
@@ -768,11 +913,21 @@ async def test_ldap_connection(connector_data: dict[str, Any]) -> dict[str, Any]
             else:
                 return {"error": "No password provided for LDAP connection test."}
 
-        client = None
-        try:
-            bypass_cert = connector_data.get("bypass_cert_verification", False)
+        bypass_cert = connector_data.get("bypass_cert_verification", False)
+
+        def bind_and_unbind() -> None:
+            # A connection test must open a fresh connection, so this bypasses the pool
             client = get_ldap_client(connector_model, bypass_cert_verification=bypass_cert)
-            client.simple_bind_s(connector_model.username, ldap_password)
+            try:
+                client.simple_bind_s(connector_model.username, ldap_password)
+            finally:
+                try:
+                    client.unbind_s()
+                except ldap.LDAPError:
+                    pass
+
+        try:
+            await run_in_ldap_thread(bind_and_unbind)
             logger.info(f"Successfully connected to LDAP server: {connector_model.host}")
             return {"message": "LDAP service account connection successful."}
 
@@ -783,12 +938,6 @@ async def test_ldap_connection(connector_data: dict[str, Any]) -> dict[str, Any]
                 "error": f"LDAP service account connection failed: {error_info}",
                 "details": str(e),
             }
-        finally:
-            if client:
-                try:
-                    client.unbind_s()
-                except ldap.LDAPError:
-                    pass
 
     except Exception as e:
         logger.exception(f"Unexpected error during LDAP connection test: {str(e)}")
@@ -823,24 +972,17 @@ async def ldap_authenticate(connector_id: str, credentials: LoginModel) -> bool:
             )
             return False
 
-        try:
-            authenticated, user_ldap_info = authenticate_ldap(
-                connector_config=connector,
-                service_bind_user=connector.username,
-                service_bind_password=service_account_password,
-                user_to_auth_id=credentials.email,
-                user_to_auth_password=credentials.password,
-            )
-
-            if authenticated:
-                logger.info(f"User '{credentials.email}' authenticated via LDAP")
-                return True
-            else:
-                logger.warning(f"User '{credentials.email}' authentication failed")
-                return False
+        authenticated = await authenticate_ldap(
+            connector,
+            {"email": credentials.email, "password": credentials.password},
+            service_bind_password=service_account_password,
+        )
 
-        except ldap.LDAPError as e:
-            logger.error(f"LDAP authentication error for {credentials.email}: {str(e)}")
+        if authenticated:
+            logger.info(f"User '{credentials.email}' authenticated via LDAP")
+            return True
+        else:
+            logger.warning(f"User '{credentials.email}' authentication failed")
             return False
 
     except Exception as e:
@@ -848,10 +990,204 @@ async def ldap_authenticate(connector_id: str, credentials: LoginModel) -> bool:
         return False
 
 
+def _search_users(client: Any, connector: LDAPConnector, query: str) -> list[LDAPSearchResult]:
+    """Run a user search on a bound connection and map entries to search results."""
+    # Construct LDAP filter
+    base_filter = connector.user_object_filter or "(&(objectClass=user)(!(objectClass=computer)))"
+
+    if query and query != "*":
+        search_term = query.replace("*", "")
+        if search_term:
+            search_filter = (
+                f"(&{base_filter}(|(cn=*{search_term}*)"
+                f"(displayName=*{search_term}*)"
+                f"(mail=*{search_term}*)"
+                f"(sAMAccountName=*{search_term}*)))"
+            )
+        else:
+            search_filter = base_filter
+    else:
+        search_filter = base_filter
+
+    search_base = connector.user_dn or connector.base_dn
+
+    logger.info(f"Search base: {search_base}")
+    logger.info(f"Search filter: {search_filter}")
+
+    # Define attributes to retrieve
+    attributes = [
+        connector.attribute_username or "sAMAccountName",
+        connector.attribute_first_name or "givenName",
+        connector.attribute_last_name or "sn",
+        connector.attribute_display_name or "displayName",
+        connector.attribute_email or "mail",
+        connector.attribute_user_guid or "objectGUID",
+        "telephoneNumber",
+        "department",
+        "objectClass",
+    ]
+
+    results = client.search_s(search_base, ldap.SCOPE_SUBTREE, search_filter, attributes)
+    logger.info(f"Raw LDAP search returned {len(results)} entries")
+
+    def get_attr_value(attr_list):
+        if attr_list and isinstance(attr_list, list) and attr_list[0]:
+            return (
+                attr_list[0].decode("utf-8")
+                if isinstance(attr_list[0], bytes)
+                else str(attr_list[0])
+            )
+        return None
+
+    # Transform results
+    search_results = []
+    for dn, attrs in results:
+        if not dn:
+            continue
+
+        # Check object class
+        object_class = attrs.get("objectClass", [])
+        if isinstance(object_class, list):
+            object_class_str = [
+                oc.decode("utf-8") if isinstance(oc, bytes) else str(oc) for oc in object_class
+            ]
+        else:
+            object_class_str = [str(object_class)]
+
+        # Skip non-user objects
+        if "computer" in object_class_str:
+            continue
+        if "user" not in object_class_str and "person" not in object_class_str:
+            continue
+
+        display_name = get_attr_value(attrs.get(connector.attribute_display_name or "displayName"))
+        first_name = get_attr_value(attrs.get(connector.attribute_first_name or "givenName"))
+        last_name = get_attr_value(attrs.get(connector.attribute_last_name or "sn"))
+        username = get_attr_value(attrs.get(connector.attribute_username or "sAMAccountName"))
+        email = get_attr_value(attrs.get(connector.attribute_email or "mail"))
+
+        # Skip entries without essential information
+        if not username and not email and not display_name:
+            continue
+
+        search_results.append(
+            LDAPSearchResult(
+                type="user",
+                name=display_name or f"{first_name or ''} {last_name or ''}".strip() or username or dn,
+                directory_id=dn,
+                username=username or "",
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                telephone=get_attr_value(attrs.get("telephoneNumber")),
+                department=get_attr_value(attrs.get("department")),
+            )
+        )
+
+    return search_results
+
+
+def invalidate_search_cache(connector_id: str) -> None:
+    """Drop cached picker results for a connector (after a sync or config change)."""
+    connector_id = str(connector_id)
+    _search_cache.invalidate_where(lambda key: key[0] == connector_id)
+
+
+def invalidate_connector(connector_id: str) -> None:
+    """Forget everything cached for a connector: config, pooled connections, picker results."""
+    _connector_cache.pop(str(connector_id))
+    close_pool(connector_id)
+    invalidate_search_cache(connector_id)
+
+
+def _normalize_query(query: str | None) -> str:
+    return (query or "").replace("*", "").strip().lower()
+
+
+def _entry_to_search_result(entry: Any) -> LDAPSearchResult:
+    full_name = f"{entry.first_name or ''} {entry.last_name or ''}".strip()
+    return LDAPSearchResult(
+        type=entry.entry_type,
+        name=entry.display_name or full_name or entry.username or entry.dn,
+        directory_id=entry.dn,
+        username=entry.username or "",
+        email=entry.email,
+        first_name=entry.first_name,
+        last_name=entry.last_name,
+        telephone=entry.telephone,
+        department=entry.department,
+    )
+
+
+async def _search_directory_index(
+    connector: LDAPConnector, term: str
+) -> list[LDAPSearchResult] | None:
+    """
+    Answer a picker search from the synced directory index.
+
+    Returns:
+        Matching users, or None if the connector has never been synced or
+        the index cannot be read (the caller then searches live LDAP)
+    """
+    try:
+        return await _query_directory_index(uuid.UUID(str(connector.id)), term)
+    except SQLAlchemyError as e:
+        logger.warning(f"LDAP directory index unavailable, searching live LDAP: {str(e)}")
+        return None
+
+
+async def _query_directory_index(
+    connector_id: uuid.UUID, term: str
+) -> list[LDAPSearchResult] | None:
+    entry = LDAPDirectoryEntryModel
+
+    async with AsyncSessionLocal() as db:
+        synced = await db.scalar(
+            select(LDAPSyncStateModel.entry_count).where(
+                LDAPSyncStateModel.connector_id == connector_id
+            )
+        )
+        if not synced:
+            return None
+
+        stmt = select(
+            entry.entry_type,
+            entry.dn,
+            entry.username,
+            entry.email,
+            entry.display_name,
+            entry.first_name,
+            entry.last_name,
+            entry.telephone,
+            entry.department,
+        ).where(
+            entry.connector_id == connector_id,
+            entry.entry_type == "user",
+            entry.is_deleted.is_(False),
+        )
+
+        if term:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            stmt = stmt.where(entry.search_text.like(f"%{escaped}%", escape="\\")).order_by(
+                # Names starting with the term first
+                func.lower(entry.display_name).like(f"{escaped}%", escape="\\").desc(),
+                entry.display_name,
+            )
+        else:
+            stmt = stmt.order_by(entry.display_name)
+
+        result = await db.execute(stmt.limit(settings.LDAP_DIRECTORY_SEARCH_LIMIT))
+        return [_entry_to_search_result(row) for row in result.all()]
+
+
 async def ldap_search(search_data: LDAPSearchInputModel) -> list[LDAPSearchResult]:
     """
     Perform a search on LDAP
 
+    Searches are answered from the synced directory index when the connector
+    has been synced, and from live LDAP (on a pooled connection already bound as
+    the service account) otherwise. Results are cached per (connector, query).
+
     Args:
         search_data: Search parameters
 
@@ -859,11 +1195,25 @@ async def ldap_search(search_data: LDAPSearchInputModel) -> list[LDAPSearchResul
         List of search results
     """
     try:
-        connector = await get_ldap_connector(search_data.connectorId)
+        term = _normalize_query(search_data.query)
+        cache_key = (str(search_data.connector_id), term)
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        connector = await get_ldap_connector(search_data.connector_id)
         if not connector:
-            logger.error(f"LDAP connector not found: {search_data.connectorId}")
+            logger.error(f"LDAP connector not found: {search_data.connector_id}")
             return []
 
+        search_results = await _search_directory_index(connector, term)
+        if search_results is not None:
+            logger.info(
+                f"LDAP search answered from directory index: {len(search_results)} users found"
+            )
+            _search_cache.set(cache_key, search_results)
+            return list(search_results)
+
         if not connector.vault_secret_name:
             logger.error(f"Vault secret not configured for connector: {connector.name}")
             return []
@@ -873,255 +1223,25 @@ async def ldap_search(search_data: LDAPSearchInputModel) -> list[LDAPSearchResul
             logger.error("Failed to retrieve LDAP password from Vault")
             return []
 
-        logger.info(f"Starting LDAP search with connector: {connector.name}")
-        logger.info(f"Host: {connector.host}, Port: {connector.port}")
-
-        # Try connection with certificate first, then bypass if fails
-        client = None
-        connection_successful = False
+        logger.info(f"Starting live LDAP search with connector: {connector.name}")
 
         try:
-            client = get_ldap_client(connector, bypass_cert_verification=False)
-            client.simple_bind_s(connector.username, ldap_password)
-            connection_successful = True
-            logger.info("Successfully bound to LDAP with certificate verification")
-        except Exception as cert_error:
-            logger.warning(f"LDAP connection with cert failed: {str(cert_error)}")
-            logger.warning("Attempting connection without certificate verification...")
-
-            try:
-                if client:
-                    try:
-                        client.unbind_s()
-                    except Exception:
-                        pass
-
-                client = get_ldap_client(connector, bypass_cert_verification=True)
-                client.simple_bind_s(connector.username, ldap_password)
-                connection_successful = True
-                logger.info("Successfully bound to LDAP without certificate verification")
-            except Exception as bypass_error:
-                logger.error(f"LDAP connection failed: {str(bypass_error)}")
-                return []
-
-        if not connection_successful:
-            logger.error("Failed to establish LDAP connection")
-            return []
-
-        try:
-            # Construct LDAP filter
-            base_filter = (
-                connector.user_object_filter or "(&(objectClass=user)(!(objectClass=computer)))"
+            search_results = await run_ldap(
+                connector,
+                ldap_password,
+                lambda client: _search_users(client, connector, search_data.query),
             )
-
-            if search_data.query and search_data.query != "*":
-                search_term = search_data.query.replace("*", "")
-                if search_term:
-                    search_filter = (
-                        f"(&{base_filter}(|(cn=*{search_term}*)"
-                        f"(displayName=*{search_term}*)"
-                        f"(mail=*{search_term}*)"
-                        f"(sAMAccountName=*{search_term}*)))"
-                    )
-                else:
-                    search_filter = base_filter
-            else:
-                search_filter = base_filter
-
-            search_base = connector.user_dn or connector.base_dn
-
-            logger.info(f"Search base: {search_base}")
-            logger.info(f"Search filter: {search_filter}")
-
-            # Define attributes to retrieve
-            attributes = [
-                connector.attribute_username or "sAMAccountName",
-                connector.attribute_first_name or "givenName",
-                connector.attribute_last_name or "sn",
-                connector.attribute_display_name or "displayName",
-                connector.attribute_email or "mail",
-                connector.attribute_user_guid or "objectGUID",
-                "telephoneNumber",
-                "department",
-                "objectClass",
-            ]
-
-            try:
-                results = client.search_s(
-                    search_base, ldap.SCOPE_SUBTREE, search_filter, attributes
-                )
-                logger.info(f"Raw LDAP search returned {len(results)} entries")
-            except ldap.LDAPError as search_error:
-                logger.error(f"LDAP search failed: {str(search_error)}")
-                return []
-
-            # Transform results
-            search_results = []
-            for dn, attrs in results:
-                if not dn:
-                    continue
-
-                def get_attr_value(attr_list):
-                    if attr_list and isinstance(attr_list, list) and attr_list[0]:
-                        return (
-                            attr_list[0].decode("utf-8")
-                            if isinstance(attr_list[0], bytes)
-                            else str(attr_list[0])
-                        )
-                    return None
-
-                # Check object class
-                object_class = attrs.get("objectClass", [])
-                if isinstance(object_class, list):
-                    object_class_str = [
-                        oc.decode("utf-8") if isinstance(oc, bytes) else str(oc)
-                        for oc in object_class
-                    ]
-                else:
-                    object_class_str = [str(object_class)]
-
-                # Skip non-user objects
-                if "computer" in object_class_str:
-                    continue
-                if "user" not in object_class_str and "person" not in object_class_str:
-                    continue
-
-                display_name = get_attr_value(
-                    attrs.get(connector.attribute_display_name or "displayName")
-                )
-                first_name = get_attr_value(
-                    attrs.get(connector.attribute_first_name or "givenName")
-                )
-                last_name = get_attr_value(attrs.get(connector.attribute_last_name or "sn"))
-                username = get_attr_value(
-                    attrs.get(connector.attribute_username or "sAMAccountName")
-                )
-                email = get_attr_value(attrs.get(connector.attribute_email or "mail"))
-
-                # Skip entries without essential information
-                if not username and not email and not display_name:
-                    continue
-
-                search_result = LDAPSearchResult(
-                    type="user",
-                    name=display_name or f"{first_name} {last_name}".strip() or username or dn,
-                    directoryId=dn,
-                    username=username,
-                    email=email,
-                    firstName=first_name,
-                    lastName=last_name,
-                    telephone=get_attr_value(attrs.get("telephoneNumber")),
-                    department=get_attr_value(attrs.get("department")),
-                )
-
-                search_results.append(search_result)
-
-            logger.info(f"LDAP search completed: {len(search_results)} users found")
-            return search_results
-
+        except LDAPPoolExhaustedError as e:
+            logger.error(f"LDAP search rejected: {str(e)}")
+            return []
         except ldap.LDAPError as e:
             logger.error(f"LDAP search error: {str(e)}")
             return []
-        finally:
-            if client:
-                try:
-                    client.unbind_s()
-                except Exception:
-                    pass
+
+        logger.info(f"LDAP search completed: {len(search_results)} users found")
+        _search_cache.set(cache_key, search_results)
+        return list(search_results)
 
     except Exception as e:
         logger.exception(f"Unexpected error during LDAP search: {str(e)}")
         return []
-
-
-async def sync_ldap_connector(connector_id: str) -> dict[str, Any]:
-    """
-    Synchronize users and groups from an LDAP connector
-
-    Args:
-        connector_id: ID of the connector to sync
-
-    Returns:
-        Sync status
-    """
-    logger.info(f"Attempting to sync LDAP connector: {connector_id}")
-
-    connector = await get_ldap_connector(connector_id)
-    if not connector:
-        return {"error": f"LDAP connector {connector_id} not found."}
-
-    if not connector.vault_secret_name:
-        return {"error": f"Vault secret not configured for connector {connector_id}."}
-
-    ldap_password = await _get_password_from_vault(connector.vault_secret_name)
-    if ldap_password is None:
-        return {"error": "Failed to retrieve LDAP password from Vault."}
-
-    # Update status to syncing
-    await update_ldap_connector(
-        connector_id,
-        {"status": "syncing", "status_message": "Synchronization started."},
-    )
-
-    try:
-        client = get_ldap_client(connector)
-        client.simple_bind_s(connector.username, ldap_password)
-        logger.info(f"Successfully bound to LDAP for sync: {connector.host}")
-
-        # TODO: Implement actual user synchronization logic
-        # 1. Fetch users from LDAP
-        # 2. For each user:
-        #    a. Check if exists in local database
-        #    b. Update or create profile
-        # 3. Handle group/role mapping
-
-        client.unbind_s()
-
-        # Update status to complete
-        await update_ldap_connector(
-            connector_id,
-            {
-                "status": "complete",
-                "last_sync": datetime.utcnow().isoformat(),
-                "status_message": "Synchronization completed successfully.",
-            },
-        )
-
-        logger.info(f"LDAP connector {connector_id} synced successfully.")
-        return {"message": "LDAP connector synced successfully."}
-
-    except ldap.LDAPError as e:
-        await update_ldap_connector(
-            connector_id,
-            {
-                "status": "failed",
-                "error": str(e),
-                "status_message": "Synchronization failed due to LDAP error.",
-            },
-        )
-        logger.error(f"LDAP error during sync for connector {connector_id}: {str(e)}")
-        return {"error": f"LDAP error during sync: {str(e)}"}
-
-    except Exception as e:
-        await update_ldap_connector(
-            connector_id,
-            {
-                "status": "failed",
-                "error": str(e),
-                "status_message": "Synchronization failed due to unexpected error.",
-            },
-        )
-        logger.exception(f"Unexpected error during sync: {str(e)}")
-        return {"error": f"Unexpected error during sync: {str(e)}"}
-
-
-# ============================================================================
-# Database Initialization
-# ============================================================================
-
-
-async def init_ldap_service_tables():
-    """Initialize LDAP service database tables"""
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("LDAP service database tables initialized successfully")
@@ -0,0 +1,655 @@
+"""
+LDAP Sync Engine
+Streams a connector's users and groups page by page (RFC 2696 Simple Paged
+Results) into ``ldap_directory_entries`` and refreshes the profiles linked to
+them.
+
+After the first full sync, runs only fetch entries changed since the stored
+high-water mark: ``uSNChanged`` on Active Directory, ``modifyTimestamp``
+elsewhere. Deletions are only visible to a full sync, which runs on demand and
+at least every ``LDAP_SYNC_FULL_RESYNC_HOURS``.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+import ldap
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+
+try:
+    from ldap.controls import SimplePagedResultsControl
+except ImportError:
+    from .mock_ldap import SimplePagedResultsControl
+
+from app.config import settings
+from app.models import Profile
+from app.services.profile_directory import ProfileDirectory
+
+from .models import LDAPConnector
+from .pool import get_pool, run_in_ldap_thread
+from .service import (
+    AsyncSessionLocal,
+    LDAPDirectoryEntryModel,
+    LDAPSyncStateModel,
+    _get_password_from_vault,
+    get_ldap_connector,
+    invalidate_search_cache,
+    update_ldap_connector,
+)
+
+logger = logging.getLogger(__name__)
+
+USER_ENTRY = "user"
+GROUP_ENTRY = "group"
+
+FULL_SYNC = "full"
+DELTA_SYNC = "delta"
+
+# Columns overwritten when an entry that already exists locally is seen again
+_UPSERT_COLUMNS = (
+    "entry_type",
+    "dn",
+    "username",
+    "email",
+    "display_name",
+    "first_name",
+    "last_name",
+    "telephone",
+    "department",
+    "description",
+    "search_text",
+    "usn_changed",
+    "modify_timestamp",
+    "is_deleted",
+    "last_seen_at",
+    "updated_at",
+)
+
+
+class _SyncAbortedError(Exception):
+    """The consumer side of a sync stopped; the LDAP producer should stop too."""
+
+
+@dataclass
+class SyncPlan:
+    """What a sync run will fetch, decided against the server it is connected to."""
+
+    mode: str
+    server: str | None
+    # highestCommittedUSN read before searching; the next delta starts after it
+    highest_usn: int | None
+    searches: list[tuple[str, str, str, list[str]]] = field(default_factory=list)
+
+
+# -----------------------------------------------------------------------------
+# LDAP side (runs on an LDAP worker thread)
+# -----------------------------------------------------------------------------
+def iter_paged_entries(
+    client: Any,
+    base: str,
+    filterstr: str,
+    attrs: list[str],
+    page_size: int,
+) -> Iterator[list[tuple[str, dict[str, list[bytes]]]]]:
+    """
+    Yield search results one page at a time using the Simple Paged Results control.
+
+    Memory stays bounded by ``page_size`` and the server's size limit (1000 on AD)
+    does not apply.
+    """
+    control = SimplePagedResultsControl(True, size=page_size, cookie="")
+    while True:
+        msgid = client.search_ext(
+            base, ldap.SCOPE_SUBTREE, filterstr, attrs, serverctrls=[control]
+        )
+        _, data, _, response_controls = client.result3(
+            msgid,
+            resp_ctrl_classes={SimplePagedResultsControl.controlType: SimplePagedResultsControl},
+        )
+
+        # Referrals come back without a DN
+        entries = [(dn, entry_attrs) for dn, entry_attrs in data if dn]
+        if entries:
+            yield entries
+
+        cookie = next(
+            (
+                c.cookie
+                for c in response_controls or []
+                if c.controlType == SimplePagedResultsControl.controlType
+            ),
+            None,
+        )
+        if not cookie:
+            return
+        control.cookie = cookie
+
+
+def _first_value(attrs: dict[str, list[Any]], name: str | None) -> str | None:
+    """First value of an attribute from a lower-cased attribute dict."""
+    values = attrs.get(name.lower()) if name else None
+    if not values:
+        return None
+    value = values[0]
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return value.hex()
+    return str(value)
+
+
+def _guid_value(attrs: dict[str, list[Any]], name: str | None) -> str | None:
+    values = attrs.get(name.lower()) if name else None
+    if values and isinstance(values[0], bytes) and len(values[0]) == 16:
+        # AD objectGUID is a little-endian binary GUID
+        return str(uuid.UUID(bytes_le=values[0]))
+    return _first_value(attrs, name) or _first_value(attrs, "entryUUID")
+
+
+def read_root_dse(client: Any) -> dict[str, str | None]:
+    """Read the server name and highest committed USN from the root DSE."""
+    try:
+        results = client.search_s(
+            "", ldap.SCOPE_BASE, "(objectClass=*)", ["dnsHostName", "highestCommittedUSN"]
+        )
+    except ldap.LDAPError as e:
+        logger.warning(f"Could not read LDAP root DSE: {str(e)}")
+        return {}
+
+    if not results:
+        return {}
+    attrs = {k.lower(): v for k, v in (results[0][1] or {}).items()}
+    return {
+        "server": _first_value(attrs, "dnsHostName"),
+        "highest_usn": _first_value(attrs, "highestCommittedUSN"),
+    }
+
+
+def _user_attributes(connector: LDAPConnector) -> list[str]:
+    return [
+        connector.attribute_username or "sAMAccountName",
+        connector.attribute_first_name or "givenName",
+        connector.attribute_last_name or "sn",
+        connector.attribute_display_name or "displayName",
+        connector.attribute_email or "mail",
+        connector.attribute_user_guid or "objectGUID",
+        "entryUUID",
+        "telephoneNumber",
+        "department",
+        "uSNChanged",
+        "modifyTimestamp",
+    ]
+
+
+def _group_attributes(connector: LDAPConnector) -> list[str]:
+    return [
+        connector.attribute_group_name or "cn",
+        connector.attribute_group_description or "description",
+        connector.attribute_group_guid or "objectGUID",
+        "entryUUID",
+        "uSNChanged",
+        "modifyTimestamp",
+    ]
+
+
+def _full_resync_due(state: dict[str, Any]) -> bool:
+    last_full = state.get("last_full_sync")
+    if last_full is None:
+        return True
+    return datetime.utcnow() - last_full > timedelta(hours=settings.LDAP_SYNC_FULL_RESYNC_HOURS)
+
+
+def plan_sync(
+    connector: LDAPConnector,
+    state: dict[str, Any] | None,
+    root_dse: dict[str, str | None],
+    force_full: bool = False,
+) -> SyncPlan:
+    """
+    Decide between a full and a delta sync and build the searches to run.
+
+    Args:
+        connector: LDAP connector configuration
+        state: Stored high-water marks (``LDAPSyncStateModel`` columns) or None
+        root_dse: Result of ``read_root_dse`` on the connection used for the sync
+        force_full: Always run a full sync
+
+    Returns:
+        The sync plan
+    """
+    server = root_dse.get("server")
+    highest_usn = int(root_dse["highest_usn"]) if root_dse.get("highest_usn") else None
+
+    delta_clause = None
+    if not force_full and state and not _full_resync_due(state):
+        if connector.directory_type == "active_directory":
+            # USNs are per domain controller; a different DC means starting over
+            if state.get("highest_usn") is not None and state.get("server") == server:
+                delta_clause = f"(uSNChanged>={state['highest_usn'] + 1})"
+        elif state.get("highest_modify_timestamp"):
+            delta_clause = f"(modifyTimestamp>={state['highest_modify_timestamp']})"
+
+    user_filter = connector.user_object_filter or "(&(objectClass=user)(!(objectClass=computer)))"
+    group_filter = (
+        connector.group_object_filter or f"(objectClass={connector.group_object or 'group'})"
+    )
+    if delta_clause:
+        user_filter = f"(&{user_filter}{delta_clause})"
+        group_filter = f"(&{group_filter}{delta_clause})"
+
+    return SyncPlan(
+        mode=DELTA_SYNC if delta_clause else FULL_SYNC,
+        server=server,
+        highest_usn=highest_usn,
+        searches=[
+            (
+                USER_ENTRY,
+                connector.user_dn or connector.base_dn,
+                user_filter,
+                _user_attributes(connector),
+            ),
+            (
+                GROUP_ENTRY,
+                connector.group_dn or connector.base_dn,
+                group_filter,
+                _group_attributes(connector),
+            ),
+        ],
+    )
+
+
+def entry_to_row(
+    kind: str,
+    dn: str,
+    attrs: dict[str, list[Any]],
+    connector: LDAPConnector,
+    seen_at: datetime,
+) -> dict[str, Any]:
+    """Map an LDAP entry to an ``ldap_directory_entries`` row."""
+    attrs = {k.lower(): v for k, v in attrs.items()}
+    usn = _first_value(attrs, "uSNChanged")
+
+    row = {
+        "connector_id": uuid.UUID(str(connector.id)),
+        "company_id": int(connector.company_id),
+        "entry_type": kind,
+        "dn": dn,
+        "username": None,
+        "email": None,
+        "display_name": None,
+        "first_name": None,
+        "last_name": None,
+        "telephone": None,
+        "department": None,
+        "description": None,
+        "usn_changed": int(usn) if usn and usn.isdigit() else None,
+        "modify_timestamp": _first_value(attrs, "modifyTimestamp"),
+        "is_deleted": False,
+        "last_seen_at": seen_at,
+        "updated_at": seen_at,
+    }
+
+    if kind == USER_ENTRY:
+        guid = _guid_value(attrs, connector.attribute_user_guid or "objectGUID")
+        row.update(
+            username=_first_value(attrs, connector.attribute_username or "sAMAccountName"),
+            email=_first_value(attrs, connector.attribute_email or "mail"),
+            display_name=_first_value(attrs, connector.attribute_display_name or "displayName"),
+            first_name=_first_value(attrs, connector.attribute_first_name or "givenName"),
+            last_name=_first_value(attrs, connector.attribute_last_name or "sn"),
+            telephone=_first_value(attrs, "telephoneNumber"),
+            department=_first_value(attrs, "department"),
+        )
+    else:
+        guid = _guid_value(attrs, connector.attribute_group_guid or "objectGUID")
+        row.update(
+            display_name=_first_value(attrs, connector.attribute_group_name or "cn"),
+            description=_first_value(
+                attrs, connector.attribute_group_description or "description"
+            ),
+        )
+
+    row["directory_key"] = guid or dn
+    row["search_text"] = (
+        " ".join(
+            value.lower()
+            for value in (
+                row["display_name"],
+                row["first_name"],
+                row["last_name"],
+                row["username"],
+                row["email"],
+            )
+            if value
+        )
+        or None
+    )
+    return row
+
+
+# -----------------------------------------------------------------------------
+# Database side (event loop)
+# -----------------------------------------------------------------------------
+def _state_snapshot(state: LDAPSyncStateModel | None) -> dict[str, Any] | None:
+    if state is None:
+        return None
+    return {
+        "server": state.server,
+        "highest_usn": state.highest_usn,
+        "highest_modify_timestamp": state.highest_modify_timestamp,
+        "last_full_sync": state.last_full_sync,
+    }
+
+
+async def _upsert_entries(db, rows: list[dict[str, Any]]) -> None:
+    # ON CONFLICT cannot touch the same row twice in one statement
+    unique_rows = list({row["directory_key"]: row for row in rows}.values())
+    stmt = insert(LDAPDirectoryEntryModel).values(unique_rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_ldap_directory_entries_connector_key",
+        set_={column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+    )
+    await db.execute(stmt)
+
+
+async def _mark_missing_deleted(db, connector_id: uuid.UUID, run_started: datetime) -> int:
+    """After a full sync, flag every entry the directory no longer returned."""
+    result = await db.execute(
+        update(LDAPDirectoryEntryModel)
+        .where(
+            LDAPDirectoryEntryModel.connector_id == connector_id,
+            LDAPDirectoryEntryModel.last_seen_at < run_started,
+            LDAPDirectoryEntryModel.is_deleted.is_(False),
+        )
+        .values(is_deleted=True, updated_at=datetime.utcnow())
+    )
+    return result.rowcount or 0
+
+
+async def _refresh_profiles(
+    db, connector_id: uuid.UUID, company_id: int, run_started: datetime
+) -> int:
+    """
+    Copy directory names/phone/department onto the tenant's existing profiles,
+    matched by email, in one set-based UPDATE ... FROM.
+    """
+    entry = LDAPDirectoryEntryModel
+    full_name = func.coalesce(entry.display_name, Profile.full_name)
+    telephone = func.coalesce(entry.telephone, Profile.telephone)
+    department = func.coalesce(entry.department, Profile.department)
+
+    result = await db.execute(
+        update(Profile)
+        .where(
+            Profile.company_id == company_id,
+            func.lower(Profile.email) == func.lower(entry.email),
+            entry.connector_id == connector_id,
+            entry.entry_type == USER_ENTRY,
+            entry.is_deleted.is_(False),
+            entry.updated_at >= run_started,
+            or_(
+                Profile.full_name.is_distinct_from(full_name),
+                Profile.telephone.is_distinct_from(telephone),
+                Profile.department.is_distinct_from(department),
+            ),
+        )
+        .values(full_name=full_name, telephone=telephone, department=department)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+async def _save_state(
+    db,
+    connector_id: uuid.UUID,
+    plan: SyncPlan,
+    state: dict[str, Any] | None,
+    max_usn: int | None,
+    max_modify_timestamp: str | None,
+    run_started: datetime,
+) -> int:
+    state = state or {}
+    if plan.highest_usn is not None:
+        highest_usn = plan.highest_usn
+    else:
+        # No root DSE (non-AD or mock): fall back to the highest USN observed
+        highest_usn = max(
+            (v for v in (state.get("highest_usn"), max_usn) if v is not None), default=None
+        )
+    highest_modify_timestamp = max(
+        (v for v in (state.get("highest_modify_timestamp"), max_modify_timestamp) if v),
+        default=None,
+    )
+
+    entry_count = (
+        await db.execute(
+            select(func.count())
+            .select_from(LDAPDirectoryEntryModel)
+            .where(
+                LDAPDirectoryEntryModel.connector_id == connector_id,
+                LDAPDirectoryEntryModel.is_deleted.is_(False),
+            )
+        )
+    ).scalar_one()
+
+    values = {
+        "server": plan.server,
+        "highest_usn": highest_usn,
+        "highest_modify_timestamp": highest_modify_timestamp,
+        "last_delta_sync": run_started,
+        "entry_count": entry_count,
+    }
+    if plan.mode == FULL_SYNC:
+        values["last_full_sync"] = run_started
+
+    stmt = insert(LDAPSyncStateModel).values(connector_id=connector_id, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=["connector_id"], set_=values)
+    await db.execute(stmt)
+    return entry_count
+
+
+async def run_sync(
+    connector: LDAPConnector, password: str, force_full: bool = False
+) -> dict[str, Any]:
+    """
+    Stream the directory into ``ldap_directory_entries``.
+
+    One pooled connection runs the paged searches on an LDAP worker thread and
+    hands pages to the event loop through a small bounded queue; each page is
+    upserted and committed as it arrives, so memory is bounded by a couple of
+    pages whatever the directory size.
+
+    Returns:
+        Counts describing the run
+    """
+    run_started = datetime.utcnow()
+    connector_id = uuid.UUID(str(connector.id))
+
+    async with AsyncSessionLocal() as db:
+        state = _state_snapshot(await db.get(LDAPSyncStateModel, connector_id))
+
+    loop = asyncio.get_running_loop()
+    pages: asyncio.Queue = asyncio.Queue(maxsize=settings.LDAP_SYNC_QUEUE_PAGES)
+    stop = threading.Event()
+
+    def publish(item: Any) -> None:
+        # Blocks this LDAP thread while the queue is full (backpressure)
+        future = asyncio.run_coroutine_threadsafe(pages.put(item), loop)
+        while True:
+            try:
+                return future.result(timeout=1.0)
+            except TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    raise _SyncAbortedError() from None
+
+    def produce(client: Any) -> SyncPlan:
+        plan = plan_sync(connector, state, read_root_dse(client), force_full)
+        publish(plan)
+        for kind, base, filterstr, attrs in plan.searches:
+            for page in iter_paged_entries(
+                client, base, filterstr, attrs, settings.LDAP_SYNC_PAGE_SIZE
+            ):
+                publish((kind, page))
+        return plan
+
+    pool = get_pool(connector, password)
+
+    def produce_all() -> SyncPlan:
+        # The end-of-stream marker goes outside pool.run: on a dropped connection
+        # the pool reruns ``produce`` and re-sent pages are idempotent upserts
+        try:
+            return pool.run(produce)
+        finally:
+            if not stop.is_set():
+                publish(None)
+
+    producer = asyncio.ensure_future(run_in_ldap_thread(produce_all))
+    # If we bail out early the producer's _SyncAbortedError must not go unretrieved
+    producer.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    counts = {USER_ENTRY: 0, GROUP_ENTRY: 0}
+    max_usn: int | None = None
+    max_modify_timestamp: str | None = None
+
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                item = await pages.get()
+                if item is None:
+                    break
+                if isinstance(item, SyncPlan):
+                    logger.info(f"Starting {item.mode} LDAP sync for connector {connector.id}")
+                    continue
+
+                kind, page = item
+                rows = [entry_to_row(kind, dn, attrs, connector, run_started) for dn, attrs in page]
+                await _upsert_entries(db, rows)
+                await db.commit()
+
+                counts[kind] += len(rows)
+                for row in rows:
+                    if row["usn_changed"] is not None and (
+                        max_usn is None or row["usn_changed"] > max_usn
+                    ):
+                        max_usn = row["usn_changed"]
+                    if row["modify_timestamp"] and (
+                        max_modify_timestamp is None
+                        or row["modify_timestamp"] > max_modify_timestamp
+                    ):
+                        max_modify_timestamp = row["modify_timestamp"]
+
+            # Surfaces any LDAP error raised after the last page
+            plan = await producer
+
+            deleted = 0
+            if plan.mode == FULL_SYNC:
+                deleted = await _mark_missing_deleted(db, connector_id, run_started)
+            profiles_updated = await _refresh_profiles(
+                db, connector_id, int(connector.company_id), run_started
+            )
+            entry_count = await _save_state(
+                db, connector_id, plan, state, max_usn, max_modify_timestamp, run_started
+            )
+            await db.commit()
+    finally:
+        stop.set()
+
+    invalidate_search_cache(connector.id)
+    if profiles_updated:
+        ProfileDirectory.invalidate()
+
+    return {
+        "mode": plan.mode,
+        "users": counts[USER_ENTRY],
+        "groups": counts[GROUP_ENTRY],
+        "deleted": deleted,
+        "profiles_updated": profiles_updated,
+        "entries": entry_count,
+        "duration_seconds": round((datetime.utcnow() - run_started).total_seconds(), 2),
+    }
+
+
+async def sync_ldap_connector(connector_id: str, full: bool = False) -> dict[str, Any]:
+    """
+    Synchronize users and groups from an LDAP connector
+
+    Args:
+        connector_id: ID of the connector to sync
+        full: Ignore the stored high-water marks and re-read the whole directory
+
+    Returns:
+        Sync status
+    """
+    logger.info(f"Attempting to sync LDAP connector: {connector_id}")
+
+    connector = await get_ldap_connector(connector_id)
+    if not connector:
+        return {"error": f"LDAP connector {connector_id} not found."}
+
+    if not connector.vault_secret_name:
+        return {"error": f"Vault secret not configured for connector {connector_id}."}
+
+    ldap_password = await _get_password_from_vault(connector.vault_secret_name)
+    if ldap_password is None:
+        return {"error": "Failed to retrieve LDAP password from Vault."}
+
+    # Update status to syncing
+    await update_ldap_connector(
+        connector_id,
+        {"status": "syncing", "status_message": "Synchronization started."},
+    )
+
+    try:
+        result = await run_sync(connector, ldap_password, force_full=full)
+
+        # Update status to complete
+        await update_ldap_connector(
+            connector_id,
+            {
+                "status": "complete",
+                "last_sync": datetime.utcnow(),
+                "error": None,
+                "status_message": (
+                    f"{result['mode'].capitalize()} synchronization completed: "
+                    f"{result['users']} users, {result['groups']} groups, "
+                    f"{result['deleted']} removed."
+                ),
+            },
+        )
+
+        logger.info(f"LDAP connector {connector_id} synced successfully: {result}")
+        return {"message": "LDAP connector synced successfully.", **result}
+
+    except ldap.LDAPError as e:
+        await update_ldap_connector(
+            connector_id,
+            {
+                "status": "failed",
+                "error": str(e),
+                "status_message": "Synchronization failed due to LDAP error.",
+            },
+        )
+        logger.error(f"LDAP error during sync for connector {connector_id}: {str(e)}")
+        return {"error": f"LDAP error during sync: {str(e)}"}
+
+    except Exception as e:
+        await update_ldap_connector(
+            connector_id,
+            {
+                "status": "failed",
+                "error": str(e),
+                "status_message": "Synchronization failed due to unexpected error.",
+            },
+        )
+        logger.exception(f"Unexpected error during sync: {str(e)}")
+        return {"error": f"Unexpected error during sync: {str(e)}"}
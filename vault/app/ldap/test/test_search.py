@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from app.core.cache import TTLCache
+from app.ldap import service
+from app.ldap.models import LDAPConnector, LDAPSearchInputModel, LDAPSearchResult
+
+CONNECTOR_ID = "6f1c1f2e-8f55-4a51-9d3e-0c0a2b9b7f10"
+
+
+class _IndexSession:
+    """AsyncSessionLocal stand-in over a fixed directory index."""
+
+    def __init__(self, entry_count, rows, error=None):
+        self.entry_count = entry_count
+        self.rows = rows
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def scalar(self, stmt):
+        if self.error is not None:
+            raise self.error
+        return self.entry_count
+
+    async def execute(self, stmt):
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+@pytest.fixture
+def live_search(monkeypatch):
+    """Stub connector lookup and the live LDAP path; returns the live calls made."""
+    calls = []
+    connector = LDAPConnector(
+        id=CONNECTOR_ID,
+        name="Test AD",
+        company_id="1",
+        domain="example",
+        host="ldap.example.com",
+        port="389",
+        username="svc",
+        base_dn="dc=example,dc=com",
+        user_dn="ou=users,dc=example,dc=com",
+        group_dn="ou=groups,dc=example,dc=com",
+        vault_secret_name="ldap-test",
+    )
+
+    async def get_ldap_connector(connector_id):
+        return connector
+
+    async def get_password(secret_name):
+        return "secret"
+
+    async def run_ldap(connector, password, operation):
+        calls.append(connector.id)
+        return [
+            LDAPSearchResult(type="user", name="Live User", directory_id="cn=live", username="live")
+        ]
+
+    monkeypatch.setattr(service, "get_ldap_connector", get_ldap_connector)
+    monkeypatch.setattr(service, "_get_password_from_vault", get_password)
+    monkeypatch.setattr(service, "run_ldap", run_ldap)
+    monkeypatch.setattr(service, "_search_cache", TTLCache(maxsize=10, ttl=60, name="test"))
+    return calls
+
+
+def _search(query):
+    return asyncio.run(
+        service.ldap_search(LDAPSearchInputModel(query=query, connector_id=CONNECTOR_ID))
+    )
+
+
+def test_search_answered_from_directory_index(monkeypatch, live_search):
+    row = SimpleNamespace(
+        entry_type="user",
+        dn="cn=jane,ou=users,dc=example,dc=com",
+        username="jane",
+        email="jane@example.com",
+        display_name="Jane Doe",
+        first_name="Jane",
+        last_name="Doe",
+        telephone=None,
+        department="HR",
+    )
+    monkeypatch.setattr(service, "AsyncSessionLocal", lambda: _IndexSession(1, [row]))
+
+    results = _search("Jan*")
+
+    assert [(r.name, r.username, r.directory_id) for r in results] == [("Jane Doe", "jane", row.dn)]
+    assert live_search == []
+
+
+def test_search_falls_back_to_live_ldap(monkeypatch, live_search):
+    # Never synced
+    monkeypatch.setattr(service, "AsyncSessionLocal", lambda: _IndexSession(None, []))
+    assert [r.name for r in _search("live")] == ["Live User"]
+
+    # Index tables missing or the database erroring
+    missing = ProgrammingError("SELECT ...", {}, Exception("relation does not exist"))
+    monkeypatch.setattr(service, "AsyncSessionLocal", lambda: _IndexSession(1, [], missing))
+    assert [r.name for r in _search("other")] == ["Live User"]
+
+    assert len(live_search) == 2
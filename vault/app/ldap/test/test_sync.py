@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from app.ldap import mock_ldap
+from app.ldap.models import LDAPConnector
+from app.ldap.sync import (
+    DELTA_SYNC,
+    FULL_SYNC,
+    USER_ENTRY,
+    entry_to_row,
+    iter_paged_entries,
+    plan_sync,
+)
+
+
+@pytest.fixture
+def connector():
+    return LDAPConnector(
+        id="6f1c1f2e-8f55-4a51-9d3e-0c0a2b9b7f10",
+        name="Test AD",
+        company_id="1",
+        domain="example",
+        host="ldap.example.com",
+        port="389",
+        username="svc",
+        base_dn="dc=example,dc=com",
+        user_dn="ou=users,dc=example,dc=com",
+        group_dn="ou=groups,dc=example,dc=com",
+    )
+
+
+def test_paged_search_streams_every_entry(monkeypatch):
+    monkeypatch.setattr(mock_ldap, "MOCK_USER_COUNT", 2500)
+    client = mock_ldap.initialize("ldap://mock")
+
+    pages = list(
+        iter_paged_entries(client, "ou=users,dc=example,dc=com", "(objectClass=user)", [], 1000)
+    )
+
+    assert [len(page) for page in pages] == [1000, 1000, 500]
+    assert len({dn for page in pages for dn, _ in page}) == 2500
+
+
+def test_plan_uses_usn_high_water_mark(connector):
+    state = {
+        "server": "dc1.example.com",
+        "highest_usn": 5000,
+        "highest_modify_timestamp": None,
+        "last_full_sync": datetime.utcnow(),
+    }
+
+    plan = plan_sync(connector, state, {"server": "dc1.example.com", "highest_usn": "6000"})
+    assert plan.mode == DELTA_SYNC
+    assert plan.highest_usn == 6000
+    assert all("(uSNChanged>=5001)" in filterstr for _, _, filterstr, _ in plan.searches)
+
+    # A different domain controller's USNs are not comparable
+    assert plan_sync(connector, state, {"server": "dc2.example.com"}).mode == FULL_SYNC
+    assert plan_sync(connector, state, {"server": "dc1.example.com"}, force_full=True).mode == (
+        FULL_SYNC
+    )
+    assert plan_sync(connector, None, {}).mode == FULL_SYNC
+
+
+def test_entry_to_row_maps_user_attributes(connector):
+    client = mock_ldap.initialize("ldap://mock")
+    dn, attrs = client.search_s("ou=users", mock_ldap.SCOPE_SUBTREE, "(objectClass=user)")[0]
+
+    row = entry_to_row(USER_ENTRY, dn, attrs, connector, datetime.utcnow())
+
+    assert row["directory_key"] == dn
+    assert row["username"] == "user1"
+    assert row["email"] == "user1@example.com"
+    assert row["first_name"] == "Test1"
+    assert row["usn_changed"] == 1001
+    assert row["company_id"] == 1
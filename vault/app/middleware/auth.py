@@ -9,7 +9,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_async_db
+from app.services.auth_context import AuthContextCache
 from app.services.auth_service import AuthService
 
 logger = logging.getLogger(__name__)
@@ -42,17 +44,23 @@ async def verify_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Get user with roles
-        user_data = await AuthService.get_user_with_roles(db, user_id)
+        # Get user with roles (cached per token for a short TTL)
+        iat = payload.get("iat")
+        user_data = AuthContextCache.get(user_id, iat)
+        if user_data is None:
+            claimed_roles = payload.get("roles") if settings.AUTH_EMBED_ROLE_CLAIMS else None
+            user_data = await AuthService.get_user_with_roles(db, user_id, roles=claimed_roles)
 
-        logger.info(f"User data retrieved: {user_data.keys() if user_data else 'None'}")  # ADD THIS
+            logger.info(f"User data retrieved: {user_data.keys() if user_data else 'None'}")  # ADD THIS
 
-        if not user_data:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            if not user_data:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+
+            AuthContextCache.set(user_id, iat, user_data)
 
         return user_data
 
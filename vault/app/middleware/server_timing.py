@@ -0,0 +1,66 @@
+"""
+Request timing middleware
+Records the request duration per route template and adds a Server-Timing
+header with the stages (embed, vector, llm, extract, db-wait) the request
+spent time in.
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.metrics import HTTP_REQUEST_SECONDS, start_request_stages
+
+
+def format_server_timing(stages: dict[str, float], total: float) -> str:
+    """``embed;dur=12.3, llm;dur=840.1, total;dur=861.0`` (milliseconds)."""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware), so streaming responses and
+    background tasks are unaffected. The header is written when the response
+    starts; stages recorded after that (streamed bodies) only reach the metrics.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages = start_request_stages()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(stages, time.perf_counter() - started),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if settings.METRICS_ENABLED:
+                # Label by route template, not raw path, to keep the series bounded
+                route = scope.get("route")
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - started,
+                    method=scope["method"],
+                    route=getattr(route, "path", None) or "unmatched",
+                    status=status,
+                )
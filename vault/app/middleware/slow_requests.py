@@ -0,0 +1,46 @@
+"""
+Slow-request capture middleware
+Tracks every HTTP request; those slower than SLOW_REQUEST_THRESHOLD_MS are
+stored with their SQL, outbound HTTP calls, stack samples and stage timings
+in the ring buffer behind /api/utils/slow-requests.
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.diagnostics import finish_capture, install_hooks, start_capture
+from app.core.metrics import current_request_stages
+
+
+class SlowRequestMiddleware:
+    """
+    Pure ASGI middleware. Registered inside ServerTimingMiddleware so the
+    request's stage timings are already being collected.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        from app.database import async_engine, sync_engine
+
+        install_hooks([sync_engine, async_engine.sync_engine])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key, capture = start_capture(scope["method"], scope["path"])
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            finish_capture(
+                key, capture, status, getattr(route, "path", None), current_request_stages()
+            )
@@ -4,7 +4,7 @@ import uuid
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Text, func
+from sqlalchemy import ForeignKey, Index, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -37,6 +37,11 @@ class DocumentStatus(str, enum.Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Workflow dashboards filter by assignee and status together
+        Index("ix_documents_responsible_status", "responsible", "status"),
+        Index("ix_documents_reviewer_status", "reviewer", "status"),
+    )
 
     doc_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(Text)
@@ -0,0 +1,55 @@
+"""
+Auth Context Cache
+Short-lived cache of the user/profile/roles context resolved from an access token
+"""
+
+import copy
+import logging
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# (user_id, token iat) -> context dict built by AuthService.get_user_with_roles
+_auth_context_cache = TTLCache(
+    maxsize=settings.AUTH_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CONTEXT_CACHE_TTL_SECONDS,
+    name="auth_context",
+)
+
+
+class AuthContextCache:
+    """
+    Per-token cache so authenticated requests skip the user/profile/roles lookup.
+
+    Keyed by (user_id, iat) so a freshly issued token never sees a context cached
+    for an older one. Entries live for ``AUTH_CONTEXT_CACHE_TTL_SECONDS``; call
+    ``invalidate_user`` after committing role, profile or account changes.
+    """
+
+    @staticmethod
+    def get(user_id: str, iat: int | None) -> dict | None:
+        """Return a copy of the cached context, or None on a miss."""
+        context = _auth_context_cache.get((str(user_id), iat))
+        return copy.deepcopy(context) if context is not None else None
+
+    @staticmethod
+    def set(user_id: str, iat: int | None, context: dict) -> None:
+        """Cache a context for the given token."""
+        _auth_context_cache.set((str(user_id), iat), copy.deepcopy(context))
+
+    @staticmethod
+    def invalidate_user(user_id: str | None) -> None:
+        """Drop every cached context (all tokens) for a user."""
+        if not user_id:
+            return
+        user_id = str(user_id)
+        removed = _auth_context_cache.invalidate_where(lambda key: key[0] == user_id)
+        if removed:
+            logger.debug(f"Invalidated {removed} cached auth context(s) for user: {user_id}")
+
+    @staticmethod
+    def clear() -> None:
+        """Drop every cached context."""
+        _auth_context_cache.clear()
@@ -9,12 +9,11 @@ import secrets
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-import bcrypt
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -23,6 +22,10 @@ from app.models.profile import Profile
 from app.models.role import Role, UserRole
 from app.models.user import User
 from app.schemas.auth import UserCreate
+from app.services import password_hasher
+from app.services.auth_context import AuthContextCache
+from app.services.password_hasher import PasswordHasherBusyError
+from app.services.profile_directory import ProfileDirectory
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -51,18 +54,13 @@ class AuthService:
 
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt"""
-        password_bytes = password.encode("utf-8")[:72]
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode("utf-8")
+        """Hash a password using bcrypt (blocking; use password_hasher in handlers)"""
+        return password_hasher.hash_password_sync(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        password_bytes = plain_password.encode("utf-8")[:72]
-        hashed_bytes = hashed_password.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        """Verify a password against its hash (blocking; use password_hasher in handlers)"""
+        return password_hasher.verify_password_sync(plain_password, hashed_password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -121,7 +119,7 @@ class AuthService:
                 if result.scalar_one_or_none():
                     raise ValueError(f"Username '{user_data.username}' is already taken")
 
-            hashed_password = AuthService.hash_password(user_data.password)
+            hashed_password = await password_hasher.hash_password(user_data.password)
             now = datetime.utcnow()
 
             # Derive full_name consistently with schema
@@ -168,6 +166,7 @@ class AuthService:
 
             await db.commit()
             await db.refresh(new_profile)
+            ProfileDirectory.invalidate(new_profile.company_reg_no)
 
             logger.info(f"Created user: {user_id} ({user_data.email})")
             return new_profile
@@ -195,7 +194,10 @@ class AuthService:
                 logger.warning(f"Authentication failed: No password set - {email}")
                 return None
 
-            if not AuthService.verify_password(password, user.encryptedpassword):
+            matches, upgraded_hash = await password_hasher.verify_and_upgrade(
+                password, user.encryptedpassword
+            )
+            if not matches:
                 logger.warning(f"Authentication failed: Invalid password - {email}")
                 return None
 
@@ -214,9 +216,16 @@ class AuthService:
                 logger.warning(f"Authentication failed: Profile inactive - {email}")
                 return None
 
+            if upgraded_hash:
+                user.encryptedpassword = upgraded_hash
+                await db.commit()
+                logger.info(f"Rehashed password at cost {settings.BCRYPT_ROUNDS}: {email}")
+
             logger.info(f"User authenticated successfully: {email}")
             return user, profile
 
+        except PasswordHasherBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error authenticating user: {str(e)}")
             return None
@@ -233,6 +242,7 @@ class AuthService:
             if user:
                 user.deletedat = datetime.utcnow()
                 await db.commit()
+                AuthContextCache.invalidate_user(user_id)
                 logger.info(f"Soft deleted user: {user_id}")
                 return True
 
@@ -264,6 +274,9 @@ class AuthService:
                     profile.updated_at = datetime.utcnow()
 
                 await db.commit()
+                AuthContextCache.invalidate_user(user_id)
+                if profile:
+                    ProfileDirectory.invalidate(profile.company_reg_no)
                 logger.info(f"Deactivated user: {user_id}")
                 return True
 
@@ -283,7 +296,7 @@ class AuthService:
             user = result.scalar_one_or_none()
 
             if user:
-                user.encryptedpassword = AuthService.hash_password(new_password)
+                user.encryptedpassword = await password_hasher.hash_password(new_password)
                 user.updatedat = datetime.utcnow()
                 await db.commit()
                 logger.info(f"Updated password for user: {user_id}")
@@ -355,7 +368,7 @@ class AuthService:
             if not user:
                 return False
 
-            user.encryptedpassword = AuthService.hash_password(new_password)
+            user.encryptedpassword = await password_hasher.hash_password(new_password)
             user.recoverytoken = None
             user.recoverysentat = None
             user.updatedat = datetime.utcnow()
@@ -374,31 +387,42 @@ class AuthService:
         db: AsyncSession,
         user_id: str,
         company_reg_no: str | None = None,
+        roles: list[str] | None = None,
     ) -> dict | None:
-        """Get user with roles and profile"""
-        try:
-            result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one_or_none()
-            if not user or not user.isactive:
-                return None
-
-            result = await db.execute(select(Profile).where(Profile.id == user.id))
-            profile = result.scalar_one_or_none()
-            if not profile:
-                return None
+        """
+        Get user with roles and profile in a single query.
 
+        Pass ``roles`` (e.g. from trusted token claims) to skip the roles lookup.
+        """
+        try:
             stmt = (
-                select(Role.name)
-                .join(UserRole, UserRole.role_id == Role.id)
-                .where(UserRole.user_id == profile.id)
+                select(User, Profile)
+                .join(Profile, Profile.id == User.id)
+                .where(User.id == user_id)
             )
-            if company_reg_no:
-                stmt = stmt.where(UserRole.company_reg_no == company_reg_no)
+            if roles is None:
+                roles_stmt = (
+                    select(func.array_agg(Role.name))
+                    .select_from(UserRole)
+                    .join(Role, UserRole.role_id == Role.id)
+                    .where(UserRole.user_id == Profile.id)
+                )
+                if company_reg_no:
+                    roles_stmt = roles_stmt.where(UserRole.company_reg_no == company_reg_no)
+                stmt = stmt.add_columns(roles_stmt.scalar_subquery().label("roles"))
+
+            row = (await db.execute(stmt)).first()
+            if not row:
+                return None
 
-            rows = (await db.execute(stmt)).all()
-            roles = [r[0] for r in rows]
+            user, profile = row[0], row[1]
+            if not user.isactive:
+                return None
+            if roles is None:
+                roles = list(row.roles or [])
 
             return {
+                "user_id": str(user.id),
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
@@ -420,6 +444,7 @@ class AuthService:
                 },
                 "roles": roles,
                 "company_reg_no": getattr(profile, "company_reg_no", None),
+                "company_id": getattr(profile, "company_id", None),
             }
 
         except Exception as e:
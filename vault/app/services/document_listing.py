@@ -0,0 +1,143 @@
+"""
+Document Listing Service
+Projection-only, keyset-paginated document queries for the workflow dashboards
+(validator, expert, collector).
+
+Listing endpoints only render id/title/status and a person's name, so they must
+never load ``content``, ``summary`` or the ``embedding`` vector.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row, and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Document, Profile
+
+logger = logging.getLogger(__name__)
+
+# Hard ceiling for a single page, regardless of what the client asks for
+MAX_PAGE_SIZE = 500
+
+# Columns needed to render a document row in any workflow list
+DOCUMENT_LIST_COLUMNS = (
+    Document.doc_id,
+    Document.title,
+    Document.status,
+    Document.author_id,
+    Document.responsible,
+    Document.reviewer,
+    Document.created_at,
+)
+
+
+def encode_cursor(created_at: datetime | None, doc_id: UUID | str) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps(
+        {"c": created_at.isoformat() if created_at else None, "i": str(doc_id)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = datetime.fromisoformat(data["c"]) if data.get("c") else None
+        return created_at, UUID(data["i"])
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def validate_cursor(cursor: str | None) -> None:
+    """Reject a malformed pagination cursor with a 400 before querying."""
+    if not cursor:
+        return
+    try:
+        decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+async def list_documents(
+    db: AsyncSession,
+    *conditions: Any,
+    limit: int | None = None,
+    cursor: str | None = None,
+    person_column: Any = None,
+    company_reg_no: str | None = None,
+) -> tuple[list[Row], str | None]:
+    """
+    List documents matching ``conditions`` newest first, using keyset pagination.
+
+    Args:
+        db: Database session
+        conditions: SQLAlchemy WHERE clauses on ``Document``
+        limit: Page size; ``None`` returns every matching row
+        cursor: Cursor returned by the previous page
+        person_column: Profile FK on ``Document`` (author_id/responsible/reviewer) whose
+            full name should be returned as ``person_name``. Only the profiles on the
+            page are joined, instead of loading the whole tenant directory.
+        company_reg_no: Restrict ``person_name`` to profiles of this tenant
+
+    Returns:
+        Tuple of (rows with ``DOCUMENT_LIST_COLUMNS`` [+ person_name], next cursor or None)
+    """
+    stmt = select(*DOCUMENT_LIST_COLUMNS)
+
+    if person_column is not None:
+        person = aliased(Profile)
+        on_clause = [person.id == person_column]
+        if company_reg_no:
+            on_clause.append(person.company_reg_no == company_reg_no)
+        stmt = stmt.add_columns(person.full_name.label("person_name")).outerjoin(
+            person, and_(*on_clause)
+        )
+
+    stmt = stmt.where(*conditions).order_by(Document.created_at.desc(), Document.doc_id.desc())
+
+    if cursor:
+        created_at, doc_id = decode_cursor(cursor)
+        if created_at is None:
+            # Postgres sorts NULLs first in DESC order, so every dated row is still ahead
+            stmt = stmt.where(
+                or_(
+                    and_(Document.created_at.is_(None), Document.doc_id < doc_id),
+                    Document.created_at.is_not(None),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                tuple_(Document.created_at, Document.doc_id) < tuple_(created_at, doc_id)
+            )
+
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        # Fetch one extra row to know whether another page exists
+        stmt = stmt.limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = list(result.all())
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.doc_id)
+
+    return rows, next_cursor
@@ -1,8 +1,7 @@
 from pathlib import Path
 
-import PyPDF2
-from docx import Document
-from docx2python import docx2python
+# Extractor libraries are imported inside the readers so importing this
+# module (every API worker does, via the collector router) stays cheap
 
 
 def extract_text(filepath: Path) -> str:
@@ -24,6 +23,8 @@ def extract_text(filepath: Path) -> str:
 
 def read_docx(filepath: str) -> str:
     """Extract text from a .docx file."""
+    from docx import Document
+
     try:
         document = Document(filepath)
         fulltext = []
@@ -37,6 +38,8 @@ def read_docx(filepath: str) -> str:
 
 def read_pdf(filepath: str) -> str:
     """Extract text from a PDF file."""
+    import PyPDF2
+
     try:
         with open(filepath, "rb") as file:
             pdf_reader = PyPDF2.PdfReader(file)
@@ -68,6 +71,8 @@ def extract_text_with_docx2python(filepath: str) -> str:
     """
     Extract text using docx2python library (alternative method).
     """
+    from docx2python import docx2python
+
     try:
         content = docx2python(filepath)
         paragraphs = []
@@ -3,11 +3,21 @@ File processing utilities for knowledge base ingestion
 Supports: PDF, DOCX, PPTX, TXT, MD, CSV, XLSX, HTML, images (OCR), audio
 """
 import logging
+import time
 from pathlib import Path
 from typing import List
 
+from app.core.metrics import EXTRACTION_SECONDS, record_stage
+
 logger = logging.getLogger(__name__)
 
+# Extensions process_file handles; anything else is reported as "other" in metrics
+_KNOWN_EXTENSIONS = {
+    ".pdf", ".docx", ".doc", ".pptx", ".txt", ".md", ".markdown", ".csv", ".xlsx", ".xls",
+    ".html", ".htm", ".jpg", ".jpeg", ".png", ".tiff", ".bmp", ".mp3", ".wav", ".m4a", ".ogg",
+    ".webm",
+}
+
 
 def process_file(file_path: Path, file_ext: str) -> str:
     """
@@ -21,6 +31,7 @@ def process_file(file_path: Path, file_ext: str) -> str:
         Extracted text content
     """
     file_ext = file_ext.lower()
+    started = time.perf_counter()
     
     try:
         if file_ext == ".pdf":
@@ -47,30 +58,49 @@ def process_file(file_path: Path, file_ext: str) -> str:
     except Exception as e:
         logger.error(f"Error processing {file_ext} file: {e}")
         raise
+    finally:
+        elapsed = time.perf_counter() - started
+        file_type = file_ext.lstrip(".") if file_ext in _KNOWN_EXTENSIONS else "other"
+        EXTRACTION_SECONDS.observe(elapsed, file_type=file_type)
+        record_stage("extract", elapsed)
 
 
 def extract_from_pdf(file_path: Path) -> str:
-    """Extract text from PDF using PyPDF2."""
+    """
+    Extract text from PDF using PyPDF2. Pages without a text layer (scans)
+    are OCRed in parallel; see app.services.ocr.
+    """
     try:
         from PyPDF2 import PdfReader
-        
-        reader = PdfReader(str(file_path))
-        text = []
-        
-        for page_num, page in enumerate(reader.pages):
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(f"--- Page {page_num + 1} ---\n{page_text}")
-            except Exception as e:
-                logger.warning(f"Error extracting page {page_num + 1}: {e}")
-                continue
-        
-        return "\n\n".join(text)
-        
     except ImportError:
         raise ImportError("PyPDF2 required: pip install PyPDF2")
 
+    from app.services import ocr
+
+    reader = PdfReader(str(file_path))
+    text = {}
+    scanned = []
+
+    for page_num, page in enumerate(reader.pages):
+        try:
+            page_text = page.extract_text()
+        except Exception as e:
+            logger.warning(f"Error extracting page {page_num + 1}: {e}")
+            page_text = ""
+        if page_text:
+            text[page_num] = page_text
+        if not ocr.has_text_layer(page_text):
+            scanned.append(page_num)
+
+    # OCR text replaces a near-empty text layer; if OCR finds nothing, keep the layer
+    for page_num, page_text in ocr.ocr_pdf_pages(file_path, reader, scanned).items():
+        if page_text.strip():
+            text[page_num] = page_text
+
+    return "\n\n".join(
+        f"--- Page {page_num + 1} ---\n{text[page_num]}" for page_num in sorted(text)
+    )
+
 
 def extract_from_docx(file_path: Path) -> str:
     """Extract text from DOCX using python-docx."""
@@ -167,120 +197,66 @@ def extract_from_excel(file_path: Path) -> str:
 def extract_from_html(file_path: Path) -> str:
     """Extract text from HTML files."""
     try:
-        from bs4 import BeautifulSoup
-        
         with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
-        
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = "\n".join(chunk for chunk in chunks if chunk)
-        
-        return text
+            return html_to_text(f.read())
         
     except ImportError:
         raise ImportError("beautifulsoup4 required: pip install beautifulsoup4")
 
 
+def html_to_text(html: str) -> str:
+    """Convert an HTML string (page, Confluence storage format) to plain text."""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, "html.parser")
+    
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
 def extract_from_image_ocr(file_path: Path) -> str:
-    """Extract text from images using Tesseract OCR."""
-    try:
-        from PIL import Image
-        import pytesseract
-        
-        image = Image.open(str(file_path))
-        text = pytesseract.image_to_string(image)
-        
-        if not text.strip():
-            raise ValueError("No text detected in image")
-        
-        return text
-        
-    except ImportError:
+    """Extract text from images using Tesseract OCR (frames of multi-page TIFFs in parallel)."""
+    from app.services import ocr
+
+    if not ocr.ocr_available():
         raise ImportError(
             "Pillow and pytesseract required: pip install Pillow pytesseract\n"
             "Also install Tesseract: brew install tesseract (macOS) or apt-get install tesseract-ocr (Ubuntu)"
         )
 
+    text = ocr.ocr_image_file(file_path)
+
+    if not text.strip():
+        raise ValueError("No text detected in image")
+
+    return text
+
 
 def extract_from_audio(file_path: Path) -> str:
     """
     Transcribe audio using Faster Whisper (no PyTorch dependency).
     """
+    from app.services.transcription import TranscriptionError, transcribe
+
     try:
-        from faster_whisper import WhisperModel
-        
-        # Use base model on CPU with int8 for better compatibility
-        model = WhisperModel("base", device="cpu", compute_type="int8")
-        
-        segments, info = model.transcribe(str(file_path))
-        
-        # Combine all segments
-        text = " ".join([segment.text for segment in segments])
-        
-        if not text.strip():
-            raise ValueError("No speech detected in audio")
-        
-        return text
-        
-    except ImportError:
-        raise ImportError(
-            "faster-whisper not installed.\n"
-            "Install with: pip install faster-whisper\n"
-            "Also requires ffmpeg: brew install ffmpeg"
-        )
+        # Shared model, loaded once per process
+        text = transcribe(file_path)
+    except TranscriptionError as e:
+        raise ImportError(str(e))
     except Exception as e:
         logger.error(f"Audio transcription failed: {e}")
         raise ValueError(f"Failed to transcribe audio: {str(e)}")
 
+    if not text.strip():
+        raise ValueError("No speech detected in audio")
 
+    return text
 
-def scrape_website(url: str) -> str:
-    """
-    Scrape text content from a website.
-    
-    Args:
-        url: Website URL to scrape
-        
-    Returns:
-        Extracted text content
-    """
-    try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            element.decompose()
-        
-        # Extract text
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = "\n".join(chunk for chunk in chunks if chunk)
-        
-        # Add URL metadata
-        title = soup.find("title")
-        title_text = title.get_text() if title else "No Title"
-        
-        return f"# {title_text}\nSource: {url}\n\n{text}"
-        
-    except Exception as e:
-        logger.error(f"Error scraping {url}: {e}")
-        raise
 
 
 def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
@@ -307,14 +283,17 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[st
         if end < len(text):
             for sep in [". ", ".\n", "! ", "?\n", "? "]:
                 last_sep = text[start:end].rfind(sep)
-                if last_sep != -1:
+                # A break inside the overlap would never move the window forward
+                if last_sep != -1 and last_sep + len(sep) > overlap:
                     end = start + last_sep + len(sep)
                     break
         
         chunk = text[start:end].strip()
         if chunk:
             chunks.append(chunk)
-        
+
+        if end >= len(text):
+            break
         start = end - overlap
     
     return chunks
\ No newline at end of file
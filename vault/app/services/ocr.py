@@ -0,0 +1,382 @@
+"""
+OCR for scanned PDF pages and images.
+
+Only pages without a usable text layer are OCRed. Each becomes one job on a
+process pool, so a scanned manual is recognised page-parallel. Tesseract
+itself runs single-threaded per worker to avoid oversubscribing the CPUs.
+
+Pages are rasterised with poppler's ``pdftoppm`` when it is installed;
+otherwise the page's embedded scan images are OCRed directly (what a
+scanner produces), which needs nothing beyond PyPDF2 and Pillow.
+
+Recognised text is cached on disk under a hash of the page content and the
+OCR settings, so re-ingesting a document (or another copy of it) never OCRs
+the same page twice.
+"""
+
+import functools
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.core.metrics import OCR_PAGES, record_stage
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate cached text after changing how pages are OCRed
+_CACHE_VERSION = "1"
+
+# Image colour spaces PIL can load from raw PDF samples
+_RAW_MODES = {"/DeviceGray": "L", "/DeviceRGB": "RGB", "/DeviceCMYK": "CMYK"}
+_ICC_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+
+def has_text_layer(text: str | None) -> bool:
+    """Whether a page's extracted text is enough to skip OCR."""
+    return len("".join((text or "").split())) >= settings.OCR_MIN_TEXT_CHARS
+
+
+@functools.cache
+def ocr_available() -> bool:
+    return (
+        find_spec("pytesseract") is not None
+        and find_spec("PIL") is not None
+        and shutil.which("tesseract") is not None
+    )
+
+
+# ============================================================================
+# Jobs (run in the worker processes)
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class _Job:
+    kind: str  # pdf | image
+    path: str
+    index: int  # page or frame
+    languages: str
+    dpi: int
+    timeout: int
+
+
+def _init_worker() -> None:
+    # Parallelism comes from the pool; Tesseract's OpenMP threads would compete with it
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+@functools.lru_cache(maxsize=4)
+def _open_pdf(path: str, mtime_ns: int):
+    from PyPDF2 import PdfReader
+
+    return PdfReader(path)
+
+
+def _iter_image_xobjects(resources: Any, depth: int = 0):
+    """Image XObjects of a page, including those wrapped in form XObjects."""
+    if not resources or "/XObject" not in resources or depth > 3:
+        return
+    xobjects = resources["/XObject"].get_object()
+    for name in xobjects:
+        xobj = xobjects[name].get_object()
+        subtype = xobj.get("/Subtype")
+        if subtype == "/Image":
+            yield xobj
+        elif subtype == "/Form":
+            yield from _iter_image_xobjects(xobj.get("/Resources"), depth + 1)
+
+
+def _decode_image(xobj: Any):
+    """A PIL image from an image XObject, or None if its encoding is not supported."""
+    from PIL import Image
+
+    filters = xobj.get("/Filter") or []
+    if not isinstance(filters, list):
+        filters = [filters]
+    try:
+        data = xobj.get_data()
+    except NotImplementedError:
+        # JBIG2 and friends; only a renderer can handle those
+        return None
+    if filters and filters[-1] in ("/DCTDecode", "/JPXDecode", "/CCITTFaxDecode"):
+        # Left encoded by PyPDF2: JPEG, JPEG 2000, or CCITT wrapped in a TIFF header
+        try:
+            return Image.open(io.BytesIO(data))
+        except OSError:
+            return None
+
+    size = (int(xobj["/Width"]), int(xobj["/Height"]))
+    if xobj.get("/BitsPerComponent") == 1:
+        return Image.frombytes("1", size, data)
+    color_space = xobj.get("/ColorSpace")
+    color_space = color_space.get_object() if color_space is not None else "/DeviceGray"
+    if isinstance(color_space, list) and color_space[0] == "/ICCBased":
+        mode = _ICC_MODES.get(int(color_space[1].get_object().get("/N", 0)))
+    else:
+        mode = _RAW_MODES.get(color_space)
+    if mode is None or xobj.get("/BitsPerComponent", 8) != 8:
+        return None
+    return Image.frombytes(mode, size, data)
+
+
+def _render_page(path: str, index: int, dpi: int, timeout: int):
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "page")
+        page = str(index + 1)
+        subprocess.run(
+            ["pdftoppm", "-f", page, "-l", page, "-r", str(dpi), "-gray", "-png", "-singlefile"]
+            + [path, root],
+            check=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+        with Image.open(f"{root}.png") as image:
+            image.load()
+            return image
+
+
+def _page_images(job: _Job) -> list:
+    if shutil.which("pdftoppm"):
+        return [_render_page(job.path, job.index, job.dpi, job.timeout)]
+    page = _open_pdf(job.path, os.stat(job.path).st_mtime_ns).pages[job.index]
+    images = [
+        image
+        for xobj in _iter_image_xobjects(page.get("/Resources"))
+        if (image := _decode_image(xobj)) is not None
+    ]
+    # /Rotate is clockwise; the embedded images are stored unrotated
+    rotate = int(page.get("/Rotate", 0)) % 360
+    return [image.rotate(-rotate, expand=True) for image in images] if rotate else images
+
+
+def _frame_image(job: _Job):
+    from PIL import Image
+
+    with Image.open(job.path) as image:
+        image.seek(job.index)
+        frame = image.copy()
+    return frame
+
+
+def _ocr_image(image: Any, languages: str, timeout: int) -> str:
+    import pytesseract
+
+    if image.mode not in ("1", "L", "RGB"):
+        image = image.convert("RGB")
+    return pytesseract.image_to_string(image, lang=languages, timeout=timeout)
+
+
+def _run_job(job: _Job) -> str:
+    images = _page_images(job) if job.kind == "pdf" else [_frame_image(job)]
+    texts = [_ocr_image(image, job.languages, job.timeout) for image in images]
+    return "\n".join(text.strip() for text in texts if text.strip())
+
+
+# ============================================================================
+# Pool and cache (caller side)
+# ============================================================================
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a process that runs the server's threads is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.OCR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+    return _pool
+
+
+def shutdown() -> None:
+    """Stop the OCR worker processes (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _cache_path(key: str) -> Path:
+    return Path(settings.OCR_CACHE_DIR) / key[:2] / f"{key}.txt"
+
+
+def _cache_get(key: str) -> str | None:
+    try:
+        return _cache_path(key).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _cache_put(key: str, text: str) -> None:
+    path = _cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, so concurrent workers never read a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not cache OCR text: {e}")
+
+
+class _DigestWriter:
+    """File-like sink for PyPDF2's ``write_to_stream`` that only hashes."""
+
+    def __init__(self, digest: Any):
+        self.write = digest.update
+
+
+def _cache_key(digest: Any) -> str:
+    digest.update(f"|{_CACHE_VERSION}|{settings.OCR_LANGUAGES}|{settings.OCR_DPI}".encode())
+    return digest.hexdigest()
+
+
+def pdf_page_key(page: Any) -> str:
+    """Hash of what a page looks like: its content stream and the images it draws."""
+    digest = hashlib.sha256()
+    writer = _DigestWriter(digest)
+    # Raw (still encoded) stream bytes, so hashing never decodes a scan
+    contents = page.get("/Contents")
+    streams = contents.get_object() if contents is not None else []
+    for stream in streams if isinstance(streams, list) else [streams]:
+        stream.get_object().write_to_stream(writer, None)
+    for xobj in _iter_image_xobjects(page.get("/Resources")):
+        xobj.write_to_stream(writer, None)
+    digest.update(f"|rotate={page.get('/Rotate', 0)}".encode())
+    return _cache_key(digest)
+
+
+def _run_jobs(jobs: dict[str, _Job]) -> dict[str, str | BaseException]:
+    """Results by cache key; a single job (or OCR_WORKERS=0) runs in the calling thread."""
+    if len(jobs) == 1 or settings.OCR_WORKERS <= 0:
+        results: dict[str, str | BaseException] = {}
+        for key, job in jobs.items():
+            try:
+                results[key] = _run_job(job)
+            except Exception as e:
+                results[key] = e
+        return results
+
+    global _pool
+    futures: dict[str, Future] = {
+        key: _get_pool().submit(_run_job, job) for key, job in jobs.items()
+    }
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            with _pool_lock:
+                _pool = None
+            results[key] = e
+        except Exception as e:
+            results[key] = e
+    return results
+
+
+def _ocr_cached(jobs: dict[int, tuple[str, _Job]], label: str) -> dict[int, str]:
+    """OCR the jobs not in the cache; text by page/frame index (failed ones are left out)."""
+    started = time.perf_counter()
+    texts: dict[int, str] = {}
+    missing: dict[str, _Job] = {}
+    for index, (key, job) in jobs.items():
+        cached = _cache_get(key)
+        if cached is None:
+            missing[key] = job
+        else:
+            texts[index] = cached
+    OCR_PAGES.inc(len(texts), source="cache")
+
+    with span("ocr", {"ocr.pages": len(jobs), "ocr.cache_misses": len(missing)}):
+        results = _run_jobs(missing) if missing else {}
+    for index, (key, _) in jobs.items():
+        result = results.get(key)
+        if isinstance(result, BaseException):
+            OCR_PAGES.inc(source="failed")
+            logger.warning(f"OCR failed for {label} page {index + 1}: {result}")
+        elif result is not None:
+            OCR_PAGES.inc(source="ocr")
+            _cache_put(key, result)
+            texts[index] = result
+    record_stage("ocr", time.perf_counter() - started)
+    return texts
+
+
+def ocr_pdf_pages(file_path: Path, reader: Any, page_numbers: list[int]) -> dict[int, str]:
+    """OCR the given (0-based) pages of an open PDF; text by page number."""
+    if not page_numbers:
+        return {}
+    if not ocr_available():
+        logger.warning(
+            f"{len(page_numbers)} pages of {file_path.name} have no text layer; "
+            "install Tesseract and pytesseract to OCR them"
+        )
+        return {}
+    path = str(file_path.resolve())
+    jobs = {
+        n: (
+            pdf_page_key(reader.pages[n]),
+            _Job(
+                "pdf",
+                path,
+                n,
+                settings.OCR_LANGUAGES,
+                settings.OCR_DPI,
+                settings.OCR_TIMEOUT_SECONDS,
+            ),
+        )
+        for n in page_numbers
+    }
+    return _ocr_cached(jobs, file_path.name)
+
+
+def ocr_image_file(file_path: Path) -> str:
+    """OCR an image; each frame of a multi-page TIFF is a separate job."""
+    from PIL import Image
+
+    with Image.open(file_path) as image:
+        frames = getattr(image, "n_frames", 1)
+    digest = hashlib.sha256(file_path.read_bytes())
+    path = str(file_path.resolve())
+    jobs = {}
+    for frame in range(frames):
+        frame_digest = digest.copy()
+        frame_digest.update(f"|frame={frame}".encode())
+        jobs[frame] = (
+            _cache_key(frame_digest),
+            _Job(
+                "image",
+                path,
+                frame,
+                settings.OCR_LANGUAGES,
+                settings.OCR_DPI,
+                settings.OCR_TIMEOUT_SECONDS,
+            ),
+        )
+    texts = _ocr_cached(jobs, file_path.name)
+    return "\n\n".join(texts[frame] for frame in sorted(texts) if texts[frame].strip())
@@ -0,0 +1,183 @@
+"""
+Password Hasher
+Runs bcrypt hashing/verification on a dedicated bounded thread pool so a burst
+of logins cannot pin the event loop, with admission control and queue metrics.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# bcrypt only uses the first 72 bytes of the password
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when too many hash/verify operations are already waiting."""
+
+
+class _HasherMetrics:
+    """Counters describing the hashing pool, safe to read from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            running = min(self.in_flight, settings.PASSWORD_HASH_WORKERS)
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+                "in_flight": self.in_flight,
+                "queue_depth": self.in_flight - running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(1000 * self.total_wait_seconds / self.completed, 2)
+                if self.completed
+                else 0.0,
+                "avg_run_ms": round(1000 * self.total_run_seconds / self.completed, 2)
+                if self.completed
+                else 0.0,
+            }
+
+
+_metrics = _HasherMetrics()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="bcrypt",
+                )
+    return _executor
+
+
+# -----------------------------------------------------------------------------
+# Synchronous primitives (scripts, migrations, worker threads)
+# -----------------------------------------------------------------------------
+def hash_password_sync(password: str, rounds: int | None = None) -> str:
+    """Hash a password with bcrypt at the configured cost factor."""
+    password_bytes = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a bcrypt hash."""
+    password_bytes = plain_password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.checkpw(password_bytes, hashed_password.encode("utf-8"))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Return True if a bcrypt hash was made with a different cost than configured."""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+# -----------------------------------------------------------------------------
+# Async API (request handlers)
+# -----------------------------------------------------------------------------
+async def _run(func, *args):
+    with _metrics._lock:
+        if _metrics.in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+            _metrics.rejected += 1
+            raise PasswordHasherBusyError("Password hashing queue is full, retry shortly")
+        _metrics.in_flight += 1
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with _metrics._lock:
+                _metrics.total_wait_seconds += started - submitted
+                _metrics.total_run_seconds += finished - started
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), timed)
+    finally:
+        with _metrics._lock:
+            _metrics.in_flight -= 1
+            _metrics.completed += 1
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop."""
+    return await _run(hash_password_sync, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop; malformed hashes never match."""
+    try:
+        return await _run(verify_password_sync, plain_password, hashed_password)
+    except PasswordHasherBusyError:
+        raise
+    except Exception as e:
+        logger.warning(f"Password verification error: {e}")
+        return False
+
+
+async def verify_and_upgrade(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if it matches but was hashed at a different cost factor,
+    return a replacement hash for the caller to persist.
+
+    Returns:
+        Tuple of (matches, new hash or None)
+    """
+    if not await verify_password(plain_password, hashed_password):
+        return False, None
+    if not needs_rehash(hashed_password):
+        return True, None
+
+    try:
+        new_hash = await hash_password(plain_password)
+    except PasswordHasherBusyError:
+        # Upgrading is opportunistic; try again on the next login
+        return True, None
+
+    with _metrics._lock:
+        _metrics.rehashed += 1
+    return True, new_hash
+
+
+def get_stats() -> dict:
+    """Current pool metrics (queue depth, rejections, average wait/run time)."""
+    return _metrics.snapshot()
+
+
+def shutdown() -> None:
+    """Stop the worker pool (application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,65 @@
+"""
+Profile Directory
+Tenant-scoped cache of profile display names (the ``user_map`` pattern)
+"""
+
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models import Profile
+
+logger = logging.getLogger(__name__)
+
+# company_reg_no -> {profile_id: full_name}
+_directory_cache = TTLCache(
+    maxsize=settings.PROFILE_DIRECTORY_CACHE_MAX_TENANTS,
+    ttl=settings.PROFILE_DIRECTORY_CACHE_TTL_SECONDS,
+    name="profile_directory",
+)
+
+
+class ProfileDirectory:
+    """Read-through cache of ``Profile.id -> full_name`` per tenant."""
+
+    @staticmethod
+    async def get_name_map(db: AsyncSession, company_reg_no: str | None) -> dict[str, str | None]:
+        """
+        Get the id -> full name mapping for every profile in a tenant.
+
+        Args:
+            db: Database session
+            company_reg_no: Company registration number
+
+        Returns:
+            Dictionary of profile id (str) to full name (may be None)
+        """
+        if not company_reg_no:
+            return {}
+
+        names = _directory_cache.get(company_reg_no)
+        if names is not None:
+            return names
+
+        stmt = select(Profile.id, Profile.full_name).where(Profile.company_reg_no == company_reg_no)
+        result = await db.execute(stmt)
+        names = {str(p.id): p.full_name for p in result.all()}
+
+        _directory_cache.set(company_reg_no, names)
+        return names
+
+    @staticmethod
+    def invalidate(company_reg_no: str | None = None) -> None:
+        """
+        Drop cached names for a tenant, or for every tenant if none is given.
+
+        Call after committing any profile create/update/delete.
+        """
+        if company_reg_no is None:
+            _directory_cache.clear()
+        else:
+            _directory_cache.pop(company_reg_no)
+        logger.debug(f"Invalidated profile directory cache for tenant: {company_reg_no or '*'}")
@@ -0,0 +1,237 @@
+"""
+Re-ranking of retrieved knowledge-base chunks before generation.
+
+Retrieval over-fetches ``RERANK_CANDIDATES`` chunks from the vector index.
+A small cross-encoder (sentence-transformers) or batched LLM scoring then
+orders them by relevance to the question, and only the best ``RERANK_TOP_N``
+reach the prompt. Scores are cached per (query hash, chunk id), so a repeated
+question only scores chunks it has not seen before.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.tracing import span
+from app.integrations.ollama_client import chat
+
+logger = logging.getLogger(__name__)
+
+# (reranker name, query hash, chunk id) -> relevance score in [0, 1]
+_score_cache = TTLCache(
+    maxsize=settings.RERANK_CACHE_MAX_ENTRIES,
+    ttl=settings.RERANK_CACHE_TTL_SECONDS,
+    name="rerank_scores",
+)
+
+
+# Pairs per cross-encoder forward pass
+_CROSS_ENCODER_BATCH_SIZE = 64
+
+
+class RerankError(Exception):
+    """Raised when a reranker cannot score the candidates."""
+
+
+def query_hash(query: str) -> str:
+    """Cache key for a question; case and whitespace differences do not matter."""
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class Reranker(ABC):
+    """Scores (query, passage) pairs; higher is more relevant."""
+
+    name: str = ""
+
+    @abstractmethod
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """One score in [0, 1] per passage, in order."""
+
+
+class CrossEncoderReranker(Reranker):
+    """sentence-transformers cross-encoder (e.g. ms-marco MiniLM) on the local CPU/GPU."""
+
+    name = "cross-encoder"
+
+    def __init__(self, model_name: str | None = None):
+        # Optional dependency: only needed when this backend is configured
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name or settings.RERANK_CROSS_ENCODER_MODEL
+        self._model = CrossEncoder(self.model_name)
+        # predict() is not safe to call from several threads at once
+        self._lock = threading.Lock()
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        with self._lock:
+            logits = self._model.predict(
+                [(query, passage) for passage in passages],
+                batch_size=_CROSS_ENCODER_BATCH_SIZE,
+                show_progress_bar=False,
+            )
+        # ms-marco models return raw logits
+        return [1.0 / (1.0 + math.exp(-float(logit))) for logit in logits]
+
+
+_LLM_SYSTEM_PROMPT = (
+    "You rate how useful each passage is for answering the question. "
+    'Reply with JSON only, in the form {"scores": [..]}, containing one integer '
+    "from 0 (irrelevant) to 10 (answers the question) per passage, in passage order."
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class LLMReranker(Reranker):
+    """Scores passages in batches with one chat completion per batch."""
+
+    name = "llm"
+
+    def __init__(self, model: str | None = None):
+        self.model = model or settings.RERANK_LLM_MODEL or None
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.RERANK_LLM_CONCURRENCY, thread_name_prefix="rerank-llm"
+        )
+
+    def _score_batch(self, query: str, passages: list[str]) -> list[float]:
+        numbered = "\n\n".join(f"[{i}] {passage}" for i, passage in enumerate(passages, 1))
+        response = chat(
+            messages=[
+                {"role": "system", "content": _LLM_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Question: {query}\n\nPassages:\n{numbered}"},
+            ],
+            model=self.model,
+            temperature=0.0,
+            max_tokens=16 + 4 * len(passages),
+            task="rerank",
+        )
+        match = _JSON_OBJECT.search(response)
+        try:
+            parsed = json.loads(match.group(0)) if match else None
+        except ValueError:
+            parsed = None
+        scores = parsed.get("scores") if isinstance(parsed, dict) else None
+        if not isinstance(scores, list) or len(scores) != len(passages):
+            raise RerankError(f"Unexpected rerank response: {response[:200]!r}")
+        return [min(max(float(s), 0.0), 10.0) / 10.0 for s in scores]
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        size = settings.RERANK_LLM_BATCH_SIZE
+        batches = [passages[i : i + size] for i in range(0, len(passages), size)]
+        # Run each batch in a copy of the caller's context so its LLM call is
+        # traced and timed as part of the request
+        contexts = [contextvars.copy_context() for _ in batches]
+        results = self._executor.map(
+            lambda context, batch: context.run(self._score_batch, query, batch), contexts, batches
+        )
+        return [score for batch_scores in results for score in batch_scores]
+
+
+_reranker: Reranker | None = None
+_reranker_failed = False
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> Reranker | None:
+    """The configured reranker, or None when disabled or unavailable."""
+    global _reranker, _reranker_failed
+    backend = settings.RERANK_BACKEND
+    if backend == "none" or _reranker_failed:
+        return None
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None and not _reranker_failed:
+                try:
+                    if backend == "cross-encoder":
+                        _reranker = CrossEncoderReranker()
+                    elif backend == "llm":
+                        _reranker = LLMReranker()
+                    else:
+                        raise ValueError(f"Unknown rerank backend: {backend}")
+                except Exception as e:
+                    # Keep answering with vector order rather than failing every request
+                    _reranker_failed = True
+                    logger.warning(f"Reranker '{backend}' unavailable, using vector order: {e}")
+    return _reranker
+
+
+def candidate_count() -> int:
+    """
+    How many chunks retrieval should fetch for ``rerank``.
+
+    Only over-fetch ``RERANK_CANDIDATES`` when a reranker is available;
+    otherwise ``rerank`` keeps the first ``RERANK_TOP_N`` in vector order.
+    """
+    if get_reranker() is None:
+        return settings.RERANK_TOP_N
+    return max(settings.RERANK_CANDIDATES, settings.RERANK_TOP_N)
+
+
+def rerank(
+    query: str,
+    docs: list[dict],
+    top_n: int | None = None,
+    min_score: float | None = None,
+    reranker: Reranker | None = None,
+) -> list[dict]:
+    """
+    Order ``search_kb`` results by reranker relevance and keep the best ``top_n``.
+
+    Each returned doc gets a ``rerank_score``; docs below ``min_score`` are
+    dropped. Without a reranker (or if scoring fails) the vector order is kept.
+    """
+    top_n = top_n or settings.RERANK_TOP_N
+    min_score = settings.RERANK_MIN_SCORE if min_score is None else min_score
+    reranker = reranker or get_reranker()
+    if reranker is None or len(docs) <= 1:
+        return docs[:top_n]
+
+    with span(
+        "rerank", {"rerank.backend": reranker.name, "rerank.candidates": len(docs)}
+    ) as rerank_span:
+        qhash = query_hash(query)
+        scores: dict[str, float] = {}
+        missing = []
+        for doc in docs:
+            cached = _score_cache.get((reranker.name, qhash, doc["id"]))
+            if cached is None:
+                missing.append(doc)
+            else:
+                scores[doc["id"]] = cached
+        rerank_span.set_attribute("rerank.cached", len(docs) - len(missing))
+
+        if missing:
+            try:
+                fresh = reranker.score(
+                    query, [doc["content"][: settings.RERANK_MAX_CHARS] for doc in missing]
+                )
+            except Exception as e:
+                logger.warning(f"Reranking failed, using vector order: {e}")
+                rerank_span.record_exception(e)
+                return docs[:top_n]
+            for doc, score in zip(missing, fresh, strict=True):
+                scores[doc["id"]] = score
+                _score_cache.set((reranker.name, qhash, doc["id"]), score)
+
+        logger.debug(f"Reranked {len(docs)} chunks ({len(docs) - len(missing)} cached scores)")
+
+        # sorted() is stable, so equal scores keep their vector order
+        ranked = sorted(docs, key=lambda doc: scores[doc["id"]], reverse=True)
+        kept = [
+            {**doc, "rerank_score": scores[doc["id"]]}
+            for doc in ranked[:top_n]
+            if scores[doc["id"]] >= min_score
+        ]
+        rerank_span.set_attributes(
+            {"rerank.kept": len(kept), "rerank.scores": [round(d["rerank_score"], 4) for d in kept]}
+        )
+        return kept
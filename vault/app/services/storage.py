@@ -4,23 +4,29 @@ Replaces Supabase Storage for company logos and bot profile pictures
 """
 
 import base64
+import functools
 import logging
 
-import cloudinary
-import cloudinary.uploader
 from fastapi import HTTPException
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET,
-    secure=True,
-)
+
+@functools.cache
+def _cloudinary():
+    """The configured cloudinary module, imported on first upload rather than at startup."""
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET,
+        secure=True,
+    )
+    return cloudinary
 
 
 class StorageService:
@@ -50,7 +56,7 @@ class StorageService:
             company_folder = company_name.lower().replace(" ", "-")
 
             # Upload to Cloudinary
-            result = cloudinary.uploader.upload(
+            result = _cloudinary().uploader.upload(
                 logo_binary,
                 folder=f"vault/companies/{company_folder}",
                 public_id="logo",
@@ -91,7 +97,7 @@ class StorageService:
 
             company_folder = company_name.lower().replace(" ", "-")
 
-            result = cloudinary.uploader.upload(
+            result = _cloudinary().uploader.upload(
                 bot_pic_binary,
                 folder=f"vault/companies/{company_folder}",
                 public_id="bot_profile",
@@ -128,7 +134,7 @@ class StorageService:
             company_folder = company_name.lower().replace(" ", "-")
             public_id = f"vault/companies/{company_folder}/logo"
 
-            return cloudinary.CloudinaryImage(public_id).build_url(
+            return _cloudinary().CloudinaryImage(public_id).build_url(
                 format="png",
                 transformation=[
                     {"width": 500, "height": 500, "crop": "limit"},
@@ -154,7 +160,7 @@ class StorageService:
             company_folder = company_name.lower().replace(" ", "-")
             public_id = f"vault/companies/{company_folder}/bot_profile"
 
-            return cloudinary.CloudinaryImage(public_id).build_url(
+            return _cloudinary().CloudinaryImage(public_id).build_url(
                 format="png",
                 transformation=[
                     {"width": 200, "height": 200, "crop": "fill"},
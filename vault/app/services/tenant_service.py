@@ -10,6 +10,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Profile
+from app.services.auth_context import AuthContextCache
+from app.services.profile_directory import ProfileDirectory
 
 logger = logging.getLogger(__name__)
 
@@ -122,6 +124,7 @@ class TenantService:
             db.add(profile)
             await db.commit()
             await db.refresh(profile)
+            ProfileDirectory.invalidate(company_regno)
 
             logger.info(f"Created profile {profile.id} in tenant {company_regno}")
             return profile
@@ -167,6 +170,8 @@ class TenantService:
 
             await db.commit()
             await db.refresh(profile)
+            ProfileDirectory.invalidate(company_regno)
+            AuthContextCache.invalidate_user(user_id)
 
             logger.info(f"Updated profile {user_id} in tenant {company_regno}")
             return profile
@@ -202,6 +207,8 @@ class TenantService:
             # Soft delete
             profile.status = "inactive"
             await db.commit()
+            ProfileDirectory.invalidate(company_regno)
+            AuthContextCache.invalidate_user(user_id)
 
             logger.info(f"Deleted profile {user_id} in tenant {company_regno}")
             return True
@@ -0,0 +1,21 @@
+from app.services.file_processor import chunk_text
+
+
+def test_separator_inside_overlap_still_advances():
+    # The only sentence break in each window falls within the overlap
+    text = "Short. " + "x" * 3000
+
+    chunks = chunk_text(text, chunk_size=1000, overlap=100)
+
+    assert chunks[0].startswith("Short.")
+    assert len(chunks) == 4
+    assert sum(len(chunk) for chunk in chunks) - 3 * 100 == len(text)
+
+
+def test_no_trailing_overlap_only_chunk():
+    text = "Sentence number one. " * 100
+
+    chunks = chunk_text(text, chunk_size=500, overlap=50)
+
+    assert all(len(chunk) > 50 for chunk in chunks)
+    assert text.strip().endswith(chunks[-1][-50:])
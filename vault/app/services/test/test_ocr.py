@@ -0,0 +1,90 @@
+import io
+
+from PIL import Image, ImageDraw
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services import file_processor, ocr
+
+
+def _text_page(writer, text):
+    page = PageObject.create_blank_page(None, 612, 792)
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    page[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})}
+    )
+    content = DecodedStreamObject()
+    content.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+    page[NameObject("/Contents")] = writer._add_object(content)
+    writer.add_page(page)
+
+
+def _scanned_page(writer, size, mode="L"):
+    """A page holding only an image, like a scanner produces."""
+    image = Image.new(mode, size, "white")
+    ImageDraw.Draw(image).rectangle((10, 10, 60, 30), fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PDF")
+    writer.add_page(PdfReader(buffer).pages[0])
+
+
+def _pdf(tmp_path):
+    writer = PdfWriter()
+    _text_page(writer, "Chapter one has a perfectly good text layer")
+    _scanned_page(writer, (400, 300))
+    _scanned_page(writer, (300, 200), mode="1")
+    path = tmp_path / "manual.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def _fake_tesseract(monkeypatch, tmp_path):
+    calls = []
+
+    def ocr_image(image, languages, timeout):
+        calls.append(image.size)
+        return f"scanned {image.size[0]}x{image.size[1]}"
+
+    monkeypatch.setattr(ocr, "ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_image", ocr_image)
+    monkeypatch.setattr(ocr.shutil, "which", lambda name: None)
+    monkeypatch.setattr(ocr.settings, "OCR_WORKERS", 0)
+    monkeypatch.setattr(ocr.settings, "OCR_CACHE_DIR", str(tmp_path / "cache"))
+    return calls
+
+
+def test_only_pages_without_a_text_layer_are_ocred(monkeypatch, tmp_path):
+    calls = _fake_tesseract(monkeypatch, tmp_path)
+
+    text = file_processor.extract_from_pdf(_pdf(tmp_path))
+
+    assert "--- Page 1 ---\nChapter one has a perfectly good text layer" in text
+    assert "--- Page 2 ---\nscanned 400x300" in text
+    assert "--- Page 3 ---\nscanned 300x200" in text
+    # The embedded scans are OCRed; the text page never is
+    assert sorted(calls) == [(300, 200), (400, 300)]
+
+
+def test_reingest_is_served_from_the_page_cache(monkeypatch, tmp_path):
+    calls = _fake_tesseract(monkeypatch, tmp_path)
+    path = _pdf(tmp_path)
+    first = file_processor.extract_from_pdf(path)
+
+    # Another copy of the same document hits the cache as well
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(path.read_bytes())
+    calls.clear()
+
+    assert file_processor.extract_from_pdf(copy) == first
+    assert calls == []
+
+    monkeypatch.setattr(ocr.settings, "OCR_LANGUAGES", "deu")
+    file_processor.extract_from_pdf(copy)
+    assert len(calls) == 2
@@ -0,0 +1,102 @@
+import sys
+
+import pytest
+
+from app.services import reranker as reranker_module
+from app.services.reranker import LLMReranker, Reranker, RerankError, rerank
+
+
+class _KeywordReranker(Reranker):
+    """Scores passages by whether they mention the keyword; records what it scored."""
+
+    name = "keyword"
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.calls: list[list[str]] = []
+
+    def score(self, query, passages):
+        self.calls.append(passages)
+        return [0.9 if self.keyword in passage else 0.1 for passage in passages]
+
+
+def _docs(*contents):
+    return [
+        {"id": f"chunk-{i}", "content": content, "title": f"T{i}", "score": 1 - i / 100}
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    reranker_module._score_cache.clear()
+    yield
+    reranker_module._score_cache.clear()
+
+
+def test_rerank_orders_by_score_and_keeps_top_n():
+    docs = _docs("nothing", "holiday policy", "misc", "holiday carry-over")
+    ranked = rerank("holiday?", docs, top_n=2, reranker=_KeywordReranker("holiday"))
+    # Equal scores keep vector order
+    assert [doc["id"] for doc in ranked] == ["chunk-1", "chunk-3"]
+    assert all(doc["rerank_score"] == 0.9 for doc in ranked)
+
+
+def test_rerank_min_score_drops_irrelevant_chunks():
+    docs = _docs("nothing", "holiday policy", "misc")
+    ranked = rerank("holiday", docs, top_n=3, min_score=0.5, reranker=_KeywordReranker("holiday"))
+    assert [doc["id"] for doc in ranked] == ["chunk-1"]
+
+
+def test_rerank_scores_are_cached_per_query_and_chunk():
+    scorer = _KeywordReranker("holiday")
+    docs = _docs("holiday policy", "misc")
+    rerank("Holiday  policy?", docs, reranker=scorer)
+    rerank("holiday policy?", docs + _docs("a", "b", "new holiday chunk")[2:], reranker=scorer)
+    assert scorer.calls == [["holiday policy", "misc"], ["new holiday chunk"]]
+
+
+def test_rerank_falls_back_to_vector_order_on_failure():
+    class Broken(Reranker):
+        name = "broken"
+
+        def score(self, query, passages):
+            raise RerankError("model offline")
+
+    docs = _docs("a", "b", "c", "d")
+    assert rerank("q", docs, top_n=2, reranker=Broken()) == docs[:2]
+
+
+def test_llm_reranker_batches_and_parses_scores(monkeypatch):
+    prompts = []
+
+    def fake_chat(messages, **kwargs):
+        prompts.append(messages[1]["content"])
+        count = messages[1]["content"].count("\n[")
+        return 'Sure: {"scores": [' + ", ".join(["7"] * (count - 1) + ["2"]) + "]}"
+
+    monkeypatch.setattr(reranker_module, "chat", fake_chat)
+    monkeypatch.setattr(reranker_module.settings, "RERANK_LLM_BATCH_SIZE", 4)
+    scores = LLMReranker().score("q", [f"passage {i}" for i in range(10)])
+    assert len(prompts) == 3
+    assert scores == [0.7, 0.7, 0.7, 0.2, 0.7, 0.7, 0.7, 0.2, 0.7, 0.2]
+
+    monkeypatch.setattr(reranker_module, "chat", lambda messages, **kwargs: "no idea")
+    with pytest.raises(RerankError):
+        LLMReranker().score("q", ["one", "two"])
+
+
+def test_candidate_count_skips_over_fetch_without_a_reranker(monkeypatch):
+    monkeypatch.setattr(reranker_module.settings, "RERANK_CANDIDATES", 50)
+    monkeypatch.setattr(reranker_module.settings, "RERANK_TOP_N", 3)
+    monkeypatch.setattr(reranker_module, "_reranker", None)
+    monkeypatch.setattr(reranker_module, "_reranker_failed", False)
+
+    # Cross-encoder configured but sentence-transformers missing
+    monkeypatch.setattr(reranker_module.settings, "RERANK_BACKEND", "cross-encoder")
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+    assert reranker_module.candidate_count() == 3
+
+    monkeypatch.setattr(reranker_module, "_reranker", _KeywordReranker("x"))
+    monkeypatch.setattr(reranker_module, "_reranker_failed", False)
+    assert reranker_module.candidate_count() == 50
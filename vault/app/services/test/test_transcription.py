@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import websocket as websocket_module
+from app.services import transcription
+from app.services.transcription import SAMPLE_RATE, UtteranceChunker
+
+FRAME = SAMPLE_RATE // 100  # 10 ms
+
+
+def energy_spans(audio):
+    """Stand-in for Silero: runs of 10 ms frames with any loud sample."""
+    spans, start = [], None
+    for i in range(0, len(audio), FRAME):
+        loud = bool(np.abs(audio[i : i + FRAME]).max(initial=0) > 0.1)
+        if loud and start is None:
+            start = i
+        elif not loud and start is not None:
+            spans.append((start, i))
+            start = None
+    if start is not None:
+        spans.append((start, len(audio)))
+    return spans
+
+
+def tone(seconds):
+    return np.full(int(SAMPLE_RATE * seconds), 0.5, dtype=np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.float32)
+
+
+def feed_in_frames(chunker, audio, frame_s=0.1):
+    step = int(SAMPLE_RATE * frame_s)
+    out = []
+    for i in range(0, len(audio), step):
+        out += chunker.feed(audio[i : i + step])
+    return out
+
+
+def test_chunker_cuts_utterances_at_pauses():
+    chunker = UtteranceChunker(energy_spans, min_silence_ms=500, max_utterance_s=20, pad_ms=0)
+    audio = np.concatenate([silence(0.5), tone(1), silence(1), tone(0.5), silence(0.2)])
+
+    utterances = feed_in_frames(chunker, audio)
+
+    # The first utterance is handed out during the pause, before the stream ends
+    assert [(start, end) for start, end, _ in utterances] == [(0.5, 1.5)]
+    assert len(utterances[0][2]) == SAMPLE_RATE
+
+    ((start, end, samples),) = chunker.flush()
+    assert (start, end) == (2.5, 3.0)
+    assert len(samples) == SAMPLE_RATE // 2
+    assert chunker.flush() == []
+
+
+def test_chunker_cuts_long_speech_at_the_limit():
+    chunker = UtteranceChunker(energy_spans, min_silence_ms=500, max_utterance_s=2, pad_ms=0)
+
+    utterances = feed_in_frames(chunker, tone(5))
+
+    assert [(start, end) for start, end, _ in utterances] == [(0.0, 2.0), (2.0, 4.0)]
+    assert [(start, end) for start, end, _ in chunker.flush()] == [(4.0, 5.0)]
+
+
+def test_websocket_streams_partial_transcripts(monkeypatch):
+    async def authenticate(token):
+        return {"user_id": "u1"}
+
+    transcribed = []
+
+    async def transcribe_async(samples, language=None):
+        transcribed.append(len(samples))
+        return f"utterance {len(transcribed)}"
+
+    monkeypatch.setattr(websocket_module, "_authenticate", authenticate)
+    monkeypatch.setattr(transcription, "transcribe_async", transcribe_async)
+    monkeypatch.setattr(transcription, "silero_speech_spans", energy_spans)
+    monkeypatch.setattr(transcription.settings, "TRANSCRIBE_MIN_SILENCE_MS", 300)
+
+    app = FastAPI()
+    app.include_router(websocket_module.router)
+    pcm = (np.concatenate([tone(1), silence(0.6), tone(0.5)]) * 32767).astype("<i2").tobytes()
+
+    with TestClient(app).websocket_connect("/ws/transcribe?token=t") as ws:
+        # Odd frame sizes split samples across frames
+        for i in range(0, len(pcm), 3201):
+            ws.send_bytes(pcm[i : i + 3201])
+        first = ws.receive_json()
+        ws.send_text(json.dumps({"type": "end"}))
+        second = ws.receive_json()
+        final = ws.receive_json()
+
+    assert first["type"] == "partial" and first["index"] == 0 and first["text"] == "utterance 1"
+    assert second["index"] == 1
+    assert final == {"type": "final", "text": "utterance 1 utterance 2"}
+    # Speech plus up to 200 ms of padding on each side
+    assert transcribed[0] == int(SAMPLE_RATE * 1.2)
+    assert SAMPLE_RATE * 0.5 < transcribed[1] <= SAMPLE_RATE * 0.9
@@ -0,0 +1,288 @@
+import numpy as np
+import pytest
+
+from app.services.vector_store import SearchFilter, VectorRecord, create_vector_store
+
+DIMENSIONS = 16
+
+
+def _records(count: int = 40) -> list[VectorRecord]:
+    rng = np.random.default_rng(7)
+    return [
+        VectorRecord(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            content=f"chunk {i}",
+            embedding=rng.normal(size=DIMENSIONS).tolist(),
+            sourcefile=f"doc-{i % 4}.pdf",
+            title=f"Doc {i % 4}",
+            access_level=1 + i % 3,
+            company_id=1 + i % 2,
+            department="hr" if i % 5 == 0 else "eng",
+        )
+        for i in range(count)
+    ]
+
+
+def _stores():
+    stores = [create_vector_store("memory")]
+    qdrant_client = pytest.importorskip("qdrant_client")
+    # The collection is created on first use
+    stores.append(
+        create_vector_store(
+            "qdrant", collection_name="test", client=qdrant_client.QdrantClient(":memory:")
+        )
+    )
+    return stores
+
+
+def _expected(records, query, limit, predicate):
+    query = np.asarray(query) / np.linalg.norm(query)
+    scored = [
+        (float(np.dot(query, np.asarray(r.embedding) / np.linalg.norm(r.embedding))), r.id)
+        for r in records
+        if predicate(r)
+    ]
+    return [record_id for _, record_id in sorted(scored, reverse=True)[:limit]]
+
+
+def test_filtered_top_k_matches_brute_force():
+    records = _records()
+    query = records[3].embedding
+    filters = SearchFilter(max_access_level=2, company_id=2)
+    expected = _expected(records, query, 5, lambda r: r.access_level <= 2 and r.company_id == 2)
+    for store in _stores():
+        store.upsert(records, batch_size=7)
+        hits = store.search(query, limit=5, filters=filters)
+        assert [hit.record.id for hit in hits] == expected, store.name
+        assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+        assert all(a.score >= b.score for a, b in zip(hits, hits[1:], strict=False))
+
+
+def test_min_score_and_department_filter():
+    records = _records()
+    for store in _stores():
+        store.upsert(records)
+        hits = store.search(
+            records[0].embedding, limit=10, filters=SearchFilter(department="hr"), min_score=0.99
+        )
+        assert [hit.record.id for hit in hits] == [records[0].id], store.name
+
+
+def test_upsert_replaces_by_id_and_delete_by_source():
+    records = _records()
+    for store in _stores():
+        store.upsert(records)
+        replaced = VectorRecord(**{**records[1].__dict__, "content": "updated"})
+        store.upsert([replaced])
+        assert store.count() == len(records)
+        assert store.search(records[1].embedding, limit=1)[0].record.content == "updated"
+
+        deleted = store.delete_by_source(["doc-0.pdf", "doc-1.pdf"])
+        assert deleted == len(records) // 2
+        assert store.count() == len(records) // 2
+        assert store.count(SearchFilter(sourcefile="doc-1.pdf")) == 0
+
+
+def test_delete_by_source_within_one_company():
+    records = _records()
+    for store in _stores():
+        store.upsert(records)
+        # doc-2 is company 1's, doc-3 company 2's
+        deleted = store.delete_by_source(["doc-2.pdf", "doc-3.pdf"], company_id=1)
+        assert deleted == len(records) // 4, store.name
+        assert store.count(SearchFilter(sourcefile="doc-2.pdf")) == 0
+        assert store.count(SearchFilter(sourcefile="doc-3.pdf")) == len(records) // 4
+
+
+def test_delete_by_id_and_list_newest_first():
+    records = _records(12)
+    for i, record in enumerate(records):
+        record.created_at = f"2026-01-{i + 1:02d}T00:00:00"
+    for store in _stores():
+        store.upsert(records)
+        assert store.delete([records[0].id, records[1].id, "not-a-uuid"]) == 2, store.name
+        assert store.delete([records[0].id]) == 0
+        assert store.count() == len(records) - 2
+
+        page = store.list_records(SearchFilter(company_id=2), limit=2, offset=1)
+        # Company 2 holds the odd records; newest is 11, then 9, 7
+        assert [record.id for record in page] == [records[9].id, records[7].id], store.name
+        assert all(record.embedding is None for record in page)
+
+
+def test_qdrant_creates_collection_once_on_first_use():
+    qdrant_client = pytest.importorskip("qdrant_client")
+    client = qdrant_client.QdrantClient(":memory:")
+    checks = []
+    collection_exists = client.collection_exists
+    client.collection_exists = lambda name: checks.append(name) or collection_exists(name)
+    store = create_vector_store("qdrant", collection_name="fresh", client=client)
+
+    assert store.search([1.0] * DIMENSIONS, limit=3) == []
+    info = client.get_collection("fresh")
+    assert info.config.params.vectors.size == DIMENSIONS
+
+    store.upsert(_records(5))
+    assert store.count() == 5
+    assert checks == ["fresh"]
+
+
+class _RecordingSession:
+    """Session stand-in that keeps the statements a store executes."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return type("Result", (), {"rowcount": 0, "all": lambda self: []})()
+
+    def commit(self):
+        pass
+
+
+def test_pgvector_delete_by_source_scopes_to_company():
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.vector_store.pgvector import PgVectorStore
+
+    session = _RecordingSession()
+    PgVectorStore(session_factory=lambda: session).delete_by_source(["a.pdf"], company_id=7)
+    sql = str(
+        session.statements[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "kbdocuments.sourcefile IN ('a.pdf')" in sql
+    assert "kbdocuments.companyid = 7" in sql
+
+
+def test_pgvector_delete_and_list_statements():
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.vector_store.pgvector import PgVectorStore
+
+    session = _RecordingSession()
+    store = PgVectorStore(session_factory=lambda: session)
+    assert store.delete(["bogus"]) == 0
+    store.delete(["00000000-0000-0000-0000-000000000001"])
+    store.list_records(SearchFilter(max_access_level=2, company_id=7), limit=10, offset=20)
+    delete_sql, list_sql = (
+        str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        for stmt in session.statements
+    )
+    assert "WHERE kbdocuments.id IN ('00000000-0000-0000-0000-000000000001')" in delete_sql
+    assert "kbdocuments.accesslevel <= 2 AND kbdocuments.companyid = 7" in list_sql
+    assert "ORDER BY kbdocuments.createdat DESC NULLS LAST" in list_sql
+    assert "LIMIT 10 OFFSET 20" in list_sql
+
+
+def test_scroll_visits_every_matching_record_once():
+    records = _records()
+    for store in _stores():
+        store.upsert(records)
+        batches = list(store.scroll(SearchFilter(company_id=1), batch_size=6))
+        ids = [record.id for batch in batches for record in batch]
+        assert sorted(ids) == sorted(r.id for r in records if r.company_id == 1)
+        assert all(len(batch) <= 6 for batch in batches)
+        assert all(batch[0].embedding is None for batch in batches)
+
+
+class _FailingSearch:
+    """Primary store whose search fails (database down)."""
+
+    def __init__(self, store):
+        self.store = store
+        self.name = store.name
+        self.fail = False
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def search(self, *args, **kwargs):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        return self.store.search(*args, **kwargs)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_local_index_matches_primary(tmp_path, dtype):
+    from app.services.vector_store.local_index import LocalIndexVectorStore
+
+    records = _records(200)
+    primary = create_vector_store("memory")
+    primary.upsert(records)
+    store = LocalIndexVectorStore(primary, directory=tmp_path, dtype=dtype, listen=False)
+    assert store.refresh(1) and store.refresh(2)
+
+    for query in (records[5].embedding, records[150].embedding):
+        for filters in (
+            SearchFilter(company_id=1),
+            SearchFilter(company_id=2, max_access_level=1),
+            SearchFilter(company_id=1, max_access_level=2, department="hr"),
+            SearchFilter(company_id=2, max_access_level=0),
+        ):
+            expected = primary.search(query, limit=8, filters=filters, min_score=0.1)
+            hits = store._fresh_snapshot(filters.company_id).search(
+                query, limit=8, filters=filters, min_score=0.1
+            )
+            if dtype == "float32":
+                assert [h.record.id for h in hits] == [h.record.id for h in expected]
+            tolerance = 1e-5 if dtype == "float32" else 2e-3
+            assert [h.score for h in hits] == pytest.approx(
+                [h.score for h in expected[: len(hits)]], abs=tolerance
+            )
+    store.close()
+
+
+def test_local_index_invalidation_and_offline_fallback(tmp_path):
+    from app.services.vector_store.local_index import LocalIndexVectorStore
+
+    records = _records()
+    primary = _FailingSearch(create_vector_store("memory"))
+    store = LocalIndexVectorStore(primary, directory=tmp_path, max_chunks=100, listen=False)
+    store.upsert(records)
+    filters = SearchFilter(company_id=1)
+
+    # First search goes to the primary and schedules the build
+    assert store.search(records[0].embedding, limit=3, filters=filters)
+    store._get_executor().submit(lambda: None).result()
+    assert store._fresh_snapshot(1) is not None
+
+    # A write marks the tenant stale until it is rebuilt
+    changed = VectorRecord(**{**records[0].__dict__, "content": "changed"})
+    store.upsert([changed])
+    assert store._fresh_snapshot(1) is None
+    store._get_executor().submit(lambda: None).result()
+    assert store.search(records[0].embedding, limit=1, filters=filters)[0].record.content == (
+        "changed"
+    )
+
+    # Stale snapshots still answer while the primary is down, from disk too
+    store.invalidate(1)
+    primary.fail = True
+    reopened = LocalIndexVectorStore(primary, directory=tmp_path, listen=False)
+    for candidate in (store, reopened):
+        hits = candidate.search(records[0].embedding, limit=1, filters=filters)
+        assert hits[0].record.id == records[0].id
+    with pytest.raises(ConnectionError):
+        store.search(records[0].embedding, limit=1, filters=SearchFilter(company_id=9))
+    store.close()
+    reopened.close()
+
+
+def test_local_index_skips_large_tenants(tmp_path):
+    from app.services.vector_store.local_index import LocalIndexVectorStore
+
+    primary = create_vector_store("memory")
+    primary.upsert(_records())
+    store = LocalIndexVectorStore(primary, directory=tmp_path, max_chunks=5, listen=False)
+    assert not store.refresh(1)
+    assert store._fresh_snapshot(1) is None
+    store.close()
@@ -0,0 +1,232 @@
+"""
+Speech-to-text with faster-whisper.
+
+One model per process, loaded on first use (or by the startup warm-up) and
+shared by every request. CTranslate2 releases the GIL and runs up to
+``TRANSCRIBE_WORKERS`` transcriptions in parallel inside that one model, so
+a thread pool of the same size is enough; no process pool or model copies.
+
+Live voice input arrives as raw 16 kHz mono PCM; ``UtteranceChunker`` cuts it
+at pauses found by voice activity detection (Silero, bundled with
+faster-whisper) so each utterance is transcribed as soon as the speaker
+pauses instead of after the whole recording.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.core.metrics import TRANSCRIPTION_SECONDS, record_stage
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# (start, end) sample offsets of speech within an audio buffer
+SpeechDetector = Callable[[np.ndarray], list[tuple[int, int]]]
+
+
+class TranscriptionError(Exception):
+    """Raised when audio cannot be transcribed."""
+
+
+_model = None
+_model_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_model():
+    """The process-wide WhisperModel, loaded on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as e:
+                    raise TranscriptionError(
+                        "faster-whisper not installed.\n"
+                        "Install with: pip install faster-whisper\n"
+                        "Also requires ffmpeg: brew install ffmpeg"
+                    ) from e
+                started = time.perf_counter()
+                _model = WhisperModel(
+                    settings.WHISPER_MODEL,
+                    device=settings.WHISPER_DEVICE,
+                    compute_type=settings.WHISPER_COMPUTE_TYPE,
+                    num_workers=settings.TRANSCRIBE_WORKERS,
+                )
+                logger.info(
+                    f"Loaded Whisper model {settings.WHISPER_MODEL} "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+    return _model
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.TRANSCRIBE_WORKERS, thread_name_prefix="whisper"
+                )
+    return _executor
+
+
+def transcribe(audio: str | Path | np.ndarray, language: str | None = None) -> str:
+    """
+    Transcribe a file or a float32 16 kHz mono array. Blocking; use
+    ``transcribe_async`` from request handlers.
+    """
+    mode = "utterance" if isinstance(audio, np.ndarray) else "file"
+    source = audio if isinstance(audio, np.ndarray) else str(audio)
+    started = time.perf_counter()
+    with span(
+        "whisper.transcribe", {"whisper.model": settings.WHISPER_MODEL, "whisper.mode": mode}
+    ):
+        model = get_model()
+        # Files get Whisper's own VAD filter; utterances were already cut by VAD
+        segments, _ = model.transcribe(source, language=language, vad_filter=mode == "file")
+        # Segments are decoded lazily while iterating
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+    elapsed = time.perf_counter() - started
+    TRANSCRIPTION_SECONDS.observe(elapsed, mode=mode)
+    record_stage("transcribe", elapsed)
+    return text
+
+
+async def transcribe_async(audio: str | Path | np.ndarray, language: str | None = None) -> str:
+    """``transcribe`` on the shared Whisper thread pool, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    # The executor does not copy the context; do it so spans and stages are attributed
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _get_executor(), lambda: context.run(transcribe, audio, language)
+    )
+
+
+def preload() -> bool:
+    """Load the model ahead of the first request; False if faster-whisper is missing."""
+    try:
+        get_model()
+    except TranscriptionError:
+        return False
+    return True
+
+
+def shutdown() -> None:
+    """Stop the transcription threads (application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# ============================================================================
+# Live transcription
+# ============================================================================
+
+
+def pcm16_to_float32(data: bytes) -> np.ndarray:
+    """Little-endian signed 16-bit PCM to float32 samples in [-1, 1]."""
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def silero_speech_spans(audio: np.ndarray) -> list[tuple[int, int]]:
+    """Speech spans found by faster-whisper's Silero VAD."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(min_silence_duration_ms=settings.TRANSCRIBE_MIN_SILENCE_MS // 2)
+    return [(ts["start"], ts["end"]) for ts in get_speech_timestamps(audio, options)]
+
+
+class UtteranceChunker:
+    """
+    Buffers a live 16 kHz mono stream and hands out utterances: the audio up
+    to the end of speech once a pause of ``min_silence_ms`` follows it, or the
+    first ``max_utterance_s`` seconds if the speaker never pauses.
+
+    VAD runs at most once per ``step_s`` of new audio, over the pending buffer
+    only, so the cost per call stays bounded.
+    """
+
+    def __init__(
+        self,
+        detect_speech: SpeechDetector | None = None,
+        min_silence_ms: int | None = None,
+        max_utterance_s: float | None = None,
+        step_s: float = 0.5,
+        pad_ms: int = 200,
+    ):
+        self.detect_speech = detect_speech or silero_speech_spans
+        self.min_silence = int(
+            SAMPLE_RATE * (min_silence_ms or settings.TRANSCRIBE_MIN_SILENCE_MS) / 1000
+        )
+        self.max_samples = int(
+            SAMPLE_RATE * (max_utterance_s or settings.TRANSCRIBE_MAX_UTTERANCE_SECONDS)
+        )
+        self.step = int(SAMPLE_RATE * step_s)
+        self.pad = int(SAMPLE_RATE * pad_ms / 1000)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        # Absolute sample offset of the buffer start, for utterance timestamps
+        self._offset = 0
+        self._unchecked = 0
+
+    def feed(self, samples: np.ndarray) -> list[tuple[float, float, np.ndarray]]:
+        """Add audio; returns completed utterances as (start s, end s, samples)."""
+        self._buffer = np.concatenate([self._buffer, samples.astype(np.float32, copy=False)])
+        self._unchecked += len(samples)
+        if self._unchecked < self.step and len(self._buffer) < self.max_samples:
+            return []
+        self._unchecked = 0
+
+        utterances = []
+        while True:
+            spans = self.detect_speech(self._buffer)
+            if not spans:
+                # Silence only: keep a short tail so the next word's onset is not clipped
+                self._advance(max(0, len(self._buffer) - self.pad))
+                return utterances
+            last_end = spans[-1][1]
+            if len(self._buffer) - last_end >= self.min_silence:
+                cut = last_end
+            elif len(self._buffer) >= self.max_samples:
+                # No pause yet: cut at the last gap between spans, or hard at the limit
+                if len(spans) > 1:
+                    cut = spans[-2][1]
+                else:
+                    cut = min(last_end, spans[0][0] + self.max_samples)
+            else:
+                return utterances
+            utterances.append(self._take(spans[0][0], cut))
+
+    def flush(self) -> list[tuple[float, float, np.ndarray]]:
+        """The remaining speech at the end of the stream."""
+        spans = self.detect_speech(self._buffer) if len(self._buffer) else []
+        if not spans:
+            return []
+        return [self._take(spans[0][0], spans[-1][1])]
+
+    def _take(self, start: int, end: int) -> tuple[float, float, np.ndarray]:
+        start = max(0, start - self.pad)
+        end = min(len(self._buffer), end + self.pad)
+        utterance = self._buffer[start:end].copy()
+        timing = ((self._offset + start) / SAMPLE_RATE, (self._offset + end) / SAMPLE_RATE)
+        self._advance(end)
+        return (*timing, utterance)
+
+    def _advance(self, samples: int) -> None:
+        self._buffer = self._buffer[samples:]
+        self._offset += samples
@@ -0,0 +1,77 @@
+"""
+Pluggable vector storage for the knowledge base.
+
+``get_vector_store()`` returns the backend selected by ``VECTOR_BACKEND``
+(``pgvector``, ``qdrant`` or ``memory``). Backends are imported lazily so a
+deployment only needs the client library of the one it uses. With
+``VECTOR_LOCAL_INDEX_ENABLED`` the store is wrapped in a
+``LocalIndexVectorStore`` that serves small tenants from in-process snapshots.
+"""
+
+import threading
+
+from app.config import settings
+
+from .base import SearchFilter, SearchHit, VectorRecord, VectorStore
+
+__all__ = [
+    "SearchFilter",
+    "SearchHit",
+    "VectorRecord",
+    "VectorStore",
+    "close_vector_store",
+    "create_vector_store",
+    "get_vector_store",
+    "set_vector_store",
+]
+
+_store: VectorStore | None = None
+_store_lock = threading.Lock()
+
+
+def create_vector_store(backend: str, **kwargs) -> VectorStore:
+    """Build a new store for ``backend`` (benchmarks compare several side by side)."""
+    if backend == "pgvector":
+        from .pgvector import PgVectorStore
+
+        return PgVectorStore(**kwargs)
+    if backend == "qdrant":
+        from .qdrant import QdrantVectorStore
+
+        return QdrantVectorStore(**kwargs)
+    if backend == "memory":
+        from .memory import InMemoryVectorStore
+
+        return InMemoryVectorStore(**kwargs)
+    raise ValueError(f"Unknown vector backend: {backend}")
+
+
+def get_vector_store() -> VectorStore:
+    """The process-wide store for the configured backend."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = create_vector_store(settings.VECTOR_BACKEND)
+                if settings.VECTOR_LOCAL_INDEX_ENABLED:
+                    from .local_index import LocalIndexVectorStore
+
+                    store = LocalIndexVectorStore(store)
+                _store = store
+    return _store
+
+
+def set_vector_store(store: VectorStore | None) -> None:
+    """Replace the process-wide store (benchmarks and tests load their own)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def close_vector_store() -> None:
+    """Release the process-wide store (application shutdown)."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -0,0 +1,144 @@
+"""
+Vector store interface shared by the pgvector, Qdrant and in-memory backends.
+
+Every backend stores the same record shape and reports the same score (cosine
+similarity, higher is better), so retrieval code and benchmarks can swap
+backends without changing results.
+"""
+
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, fields
+
+
+@dataclass
+class VectorRecord:
+    """One knowledge-base chunk with its embedding and filterable metadata."""
+
+    id: str
+    content: str
+    embedding: Sequence[float] | None = None
+    sourcefile: str | None = None
+    title: str | None = None
+    access_level: int = 1
+    company_id: int | None = None
+    company_reg_no: str | None = None
+    department: str | None = None
+    tags: str | None = None
+    author: str | None = None
+    doc_type: str | None = None
+    # ISO 8601 timestamps
+    created_at: str | None = None
+    last_modified_date: str | None = None
+
+    def payload(self) -> dict:
+        """Metadata (everything except id and embedding)."""
+        return {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if field.name not in ("id", "embedding")
+        }
+
+    @classmethod
+    def from_payload(
+        cls, id: str, payload: dict, embedding: Sequence[float] | None = None
+    ) -> VectorRecord:
+        known = {field.name for field in fields(cls)} - {"id", "embedding"}
+        return cls(
+            id=str(id),
+            embedding=embedding,
+            **{key: value for key, value in payload.items() if key in known},
+        )
+
+
+def valid_uuids(ids: Sequence[str]) -> list[uuid.UUID]:
+    """The ids that are UUIDs (the pgvector and Qdrant key type); others match nothing."""
+    parsed = []
+    for value in ids:
+        try:
+            parsed.append(uuid.UUID(str(value)))
+        except ValueError:
+            continue
+    return parsed
+
+
+@dataclass
+class SearchFilter:
+    """
+    Metadata filter applied inside the top-k search (not after it), so a
+    restricted user still gets ``limit`` results when enough exist.
+    """
+
+    max_access_level: int | None = None
+    company_id: int | None = None
+    company_reg_no: str | None = None
+    department: str | None = None
+    sourcefile: str | None = None
+
+
+@dataclass
+class SearchHit:
+    record: VectorRecord
+    score: float  # cosine similarity
+
+
+class VectorStore(ABC):
+    """Batched upsert, filtered top-k, delete-by-source and scroll over one collection."""
+
+    name: str = ""
+
+    @abstractmethod
+    def upsert(self, records: Sequence[VectorRecord], batch_size: int | None = None) -> int:
+        """Insert or replace records (matched by id); returns the number written."""
+
+    @abstractmethod
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        """Top-``limit`` records by cosine similarity, best first."""
+
+    @abstractmethod
+    def delete_by_source(self, sourcefiles: Sequence[str], company_id: int | None = None) -> int:
+        """
+        Delete every record of the given source files (only ``company_id``'s
+        when given); returns the number deleted.
+        """
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]) -> int:
+        """Delete records by id; returns the number deleted (unknown ids are ignored)."""
+
+    @abstractmethod
+    def scroll(
+        self,
+        filters: SearchFilter | None = None,
+        batch_size: int = 1000,
+        with_embeddings: bool = False,
+    ) -> Iterator[list[VectorRecord]]:
+        """Iterate over all (matching) records in batches, in a stable order."""
+
+    @abstractmethod
+    def count(self, filters: SearchFilter | None = None) -> int:
+        """Number of (matching) records."""
+
+    def list_records(
+        self, filters: SearchFilter | None = None, limit: int = 100, offset: int = 0
+    ) -> list[VectorRecord]:
+        """
+        One page of (matching) records without embeddings, newest first.
+
+        The default scrolls every match and sorts; backends that can order
+        server-side override it.
+        """
+        records = [record for batch in self.scroll(filters) for record in batch]
+        # ISO 8601 strings sort chronologically; undated records go last
+        records.sort(key=lambda record: record.created_at or "", reverse=True)
+        return records[offset : offset + limit]
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release connections held by the backend."""
@@ -0,0 +1,446 @@
+"""
+In-process exact-search index for small tenants.
+
+Every tenant (company) with at most ``VECTOR_LOCAL_INDEX_MAX_CHUNKS`` chunks
+gets a snapshot on disk: the normalized embedding matrix as a memory-mapped
+``.npy`` file, one packed bitmap per access level and the chunk metadata.
+Search is a single matrix-vector product plus ``argpartition``, with no
+database round trip, and ranks exactly like the primary store's cosine search.
+
+Snapshots are rebuilt in the background after a change notification. Writes
+through this store invalidate the affected tenants directly. With the
+pgvector backend, a trigger on ``kbdocuments`` also publishes changes made
+by other processes on ``KB_CHANGE_CHANNEL``. A stale snapshot is never used
+for normal searches, but it still answers when the primary store fails
+(local-first mode while the database is degraded).
+"""
+
+import json
+import logging
+import os
+import select
+import shutil
+import threading
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+
+from .base import SearchFilter, SearchHit, VectorRecord, VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Published by the kbdocuments trigger with the row's companyid as payload
+KB_CHANGE_CHANNEL = "kbdocuments_changed"
+
+# Rows converted per block when scoring a float16 matrix
+_SCORE_BLOCK_ROWS = 16384
+
+
+class TenantSnapshot:
+    """One tenant's chunks, loaded from a snapshot directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.matrix = np.load(path / "embeddings.npy", mmap_mode="r")
+        with np.load(path / "access.npz") as access:
+            self.levels = access["levels"]
+            self.bitmaps = access["bitmaps"]
+        with open(path / "records.json", encoding="utf-8") as f:
+            self.payloads: list[dict] = json.load(f)
+        self.columns = {
+            key: np.array([payload.get(key) for payload in self.payloads], dtype=object)
+            for key in ("company_id", "company_reg_no", "department", "sourcefile")
+        }
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    @classmethod
+    def write(cls, path: Path, records: Iterable[VectorRecord], dtype: np.dtype) -> TenantSnapshot:
+        """Write ``records`` (with embeddings) to a new snapshot directory and load it."""
+        payloads, vectors = [], []
+        for record in records:
+            if record.embedding is None:
+                continue  # not searchable in the primary store either
+            payloads.append({"id": record.id, **record.payload()})
+            vectors.append(np.asarray(record.embedding, dtype=np.float32))
+
+        matrix = np.vstack(vectors) if vectors else np.empty((0, settings.VECTOR_DIMENSIONS))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        access_levels = np.array([p["access_level"] for p in payloads], dtype=np.int64)
+        levels = np.unique(access_levels)
+
+        path.mkdir(parents=True)
+        np.save(path / "embeddings.npy", (matrix / norms).astype(dtype))
+        # Row bitmap of "access_level <= level" for each distinct level
+        bitmaps = np.zeros((len(levels), (len(payloads) + 7) // 8), dtype=np.uint8)
+        for i, level in enumerate(levels):
+            bitmaps[i] = np.packbits(access_levels <= level)
+        np.savez(path / "access.npz", levels=levels, bitmaps=bitmaps)
+        with open(path / "records.json", "w", encoding="utf-8") as f:
+            json.dump(payloads, f)
+        return cls(path)
+
+    def _mask(self, filters: SearchFilter | None) -> np.ndarray | None:
+        if filters is None:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        if filters.max_access_level is not None:
+            i = np.searchsorted(self.levels, filters.max_access_level, side="right") - 1
+            if i < 0:
+                return np.zeros(len(self), dtype=bool)
+            mask &= np.unpackbits(self.bitmaps[i], count=len(self)).view(bool)
+        for key in ("company_id", "company_reg_no", "department", "sourcefile"):
+            value = getattr(filters, key)
+            if value is not None:
+                mask &= self.columns[key] == value
+        return mask
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        if self.matrix.dtype == np.float32:
+            return self.matrix @ query
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), _SCORE_BLOCK_ROWS):
+            block = self.matrix[start : start + _SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start : start + len(block)] = block @ query
+        return scores
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        if not len(self) or limit <= 0:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = self._scores(query / norm if norm else query)
+        mask = self._mask(filters)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            SearchHit(
+                record=VectorRecord.from_payload(self.payloads[i]["id"], self.payloads[i]),
+                score=float(scores[i]),
+            )
+            for i in top
+            if np.isfinite(scores[i]) and (min_score is None or scores[i] >= min_score)
+        ]
+
+
+class KBChangeListener:
+    """
+    LISTENs on ``KB_CHANGE_CHANNEL`` over a dedicated psycopg2 connection.
+
+    ``on_connect`` runs after every (re)connect and ``on_disconnect`` whenever
+    the connection is lost; notifications sent in between are missed, so both
+    should treat every snapshot as stale.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[int], None],
+        on_connect: Callable[[], None],
+        on_disconnect: Callable[[], None],
+        poll_seconds: float = 1.0,
+        keepalive_seconds: float = 30.0,
+    ):
+        self._on_change = on_change
+        self._on_connect = on_connect
+        self._on_disconnect = on_disconnect
+        self.poll_seconds = poll_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="kb-change-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds * 2)
+
+    def _connect(self):
+        from app.database import sync_engine
+
+        connection = sync_engine.raw_connection()
+        # Held for the process lifetime, so take it out of the pool
+        connection.detach()
+        dbapi = connection.driver_connection
+        dbapi.autocommit = True
+        with dbapi.cursor() as cursor:
+            cursor.execute(f"LISTEN {KB_CHANGE_CHANNEL}")
+        return connection, dbapi
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                connection, dbapi = self._connect()
+            except Exception as e:
+                logger.warning(f"KB change listener cannot connect: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            backoff = 1.0
+            try:
+                self._on_connect()
+                idle = 0.0
+                while not self._stop.is_set():
+                    if select.select([dbapi], [], [], self.poll_seconds) == ([], [], []):
+                        idle += self.poll_seconds
+                        if idle < self.keepalive_seconds:
+                            continue
+                        # Surfaces a silently dropped connection
+                        with dbapi.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                    idle = 0.0
+                    dbapi.poll()
+                    while dbapi.notifies:
+                        payload = dbapi.notifies.pop(0).payload
+                        if payload:
+                            self._on_change(int(payload))
+            except Exception as e:
+                logger.warning(f"KB change listener disconnected: {e}")
+            finally:
+                self._on_disconnect()
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+
+class LocalIndexVectorStore(VectorStore):
+    """
+    Wraps the primary store and answers tenant-scoped searches from local
+    snapshots. Writes, scrolls, counts and unscoped searches go to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: VectorStore,
+        directory: str | Path | None = None,
+        max_chunks: int | None = None,
+        dtype: str | None = None,
+        listen: bool | None = None,
+    ):
+        self.primary = primary
+        self.name = f"{primary.name}+local"
+        self.directory = Path(directory or settings.VECTOR_LOCAL_INDEX_DIR)
+        self.max_chunks = max_chunks or settings.VECTOR_LOCAL_INDEX_MAX_CHUNKS
+        self.dtype = np.dtype(dtype or settings.VECTOR_LOCAL_INDEX_DTYPE)
+
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, TenantSnapshot] = {}
+        self._fresh: set[int] = set()
+        self._too_large: set[int] = set()
+        self._building: set[int] = set()
+        # Bumped on every invalidation; a build only counts as fresh if neither moved
+        self._versions: dict[int, int] = {}
+        self._epoch = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+        if listen is None:
+            listen = primary.name == "pgvector"
+        self._listener = None
+        # Without a listener only in-process writes invalidate snapshots
+        self._listening = not listen
+        if listen:
+            self._listener = KBChangeListener(
+                on_change=self.invalidate,
+                on_connect=lambda: self._set_listening(True),
+                on_disconnect=lambda: self._set_listening(False),
+            )
+            self._listener.start()
+
+    # Freshness
+    def _set_listening(self, listening: bool) -> None:
+        with self._lock:
+            self._listening = listening
+        self.invalidate()
+
+    def invalidate(self, company_id: int | None = None) -> None:
+        """Mark one tenant (or every tenant) stale; it is rebuilt on its next search."""
+        with self._lock:
+            if company_id is None:
+                self._epoch += 1
+                self._fresh.clear()
+                self._too_large.clear()
+            else:
+                self._versions[company_id] = self._versions.get(company_id, 0) + 1
+                self._fresh.discard(company_id)
+                self._too_large.discard(company_id)
+
+    def _token(self, company_id: int) -> tuple[int, int]:
+        return self._epoch, self._versions.get(company_id, 0)
+
+    def _tenant_dir(self, company_id: int) -> Path:
+        return self.directory / str(company_id)
+
+    def refresh(self, company_id: int) -> bool:
+        """
+        Rebuild the tenant's snapshot from the primary store now. Returns True if
+        it is fresh afterwards (False for tenants above ``max_chunks`` or when a
+        change arrived during the build).
+        """
+        with self._lock:
+            token = self._token(company_id)
+            listening = self._listening
+        try:
+            filters = SearchFilter(company_id=company_id)
+            if self.primary.count(filters) > self.max_chunks:
+                with self._lock:
+                    if token == self._token(company_id):
+                        self._too_large.add(company_id)
+                return False
+            snapshot = self._write_snapshot(
+                company_id, self.primary.scroll(filters, with_embeddings=True)
+            )
+        finally:
+            with self._lock:
+                self._building.discard(company_id)
+        with self._lock:
+            self._snapshots[company_id] = snapshot
+            if listening and self._listening and token == self._token(company_id):
+                self._fresh.add(company_id)
+                return True
+        return False
+
+    def _write_snapshot(
+        self, company_id: int, batches: Iterator[list[VectorRecord]]
+    ) -> TenantSnapshot:
+        tenant_dir = self._tenant_dir(company_id)
+        generation = uuid.uuid4().hex
+        records = (record for batch in batches for record in batch)
+        snapshot = TenantSnapshot.write(tenant_dir / generation, records, self.dtype)
+        # Switch CURRENT atomically; open memory maps keep unlinked files alive
+        current_tmp = tenant_dir / f"CURRENT.{generation}"
+        current_tmp.write_text(generation)
+        os.replace(current_tmp, tenant_dir / "CURRENT")
+        for entry in tenant_dir.iterdir():
+            if entry.is_dir() and entry.name != generation:
+                shutil.rmtree(entry, ignore_errors=True)
+        return snapshot
+
+    def _load_snapshot(self, company_id: int) -> TenantSnapshot | None:
+        """The last snapshot written for the tenant, fresh or not."""
+        with self._lock:
+            snapshot = self._snapshots.get(company_id)
+        if snapshot is not None:
+            return snapshot
+        try:
+            generation = (self._tenant_dir(company_id) / "CURRENT").read_text().strip()
+            snapshot = TenantSnapshot(self._tenant_dir(company_id) / generation)
+        except (OSError, ValueError) as e:
+            logger.debug(f"No local vector snapshot for company {company_id}: {e}")
+            return None
+        with self._lock:
+            return self._snapshots.setdefault(company_id, snapshot)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="vector-index"
+                    )
+        return self._executor
+
+    def _background_refresh(self, company_id: int) -> None:
+        try:
+            self.refresh(company_id)
+        except Exception as e:
+            logger.warning(f"Local vector index build failed for company {company_id}: {e}")
+
+    def _fresh_snapshot(self, company_id: int) -> TenantSnapshot | None:
+        """The tenant's snapshot if it is current; otherwise schedule a rebuild."""
+        with self._lock:
+            if company_id in self._fresh:
+                return self._snapshots[company_id]
+            if not self._listening or company_id in self._too_large or company_id in self._building:
+                return None
+            self._building.add(company_id)
+        self._get_executor().submit(self._background_refresh, company_id)
+        return None
+
+    # VectorStore
+    def upsert(self, records: Sequence[VectorRecord], batch_size: int | None = None) -> int:
+        written = self.primary.upsert(records, batch_size)
+        for company_id in {record.company_id for record in records}:
+            if company_id is not None:
+                self.invalidate(company_id)
+        return written
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        company_id = filters.company_id if filters is not None else None
+        if company_id is not None:
+            snapshot = self._fresh_snapshot(company_id)
+            if snapshot is not None:
+                return snapshot.search(embedding, limit, filters, min_score)
+        try:
+            return self.primary.search(embedding, limit, filters, min_score)
+        except Exception as e:
+            snapshot = self._load_snapshot(company_id) if company_id is not None else None
+            if snapshot is None:
+                raise
+            logger.warning(
+                f"Primary vector store failed ({e}); "
+                f"serving company {company_id} from its local snapshot"
+            )
+            return snapshot.search(embedding, limit, filters, min_score)
+
+    def delete_by_source(self, sourcefiles: Sequence[str], company_id: int | None = None) -> int:
+        deleted = self.primary.delete_by_source(sourcefiles, company_id)
+        if deleted:
+            # Without a company the sources are not tied to one tenant
+            self.invalidate(company_id)
+        return deleted
+
+    def delete(self, ids: Sequence[str]) -> int:
+        deleted = self.primary.delete(ids)
+        if deleted:
+            # The ids do not say which tenants they belonged to
+            self.invalidate()
+        return deleted
+
+    def scroll(
+        self,
+        filters: SearchFilter | None = None,
+        batch_size: int = 1000,
+        with_embeddings: bool = False,
+    ) -> Iterator[list[VectorRecord]]:
+        return self.primary.scroll(filters, batch_size, with_embeddings)
+
+    def list_records(
+        self, filters: SearchFilter | None = None, limit: int = 100, offset: int = 0
+    ) -> list[VectorRecord]:
+        return self.primary.list_records(filters, limit, offset)
+
+    def count(self, filters: SearchFilter | None = None) -> int:
+        return self.primary.count(filters)
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.primary.close()
@@ -0,0 +1,191 @@
+"""
+In-memory NumPy backend: exact cosine search over a normalized float32 matrix.
+
+Meant for tests, benchmarks and small single-process deployments; nothing is
+persisted.
+"""
+
+import threading
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from .base import SearchFilter, SearchHit, VectorRecord, VectorStore
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class InMemoryVectorStore(VectorStore):
+    """
+    Records in insertion order with a row-aligned embedding matrix.
+
+    Search is one matrix-vector product plus ``argpartition``; metadata filters
+    are evaluated as vectorized masks over per-field arrays.
+    """
+
+    name = "memory"
+
+    def __init__(self, dimensions: int | None = None):
+        self.dimensions = dimensions
+        self._records: list[VectorRecord] = []
+        self._rows: dict[str, int] = {}
+        self._matrix = np.empty((0, dimensions or 0), dtype=np.float32)
+        self._pending: list[np.ndarray] = []
+        self._columns: dict[str, np.ndarray] | None = None
+        self._lock = threading.RLock()
+
+    # Internal state
+    def _materialize(self) -> None:
+        """Fold pending rows into the matrix and rebuild the filter columns."""
+        if self._pending:
+            self._matrix = np.vstack([self._matrix, *self._pending])
+            self._pending = []
+        if self._columns is None:
+            records = self._records
+            self._columns = {
+                "access_level": np.fromiter(
+                    (r.access_level for r in records), dtype=np.int64, count=len(records)
+                ),
+                "company_id": np.fromiter(
+                    (-1 if r.company_id is None else r.company_id for r in records),
+                    dtype=np.int64,
+                    count=len(records),
+                ),
+                "company_reg_no": np.array([r.company_reg_no for r in records], dtype=object),
+                "department": np.array([r.department for r in records], dtype=object),
+                "sourcefile": np.array([r.sourcefile for r in records], dtype=object),
+            }
+
+    def _mask(self, filters: SearchFilter | None) -> np.ndarray | None:
+        if filters is None:
+            return None
+        columns = self._columns
+        mask = np.ones(len(self._records), dtype=bool)
+        if filters.max_access_level is not None:
+            mask &= columns["access_level"] <= filters.max_access_level
+        if filters.company_id is not None:
+            mask &= columns["company_id"] == filters.company_id
+        for key in ("company_reg_no", "department", "sourcefile"):
+            value = getattr(filters, key)
+            if value is not None:
+                mask &= columns[key] == value
+        return mask
+
+    def _vector(self, embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.dimensions is None:
+            self.dimensions = vector.shape[0]
+            self._matrix = np.empty((0, self.dimensions), dtype=np.float32)
+        elif vector.shape[0] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions} dimensions, got {vector.shape[0]}")
+        return vector
+
+    # VectorStore
+    def upsert(self, records: Sequence[VectorRecord], batch_size: int | None = None) -> int:
+        with self._lock:
+            new_rows = []
+            for record in records:
+                vector = self._vector(record.embedding)
+                stored = VectorRecord(**{**record.__dict__, "embedding": None})
+                row = self._rows.get(record.id)
+                if row is None:
+                    self._rows[record.id] = len(self._records)
+                    self._records.append(stored)
+                    new_rows.append(vector)
+                else:
+                    if new_rows:
+                        # The row may be one added earlier in this same batch
+                        self._pending.append(_normalize(np.vstack(new_rows)))
+                        new_rows = []
+                    self._materialize()
+                    self._records[row] = stored
+                    self._matrix[row] = _normalize(vector)
+            if new_rows:
+                self._pending.append(_normalize(np.vstack(new_rows)))
+            self._columns = None
+        return len(records)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        with self._lock:
+            self._materialize()
+            if not self._records:
+                return []
+            scores = self._matrix @ _normalize(self._vector(embedding))
+            mask = self._mask(filters)
+            if mask is not None:
+                scores = np.where(mask, scores, -np.inf)
+            k = min(limit, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                SearchHit(record=self._records[i], score=float(scores[i]))
+                for i in top
+                if np.isfinite(scores[i]) and (min_score is None or scores[i] >= min_score)
+            ]
+
+    def _drop(self, matches: np.ndarray) -> int:
+        """Remove the rows where ``matches`` is set (lock held, state materialized)."""
+        keep = ~matches
+        deleted = int(len(keep) - keep.sum())
+        if deleted:
+            self._matrix = self._matrix[keep]
+            self._records = [r for r, kept in zip(self._records, keep, strict=True) if kept]
+            self._rows = {r.id: i for i, r in enumerate(self._records)}
+            self._columns = None
+        return deleted
+
+    def delete_by_source(self, sourcefiles: Sequence[str], company_id: int | None = None) -> int:
+        with self._lock:
+            self._materialize()
+            matches = np.isin(self._columns["sourcefile"], list(sourcefiles))
+            if company_id is not None:
+                matches &= self._columns["company_id"] == company_id
+            return self._drop(matches)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        with self._lock:
+            self._materialize()
+            matches = np.zeros(len(self._records), dtype=bool)
+            for record_id in ids:
+                row = self._rows.get(str(record_id))
+                if row is not None:
+                    matches[row] = True
+            return self._drop(matches)
+
+    def scroll(
+        self,
+        filters: SearchFilter | None = None,
+        batch_size: int = 1000,
+        with_embeddings: bool = False,
+    ) -> Iterator[list[VectorRecord]]:
+        with self._lock:
+            self._materialize()
+            mask = self._mask(filters)
+            rows = np.arange(len(self._records)) if mask is None else np.flatnonzero(mask)
+            records = [
+                VectorRecord(
+                    **{
+                        **self._records[i].__dict__,
+                        "embedding": self._matrix[i].tolist() if with_embeddings else None,
+                    }
+                )
+                for i in rows
+            ]
+        for i in range(0, len(records), batch_size):
+            yield records[i : i + batch_size]
+
+    def count(self, filters: SearchFilter | None = None) -> int:
+        with self._lock:
+            self._materialize()
+            mask = self._mask(filters)
+            return len(self._records) if mask is None else int(mask.sum())
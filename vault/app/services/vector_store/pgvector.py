@@ -0,0 +1,177 @@
+"""
+pgvector backend over the ``kbdocuments`` table.
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.kb import KBDocument
+
+from .base import SearchFilter, SearchHit, VectorRecord, VectorStore, valid_uuids
+
+# VectorRecord field -> KBDocument column
+_COLUMNS = {
+    "content": KBDocument.content,
+    "sourcefile": KBDocument.sourcefile,
+    "title": KBDocument.title,
+    "access_level": KBDocument.accesslevel,
+    "company_id": KBDocument.companyid,
+    "company_reg_no": KBDocument.companyregno,
+    "department": KBDocument.department,
+    "tags": KBDocument.tags,
+    "author": KBDocument.author,
+    "doc_type": KBDocument.doctype,
+}
+
+
+def _conditions(filters: SearchFilter | None) -> list:
+    if filters is None:
+        return []
+    conditions = []
+    if filters.max_access_level is not None:
+        conditions.append(KBDocument.accesslevel <= filters.max_access_level)
+    if filters.company_id is not None:
+        conditions.append(KBDocument.companyid == filters.company_id)
+    if filters.company_reg_no is not None:
+        conditions.append(KBDocument.companyregno == filters.company_reg_no)
+    if filters.department is not None:
+        conditions.append(KBDocument.department == filters.department)
+    if filters.sourcefile is not None:
+        conditions.append(KBDocument.sourcefile == filters.sourcefile)
+    return conditions
+
+
+# Columns read alongside _COLUMNS; timestamps are set by the database/upsert
+_SELECT = (KBDocument.id, *_COLUMNS.values(), KBDocument.createdat, KBDocument.lastmodifieddate)
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _to_record(row, embedding=None) -> VectorRecord:
+    return VectorRecord(
+        id=str(row.id),
+        # pgvector returns float32 ndarrays; kept as-is so large scrolls stay cheap
+        embedding=embedding,
+        created_at=_isoformat(row.createdat),
+        last_modified_date=_isoformat(row.lastmodifieddate),
+        **{name: getattr(row, column.key) for name, column in _COLUMNS.items()},
+    )
+
+
+class PgVectorStore(VectorStore):
+    """Knowledge-base chunks in PostgreSQL, searched with pgvector's ``<=>`` operator."""
+
+    name = "pgvector"
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self._session_factory = session_factory
+
+    def upsert(self, records: Sequence[VectorRecord], batch_size: int | None = None) -> int:
+        batch_size = batch_size or settings.VECTOR_UPSERT_BATCH_SIZE
+        now = datetime.now()
+        written = 0
+        with self._session_factory() as db:
+            for i in range(0, len(records), batch_size):
+                rows = [
+                    {
+                        "id": record.id,
+                        "embedding": record.embedding,
+                        "lastmodifieddate": now,
+                        **{column.key: getattr(record, name) for name, column in _COLUMNS.items()},
+                    }
+                    for record in records[i : i + batch_size]
+                ]
+                stmt = insert(KBDocument).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[KBDocument.id],
+                    set_={key: stmt.excluded[key] for key in rows[0] if key != "id"},
+                )
+                db.execute(stmt)
+                written += len(rows)
+            db.commit()
+        return written
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        distance_expr = KBDocument.embedding.cosine_distance(list(embedding))
+        conditions = [KBDocument.embedding.is_not(None), *_conditions(filters)]
+        if min_score is not None:
+            conditions.append(distance_expr <= 1 - min_score)
+        distance = distance_expr.label("distance")
+        stmt = select(*_SELECT, distance).where(*conditions).order_by(distance).limit(limit)
+        with self._session_factory() as db:
+            rows = db.execute(stmt).all()
+        return [SearchHit(record=_to_record(row), score=1 - float(row.distance)) for row in rows]
+
+    def delete_by_source(self, sourcefiles: Sequence[str], company_id: int | None = None) -> int:
+        stmt = delete(KBDocument).where(KBDocument.sourcefile.in_(list(sourcefiles)))
+        if company_id is not None:
+            stmt = stmt.where(KBDocument.companyid == company_id)
+        with self._session_factory() as db:
+            result = db.execute(stmt)
+            db.commit()
+        return result.rowcount
+
+    def delete(self, ids: Sequence[str]) -> int:
+        ids = valid_uuids(ids)
+        if not ids:
+            return 0
+        with self._session_factory() as db:
+            result = db.execute(delete(KBDocument).where(KBDocument.id.in_(ids)))
+            db.commit()
+        return result.rowcount
+
+    def scroll(
+        self,
+        filters: SearchFilter | None = None,
+        batch_size: int = 1000,
+        with_embeddings: bool = False,
+    ) -> Iterator[list[VectorRecord]]:
+        columns = list(_SELECT)
+        if with_embeddings:
+            columns.append(KBDocument.embedding)
+        last_id = None
+        while True:
+            # Keyset pagination on the primary key: constant cost per page
+            stmt = select(*columns).where(*_conditions(filters)).order_by(KBDocument.id)
+            if last_id is not None:
+                stmt = stmt.where(KBDocument.id > last_id)
+            with self._session_factory() as db:
+                rows = db.execute(stmt.limit(batch_size)).all()
+            if not rows:
+                return
+            yield [_to_record(row, row.embedding if with_embeddings else None) for row in rows]
+            last_id = rows[-1].id
+
+    def list_records(
+        self, filters: SearchFilter | None = None, limit: int = 100, offset: int = 0
+    ) -> list[VectorRecord]:
+        stmt = (
+            select(*_SELECT)
+            .where(*_conditions(filters))
+            .order_by(KBDocument.createdat.desc().nulls_last(), KBDocument.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        with self._session_factory() as db:
+            rows = db.execute(stmt).all()
+        return [_to_record(row) for row in rows]
+
+    def count(self, filters: SearchFilter | None = None) -> int:
+        with self._session_factory() as db:
+            return db.execute(
+                select(func.count()).select_from(KBDocument).where(*_conditions(filters))
+            ).scalar_one()
@@ -0,0 +1,167 @@
+"""
+Qdrant backend; payload keys match the ones the chat retrieval path reads.
+"""
+
+import threading
+from collections.abc import Iterator, Sequence
+
+from qdrant_client import QdrantClient, models
+
+from app.config import settings
+from app.connectors.qdrant_utils import get_qdrant_client
+
+from .base import SearchFilter, SearchHit, VectorRecord, VectorStore, valid_uuids
+
+
+def _filter(filters: SearchFilter | None, sourcefiles: Sequence[str] | None = None):
+    must = []
+    if filters is not None:
+        if filters.max_access_level is not None:
+            must.append(
+                models.FieldCondition(
+                    key="access_level", range=models.Range(lte=filters.max_access_level)
+                )
+            )
+        for key in ("company_id", "company_reg_no", "department", "sourcefile"):
+            value = getattr(filters, key)
+            if value is not None:
+                must.append(models.FieldCondition(key=key, match=models.MatchValue(value=value)))
+    if sourcefiles is not None:
+        must.append(
+            models.FieldCondition(key="sourcefile", match=models.MatchAny(any=list(sourcefiles)))
+        )
+    return models.Filter(must=must) if must else None
+
+
+class QdrantVectorStore(VectorStore):
+    """Knowledge-base chunks in a Qdrant collection (cosine distance)."""
+
+    name = "qdrant"
+
+    # Payload fields used in filters; indexed so filtered search stays fast
+    _INDEXED_FIELDS = {
+        "access_level": models.PayloadSchemaType.INTEGER,
+        "company_id": models.PayloadSchemaType.INTEGER,
+        "company_reg_no": models.PayloadSchemaType.KEYWORD,
+        "department": models.PayloadSchemaType.KEYWORD,
+        "sourcefile": models.PayloadSchemaType.KEYWORD,
+    }
+
+    def __init__(self, collection_name: str | None = None, client: QdrantClient | None = None):
+        self.collection_name = collection_name or settings.QDRANT_COLLECTION
+        self.client = client or get_qdrant_client()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def ensure_collection(self, dimensions: int | None = None) -> None:
+        """Create the collection and its payload indexes if missing."""
+        with self._ready_lock:
+            if self._ready:
+                return
+            if not self.client.collection_exists(self.collection_name):
+                self.client.create_collection(
+                    self.collection_name,
+                    vectors_config=models.VectorParams(
+                        size=dimensions or settings.VECTOR_DIMENSIONS,
+                        distance=models.Distance.COSINE,
+                    ),
+                )
+                for field_name, schema in self._INDEXED_FIELDS.items():
+                    self.client.create_payload_index(self.collection_name, field_name, schema)
+            self._ready = True
+
+    def _collection(self, dimensions: int | None = None) -> str:
+        # Checked once per store, on first use
+        if not self._ready:
+            self.ensure_collection(dimensions)
+        return self.collection_name
+
+    def upsert(self, records: Sequence[VectorRecord], batch_size: int | None = None) -> int:
+        if not records:
+            return 0
+        batch_size = batch_size or settings.VECTOR_UPSERT_BATCH_SIZE
+        collection = self._collection(len(records[0].embedding))
+        for i in range(0, len(records), batch_size):
+            self.client.upsert(
+                collection,
+                points=[
+                    models.PointStruct(
+                        id=record.id, vector=list(record.embedding), payload=record.payload()
+                    )
+                    for record in records[i : i + batch_size]
+                ],
+            )
+        return len(records)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        filters: SearchFilter | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchHit]:
+        response = self.client.query_points(
+            self._collection(len(embedding)),
+            query=list(embedding),
+            query_filter=_filter(filters),
+            limit=limit,
+            score_threshold=min_score,
+            with_payload=True,
+        )
+        return [
+            SearchHit(record=VectorRecord.from_payload(point.id, point.payload), score=point.score)
+            for point in response.points
+        ]
+
+    def delete_by_source(self, sourcefiles: Sequence[str], company_id: int | None = None) -> int:
+        selector = _filter(SearchFilter(company_id=company_id), sourcefiles)
+        # Qdrant's delete does not report a count
+        deleted = self.client.count(self._collection(), count_filter=selector).count
+        self.client.delete(
+            self.collection_name, points_selector=models.FilterSelector(filter=selector)
+        )
+        return deleted
+
+    def delete(self, ids: Sequence[str]) -> int:
+        ids = [str(point_id) for point_id in valid_uuids(ids)]
+        if not ids:
+            return 0
+        # As for delete_by_source, count what exists first
+        existing = self.client.retrieve(
+            self._collection(), ids=ids, with_payload=False, with_vectors=False
+        )
+        if existing:
+            self.client.delete(
+                self.collection_name,
+                points_selector=models.PointIdsList(points=[point.id for point in existing]),
+            )
+        return len(existing)
+
+    def scroll(
+        self,
+        filters: SearchFilter | None = None,
+        batch_size: int = 1000,
+        with_embeddings: bool = False,
+    ) -> Iterator[list[VectorRecord]]:
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                self._collection(),
+                scroll_filter=_filter(filters),
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_embeddings,
+            )
+            if points:
+                yield [
+                    VectorRecord.from_payload(
+                        point.id, point.payload, point.vector if with_embeddings else None
+                    )
+                    for point in points
+                ]
+            if offset is None:
+                return
+
+    def count(self, filters: SearchFilter | None = None) -> int:
+        return self.client.count(self._collection(), count_filter=_filter(filters)).count
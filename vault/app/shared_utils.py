@@ -6,8 +6,6 @@ Migrated from Supabase to SQLAlchemy.
 from datetime import datetime
 from typing import Any
 
-import PyPDF2
-from docx import Document
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -127,6 +125,8 @@ def read_docx(file_path: str) -> str:
     Raises:
         ValueError: If file cannot be read
     """
+    from docx import Document
+
     try:
         # Load the .docx file
         document = Document(file_path)
@@ -152,6 +152,8 @@ def read_pdf(file_path: str) -> str:
     Returns:
         Extracted text content (empty string on error)
     """
+    import PyPDF2
+
     try:
         # Open the PDF file in binary read mode
         with open(file_path, "rb") as file:
@@ -0,0 +1,11 @@
+"""
+Performance benchmarks (run from the ``vault`` directory).
+
+- ``python -m benchmarks.retrieval``: search and RAG latency, QPS and recall@k
+- ``python -m benchmarks.ingestion``: per-stage ingestion throughput and memory
+- ``python -m benchmarks.startup``: cold-start import time against a budget
+- ``python -m benchmarks.fake_ollama``: the deterministic Ollama stand-in on its own
+
+The suites never call a real Ollama; see ``fake_ollama`` for how embeddings
+and generations are produced.
+"""
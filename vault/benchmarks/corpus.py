@@ -0,0 +1,145 @@
+"""
+Synthetic knowledge-base corpus with exact ground truth.
+
+Chunks are drawn from topic-specific vocabularies (Zipf-distributed within
+a topic), so the embedding space has the cluster structure that real
+documents have and that ANN indexes are sensitive to. Embeddings come from
+``fake_ollama.embed_texts``, so they equal what the fake server returns for
+the same text.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .fake_ollama import DIMENSIONS, token_vector
+
+SOURCE_PREFIX = "bench://"
+DEPARTMENTS = ["finance", "hr", "engineering", "legal", "sales"]
+
+_SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "qui", "bel", "dor", "sen", "pra", "zu"]
+
+
+def _vocabulary(size: int, rng: np.random.Generator) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES, size=rng.integers(2, 5))))
+    return sorted(words)
+
+
+@dataclass
+class Query:
+    text: str
+    access_level: int
+    company_id: int
+    # Exact top-k chunk indexes under the query's filters, best first
+    expected: list[int]
+
+
+class SyntheticCorpus:
+    """``size`` chunks with metadata, texts (on demand) and normalized embeddings."""
+
+    def __init__(
+        self,
+        size: int,
+        tenants: int = 10,
+        topics: int = 200,
+        vocabulary: int = 5000,
+        chunk_tokens: int = 60,
+        dimensions: int = DIMENSIONS,
+        seed: int = 42,
+    ):
+        self.size = size
+        self.dimensions = dimensions
+        self.chunk_tokens = chunk_tokens
+        rng = np.random.default_rng(seed)
+        self.words = _vocabulary(vocabulary, rng)
+        word_vectors = np.vstack([token_vector(word, dimensions) for word in self.words])
+
+        # Each topic favours its own permutation of the vocabulary
+        self._topic_words = np.vstack([rng.permutation(vocabulary) for _ in range(topics)])
+        zipf = 1.0 / np.arange(1, vocabulary + 1)
+        self._word_probabilities = zipf / zipf.sum()
+
+        self.topics = rng.integers(0, topics, size=size)
+        self.company_ids = rng.integers(1, tenants + 1, size=size)
+        self.access_levels = rng.integers(1, 6, size=size)
+        self.departments = rng.integers(0, len(DEPARTMENTS), size=size)
+        self.tokens = np.empty((size, chunk_tokens), dtype=np.int32)
+        for start in range(0, size, 10_000):
+            end = min(size, start + 10_000)
+            ranks = rng.choice(
+                vocabulary, size=(end - start, chunk_tokens), p=self._word_probabilities
+            )
+            self.tokens[start:end] = self._topic_words[self.topics[start:end, None], ranks]
+
+        # Sum of token vectors == fake_ollama.embed_texts(self.text(i))
+        self.embeddings = np.empty((size, dimensions), dtype=np.float32)
+        # Small blocks: the gathered (rows, tokens, dimensions) array is the peak memory
+        for start in range(0, size, 512):
+            block = word_vectors[self.tokens[start : start + 512]].sum(axis=1)
+            block /= np.linalg.norm(block, axis=1, keepdims=True)
+            self.embeddings[start : start + len(block)] = block
+        self._rng = rng
+
+    def text(self, index: int) -> str:
+        return " ".join(self.words[token] for token in self.tokens[index])
+
+    def sourcefile(self, index: int) -> str:
+        # Ten chunks per source document
+        return f"{SOURCE_PREFIX}doc-{index // 10}"
+
+    def sourcefiles(self) -> list[str]:
+        return [f"{SOURCE_PREFIX}doc-{i}" for i in range((self.size + 9) // 10)]
+
+    def records(self, start: int = 0, end: int | None = None):
+        """VectorRecords for ``[start, end)`` (imported lazily: needs app settings)."""
+        from app.services.vector_store import VectorRecord
+
+        end = self.size if end is None else end
+        return [
+            VectorRecord(
+                id=f"00000000-0000-4000-8000-{i:012d}",
+                content=self.text(i),
+                embedding=self.embeddings[i],
+                sourcefile=self.sourcefile(i),
+                title=f"Benchmark document {i // 10} (Part {i % 10 + 1}/10)",
+                access_level=int(self.access_levels[i]),
+                company_id=int(self.company_ids[i]),
+                department=DEPARTMENTS[self.departments[i]],
+                doc_type="txt",
+            )
+            for i in range(start, end)
+        ]
+
+    def record_index(self, record_id: str) -> int:
+        return int(record_id.rsplit("-", 1)[1])
+
+    def ground_truth(
+        self, embedding: np.ndarray, k: int, access_level: int, company_id: int, min_score: float
+    ) -> list[int]:
+        """Exact cosine top-k with the same filters search_kb applies."""
+        scores = self.embeddings @ embedding
+        mask = (self.access_levels <= access_level) & (self.company_ids == company_id)
+        scores = np.where(mask & (scores >= min_score), scores, -np.inf)
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+    def queries(self, count: int, k: int, min_score: float, words: int = 8) -> list[Query]:
+        """Queries built from words of random chunks, with their exact answers."""
+        from .fake_ollama import embed_texts
+
+        out = []
+        for _ in range(count):
+            source = int(self._rng.integers(0, self.size))
+            picked = self._rng.choice(self.tokens[source], size=words, replace=False)
+            text = " ".join(self.words[token] for token in picked)
+            access_level = int(self._rng.integers(2, 6))
+            company_id = int(self.company_ids[source])
+            embedding = embed_texts([text], self.dimensions)[0]
+            expected = self.ground_truth(embedding, k, access_level, company_id, min_score)
+            out.append(Query(text, access_level, company_id, expected))
+        return out
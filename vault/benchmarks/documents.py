@@ -0,0 +1,179 @@
+"""
+Synthetic document corpus for the ingestion benchmark.
+
+Writes PDF, DOCX, PPTX, XLSX, HTML and TXT files filled with generated
+sentences. PDFs are written directly (one Helvetica text stream per page),
+so no PDF-writing library is needed. The Office formats use the same
+libraries the extractors read them with; a format whose library is missing
+is skipped.
+"""
+
+import html
+import logging
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ["pdf", "docx", "pptx", "xlsx", "html", "txt"]
+
+_WORDS = (
+    "policy report quarterly revenue employee contract onboarding security access review "
+    "budget forecast customer invoice supplier compliance audit training schedule project "
+    "milestone risk incident procedure approval holiday expense travel pension benefits "
+    "warehouse inventory shipment logistics marketing campaign release deployment server"
+).split()
+
+
+class TextSource:
+    """Deterministic sentences and paragraphs."""
+
+    def __init__(self, seed: int = 7):
+        self._rng = np.random.default_rng(seed)
+
+    def sentence(self) -> str:
+        words = self._rng.choice(_WORDS, size=int(self._rng.integers(8, 20)))
+        return " ".join(words).capitalize() + "."
+
+    def paragraph(self, sentences: int = 6) -> str:
+        return " ".join(self.sentence() for _ in range(sentences))
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, text: TextSource, pages: int) -> None:
+    """Minimal PDF with one text stream per page (text layer, no images)."""
+    objects: list[bytes] = []
+    page_ids = []
+    font_id = 3
+    for _ in range(pages):
+        lines = [text.sentence() for _ in range(40)]
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in lines
+        )
+        stream += " ET"
+        content_id = 4 + len(objects)
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1")
+        )
+        page_ids.append(4 + len(objects))
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode("latin-1")
+        )
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    header = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1"),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(header + objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (
+        f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    )
+    path.write_bytes(bytes(out))
+
+
+def write_docx(path: Path, text: TextSource, pages: int) -> None:
+    from docx import Document
+
+    doc = Document()
+    for page in range(pages):
+        doc.add_heading(f"Section {page + 1}", level=1)
+        for _ in range(5):
+            doc.add_paragraph(text.paragraph())
+        table = doc.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = text.sentence()
+    doc.save(str(path))
+
+
+def write_pptx(path: Path, text: TextSource, pages: int) -> None:
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    for slide_number in range(pages):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {slide_number + 1}: {text.sentence()}"
+        slide.placeholders[1].text = "\n".join(text.sentence() for _ in range(6))
+        box = slide.shapes.add_textbox(Inches(1), Inches(6), Inches(8), Inches(1))
+        box.text_frame.text = text.sentence()
+    prs.save(str(path))
+
+
+def write_xlsx(path: Path, text: TextSource, pages: int) -> None:
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    for sheet_number in range(pages):
+        sheet = wb.active if sheet_number == 0 else wb.create_sheet()
+        sheet.title = f"Sheet{sheet_number + 1}"
+        sheet.append(["id", "description", "amount", "owner"])
+        for row in range(50):
+            sheet.append([row, text.sentence(), row * 13.5, text.sentence()[:20]])
+    wb.save(str(path))
+
+
+def write_html(path: Path, text: TextSource, pages: int) -> None:
+    body = "".join(
+        f"<h2>Section {page + 1}</h2>"
+        + "".join(f"<p>{html.escape(text.paragraph())}</p>" for _ in range(5))
+        + "<ul>"
+        + "".join(f"<li>{html.escape(text.sentence())}</li>" for _ in range(4))
+        + "</ul>"
+        for page in range(pages)
+    )
+    path.write_text(
+        "<html><head><title>Benchmark</title><style>p{margin:0}</style>"
+        f"<script>var x = 1;</script></head><body><nav>Home | Docs</nav>{body}</body></html>",
+        encoding="utf-8",
+    )
+
+
+def write_txt(path: Path, text: TextSource, pages: int) -> None:
+    path.write_text("\n\n".join(text.paragraph() for _ in range(pages * 5)), encoding="utf-8")
+
+
+WRITERS: dict[str, Callable[[Path, TextSource, int], None]] = {
+    "pdf": write_pdf,
+    "docx": write_docx,
+    "pptx": write_pptx,
+    "xlsx": write_xlsx,
+    "html": write_html,
+    "txt": write_txt,
+}
+
+
+def generate_corpus(
+    directory: Path, files_per_format: int, pages: int, formats: list[str], seed: int = 7
+) -> list[Path]:
+    """Write ``files_per_format`` files of each format; returns the written paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    text = TextSource(seed)
+    paths = []
+    for fmt in formats:
+        writer = WRITERS[fmt]
+        for i in range(files_per_format):
+            path = directory / f"{fmt}-{i:05d}.{fmt}"
+            try:
+                writer(path, text, pages)
+            except ImportError as e:
+                logger.warning(f"Skipping {fmt} files: {e}")
+                break
+            paths.append(path)
+    return paths
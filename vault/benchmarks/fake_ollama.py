@@ -0,0 +1,200 @@
+"""
+Deterministic stand-in for the Ollama HTTP API.
+
+Embeddings are hash-based bag-of-words vectors: every token maps to a fixed
+pseudo-random unit vector (seeded by its hash) and a text embeds as the sum of
+its tokens. Texts that share words are close in cosine space, so retrieval
+quality (recall@k) means something, and any process can recompute the exact
+vector of a text without calling the server (see ``embed_texts``).
+
+Chat and generate return canned answers after a configurable latency. A
+rerank scoring prompt (``Passages:`` with numbered passages) gets a JSON
+``scores`` list, so the LLM reranker also works against it.
+
+Usage::
+
+    with FakeOllama(chat_latency_ms=300) as ollama:
+        os.environ["OLLAMA_HOST"] = ollama.url
+        ...
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+DIMENSIONS = 768
+MODELS = ["llama3.2:1b", "nomic-embed-text:latest"]
+CANNED_ANSWER = (
+    "Based on the knowledge base, the requested information is described in the "
+    "referenced documents. Please consult the cited sources for details."
+)
+
+_TOKEN = re.compile(r"\w+")
+_PASSAGE = re.compile(r"^\[\d+\] ", re.MULTILINE)
+
+
+@lru_cache(maxsize=200_000)
+def token_vector(token: str, dimensions: int = DIMENSIONS) -> np.ndarray:
+    """Fixed unit vector for a token (the same in every process)."""
+    seed = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def embed_texts(texts: list[str], dimensions: int = DIMENSIONS) -> np.ndarray:
+    """Embeddings exactly as the server returns them (unit-normalized float32)."""
+    out = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for token in tokenize(text):
+            out[i] += token_vector(token, dimensions)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body: dict, status: int = 200) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _sleep(self, milliseconds: float) -> None:
+        if milliseconds > 0:
+            time.sleep(milliseconds / 1000)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._json({"models": [{"name": name, "model": name} for name in MODELS]})
+        else:
+            self._json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        fake: FakeOllama = self.server.fake
+        with fake.lock:
+            fake.requests[self.path] = fake.requests.get(self.path, 0) + 1
+
+        if self.path == "/api/embed":
+            texts = body.get("input", [])
+            texts = [texts] if isinstance(texts, str) else texts
+            self._sleep(fake.embed_latency_ms + fake.embed_latency_per_text_ms * len(texts))
+            vectors = embed_texts(texts, fake.dimensions)
+            self._json({"model": body.get("model"), "embeddings": vectors.tolist()})
+        elif self.path == "/api/embeddings":
+            self._sleep(fake.embed_latency_ms + fake.embed_latency_per_text_ms)
+            vector = embed_texts([body.get("prompt", "")], fake.dimensions)[0]
+            self._json({"embedding": vector.tolist()})
+        elif self.path in ("/api/chat", "/api/generate"):
+            self._sleep(fake.chat_latency_ms)
+            prompt = (
+                "\n".join(message.get("content", "") for message in body.get("messages", []))
+                if self.path == "/api/chat"
+                else body.get("prompt", "")
+            )
+            answer = fake.answer(prompt)
+            done = {
+                "model": body.get("model"),
+                "created_at": "1970-01-01T00:00:00Z",
+                "done": True,
+                "prompt_eval_count": len(tokenize(prompt)),
+                "eval_count": len(tokenize(answer)),
+            }
+            if self.path == "/api/chat":
+                self._json({**done, "message": {"role": "assistant", "content": answer}})
+            else:
+                self._json({**done, "response": answer})
+        else:
+            self._json({"error": "not found"}, status=404)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: FakeOllama
+
+
+class FakeOllama:
+    """Fake Ollama server on a background thread; use as a context manager."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        dimensions: int = DIMENSIONS,
+        embed_latency_ms: float = 0.0,
+        embed_latency_per_text_ms: float = 0.0,
+        chat_latency_ms: float = 0.0,
+    ):
+        self.dimensions = dimensions
+        self.embed_latency_ms = embed_latency_ms
+        self.embed_latency_per_text_ms = embed_latency_per_text_ms
+        self.chat_latency_ms = chat_latency_ms
+        self.requests: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def answer(self, prompt: str) -> str:
+        passages = len(_PASSAGE.findall(prompt))
+        if passages and "scores" in prompt:
+            # Rerank scoring prompt: deterministic, prefers earlier (higher-ranked) passages
+            return json.dumps({"scores": [max(10 - i, 1) for i in range(passages)]})
+        return CANNED_ANSWER
+
+    def start(self) -> FakeOllama:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeOllama:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the fake Ollama server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--chat-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeOllama(
+        port=args.port,
+        embed_latency_ms=args.embed_latency_ms,
+        chat_latency_ms=args.chat_latency_ms,
+    )
+    print(f"Fake Ollama listening on {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,122 @@
+"""
+Latency statistics, report formatting and baseline comparison shared by the
+benchmark suites.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass
+class Result:
+    """One benchmarked operation at one corpus size."""
+
+    name: str
+    size: int
+    samples: int = 0
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+    qps: float | None = None
+    recall: float | None = None
+    k: int | None = None
+    error: str | None = None
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+
+def percentiles(latencies_s: list[float]) -> dict[str, float]:
+    values = np.asarray(latencies_s) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def measure_latency(call: Callable[[int], object], count: int) -> tuple[list[float], list]:
+    """Run ``call(i)`` sequentially; returns per-call latencies and results."""
+    latencies, results = [], []
+    for i in range(count):
+        started = time.perf_counter()
+        results.append(call(i))
+        latencies.append(time.perf_counter() - started)
+    return latencies, results
+
+
+def measure_qps(call: Callable[[int], object], count: int, concurrency: int) -> float:
+    """Throughput of ``count`` calls spread over ``concurrency`` threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def recall_at_k(expected: list[list], actual: list[list], k: int) -> float:
+    """Mean fraction of the exact top-k found in the returned top-k."""
+    scores = []
+    for truth, found in zip(expected, actual, strict=True):
+        truth = truth[:k]
+        if truth:
+            scores.append(len(set(truth) & set(found[:k])) / len(truth))
+    return float(np.mean(scores)) if scores else 1.0
+
+
+def format_table(results: list[Result]) -> str:
+    header = f"{'operation':<28}{'chunks':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    header += f"{'QPS':>10}{'recall':>12}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name:<28}{r.size:>10}  {r.error}")
+            continue
+
+        def fmt(value, spec=".2f"):
+            return format(value, spec) if value is not None else "-"
+
+        recall = f"{fmt(r.recall, '.3f')}@{r.k}" if r.recall is not None else "-"
+        lines.append(
+            f"{r.name:<28}{r.size:>10}{fmt(r.p50_ms):>10}{fmt(r.p95_ms):>10}"
+            f"{fmt(r.p99_ms):>10}{fmt(r.qps, '.1f'):>10}{recall:>12}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(results: list[Result], path: str | Path, metadata: dict) -> None:
+    Path(path).write_text(
+        json.dumps({"metadata": metadata, "results": [asdict(r) for r in results]}, indent=2)
+    )
+
+
+def compare_to_baseline(
+    results: list[Result], baseline_path: str | Path, max_regression: float
+) -> list[str]:
+    """
+    Regressions against a previous ``--json`` report: p95 latency more than
+    ``max_regression`` (fraction) slower, or recall lower by more than 0.01.
+    """
+    baseline = {
+        f"{r['name']}@{r['size']}": r
+        for r in json.loads(Path(baseline_path).read_text())["results"]
+    }
+    regressions = []
+    for result in results:
+        before = baseline.get(result.key)
+        if before is None or result.error or before.get("error"):
+            continue
+        if before["p95_ms"] and result.p95_ms > before["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{result.key}: p95 {before['p95_ms']:.2f} ms -> {result.p95_ms:.2f} ms"
+            )
+        if before.get("recall") is not None and result.recall is not None:
+            if result.recall < before["recall"] - 0.01:
+                regressions.append(
+                    f"{result.key}: recall {before['recall']:.3f} -> {result.recall:.3f}"
+                )
+    return regressions
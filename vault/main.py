@@ -4,6 +4,7 @@ Slim orchestrator that imports modular routers
 """
 
 import logging
+import sys
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -15,8 +16,10 @@ from app.api import (
     collector_router,
     companies_router,
     expert_router,
+    health_router,
     helper_router,
     kb_router,
+    metrics_router,
     passwords_router,
     users_router,
     utils_router,
@@ -24,7 +27,10 @@ from app.api import (
     websocket_router,
 )
 from app.config.middleware import setup_middleware
+from app.core.tracing import setup_tracing, shutdown_tracing
+from app.core.warmup import warmup
 from app.logger_config import setup_logging
+from app.services import password_hasher
 
 # Initialize logging
 setup_logging()
@@ -35,7 +41,25 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Application startup: Logging system initialized.")
+    # DB pools, Ollama and Whisper models, vector indexes; /ready reports progress
+    warmup.start()
     yield
+    await warmup.stop()
+    password_hasher.shutdown()
+    # Only close LDAP pools if something loaded the LDAP package
+    ldap_pool = sys.modules.get("app.ldap.pool")
+    if ldap_pool is not None:
+        ldap_pool.shutdown()
+    vector_store = sys.modules.get("app.services.vector_store")
+    if vector_store is not None:
+        vector_store.close_vector_store()
+    transcription = sys.modules.get("app.services.transcription")
+    if transcription is not None:
+        transcription.shutdown()
+    ocr = sys.modules.get("app.services.ocr")
+    if ocr is not None:
+        ocr.shutdown()
+    shutdown_tracing()
     logger.info("Application shutdown: Logging system finalized.")
 
 
@@ -47,6 +71,9 @@ app = FastAPI(
 # Setup middleware (CORS, etc.)
 setup_middleware(app)
 
+# OpenTelemetry (no-op unless TRACING_ENABLED)
+setup_tracing(app)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(users_router, prefix="/api/users", tags=["Users"])
@@ -60,6 +87,8 @@ app.include_router(collector_router, tags=["Collector"])
 app.include_router(expert_router, tags=["Expert"])
 app.include_router(validator_router, tags=["Validator"])
 app.include_router(helper_router, tags=["Helper"])
+app.include_router(metrics_router, tags=["Metrics"])
+app.include_router(health_router, tags=["Health"])
 
 
 @app.get("/")
@@ -72,58 +101,5 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """Health check with dependency verification."""
-    checks = {
-        "status": "healthy",
-        "dependencies": {}
-    }
-    
-    # Check Tesseract
-    try:
-        import pytesseract
-        version = pytesseract.get_tesseract_version()
-        checks["dependencies"]["tesseract"] = {
-            "installed": True,
-            "version": str(version)
-        }
-    except Exception as e:
-        checks["dependencies"]["tesseract"] = {
-            "installed": False,
-            "error": str(e)
-        }
-    
-    # Check Whisper
-    try:
-        import whisper
-        checks["dependencies"]["whisper"] = {"installed": True}
-    except Exception as e:
-        checks["dependencies"]["whisper"] = {
-            "installed": False,
-            "error": str(e)
-        }
-    
-    # Check FFmpeg
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["ffmpeg", "-version"],
-            capture_output=True,
-            text=True
-        )
-        checks["dependencies"]["ffmpeg"] = {
-            "installed": result.returncode == 0
-        }
-    except Exception as e:
-        checks["dependencies"]["ffmpeg"] = {
-            "installed": False,
-            "error": str(e)
-        }
-    
-    return checks
-
-
-
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=7860)